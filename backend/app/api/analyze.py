@@ -1,11 +1,16 @@
 """Analysis API endpoints."""
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+import asyncio
+import json
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 from datetime import datetime, timedelta
 from uuid import uuid4
 
-from app.models.requests import AnalyzeRequest, AnalyzeResponse, AnalysisResultResponse
-from app.services.analysis_service import AnalysisService, get_analysis_service
+from app.models.requests import AnalysisPriority, AnalyzeRequest, AnalyzeResponse, AnalysisResultResponse
 from app.services.db_service import DBService, get_db_service
+from app.services.job_queue import AnalysisJob, JobQueue, get_job_queue
+from app.services.progress_service import ProgressReporter, get_progress_reporter
+from app.config import settings
 from app.dependencies import get_current_user
 from app.utils import get_logger, log_with_context, get_correlation_id
 
@@ -13,26 +18,38 @@ router = APIRouter()
 logger = get_logger(__name__)
 
 
+def _job_priority(request: AnalyzeRequest) -> AnalysisPriority:
+    """Queue lane for a client request; bulk requests go to the low lane.
+
+    The high lane is reserved for server-side jobs.
+    """
+    if len(request.document_ids) > settings.analysis_bulk_document_threshold:
+        return AnalysisPriority.LOW
+    return AnalysisPriority.NORMAL
+
+
 @router.post("/", response_model=AnalyzeResponse)
 async def trigger_analysis(
     request: AnalyzeRequest,
-    background_tasks: BackgroundTasks,
     current_user: dict = Depends(get_current_user),
-    analysis_service: AnalysisService = Depends(get_analysis_service),
-    db: DBService = Depends(get_db_service)
+    db: DBService = Depends(get_db_service),
+    progress: ProgressReporter = Depends(get_progress_reporter),
+    job_queue: JobQueue = Depends(get_job_queue)
 ):
     """
-    Trigger document analysis (async background task).
+    Trigger document analysis (queued job).
 
     Flow:
     1. Client calls this endpoint with document IDs
     2. Backend creates analysis record in database
-    3. Backend queues background task to run MedGemma analysis
+    3. Backend enqueues a job; a worker runs the MedGemma analysis
     4. Backend immediately returns analysis_id
-    5. Client polls GET /analyze/{analysis_id} for results
+    5. Client subscribes to GET /analyze/{analysis_id}/events (or polls
+       GET /analyze/{analysis_id}) for progress and results
     """
     user_id = current_user['user_id']
     correlation_id = get_correlation_id()
+    analysis_id = None
 
     try:
         # Convert provider enum to string value (already validated by Pydantic)
@@ -57,9 +74,12 @@ async def trigger_analysis(
 
         # Validate documents belong to user
         logger.info(f"📊 Validating {len(request.document_ids)} document(s)...")
+        # One IN query; rows are memoized for the background run
+        docs = await db.get_documents_bulk(
+            request.document_ids, user_id, analysis_id=analysis_id
+        )
         for doc_id in request.document_ids:
-            doc = await db.get_document(doc_id, user_id)
-            if not doc:
+            if doc_id not in docs:
                 log_with_context(
                     logger, 30,
                     f"⚠️  Document not found or unauthorized",
@@ -78,7 +98,7 @@ async def trigger_analysis(
                 )
 
         # Create analysis record
-        await db.create_analysis(
+        analysis_row = await db.create_analysis(
             analysis_id=analysis_id,
             user_id=user_id,
             document_ids=request.document_ids,
@@ -91,19 +111,33 @@ async def trigger_analysis(
             analysis_id=analysis_id
         )
 
-        # Queue background task for analysis
-        background_tasks.add_task(
-            analysis_service.run_analysis,
+        if job_queue.in_process:
+            # Serve status polls from memory until the worker picks it up
+            progress.start_analysis(
+                analysis_id,
+                user_id,
+                provider_str,
+                created_at=analysis_row.get('created_at'),
+                status="queued"
+            )
+        else:
+            # A worker process fetches its own rows
+            db.release_analysis_documents(analysis_id)
+
+        priority = _job_priority(request)
+        await job_queue.enqueue(AnalysisJob(
             analysis_id=analysis_id,
-            document_ids=request.document_ids,
             user_id=user_id,
-            provider=provider_str
-        )
+            document_ids=request.document_ids,
+            provider=provider_str,
+            priority=priority.value
+        ))
         log_with_context(
             logger, 20,
-            f"🚀 Queued background analysis task",
+            f"🚀 Queued analysis job",
             user_id=user_id,
-            analysis_id=analysis_id
+            analysis_id=analysis_id,
+            priority=priority.value
         )
 
         return AnalyzeResponse(
@@ -113,8 +147,10 @@ async def trigger_analysis(
         )
 
     except HTTPException:
+        db.release_analysis_documents(analysis_id)
         raise
     except Exception as e:
+        db.release_analysis_documents(analysis_id)
         log_with_context(
             logger, 40,
             f"❌ Failed to trigger analysis: {type(e).__name__}",
@@ -136,7 +172,8 @@ async def trigger_analysis(
 async def get_analysis(
     analysis_id: str,
     current_user: dict = Depends(get_current_user),
-    db: DBService = Depends(get_db_service)
+    db: DBService = Depends(get_db_service),
+    progress: ProgressReporter = Depends(get_progress_reporter)
 ):
     """
     Get analysis results (polling endpoint).
@@ -154,6 +191,11 @@ async def get_analysis(
             analysis_id=analysis_id
         )
 
+        # In-flight analyses in this process are served from memory
+        snapshot = progress.snapshot(analysis_id, user_id)
+        if snapshot:
+            return AnalysisResultResponse(**snapshot)
+
         # Get analysis from database
         analysis = await db.get_analysis(
             analysis_id=analysis_id,
@@ -220,6 +262,157 @@ async def get_analysis(
         )
 
 
+def _sse(event: str, data: dict, retry_ms: int | None = None) -> str:
+    """Format one server-sent event."""
+    message = f"event: {event}\ndata: {json.dumps(data, default=str)}\n"
+    if retry_ms is not None:
+        message = f"retry: {retry_ms}\n" + message
+    return message + "\n"
+
+
+async def _relay_worker_events(
+    request: Request,
+    job_queue: JobQueue,
+    db: DBService,
+    analysis_id: str,
+    user_id: str,
+    summary: dict
+):
+    """SSE body relaying events that worker processes publish for an analysis.
+
+    Idle intervals re-check the database, so a 'complete' event published
+    before the subscription started cannot leave the stream open forever.
+    """
+    events = job_queue.subscribe_events(analysis_id)
+    pending = None
+    try:
+        yield _sse("snapshot", summary)
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(events.__anext__())
+            done, _ = await asyncio.wait({pending}, timeout=settings.analysis_events_keepalive_seconds)
+            if not done:
+                if await request.is_disconnected():
+                    break
+                analysis = await db.get_analysis(analysis_id=analysis_id, user_id=user_id)
+                if analysis and analysis['status'] in ("completed", "failed"):
+                    yield _sse("complete", {
+                        "analysis_id": analysis_id,
+                        "status": analysis['status'],
+                        "issues_count": analysis.get('issues_count', 0),
+                        "total_savings_detected": analysis.get('total_savings_detected'),
+                    })
+                    break
+                yield ": keep-alive\n\n"
+                continue
+            try:
+                event, data = pending.result()
+            except StopAsyncIteration:
+                break
+            pending = None
+            yield _sse(event, data)
+            if event == "complete":
+                break
+    finally:
+        if pending is not None:
+            pending.cancel()
+        await events.aclose()
+
+
+@router.get("/{analysis_id}/events")
+async def stream_analysis_events(
+    analysis_id: str,
+    request: Request,
+    current_user: dict = Depends(get_current_user),
+    db: DBService = Depends(get_db_service),
+    progress: ProgressReporter = Depends(get_progress_reporter),
+    job_queue: JobQueue = Depends(get_job_queue)
+):
+    """
+    Stream analysis progress as Server-Sent Events.
+
+    Events:
+    - snapshot: current status (same shape as GET /analyze/{analysis_id})
+    - phase: {document_id, phase, started_at, updated_at} on each phase change
+    - issue: {document_id, issue} as soon as the provider detects it
+    - complete: {analysis_id, status, ...} once results are saved; then the
+      stream closes and the final results can be fetched once
+
+    Analyses running in a worker process are relayed from the job queue's
+    event channel when it has one. Otherwise, analyses that are not running
+    in this process get a single snapshot and a retry hint, so EventSource
+    clients reconnect instead of polling.
+    """
+    user_id = current_user['user_id']
+    correlation_id = get_correlation_id()
+
+    subscription = progress.subscribe(analysis_id, user_id)
+    if subscription is None:
+        analysis = await db.get_analysis(analysis_id=analysis_id, user_id=user_id)
+        if not analysis:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail={
+                    "error": "Analysis not found",
+                    "message": f"Analysis {analysis_id} not found. It may have been deleted or you don't have access to it.",
+                    "analysis_id": analysis_id,
+                    "correlation_id": correlation_id
+                }
+            )
+        summary = {
+            "analysis_id": analysis['analysis_id'],
+            "status": analysis['status'],
+            "issues_count": analysis.get('issues_count', 0),
+            "total_savings_detected": analysis.get('total_savings_detected'),
+        }
+        if analysis['status'] in ("completed", "failed"):
+            body = _sse("complete", summary)
+        elif job_queue.remote_events:
+            return StreamingResponse(
+                _relay_worker_events(request, job_queue, db, analysis_id, user_id, summary),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+            )
+        else:
+            body = _sse("snapshot", summary, retry_ms=int(settings.analysis_events_keepalive_seconds * 1000))
+        return StreamingResponse(iter([body]), media_type="text/event-stream")
+
+    queue, snapshot = subscription
+    log_with_context(
+        logger, 20,
+        f"📡 Event stream opened",
+        user_id=user_id,
+        analysis_id=analysis_id
+    )
+
+    async def events():
+        try:
+            yield _sse("snapshot", snapshot)
+            while True:
+                try:
+                    item = await asyncio.wait_for(
+                        queue.get(),
+                        timeout=settings.analysis_events_keepalive_seconds
+                    )
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keep-alive\n\n"
+                    continue
+                if item is None:
+                    break
+                event, data = item
+                yield _sse(event, data)
+        finally:
+            progress.unsubscribe(analysis_id, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/")
 async def list_analyses(
     limit: int = 20,
@@ -1,5 +1,5 @@
 """Issue management API endpoints."""
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from typing import List, Optional
 from pydantic import BaseModel
 
@@ -8,6 +8,9 @@ from app.dependencies import get_current_user
 
 router = APIRouter()
 
+# Most analyses GET /issues/statistics accepts in one call
+MAX_STATISTICS_ANALYSES = 100
+
 
 # Request/Response Models
 class UpdateIssueStatusRequest(BaseModel):
@@ -178,27 +181,18 @@ async def get_issue_statistics(
     Get statistics on issue statuses for an analysis.
     """
     try:
-        # Verify user owns this analysis
-        analysis = await db.get_analysis(analysis_id, current_user['user_id'])
-        if not analysis:
+        # Aggregated in the database; scoped to the user, so a missing row
+        # means the analysis doesn't exist or isn't theirs
+        stats_by_analysis = await db.get_issue_statistics_bulk(
+            [analysis_id], current_user['user_id']
+        )
+        if analysis_id not in stats_by_analysis:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Analysis not found"
             )
 
-        # Get statistics
-        stats = await db.get_issue_statistics(analysis_id)
-
-        return IssueStatisticsResponse(
-            analysis_id=analysis_id,
-            open_count=stats.get('open_count', 0),
-            follow_up_count=stats.get('follow_up_count', 0),
-            resolved_count=stats.get('resolved_count', 0),
-            ignored_count=stats.get('ignored_count', 0),
-            open_potential_savings=float(stats.get('open_potential_savings', 0) or 0),
-            follow_up_potential_savings=float(stats.get('follow_up_potential_savings', 0) or 0),
-            resolved_savings=float(stats.get('resolved_savings', 0) or 0)
-        )
+        return IssueStatisticsResponse(analysis_id=analysis_id, **stats_by_analysis[analysis_id])
 
     except HTTPException:
         raise
@@ -209,6 +203,36 @@ async def get_issue_statistics(
         )
 
 
+@router.get("/statistics", response_model=List[IssueStatisticsResponse])
+async def get_issue_statistics_for_analyses(
+    analysis_ids: List[str] = Query(..., max_length=MAX_STATISTICS_ANALYSES),
+    current_user: dict = Depends(get_current_user),
+    db: DBService = Depends(get_db_service)
+):
+    """
+    Get issue statistics for several analyses in one call (dashboard pages).
+
+    Pass analysis_ids repeatedly: /statistics?analysis_ids=a&analysis_ids=b.
+    Analyses that don't exist or belong to another user are omitted; more
+    than MAX_STATISTICS_ANALYSES ids are rejected with 422.
+    """
+    try:
+        stats_by_analysis = await db.get_issue_statistics_bulk(
+            analysis_ids, current_user['user_id']
+        )
+        return [
+            IssueStatisticsResponse(analysis_id=analysis_id, **stats_by_analysis[analysis_id])
+            for analysis_id in dict.fromkeys(analysis_ids)
+            if analysis_id in stats_by_analysis
+        ]
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get issue statistics: {str(e)}"
+        )
+
+
 @router.post("/{issue_id}/notes")
 async def add_issue_note(
     issue_id: str,
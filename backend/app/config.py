@@ -30,6 +30,14 @@ class Settings(BaseSettings):
     gcs_bucket_documents: str = "medbilldozer-documents"
     gcs_bucket_clinical_images: str = "medbilldozer-clinical"
 
+    # Blob storage reads
+    storage_backend: str = "gcs"  # "gcs" or "local" (buckets as directories under storage_local_root)
+    storage_local_root: str = "./local_storage"
+    storage_chunk_size_bytes: int = 1024 * 1024  # Streaming read size
+    storage_max_download_bytes: int = 0  # Reject larger files on download (0 = no limit)
+    storage_cache_dir: Optional[str] = None  # Enables the read-through disk cache
+    storage_cache_max_bytes: int = 512 * 1024 * 1024  # Disk cache size bound (LRU eviction)
+
     # Supabase - supports both beta and production env vars
     supabase_url: str = Field(
         default_factory=lambda: os.getenv("SUPABASE_BETA_URL") or os.getenv("SUPABASE_URL", "")
@@ -38,11 +46,34 @@ class Settings(BaseSettings):
         default_factory=lambda: os.getenv("SUPABASE_BETA_KEY") or os.getenv("SUPABASE_SERVICE_ROLE_KEY", "")
     )
 
+    # Database client (async PostgREST over a pooled connection)
+    database_rest_url: Optional[str] = None  # Defaults to {supabase_url}/rest/v1
+    database_timeout_seconds: float = 10.0  # Per-request timeout
+    database_max_connections: int = 20  # Upper bound on open connections per worker
+    database_max_keepalive_connections: int = 10  # Idle connections kept for reuse
+
     # AI Providers
     openai_api_key: str
     gemini_api_key: Optional[str] = None
     hf_api_token: Optional[str] = None
 
+    # Analysis execution
+    analysis_max_concurrency: int = 4  # Concurrent document fetches / orchestrations
+    analysis_concurrent_phases: bool = False  # Overlap phase-2 parsing with the analyzer call
+    progress_flush_interval_seconds: float = 1.0  # Batch window for per-document progress writes
+    analysis_stream_issues: bool = True  # Stream provider issues to /analyze/{id}/events subscribers
+    analysis_events_keepalive_seconds: float = 15.0  # SSE comment interval to keep proxies from timing out
+    analysis_bulk_document_threshold: int = 10  # Requests with more documents are queued in the low lane
+
+    # Analysis job queue
+    job_queue_backend: str = "inprocess"  # "inprocess" (API runs jobs) or "redis" (`python -m app.worker` runs them)
+    redis_url: str = "redis://localhost:6379/0"
+    job_queue_prefix: str = "medbilldozer:jobs"  # Redis key prefix
+    job_queue_concurrency: int = 2  # Analyses run at once per worker process
+    job_queue_visibility_timeout_seconds: float = 600.0  # Unacknowledged jobs return to the queue after this
+    job_queue_max_attempts: int = 3  # Failed jobs are dead-lettered after this many attempts
+    job_queue_max_lane_wait_seconds: float = 300.0  # Jobs waiting longer are served ahead of higher lanes
+
     # JWT
     jwt_secret_key: str = "your-secret-key-change-in-production"
     jwt_algorithm: str = "HS256"
@@ -42,10 +42,41 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"⚠️  Warning: Could not initialize provider registry: {e}")
 
+    # Start background flusher for analysis progress
+    from app.services.progress_service import get_progress_reporter
+    progress_reporter = get_progress_reporter()
+    progress_reporter.start()
+
+    # In-process queue: this process also runs the analysis workers
+    from app.services.job_queue import JobWorker, get_job_queue
+    job_queue = get_job_queue()
+    job_worker = None
+    if job_queue.in_process:
+        from app.services.analysis_service import get_analysis_service
+        analysis_service = get_analysis_service()
+        job_worker = JobWorker(
+            job_queue,
+            analysis_service.run_job,
+            concurrency=settings.job_queue_concurrency,
+            max_attempts=settings.job_queue_max_attempts,
+            on_dead_letter=analysis_service.fail_job
+        )
+        job_worker.start()
+        logger.info(f"✅ In-process job workers started (concurrency={settings.job_queue_concurrency})")
+    else:
+        logger.info(f"✅ Job queue: {settings.job_queue_backend} (run workers with `python -m app.worker`)")
+
     yield
 
     # Shutdown
     logger.info("👋 Shutting down MedBillDozer API...")
+    if job_worker is not None:
+        await job_worker.stop()
+    await job_queue.close()
+    await progress_reporter.stop()
+
+    from app.services.db_service import get_db_service
+    await get_db_service().aclose()
 
 
 app = FastAPI(
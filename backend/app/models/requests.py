@@ -90,6 +90,13 @@ class AnalysisProvider(str, Enum):
     SMART = "smart"
 
 
+class AnalysisPriority(str, Enum):
+    """Job queue lanes; assigned by the server, never by the client."""
+    HIGH = "high"
+    NORMAL = "normal"
+    LOW = "low"
+
+
 class AnalyzeRequest(BaseModel):
     """Request to analyze documents."""
     document_ids: List[str] = Field(..., description="List of document IDs to analyze")
@@ -3,24 +3,36 @@ import sys
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
 
 # Add parent directory to path for importing medbilldozer modules
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
 from app.services.storage_service import get_storage_service
 from app.services.db_service import get_db_service
+from app.services.progress_service import get_progress_reporter
+from app.services.job_queue import AnalysisJob
+from app.config import settings
 from app.utils import get_logger, log_with_context
 from medbilldozer.core.document_identity import maybe_enhance_identity
-from medbilldozer.core.transaction_normalization import (
-    normalize_line_items,
-    deduplicate_transactions,
-)
+from medbilldozer.core.transaction_normalization import normalize_documents
 from medbilldozer.core.coverage_matrix import build_coverage_matrix
 
 logger = get_logger(__name__)
 
 
+class AnalysisFailedError(RuntimeError):
+    """An analysis attempt failed without an exception of its own."""
+
+
+def _analysis_as_dict(analysis: Any) -> Dict[str, Any]:
+    """Orchestrator AnalysisResult as a plain dict (dicts pass through)."""
+    to_dict = getattr(analysis, "to_dict", None)
+    return to_dict() if callable(to_dict) else analysis
+
+
 class AnalysisService:
     """
     Wraps existing OrchestratorAgent for async analysis execution.
@@ -34,10 +46,17 @@ class AnalysisService:
         logger.info("  ✓ StorageService initialized")
         self.db = get_db_service()
         logger.info("  ✓ DBService initialized")
+        self.progress = get_progress_reporter()
         from app.services.multimodal_analysis_service import MultimodalAnalysisService
         logger.info("  ⏳ Initializing MultimodalAnalysisService...")
         self.multimodal_service = MultimodalAnalysisService()
         logger.info("  ✓ MultimodalAnalysisService initialized")
+        # Shared pool bounds concurrent orchestrations across all analyses
+        self.executor = ThreadPoolExecutor(
+            max_workers=settings.analysis_max_concurrency,
+            thread_name_prefix="analysis-worker"
+        )
+        logger.info(f"  ✓ Worker pool ready (max_concurrency={settings.analysis_max_concurrency})")
         logger.info("✅ AnalysisService ready")
 
     async def run_analysis(
@@ -45,7 +64,8 @@ class AnalysisService:
         analysis_id: str,
         document_ids: List[str],
         user_id: str,
-        provider: str = "medgemma-ensemble"
+        provider: str = "medgemma-ensemble",
+        record_failure: bool = True
     ) -> Dict[str, Any]:
         """
         Run MedGemma analysis on uploaded documents (background task).
@@ -55,10 +75,71 @@ class AnalysisService:
             document_ids: List of document IDs to analyze
             user_id: User ID
             provider: AI provider to use (default: medgemma-ensemble)
+            record_failure: If False, a failed attempt raises instead of
+                marking the analysis failed and ending its event stream
+                (the job worker retries it; fail_job() records the last one)
 
         Returns:
             Analysis results dict
         """
+        result: Dict[str, Any] = {"analysis_id": analysis_id, "status": "failed"}
+        try:
+            result = await self._run_analysis(
+                analysis_id, document_ids, user_id, provider, record_failure
+            )
+            return result
+        finally:
+            # Results are persisted by now; release event-stream subscribers.
+            # A failed attempt that will be retried keeps them attached.
+            if record_failure or result["status"] != "failed":
+                self.progress.end_stream(analysis_id, result)
+            self.db.release_analysis_documents(analysis_id)
+
+    async def run_job(self, job: AnalysisJob) -> Dict[str, Any]:
+        """Run a queued analysis job (JobWorker handler).
+
+        Failures propagate so JobWorker retries the job; fail_job() marks
+        the analysis failed once its attempts are exhausted.
+        """
+        return await self.run_analysis(
+            analysis_id=job.analysis_id,
+            document_ids=job.document_ids,
+            user_id=job.user_id,
+            provider=job.provider,
+            record_failure=False
+        )
+
+    async def fail_job(self, job: AnalysisJob, error: str) -> None:
+        """Mark an analysis failed once its job has exhausted its retries."""
+        log_with_context(
+            logger, 40,
+            f"❌ Analysis job dead-lettered after {job.attempts + 1} attempt(s)",
+            analysis_id=job.analysis_id,
+            user_id=job.user_id,
+            error=error
+        )
+        # Drop the in-memory snapshot (e.g. "queued" from trigger_analysis)
+        # first, or GET /analyze/{id} keeps serving it instead of the DB row
+        await self.progress.finish(job.analysis_id)
+        await self.db.update_analysis_status(job.analysis_id, "failed", error_message=error)
+        self.progress.end_stream(job.analysis_id, {
+            "analysis_id": job.analysis_id,
+            "status": "failed",
+            "error": error
+        })
+
+    async def _run_analysis(
+        self,
+        analysis_id: str,
+        document_ids: List[str],
+        user_id: str,
+        provider: str,
+        record_failure: bool = True
+    ) -> Dict[str, Any]:
+        """Analysis workflow behind run_analysis()."""
+        self.progress.start()
+        self.progress.start_analysis(analysis_id, user_id, provider)
+
         try:
             log_with_context(
                 logger, 20,
@@ -78,8 +159,13 @@ class AnalysisService:
                 user_id=user_id
             )
 
+            # One IN query for all metadata (memoized by trigger_analysis's validation)
+            doc_rows = await self.db.get_documents_bulk(
+                document_ids, user_id, analysis_id=analysis_id
+            )
+
             # Check if any documents are images (multimodal analysis needed)
-            has_images = await self._check_for_images(document_ids, user_id)
+            has_images = self._check_for_images(doc_rows)
             log_with_context(
                 logger, 20,
                 f"🔍 Checked for images: {has_images}",
@@ -91,13 +177,13 @@ class AnalysisService:
             # Use multimodal service if images are present
             if has_images:
                 logger.info(f"📷 Using multimodal analysis for analysis {analysis_id}")
+                await self.progress.finish(analysis_id)
                 return await self._run_multimodal_analysis(
-                    analysis_id, document_ids, user_id, provider
+                    analysis_id, document_ids, user_id, provider, record_failure
                 )
 
             # Otherwise, continue with text-only analysis
             # Import existing medbilldozer modules
-            from medbilldozer.core.orchestrator_agent import OrchestratorAgent
             from medbilldozer.core.coverage_matrix import build_coverage_matrix
             from medbilldozer.providers.provider_registry import register_providers, ProviderRegistry
 
@@ -115,61 +201,13 @@ class AnalysisService:
 
             logger.info(f"📚 Downloading {len(document_ids)} document(s) from storage...")
 
-            # Download documents from GCS and prepare for analysis
-            documents = []
-            for doc_id in document_ids:
-                doc_meta = await self.db.get_document(doc_id, user_id)
-                if not doc_meta:
-                    log_with_context(
-                        logger, 30,
-                        f"⚠️  Document not found in database",
-                        analysis_id=analysis_id,
-                        user_id=user_id,
-                        document_id=doc_id
-                    )
-                    continue
-
-                # Download raw text from GCS
-                try:
-                    raw_text = await self.storage.download_text(
-                        bucket_name=self.storage.documents_bucket,
-                        blob_path=doc_meta['gcs_path']
-                    )
-                    log_with_context(
-                        logger, 20,
-                        f"✅ Downloaded document from GCS",
-                        analysis_id=analysis_id,
-                        document_id=doc_id,
-                        filename=doc_meta['filename']
-                    )
-                except Exception as e:
-                    # If download fails, use extracted_text from metadata
-                    log_with_context(
-                        logger, 30,
-                        f"⚠️  GCS download failed, using extracted_text fallback",
-                        analysis_id=analysis_id,
-                        document_id=doc_id,
-                        error=str(e)
-                    )
-                    raw_text = doc_meta.get('extracted_text') or ''
-
-                # Ensure raw_text is never None
-                if not raw_text or not isinstance(raw_text, str):
-                    log_with_context(
-                        logger, 40,
-                        f"❌ Document has no text content",
-                        analysis_id=analysis_id,
-                        document_id=doc_id
-                    )
-                    continue  # Skip this document
-
-                documents.append({
-                    "document_id": doc_id,
-                    "raw_text": raw_text,
-                    "filename": doc_meta['filename'],
-                    "document_type": doc_meta.get('document_type'),
-                    "facts": {}
-                })
+            # Fetch blobs concurrently; gather() keeps input order
+            fetch_limit = asyncio.Semaphore(settings.analysis_max_concurrency)
+            loaded = await asyncio.gather(*(
+                self._load_document(analysis_id, user_id, doc_id, doc_rows.get(doc_id), fetch_limit)
+                for doc_id in document_ids
+            ))
+            documents = [doc for doc in loaded if doc is not None]
 
             if not documents:
                 log_with_context(
@@ -178,12 +216,7 @@ class AnalysisService:
                     analysis_id=analysis_id,
                     user_id=user_id
                 )
-                await self.db.update_analysis_status(
-                    analysis_id,
-                    "failed",
-                    error_message="No documents found"
-                )
-                return {"status": "failed", "error": "No documents found"}
+                raise AnalysisFailedError("No documents found")
 
             log_with_context(
                 logger, 20,
@@ -193,180 +226,21 @@ class AnalysisService:
                 document_count=len(documents)
             )
 
-            # Run orchestrator for each document (REUSE EXISTING CODE)
-            results = []
+            # Run orchestrator for each document (REUSE EXISTING CODE) in the
+            # worker pool; results stay in document order for aggregation
             log_with_context(
                 logger, 20,
-                f"🔄 Starting document loop with {len(documents)} documents",
+                f"🔄 Starting document fan-out with {len(documents)} documents",
                 analysis_id=analysis_id,
-                document_keys=str([list(d.keys()) for d in documents[:2]])  # Show keys of first 2 docs
+                max_concurrency=settings.analysis_max_concurrency
             )
-            for idx, doc in enumerate(documents, 1):
-                log_with_context(
-                    logger, 20,
-                    f"📋 Processing document {idx}, type: {type(doc)}, keys: {list(doc.keys()) if isinstance(doc, dict) else 'NOT A DICT'}",
-                    analysis_id=analysis_id
-                )
-                doc_id = doc['document_id']
-                doc_started_at = datetime.utcnow().isoformat()
-
-                log_with_context(
-                    logger, 20,
-                    f"🔬 Analyzing document {idx}/{len(documents)}",
-                    analysis_id=analysis_id,
-                    document_id=doc_id,
-                    document_filename=doc['filename'],
-                    provider=provider
-                )
-
-                try:
-                    orchestrator = OrchestratorAgent(
-                        analyzer_override=provider,
-                        profile_context=None  # TODO: load user profile from DB
-                    )
-
-                    # Create progress callback that updates database
-                    def progress_callback(workflow_log, step_status):
-                        """Update database with current phase."""
-                        try:
-                            log_with_context(
-                                logger, 20,
-                                f"📊 Analysis progress: {step_status}",
-                                analysis_id=analysis_id,
-                                document_id=doc_id,
-                                phase=step_status
-                            )
-                            # Use asyncio to call async method from sync callback
-                            import asyncio
-                            loop = asyncio.new_event_loop()
-                            asyncio.set_event_loop(loop)
-                            loop.run_until_complete(
-                                self.db.update_document_progress(
-                                    analysis_id=analysis_id,
-                                    document_id=doc_id,
-                                    phase=step_status,
-                                    started_at=doc_started_at
-                                )
-                            )
-                            loop.close()
-                        except Exception as e:
-                            log_with_context(
-                                logger, 30,
-                                f"⚠️  Progress update failed",
-                                analysis_id=analysis_id,
-                                document_id=doc_id,
-                                error=str(e)
-                            )
-
-                    # Initialize progress as "starting"
-                    await self.db.update_document_progress(
-                        analysis_id=analysis_id,
-                        document_id=doc_id,
-                        phase="pre_extraction_active",
-                        started_at=doc_started_at
-                    )
-
-                    # Run analysis with progress callback
-                    try:
-                        result = orchestrator.run(doc['raw_text'], progress_callback=progress_callback)
-                    except KeyError as ke:
-                        logger.error(f"KeyError during orchestrator.run(): {ke}")
-                        logger.exception("Full traceback:")
-                        raise
-                    except Exception as e:
-                        logger.error(f"Error during orchestrator.run(): {type(e).__name__}: {e}")
-                        raise
-
-                    # Validate result structure
-                    if not isinstance(result, dict):
-                        raise ValueError(f"Orchestrator returned non-dict result: {type(result)}")
-
-                    # Mark as complete
-                    await self.db.update_document_progress(
-                        analysis_id=analysis_id,
-                        document_id=doc_id,
-                        phase="complete",
-                        started_at=doc_started_at
-                    )
-
-                    log_with_context(
-                        logger, 20,
-                        f"✅ Document analysis completed successfully",
-                        analysis_id=analysis_id,
-                        document_id=doc_id,
-                        document_filename=doc['filename'],
-                        result_keys=list(result.keys()) if isinstance(result, dict) else "not-a-dict"
-                    )
-
-                    # Build document result with facts and analysis
-                    doc_result = {
-                        "document_id": doc_id,
-                        "filename": doc['filename'],
-                        "facts": result.get('facts', {}),
-                        "analysis": result.get('analysis', {}),
-                        "orchestration": result.get('_orchestration', {}),
-                        "progress": {
-                            "phase": "complete",
-                            "started_at": doc_started_at,
-                            "completed_at": datetime.utcnow().isoformat()
-                        }
-                    }
-
-                    # Enhance document with identity fingerprint (same as Streamlit app)
-                    # This adds canonical fingerprint and friendly document ID
-                    try:
-                        maybe_enhance_identity(doc_result)
-                        log_with_context(
-                            logger, 20,
-                            f"✅ Document identity enhanced",
-                            analysis_id=analysis_id,
-                            document_id=doc_id,
-                            friendly_id=doc_result.get('document_id'),
-                            fingerprint=doc_result.get('internal_id')
-                        )
-                    except Exception as e:
-                        log_with_context(
-                            logger, 30,
-                            f"⚠️  Document identity enhancement failed: {str(e)}",
-                            analysis_id=analysis_id,
-                            document_id=doc_id
-                        )
-
-                    results.append(doc_result)
-                except Exception as e:
-                    log_with_context(
-                        logger, 40,
-                        f"❌ Document analysis failed: {type(e).__name__}",
-                        analysis_id=analysis_id,
-                        document_id=doc_id,
-                        document_filename=doc['filename'],
-                        error=str(e)
-                    )
-                    logger.exception(f"Document {doc_id} analysis failed")
-
-                    # Mark as failed
-                    await self.db.update_document_progress(
-                        analysis_id=analysis_id,
-                        document_id=doc_id,
-                        phase="failed",
-                        started_at=doc_started_at
-                    )
-
-                    results.append({
-                        "document_id": doc_id,
-                        "filename": doc['filename'],
-                        "error": str(e),
-                        "status": "failed",
-                        "progress": {
-                            "phase": "failed",
-                            "started_at": doc_started_at,
-                            "failed_at": datetime.utcnow().isoformat(),
-                            "error_message": str(e)
-                        }
-                    })
+            results = list(await asyncio.gather(*(
+                self._analyze_document(analysis_id, doc, idx, len(documents), provider)
+                for idx, doc in enumerate(documents, 1)
+            )))
 
             # Transaction normalization (cross-document, same as Streamlit)
-            all_normalized_transactions = []
+            document_line_items = []
             transaction_provenance = {}
             try:
                 log_with_context(
@@ -390,23 +264,17 @@ class AnalysisService:
                         )
                         continue
 
-                    # Normalize line items
-                    normalized = normalize_line_items(
-                        line_items=line_items,
-                        source_document_id=doc_result.get('document_id', ''),
-                    )
-                    all_normalized_transactions.extend(normalized)
+                    document_line_items.append((line_items, doc_result.get('document_id', '')))
 
-                # Cross-document deduplication
-                if all_normalized_transactions:
-                    unique_transactions, transaction_provenance = deduplicate_transactions(
-                        all_normalized_transactions
-                    )
+                # Normalize all documents as one columnar batch, then deduplicate
+                transactions = normalize_documents(document_line_items)
+                if len(transactions):
+                    unique_transactions, transaction_provenance = transactions.deduplicate()
                     log_with_context(
                         logger, 20,
                         f"✅ Transaction deduplication complete",
                         analysis_id=analysis_id,
-                        total_transactions=len(all_normalized_transactions),
+                        total_transactions=len(transactions),
                         unique_transactions=len(unique_transactions)
                     )
 
@@ -471,27 +339,21 @@ class AnalysisService:
                 "transaction_provenance": transaction_provenance
             }
 
-            # Save results to database
-            await self.db.save_analysis_results(
-                analysis_id=analysis_id,
-                results=analysis_results,
-                coverage_matrix=coverage_matrix,
-                total_savings=total_savings,
-                issues_count=len(all_issues)
-            )
+            # Flush outstanding progress first so it cannot overwrite results
+            await self.progress.finish(analysis_id)
 
-            # Insert individual issues
+            # Insert individual issues (replacing any from an earlier, failed
+            # attempt) before results, so "completed" is the last write
+            issues_to_insert = []
             if all_issues:
                 logger.info(f"💾 Inserting {len(all_issues)} issues into database...")
-                issues_to_insert = []
-                for i, issue in enumerate(all_issues):
-                    # Find which document this issue belongs to
-                    document_id = None
-                    for result in results:
-                        if 'analysis' in result and issue in result['analysis'].get('issues', []):
-                            document_id = result.get('document_id')
-                            break
-
+                document_issues = (
+                    (result.get('document_id'), issue)
+                    for result in results
+                    if 'analysis' in result
+                    for issue in result['analysis'].get('issues', [])
+                )
+                for i, (document_id, issue) in enumerate(document_issues):
                     issues_to_insert.append({
                         "document_id": document_id,
                         "issue_type": issue.get('type', 'unknown'),
@@ -505,9 +367,19 @@ class AnalysisService:
                         "metadata": issue.get('metadata', {})
                     })
 
-                await self.db.insert_issues(analysis_id, issues_to_insert)
+            await self.db.replace_issues(analysis_id, issues_to_insert)
+            if issues_to_insert:
                 logger.info(f"✅ Issues inserted successfully")
 
+            # Save results to database
+            await self.db.save_analysis_results(
+                analysis_id=analysis_id,
+                results=analysis_results,
+                coverage_matrix=coverage_matrix,
+                total_savings=total_savings,
+                issues_count=len(all_issues)
+            )
+
             log_with_context(
                 logger, 20,
                 f"🎉 Analysis completed successfully!",
@@ -539,6 +411,10 @@ class AnalysisService:
             logger.error(f"Full traceback:\n{tb_str}")
             logger.exception("Analysis workflow failed")
 
+            await self.progress.finish(analysis_id)
+            if not record_failure:
+                raise
+
             # Save error to database
             await self.db.update_analysis_status(
                 analysis_id,
@@ -551,29 +427,254 @@ class AnalysisService:
                 "error": str(e)
             }
 
-    async def _check_for_images(self, document_ids: List[str], user_id: str) -> bool:
-        """Check if any documents are images."""
-        for doc_id in document_ids:
+    async def _load_document(
+        self,
+        analysis_id: str,
+        user_id: str,
+        doc_id: str,
+        doc_meta: Optional[Dict[str, Any]],
+        limit: asyncio.Semaphore
+    ) -> Optional[Dict[str, Any]]:
+        """Fetch raw text for one document (None if unusable)."""
+        async with limit:
+            if not doc_meta:
+                log_with_context(
+                    logger, 30,
+                    f"⚠️  Document not found in database",
+                    analysis_id=analysis_id,
+                    user_id=user_id,
+                    document_id=doc_id
+                )
+                return None
+
+            # Download raw text from GCS
             try:
-                doc = await self.db.get_document(doc_id, user_id)
-                if doc and doc.get('content_type', '').startswith('image/'):
-                    return True
+                raw_text = await self.storage.download_text(
+                    bucket_name=self.storage.documents_bucket,
+                    blob_path=doc_meta['gcs_path']
+                )
+                log_with_context(
+                    logger, 20,
+                    f"✅ Downloaded document from GCS",
+                    analysis_id=analysis_id,
+                    document_id=doc_id,
+                    filename=doc_meta['filename']
+                )
             except Exception as e:
+                # If download fails, use extracted_text from metadata
                 log_with_context(
                     logger, 30,
-                    f"⚠️  Error checking document type",
+                    f"⚠️  GCS download failed, using extracted_text fallback",
+                    analysis_id=analysis_id,
                     document_id=doc_id,
                     error=str(e)
                 )
-                continue
-        return False
+                raw_text = doc_meta.get('extracted_text') or ''
+
+        # Ensure raw_text is never None
+        if not raw_text or not isinstance(raw_text, str):
+            log_with_context(
+                logger, 40,
+                f"❌ Document has no text content",
+                analysis_id=analysis_id,
+                document_id=doc_id
+            )
+            return None  # Skip this document
+
+        return {
+            "document_id": doc_id,
+            "raw_text": raw_text,
+            "filename": doc_meta['filename'],
+            "document_type": doc_meta.get('document_type'),
+            "facts": {}
+        }
+
+    async def _analyze_document(
+        self,
+        analysis_id: str,
+        doc: Dict[str, Any],
+        idx: int,
+        total: int,
+        provider: str
+    ) -> Dict[str, Any]:
+        """Run the orchestrator for one document in the worker pool."""
+        from medbilldozer.core.orchestrator_agent import OrchestratorAgent
+
+        doc_id = doc['document_id']
+        doc_started_at = datetime.utcnow().isoformat()
+
+        log_with_context(
+            logger, 20,
+            f"🔬 Analyzing document {idx}/{total}",
+            analysis_id=analysis_id,
+            document_id=doc_id,
+            document_filename=doc['filename'],
+            provider=provider
+        )
+
+        try:
+            orchestrator = OrchestratorAgent(
+                analyzer_override=provider,
+                profile_context=None,  # TODO: load user profile from DB
+                concurrent_phases=settings.analysis_concurrent_phases
+            )
+
+            # Progress callback runs on the worker thread; the reporter
+            # coalesces phases and a background flusher batches DB writes
+            def progress_callback(workflow_log, step_status):
+                """Record current phase for this document."""
+                log_with_context(
+                    logger, 20,
+                    f"📊 Analysis progress: {step_status}",
+                    analysis_id=analysis_id,
+                    document_id=doc_id,
+                    phase=step_status
+                )
+                self.progress.report(
+                    analysis_id=analysis_id,
+                    document_id=doc_id,
+                    phase=step_status,
+                    started_at=doc_started_at
+                )
+
+            # Initialize progress as "starting"
+            self.progress.report(
+                analysis_id=analysis_id,
+                document_id=doc_id,
+                phase="pre_extraction_active",
+                started_at=doc_started_at
+            )
+
+            # Streamed issues go straight to /analyze/{id}/events subscribers
+            def issue_callback(issue):
+                """Publish an issue as soon as the analyzer yields it."""
+                self.progress.publish(
+                    analysis_id,
+                    "issue",
+                    {"document_id": doc_id, "issue": issue.to_dict()}
+                )
+
+            # Run analysis off the event loop with progress callback
+            try:
+                result = await asyncio.get_running_loop().run_in_executor(
+                    self.executor,
+                    partial(
+                        orchestrator.run,
+                        doc['raw_text'],
+                        progress_callback=progress_callback,
+                        issue_callback=issue_callback if settings.analysis_stream_issues else None
+                    )
+                )
+            except KeyError as ke:
+                logger.error(f"KeyError during orchestrator.run(): {ke}")
+                logger.exception("Full traceback:")
+                raise
+            except Exception as e:
+                logger.error(f"Error during orchestrator.run(): {type(e).__name__}: {e}")
+                raise
+
+            # Validate result structure
+            if not isinstance(result, dict):
+                raise ValueError(f"Orchestrator returned non-dict result: {type(result)}")
+
+            # Mark as complete
+            self.progress.report(
+                analysis_id=analysis_id,
+                document_id=doc_id,
+                phase="complete",
+                started_at=doc_started_at
+            )
+
+            log_with_context(
+                logger, 20,
+                f"✅ Document analysis completed successfully",
+                analysis_id=analysis_id,
+                document_id=doc_id,
+                document_filename=doc['filename'],
+                result_keys=list(result.keys()) if isinstance(result, dict) else "not-a-dict"
+            )
+
+            # Build document result with facts and analysis
+            doc_result = {
+                "document_id": doc_id,
+                "filename": doc['filename'],
+                "facts": result.get('facts', {}),
+                "analysis": _analysis_as_dict(result.get('analysis', {})),
+                "orchestration": result.get('_orchestration', {}),
+                "progress": {
+                    "phase": "complete",
+                    "started_at": doc_started_at,
+                    "completed_at": datetime.utcnow().isoformat()
+                }
+            }
+
+            # Enhance document with identity fingerprint (same as Streamlit app)
+            # This adds canonical fingerprint and friendly document ID
+            try:
+                maybe_enhance_identity(doc_result)
+                log_with_context(
+                    logger, 20,
+                    f"✅ Document identity enhanced",
+                    analysis_id=analysis_id,
+                    document_id=doc_id,
+                    friendly_id=doc_result.get('document_id'),
+                    fingerprint=doc_result.get('internal_id')
+                )
+            except Exception as e:
+                log_with_context(
+                    logger, 30,
+                    f"⚠️  Document identity enhancement failed: {str(e)}",
+                    analysis_id=analysis_id,
+                    document_id=doc_id
+                )
+
+            return doc_result
+        except Exception as e:
+            log_with_context(
+                logger, 40,
+                f"❌ Document analysis failed: {type(e).__name__}",
+                analysis_id=analysis_id,
+                document_id=doc_id,
+                document_filename=doc['filename'],
+                error=str(e)
+            )
+            logger.exception(f"Document {doc_id} analysis failed")
+
+            # Mark as failed
+            self.progress.report(
+                analysis_id=analysis_id,
+                document_id=doc_id,
+                phase="failed",
+                started_at=doc_started_at
+            )
+
+            return {
+                "document_id": doc_id,
+                "filename": doc['filename'],
+                "error": str(e),
+                "status": "failed",
+                "progress": {
+                    "phase": "failed",
+                    "started_at": doc_started_at,
+                    "failed_at": datetime.utcnow().isoformat(),
+                    "error_message": str(e)
+                }
+            }
+
+    def _check_for_images(self, doc_rows: Dict[str, Dict[str, Any]]) -> bool:
+        """Check if any documents are images."""
+        return any(
+            (doc.get('content_type') or '').startswith('image/')
+            for doc in doc_rows.values()
+        )
 
     async def _run_multimodal_analysis(
         self,
         analysis_id: str,
         document_ids: List[str],
         user_id: str,
-        provider: str
+        provider: str,
+        record_failure: bool = True
     ) -> Dict[str, Any]:
         """Run multimodal analysis combining text and images."""
         try:
@@ -581,7 +682,8 @@ class AnalysisService:
             results = await self.multimodal_service.analyze_documents(
                 document_ids=document_ids,
                 user_id=user_id,
-                provider=provider
+                provider=provider,
+                analysis_id=analysis_id
             )
 
             # Extract summary metrics
@@ -589,15 +691,6 @@ class AnalysisService:
             total_savings = summary.get('total_potential_savings', 0)
             total_issues = summary.get('total_issues', 0)
 
-            # Save results to database
-            await self.db.save_analysis_results(
-                analysis_id=analysis_id,
-                results=results,
-                coverage_matrix=results.get('cross_document_findings'),
-                total_savings=total_savings,
-                issues_count=total_issues
-            )
-
             # Insert individual issues
             all_issues = []
 
@@ -650,8 +743,17 @@ class AnalysisService:
                     'metadata': inconsistency
                 })
 
-            if all_issues:
-                await self.db.insert_issues(analysis_id, all_issues)
+            # Issues first (replacing an earlier attempt's), then results
+            await self.db.replace_issues(analysis_id, all_issues)
+
+            # Save results to database
+            await self.db.save_analysis_results(
+                analysis_id=analysis_id,
+                results=results,
+                coverage_matrix=results.get('cross_document_findings'),
+                total_savings=total_savings,
+                issues_count=total_issues
+            )
 
             return {
                 "analysis_id": analysis_id,
@@ -671,6 +773,8 @@ class AnalysisService:
                 error=str(e)
             )
             logger.exception("Multimodal analysis failed")
+            if not record_failure:
+                raise
 
             # Save error to database
             await self.db.update_analysis_status(
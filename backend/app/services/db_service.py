@@ -1,20 +1,41 @@
-"""Supabase database service."""
+"""Supabase database service.
+
+Queries go to Supabase's PostgREST API through AsyncPostgrestClient, a
+pooled async HTTP client, so awaiting a DB call no longer blocks the event
+loop. Set DATABASE_REST_URL to point the service at another
+PostgREST-compatible server (e.g. a local stand-in for tests).
+"""
 from typing import Optional, List, Dict, Any
 from datetime import datetime
+import asyncio
 import uuid
-from supabase import create_client, Client
 from app.config import settings
+from app.services.postgrest_client import AsyncPostgrestClient, PostgrestError
+
+# Document IDs per IN (...) query in get_documents_bulk()
+BULK_FETCH_CHUNK_SIZE = 100
 
 
 class DBService:
     """Handles database operations with Supabase."""
 
-    def __init__(self):
-        """Initialize Supabase client."""
-        self.client: Client = create_client(
-            settings.supabase_url,
-            settings.supabase_service_role_key
+    def __init__(self, client: Optional[AsyncPostgrestClient] = None):
+        """Initialize the pooled PostgREST client."""
+        self.client = client or AsyncPostgrestClient(
+            settings.database_rest_url or f"{settings.supabase_url.rstrip('/')}/rest/v1",
+            settings.supabase_service_role_key,
+            timeout=settings.database_timeout_seconds,
+            max_connections=settings.database_max_connections,
+            max_keepalive_connections=settings.database_max_keepalive_connections,
         )
+        # analysis_id -> (user_id, {document_id: row or None if not found})
+        self._analysis_documents: Dict[str, tuple] = {}
+        # Cleared if patch_analysis_progress() isn't deployed
+        self._progress_rpc_available = True
+
+    async def aclose(self) -> None:
+        """Close pooled database connections."""
+        await self.client.aclose()
 
     # ========================================================================
     # USER PROFILES
@@ -32,7 +53,7 @@ class DBService:
             print(f"🔄 Checking if user exists: {firebase_uid}")
 
             # Check if user already exists
-            existing = self.client.table("user_profiles")\
+            existing = await self.client.table("user_profiles")\
                 .select("*")\
                 .eq("firebase_uid", firebase_uid)\
                 .execute()
@@ -46,7 +67,7 @@ class DBService:
                 print(f"🔄 Creating new user with minimal fields: {email}")
                 # Generate user_id in Python since PostgREST cache won't use the database default
                 user_id = str(uuid.uuid4())
-                new_user = self.client.table("user_profiles")\
+                new_user = await self.client.table("user_profiles")\
                     .insert({
                         "user_id": user_id,
                         "firebase_uid": firebase_uid,
@@ -66,7 +87,7 @@ class DBService:
 
     async def get_user_by_firebase_uid(self, firebase_uid: str) -> Optional[Dict[str, Any]]:
         """Get user by Firebase UID."""
-        result = self.client.table("user_profiles")\
+        result = await self.client.table("user_profiles")\
             .select("*")\
             .eq("firebase_uid", firebase_uid)\
             .execute()
@@ -74,7 +95,7 @@ class DBService:
 
     async def get_user_by_id(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get user by user ID."""
-        result = self.client.table("user_profiles")\
+        result = await self.client.table("user_profiles")\
             .select("*")\
             .eq("user_id", user_id)\
             .execute()
@@ -86,7 +107,7 @@ class DBService:
 
     async def insert_document(self, document_data: Dict[str, Any]) -> Dict[str, Any]:
         """Insert document metadata."""
-        result = self.client.table("documents")\
+        result = await self.client.table("documents")\
             .insert(document_data)\
             .execute()
         return result.data[0]
@@ -97,13 +118,73 @@ class DBService:
         user_id: str
     ) -> Optional[Dict[str, Any]]:
         """Get document by ID and user ID."""
-        result = self.client.table("documents")\
+        result = await self.client.table("documents")\
             .select("*")\
             .eq("document_id", document_id)\
             .eq("user_id", user_id)\
             .execute()
         return result.data[0] if result.data else None
 
+    async def get_documents_bulk(
+        self,
+        document_ids: List[str],
+        user_id: str,
+        analysis_id: Optional[str] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get several documents by ID and user ID with one IN query.
+
+        Args:
+            document_ids: Document IDs (duplicates are fetched once)
+            user_id: Owner; rows belonging to other users are not returned
+            analysis_id: If set, rows are memoized for this analysis until
+                release_analysis_documents() is called, so validation, image
+                checks and loading share one round-trip
+
+        Returns:
+            Mapping of document_id -> row for the documents that were found
+        """
+        cached: Dict[str, Optional[Dict[str, Any]]] = {}
+        if analysis_id is not None:
+            owner, rows = self._analysis_documents.get(analysis_id, (user_id, {}))
+            if owner == user_id:
+                cached = rows
+
+        missing = list(dict.fromkeys(doc_id for doc_id in document_ids if doc_id not in cached))
+        if missing:
+            # Chunk very large requests to keep the query string bounded
+            chunks = [
+                missing[i:i + BULK_FETCH_CHUNK_SIZE]
+                for i in range(0, len(missing), BULK_FETCH_CHUNK_SIZE)
+            ]
+            responses = await asyncio.gather(*(
+                self.client.table("documents")
+                    .select("*")
+                    .eq("user_id", user_id)
+                    .in_("document_id", chunk)
+                    .execute()
+                for chunk in chunks
+            ))
+            fetched = {
+                row["document_id"]: row
+                for response in responses
+                for row in response.data
+            }
+            cached = dict(cached)
+            for doc_id in missing:
+                cached[doc_id] = fetched.get(doc_id)
+            if analysis_id is not None:
+                self._analysis_documents[analysis_id] = (user_id, cached)
+
+        return {
+            doc_id: cached[doc_id]
+            for doc_id in dict.fromkeys(document_ids)
+            if cached.get(doc_id) is not None
+        }
+
+    def release_analysis_documents(self, analysis_id: str) -> None:
+        """Drop rows memoized by get_documents_bulk() for an analysis."""
+        self._analysis_documents.pop(analysis_id, None)
+
     async def list_user_documents(
         self,
         user_id: str,
@@ -111,7 +192,7 @@ class DBService:
         offset: int = 0
     ) -> List[Dict[str, Any]]:
         """List all documents for a user."""
-        result = self.client.table("documents")\
+        result = await self.client.table("documents")\
             .select("*")\
             .eq("user_id", user_id)\
             .order("uploaded_at", desc=True)\
@@ -130,7 +211,7 @@ class DBService:
         if error_message:
             update_data["error_message"] = error_message
 
-        result = self.client.table("documents")\
+        result = await self.client.table("documents")\
             .update(update_data)\
             .eq("document_id", document_id)\
             .execute()
@@ -138,7 +219,7 @@ class DBService:
 
     async def delete_document(self, document_id: str, user_id: str) -> bool:
         """Delete document."""
-        self.client.table("documents")\
+        await self.client.table("documents")\
             .delete()\
             .eq("document_id", document_id)\
             .eq("user_id", user_id)\
@@ -157,7 +238,7 @@ class DBService:
         provider: str = "medgemma-ensemble"
     ) -> Dict[str, Any]:
         """Create new analysis record."""
-        result = self.client.table("analyses")\
+        result = await self.client.table("analyses")\
             .insert({
                 "analysis_id": analysis_id,
                 "user_id": user_id,
@@ -174,7 +255,7 @@ class DBService:
         user_id: str
     ) -> Optional[Dict[str, Any]]:
         """Get analysis by ID."""
-        result = self.client.table("analyses")\
+        result = await self.client.table("analyses")\
             .select("*")\
             .eq("analysis_id", analysis_id)\
             .eq("user_id", user_id)\
@@ -199,7 +280,7 @@ class DBService:
         if error_message:
             update_data["error_message"] = error_message
 
-        result = self.client.table("analyses")\
+        result = await self.client.table("analyses")\
             .update(update_data)\
             .eq("analysis_id", analysis_id)\
             .execute()
@@ -211,7 +292,7 @@ class DBService:
         document_id: str,
         phase: str,
         started_at: Optional[str] = None
-    ) -> Dict[str, Any]:
+    ) -> bool:
         """Update progress for a specific document during analysis.
 
         Args:
@@ -220,48 +301,97 @@ class DBService:
             phase: Current phase (pre_extraction_active, extraction_active, etc.)
             started_at: ISO timestamp when this document started processing
         """
-        # Get current analysis
-        result = self.client.table("analyses")\
+        progress = {
+            "phase": phase,
+            "updated_at": datetime.utcnow().isoformat()
+        }
+        if started_at:
+            progress["started_at"] = started_at
+
+        return await self.update_documents_progress(analysis_id, {document_id: progress})
+
+    async def update_documents_progress(
+        self,
+        analysis_id: str,
+        progress_by_document: Dict[str, Dict[str, Any]]
+    ) -> bool:
+        """Apply progress for several documents in one atomic server-side patch.
+
+        Calls patch_analysis_progress()
+        (sql/migration_add_progress_patch_function.sql), which merges the
+        entries into analyses.results under the row lock, so concurrent
+        writers can't lose each other's updates. Falls back to a
+        read-modify-write if the function hasn't been deployed yet.
+
+        Args:
+            analysis_id: Analysis ID
+            progress_by_document: Mapping of document_id -> progress dict
+                (phase, updated_at and optionally started_at)
+
+        Returns:
+            True if the analysis was updated (False if it doesn't exist or
+            its final results were already saved)
+        """
+        if not progress_by_document:
+            return False
+
+        if self._progress_rpc_available:
+            try:
+                result = await self.client.rpc("patch_analysis_progress", {
+                    "p_analysis_id": analysis_id,
+                    "p_progress": progress_by_document
+                }).execute()
+                return bool(result.data)
+            except PostgrestError as e:
+                if e.status_code != 404:
+                    raise
+                print(f"⚠️  patch_analysis_progress() not found, using read-modify-write: {e}")
+                self._progress_rpc_available = False
+
+        return await self._update_documents_progress_rmw(analysis_id, progress_by_document)
+
+    async def _update_documents_progress_rmw(
+        self,
+        analysis_id: str,
+        progress_by_document: Dict[str, Dict[str, Any]]
+    ) -> bool:
+        """Client-side fallback for update_documents_progress() (not atomic)."""
+        result = await self.client.table("analyses")\
             .select("results")\
             .eq("analysis_id", analysis_id)\
             .execute()
 
         if not result.data:
-            return {}
+            return False
 
         current_results = result.data[0].get("results") or []
+        if not isinstance(current_results, list):
+            # Final results already saved; progress is no longer tracked here
+            return False
+
+        by_document = {
+            doc_result.get("document_id"): doc_result
+            for doc_result in current_results
+            if isinstance(doc_result, dict)
+        }
+
+        for document_id, progress in progress_by_document.items():
+            doc_result = by_document.get(document_id)
+            if doc_result is not None:
+                doc_result["progress"] = dict(progress)
+            else:
+                # Create new document entry with progress
+                entry = {"document_id": document_id, "progress": dict(progress)}
+                entry["progress"].setdefault("started_at", progress.get("updated_at"))
+                current_results.append(entry)
+                by_document[document_id] = entry
 
-        # Find or create document entry in results
-        doc_found = False
-        for doc_result in current_results:
-            if doc_result.get("document_id") == document_id:
-                doc_result["progress"] = {
-                    "phase": phase,
-                    "updated_at": datetime.utcnow().isoformat()
-                }
-                if started_at:
-                    doc_result["progress"]["started_at"] = started_at
-                doc_found = True
-                break
-
-        if not doc_found:
-            # Create new document entry with progress
-            current_results.append({
-                "document_id": document_id,
-                "progress": {
-                    "phase": phase,
-                    "started_at": started_at or datetime.utcnow().isoformat(),
-                    "updated_at": datetime.utcnow().isoformat()
-                }
-            })
-
-        # Update the results in database
-        update_result = self.client.table("analyses")\
+        update_result = await self.client.table("analyses")\
             .update({"results": current_results})\
             .eq("analysis_id", analysis_id)\
             .execute()
 
-        return update_result.data[0] if update_result.data else {}
+        return bool(update_result.data)
 
     async def save_analysis_results(
         self,
@@ -272,7 +402,7 @@ class DBService:
         issues_count: int = 0
     ) -> Dict[str, Any]:
         """Save analysis results."""
-        result = self.client.table("analyses")\
+        result = await self.client.table("analyses")\
             .update({
                 "status": "completed",
                 "results": results,
@@ -292,7 +422,7 @@ class DBService:
         offset: int = 0
     ) -> List[Dict[str, Any]]:
         """List all analyses for a user."""
-        result = self.client.table("analyses")\
+        result = await self.client.table("analyses")\
             .select("*")\
             .eq("user_id", user_id)\
             .order("created_at", desc=True)\
@@ -317,14 +447,32 @@ class DBService:
             }
             for issue in issues
         ]
-        result = self.client.table("issues")\
+        result = await self.client.table("issues")\
             .insert(issues_data)\
             .execute()
         return result.data
 
+    async def replace_issues(
+        self,
+        analysis_id: str,
+        issues: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Insert an analysis' issues, deleting any it already has.
+
+        A retried analysis job may have inserted issues before it failed;
+        replacing them keeps the re-run from duplicating rows.
+        """
+        await self.client.table("issues")\
+            .delete()\
+            .eq("analysis_id", analysis_id)\
+            .execute()
+        if not issues:
+            return []
+        return await self.insert_issues(analysis_id, issues)
+
     async def get_issue(self, issue_id: str) -> Optional[Dict[str, Any]]:
         """Get single issue by ID."""
-        result = self.client.table("issues")\
+        result = await self.client.table("issues")\
             .select("*")\
             .eq("issue_id", issue_id)\
             .execute()
@@ -344,7 +492,7 @@ class DBService:
         if status_filter:
             query = query.eq("status", status_filter)
 
-        result = query.execute()
+        result = await query.execute()
         return result.data
 
     async def update_issue_status(
@@ -366,7 +514,7 @@ class DBService:
         if updated_by:
             update_data["status_updated_by"] = updated_by
 
-        result = self.client.table("issues")\
+        result = await self.client.table("issues")\
             .update(update_data)\
             .eq("issue_id", issue_id)\
             .execute()
@@ -378,7 +526,7 @@ class DBService:
         notes: str
     ) -> Dict[str, Any]:
         """Update notes for an issue."""
-        result = self.client.table("issues")\
+        result = await self.client.table("issues")\
             .update({"notes": notes})\
             .eq("issue_id", issue_id)\
             .execute()
@@ -388,38 +536,52 @@ class DBService:
         self,
         analysis_id: str
     ) -> Dict[str, Any]:
-        """Get issue statistics for an analysis."""
-        # Get all issues for the analysis
-        issues = await self.get_issues_by_analysis(analysis_id)
-
-        # Calculate statistics
-        stats = {
-            "open_count": 0,
-            "follow_up_count": 0,
-            "resolved_count": 0,
-            "ignored_count": 0,
-            "open_potential_savings": 0,
-            "follow_up_potential_savings": 0,
-            "resolved_savings": 0
+        """Get issue statistics for an analysis.
+
+        Counts and savings are aggregated in the database by the
+        issue_statistics view (sql/migration_add_issue_status.sql).
+        """
+        result = await self.client.table("issue_statistics")\
+            .select(ISSUE_STATISTICS_COLUMNS)\
+            .eq("analysis_id", analysis_id)\
+            .execute()
+        return _issue_statistics_row(result.data[0] if result.data else {})
+
+    async def get_issue_statistics_bulk(
+        self,
+        analysis_ids: List[str],
+        user_id: str
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get issue statistics for several of a user's analyses in one query.
+
+        Returns:
+            Mapping of analysis_id -> statistics for the analyses that exist
+            and belong to user_id (analyses without issues report zeros)
+        """
+        if not analysis_ids:
+            return {}
+
+        result = await self.client.table("issue_statistics")\
+            .select(f"analysis_id,{ISSUE_STATISTICS_COLUMNS}")\
+            .eq("user_id", user_id)\
+            .in_("analysis_id", list(dict.fromkeys(analysis_ids)))\
+            .execute()
+        return {
+            str(row["analysis_id"]): _issue_statistics_row(row)
+            for row in result.data
         }
 
-        for issue in issues:
-            status = issue.get('status', 'open')
-            savings = float(issue.get('max_savings', 0) or 0)
-
-            if status == 'open':
-                stats['open_count'] += 1
-                stats['open_potential_savings'] += savings
-            elif status == 'follow_up':
-                stats['follow_up_count'] += 1
-                stats['follow_up_potential_savings'] += savings
-            elif status == 'resolved':
-                stats['resolved_count'] += 1
-                stats['resolved_savings'] += savings
-            elif status == 'ignored':
-                stats['ignored_count'] += 1
-
-        return stats
+
+ISSUE_STATISTICS_COUNTS = ("open_count", "follow_up_count", "resolved_count", "ignored_count")
+ISSUE_STATISTICS_SAVINGS = ("open_potential_savings", "follow_up_potential_savings", "resolved_savings")
+ISSUE_STATISTICS_COLUMNS = ",".join(ISSUE_STATISTICS_COUNTS + ISSUE_STATISTICS_SAVINGS)
+
+
+def _issue_statistics_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Statistics dict from an issue_statistics row (SUM over no rows is NULL)."""
+    stats: Dict[str, Any] = {key: int(row.get(key) or 0) for key in ISSUE_STATISTICS_COUNTS}
+    stats.update({key: float(row.get(key) or 0) for key in ISSUE_STATISTICS_SAVINGS})
+    return stats
 
 
 # Singleton instance
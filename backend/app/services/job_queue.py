@@ -0,0 +1,547 @@
+"""Analysis job queue with pluggable backends and a worker pool.
+
+trigger_analysis used to hand run_analysis to FastAPI BackgroundTasks: the
+work ran inside the API process with no concurrency cap, no retry, and was
+lost on every deploy. The API now enqueues an AnalysisJob and returns;
+JobWorker consumers reserve jobs, run them and acknowledge them.
+
+Backends:
+- InProcessJobQueue: asyncio lanes in the API process (development, single
+  instance). Jobs do not survive a restart.
+- RedisJobQueue: lists/sorted sets in Redis (or a Redis-compatible server)
+  consumed by separate `python -m app.worker` processes. Jobs survive
+  restarts, and progress events are relayed to the API over pub/sub.
+
+Semantics shared by both:
+- priority lanes ("high", "normal", "low"), served in that order, except
+  that a job waiting longer than max_lane_wait is served first (oldest
+  first), so a busy higher lane cannot starve the lower ones
+- visibility timeout: a reserved job that is neither acknowledged nor kept
+  alive by heartbeat() within the timeout (e.g. its worker died) is handed
+  to another worker
+- failed jobs are retried up to max_attempts, then dead-lettered
+
+This module deliberately avoids importing app.config (redis is imported
+lazily) so it can be used on its own; get_job_queue() reads settings.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+logger = logging.getLogger(__name__)
+
+PRIORITIES = ("high", "normal", "low")
+DEFAULT_PRIORITY = "normal"
+DEFAULT_VISIBILITY_TIMEOUT = 600.0
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_MAX_LANE_WAIT = 300.0
+
+
+@dataclass
+class AnalysisJob:
+    """One queued run_analysis() call."""
+    analysis_id: str
+    user_id: str
+    document_ids: List[str]
+    provider: str
+    priority: str = DEFAULT_PRIORITY
+    attempts: int = 0
+    job_id: str = field(default_factory=lambda: str(uuid4()))
+    enqueued_at: float = field(default_factory=time.time)
+
+    def __post_init__(self):
+        if self.priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority {self.priority!r}; expected one of {PRIORITIES}")
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, raw: str | bytes) -> "AnalysisJob":
+        return cls(**json.loads(raw))
+
+
+class JobQueue(ABC):
+    """Queue of AnalysisJobs with leases (visibility timeouts).
+
+    Attributes:
+        in_process: True if jobs run in the process that enqueued them
+            (so in-memory state such as progress snapshots is shared)
+        remote_events: True if subscribe_events() relays worker events
+    """
+
+    in_process = False
+    remote_events = False
+
+    def __init__(
+        self,
+        visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT,
+        max_lane_wait: float = DEFAULT_MAX_LANE_WAIT,
+    ):
+        self.visibility_timeout = visibility_timeout
+        self.max_lane_wait = max_lane_wait
+
+    @abstractmethod
+    async def enqueue(self, job: AnalysisJob) -> None:
+        """Add a job to the back of its priority lane."""
+
+    @abstractmethod
+    async def reserve(self, timeout: float) -> Optional[AnalysisJob]:
+        """Lease the next job, waiting up to timeout seconds (None if none)."""
+
+    @abstractmethod
+    async def heartbeat(self, job: AnalysisJob) -> None:
+        """Extend a lease by another visibility timeout."""
+
+    @abstractmethod
+    async def ack(self, job: AnalysisJob) -> None:
+        """Mark a leased job done."""
+
+    @abstractmethod
+    async def release(self, job: AnalysisJob) -> None:
+        """Return a leased job to the front of its lane (e.g. on shutdown)."""
+
+    @abstractmethod
+    async def retry(self, job: AnalysisJob) -> None:
+        """Requeue a failed job at the back of its lane, counting the attempt."""
+
+    @abstractmethod
+    async def dead_letter(self, job: AnalysisJob, error: str) -> None:
+        """Drop a job that exhausted its attempts, keeping a record of it."""
+
+    async def publish_event(self, analysis_id: str, event: str, data: Dict[str, Any]) -> None:
+        """Relay a progress event to API processes (no-op in process)."""
+
+    def subscribe_events(self, analysis_id: str) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Async iterator of (event, data) published for an analysis."""
+        raise NotImplementedError(f"{type(self).__name__} does not relay events")
+
+    async def close(self) -> None:
+        """Release connections."""
+
+
+# ============================================================================
+# IN-PROCESS
+# ============================================================================
+
+class InProcessJobQueue(JobQueue):
+    """asyncio-based queue for a single process."""
+
+    in_process = True
+
+    def __init__(
+        self,
+        visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT,
+        max_lane_wait: float = DEFAULT_MAX_LANE_WAIT,
+    ):
+        super().__init__(visibility_timeout, max_lane_wait)
+        self._lanes: Dict[str, Deque[AnalysisJob]] = {p: deque() for p in PRIORITIES}
+        self._leases: Dict[str, Tuple[float, AnalysisJob]] = {}
+        self.dead_letters: List[Tuple[AnalysisJob, str]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _event(self) -> asyncio.Event:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+        return self._wakeup
+
+    def _notify(self) -> None:
+        self._event().set()
+
+    def _requeue_expired(self) -> None:
+        now = time.monotonic()
+        for job_id, (deadline, job) in list(self._leases.items()):
+            if deadline <= now:
+                del self._leases[job_id]
+                logger.warning(f"Job {job_id} lease expired; requeueing")
+                self._lanes[job.priority].appendleft(job)
+
+    def _pop(self) -> Optional[AnalysisJob]:
+        self._requeue_expired()
+        lanes = [self._lanes[p] for p in PRIORITIES if self._lanes[p]]
+        if not lanes:
+            return None
+        now = time.time()
+        aged = [lane for lane in lanes if now - lane[0].enqueued_at >= self.max_lane_wait]
+        lane = min(aged, key=lambda lane: lane[0].enqueued_at) if aged else lanes[0]
+        job = lane.popleft()
+        self._leases[job.job_id] = (time.monotonic() + self.visibility_timeout, job)
+        return job
+
+    def pending(self) -> int:
+        """Jobs waiting in all lanes."""
+        return sum(len(lane) for lane in self._lanes.values())
+
+    async def enqueue(self, job: AnalysisJob) -> None:
+        self._lanes[job.priority].append(job)
+        self._notify()
+
+    async def reserve(self, timeout: float) -> Optional[AnalysisJob]:
+        deadline = time.monotonic() + timeout
+        event = self._event()
+        while True:
+            job = self._pop()
+            if job is not None:
+                return job
+            event.clear()
+            remaining = deadline - time.monotonic()
+            if self._leases:
+                # Wake up in time to requeue the earliest expiring lease
+                earliest = min(d for d, _ in self._leases.values())
+                remaining = min(remaining, max(earliest - time.monotonic(), 0))
+            if deadline - time.monotonic() <= 0:
+                return None
+            try:
+                await asyncio.wait_for(event.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    async def heartbeat(self, job: AnalysisJob) -> None:
+        if job.job_id in self._leases:
+            self._leases[job.job_id] = (time.monotonic() + self.visibility_timeout, job)
+
+    async def ack(self, job: AnalysisJob) -> None:
+        self._leases.pop(job.job_id, None)
+
+    async def release(self, job: AnalysisJob) -> None:
+        if self._leases.pop(job.job_id, None) is not None:
+            self._lanes[job.priority].appendleft(job)
+            self._notify()
+
+    async def retry(self, job: AnalysisJob) -> None:
+        self._leases.pop(job.job_id, None)
+        job.attempts += 1
+        await self.enqueue(job)
+
+    async def dead_letter(self, job: AnalysisJob, error: str) -> None:
+        self._leases.pop(job.job_id, None)
+        self.dead_letters.append((job, error))
+
+
+# ============================================================================
+# REDIS
+# ============================================================================
+
+# Pop the first job from the lanes in priority order (or the oldest lane
+# head that has waited past the max lane wait) and lease it atomically.
+# KEYS: leases, jobs, lane... ; ARGV: lease deadline, now, max lane wait
+_RESERVE_SCRIPT = """
+local first, aged, oldest = nil, nil, nil
+for i = 3, #KEYS do
+    local job_id = redis.call('LINDEX', KEYS[i], -1)
+    if job_id then
+        first = first or i
+        local raw = redis.call('HGET', KEYS[2], job_id)
+        if raw then
+            local enqueued_at = tonumber(cjson.decode(raw)['enqueued_at'])
+            if tonumber(ARGV[2]) - enqueued_at >= tonumber(ARGV[3])
+                    and (oldest == nil or enqueued_at < oldest) then
+                aged, oldest = i, enqueued_at
+            end
+        end
+    end
+end
+local lane = aged or first
+if not lane then
+    return false
+end
+local job_id = redis.call('RPOP', KEYS[lane])
+redis.call('ZADD', KEYS[1], ARGV[1], job_id)
+return job_id
+"""
+
+# Move expired leases back to the front (RPOP end) of their lanes.
+# KEYS: leases, jobs ; ARGV: now, lane key prefix, batch size
+_REQUEUE_SCRIPT = """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[3]))
+for _, job_id in ipairs(ids) do
+    redis.call('ZREM', KEYS[1], job_id)
+    local raw = redis.call('HGET', KEYS[2], job_id)
+    if raw then
+        redis.call('RPUSH', ARGV[2] .. cjson.decode(raw)['priority'], job_id)
+    end
+end
+return #ids
+"""
+
+
+class RedisJobQueue(JobQueue):
+    """Redis-backed queue shared by API and worker processes.
+
+    Keys (under prefix):
+        lane:<priority>  list of job ids (LPUSH to enqueue, RPOP to reserve)
+        jobs             hash of job id -> job JSON
+        leases           sorted set of reserved job ids scored by lease deadline
+        dead             list of dead-lettered job records
+        events:<id>      pub/sub channel of progress events for an analysis
+
+    The scripts build lane keys at runtime, so all keys must live on one
+    node (no Redis Cluster sharding).
+    """
+
+    remote_events = True
+
+    def __init__(
+        self,
+        url: str,
+        prefix: str = "medbilldozer:jobs",
+        visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT,
+        max_lane_wait: float = DEFAULT_MAX_LANE_WAIT,
+        poll_interval: float = 0.5,
+        client: Any = None,
+    ):
+        super().__init__(visibility_timeout, max_lane_wait)
+        if client is None:
+            try:
+                import redis.asyncio as redis_asyncio
+            except ImportError as e:  # pragma: no cover - optional dependency
+                raise RuntimeError("JOB_QUEUE_BACKEND=redis requires the redis package (pip install redis)") from e
+            client = redis_asyncio.from_url(url)
+        self.redis = client
+        self.prefix = prefix
+        self.poll_interval = poll_interval
+        self._reserve = self.redis.register_script(_RESERVE_SCRIPT)
+        self._requeue = self.redis.register_script(_REQUEUE_SCRIPT)
+
+    def _key(self, *parts: str) -> str:
+        return ":".join((self.prefix,) + parts)
+
+    async def enqueue(self, job: AnalysisJob) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self._key("jobs"), job.job_id, job.to_json())
+            pipe.lpush(self._key("lane", job.priority), job.job_id)
+            await pipe.execute()
+
+    async def reserve(self, timeout: float) -> Optional[AnalysisJob]:
+        deadline = time.monotonic() + timeout
+        lanes = [self._key("lane", p) for p in PRIORITIES]
+        while True:
+            now = time.time()
+            await self._requeue(
+                keys=[self._key("leases"), self._key("jobs")],
+                args=[now, self._key("lane", ""), 100],
+            )
+            job_id = await self._reserve(
+                keys=[self._key("leases"), self._key("jobs")] + lanes,
+                args=[now + self.visibility_timeout, now, self.max_lane_wait],
+            )
+            if job_id:
+                raw = await self.redis.hget(self._key("jobs"), job_id)
+                if raw is not None:
+                    return AnalysisJob.from_json(raw)
+                # Acknowledged elsewhere after an expired lease; drop it
+                await self.redis.zrem(self._key("leases"), job_id)
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            await asyncio.sleep(min(self.poll_interval, remaining))
+
+    async def heartbeat(self, job: AnalysisJob) -> None:
+        await self.redis.zadd(
+            self._key("leases"), {job.job_id: time.time() + self.visibility_timeout}, xx=True
+        )
+
+    async def ack(self, job: AnalysisJob) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zrem(self._key("leases"), job.job_id)
+            pipe.hdel(self._key("jobs"), job.job_id)
+            await pipe.execute()
+
+    async def release(self, job: AnalysisJob) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zrem(self._key("leases"), job.job_id)
+            pipe.rpush(self._key("lane", job.priority), job.job_id)
+            await pipe.execute()
+
+    async def retry(self, job: AnalysisJob) -> None:
+        job.attempts += 1
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zrem(self._key("leases"), job.job_id)
+            pipe.hset(self._key("jobs"), job.job_id, job.to_json())
+            pipe.lpush(self._key("lane", job.priority), job.job_id)
+            await pipe.execute()
+
+    async def dead_letter(self, job: AnalysisJob, error: str) -> None:
+        record = json.dumps({"job": asdict(job), "error": error, "failed_at": time.time()})
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zrem(self._key("leases"), job.job_id)
+            pipe.hdel(self._key("jobs"), job.job_id)
+            pipe.lpush(self._key("dead"), record)
+            await pipe.execute()
+
+    async def publish_event(self, analysis_id: str, event: str, data: Dict[str, Any]) -> None:
+        message = json.dumps({"event": event, "data": data}, default=str)
+        await self.redis.publish(self._key("events", analysis_id), message)
+
+    async def subscribe_events(self, analysis_id: str) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        pubsub = self.redis.pubsub()
+        await pubsub.subscribe(self._key("events", analysis_id))
+        try:
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                payload = json.loads(message["data"])
+                yield payload["event"], payload["data"]
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+
+# ============================================================================
+# WORKER
+# ============================================================================
+
+JobHandler = Callable[[AnalysisJob], Awaitable[Any]]
+DeadLetterHandler = Callable[[AnalysisJob, str], Awaitable[Any]]
+
+
+class JobWorker:
+    """Runs jobs from a queue with bounded concurrency.
+
+    Each consumer task reserves one job at a time, keeps its lease alive
+    while the handler runs, then acknowledges it. A handler exception
+    retries the job until max_attempts, then dead-letters it and calls
+    on_dead_letter. stop() returns in-flight jobs to the queue so another
+    worker picks them up immediately.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handler: JobHandler,
+        concurrency: int = 2,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        on_dead_letter: Optional[DeadLetterHandler] = None,
+        poll_timeout: float = 5.0,
+    ):
+        self.queue = queue
+        self.handler = handler
+        self.concurrency = max(1, concurrency)
+        self.max_attempts = max(1, max_attempts)
+        self.on_dead_letter = on_dead_letter
+        self.poll_timeout = poll_timeout
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        """Start consumer tasks on the running loop (idempotent)."""
+        if self._tasks:
+            return
+        loop = asyncio.get_running_loop()
+        self._tasks = [
+            loop.create_task(self._consume(), name=f"job-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+
+    async def stop(self) -> None:
+        """Cancel consumers, releasing in-flight jobs back to the queue."""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def run_forever(self) -> None:
+        """Start consumers and wait until they are cancelled."""
+        self.start()
+        try:
+            await asyncio.gather(*self._tasks)
+        finally:
+            await self.stop()
+
+    async def _consume(self) -> None:
+        while True:
+            try:
+                job = await self.queue.reserve(timeout=self.poll_timeout)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Job reservation failed: {e}")
+                await asyncio.sleep(self.poll_timeout)
+                continue
+            if job is not None:
+                await self.process(job)
+
+    async def process(self, job: AnalysisJob) -> None:
+        """Run one reserved job to completion (ack, retry or dead-letter)."""
+        heartbeat = asyncio.get_running_loop().create_task(self._heartbeat(job))
+        try:
+            await self.handler(job)
+        except asyncio.CancelledError:
+            await asyncio.shield(self.queue.release(job))
+            raise
+        except Exception as e:
+            logger.exception(f"Job {job.job_id} for analysis {job.analysis_id} failed")
+            if job.attempts + 1 < self.max_attempts:
+                await self.queue.retry(job)
+            else:
+                await self.queue.dead_letter(job, str(e))
+                if self.on_dead_letter is not None:
+                    try:
+                        await self.on_dead_letter(job, str(e))
+                    except Exception as callback_error:
+                        logger.warning(f"Dead-letter handler failed: {callback_error}")
+        else:
+            await self.queue.ack(job)
+        finally:
+            heartbeat.cancel()
+
+    async def _heartbeat(self, job: AnalysisJob) -> None:
+        interval = max(self.queue.visibility_timeout / 3, 0.01)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.queue.heartbeat(job)
+            except Exception as e:
+                logger.warning(f"Heartbeat for job {job.job_id} failed: {e}")
+
+
+# Singleton instance
+_job_queue: Optional[JobQueue] = None
+
+
+def get_job_queue() -> JobQueue:
+    """Get or create the configured JobQueue singleton."""
+    global _job_queue
+    if _job_queue is None:
+        from app.config import settings
+
+        if settings.job_queue_backend == "redis":
+            _job_queue = RedisJobQueue(
+                settings.redis_url,
+                prefix=settings.job_queue_prefix,
+                visibility_timeout=settings.job_queue_visibility_timeout_seconds,
+                max_lane_wait=settings.job_queue_max_lane_wait_seconds,
+            )
+        elif settings.job_queue_backend == "inprocess":
+            _job_queue = InProcessJobQueue(
+                visibility_timeout=settings.job_queue_visibility_timeout_seconds,
+                max_lane_wait=settings.job_queue_max_lane_wait_seconds,
+            )
+        else:
+            raise ValueError(f"Unknown JOB_QUEUE_BACKEND: {settings.job_queue_backend!r}")
+    return _job_queue
+
+
+__all__ = [
+    "AnalysisJob",
+    "InProcessJobQueue",
+    "JobQueue",
+    "JobWorker",
+    "PRIORITIES",
+    "RedisJobQueue",
+    "get_job_queue",
+]
@@ -6,11 +6,10 @@ Detects both billing errors and clinical inconsistencies
 
 import asyncio
 from typing import List, Dict, Any, Optional
-from pathlib import Path
-import tempfile
 import logging
 
-from app.services.storage_service import StorageService
+from app.services.db_service import get_db_service
+from app.services.storage_service import get_storage_service
 from medbilldozer.core.clinical_validator import ClinicalValidator
 from medbilldozer.core.orchestrator_agent import OrchestratorAgent
 from medbilldozer.providers.provider_registry import register_providers, ProviderRegistry
@@ -25,7 +24,8 @@ class MultimodalAnalysisService:
     """
 
     def __init__(self):
-        self.storage_service = StorageService()
+        self.storage_service = get_storage_service()
+        self.db = get_db_service()
         self.clinical_validator = ClinicalValidator(model="gpt-4o-mini")
         # Register providers on initialization
         register_providers()
@@ -34,7 +34,8 @@ class MultimodalAnalysisService:
         self,
         document_ids: List[str],
         user_id: str,
-        provider: str = "medgemma-ensemble"
+        provider: str = "medgemma-ensemble",
+        analysis_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Perform comprehensive multimodal analysis on multiple documents
@@ -43,6 +44,7 @@ class MultimodalAnalysisService:
             document_ids: List of document IDs to analyze
             user_id: User ID for authentication
             provider: LLM provider to use (default: medgemma-ensemble)
+            analysis_id: Reuses document rows already fetched for this analysis
 
         Returns:
             Comprehensive analysis results with billing and clinical findings
@@ -50,7 +52,7 @@ class MultimodalAnalysisService:
         logger.info(f"Starting multimodal analysis for {len(document_ids)} documents")
 
         # Step 1: Download and categorize documents
-        documents = await self._download_documents(document_ids, user_id)
+        documents = await self._download_documents(document_ids, user_id, analysis_id)
         text_docs = [d for d in documents if d['type'] == 'text']
         image_docs = [d for d in documents if d['type'] == 'image']
 
@@ -83,24 +85,38 @@ class MultimodalAnalysisService:
     async def _download_documents(
         self,
         document_ids: List[str],
-        user_id: str
+        user_id: str,
+        analysis_id: Optional[str] = None
     ) -> List[Dict[str, Any]]:
-        """Download documents from storage and categorize"""
+        """Download text documents and categorize.
+
+        Images are not downloaded here: _analyze_images() streams each one
+        straight to base64 when it is analyzed, so at most one image is held
+        in memory at a time.
+        """
+        rows = await self.db.get_documents_bulk(document_ids, user_id, analysis_id=analysis_id)
         documents = []
 
         for doc_id in document_ids:
+            row = rows.get(doc_id)
+            if row is None:
+                logger.error(f"Document {doc_id} not found")
+                continue
             try:
-                # Download document content
-                content = await self.storage_service.download_document(doc_id, user_id)
-
-                # Determine document type
-                doc_type = self._classify_document_type(content)
+                doc_type = self._classify_document_type(row)
+                content = None
+                if doc_type == 'text':
+                    content = await self.storage_service.download_text(
+                        self.storage_service.documents_bucket, row['gcs_path']
+                    )
 
                 documents.append({
                     'id': doc_id,
                     'type': doc_type,
                     'content': content,
-                    'path': content.get('path') if isinstance(content, dict) else None
+                    'content_type': row.get('content_type'),
+                    'filename': row.get('filename'),
+                    'path': row['gcs_path']
                 })
             except Exception as e:
                 logger.error(f"Failed to download document {doc_id}: {e}")
@@ -176,10 +192,10 @@ class MultimodalAnalysisService:
 
         for img_doc in image_docs:
             try:
-                # Save image to temporary file
-                with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as tmp:
-                    tmp.write(img_doc['content'])
-                    tmp_path = Path(tmp.name)
+                # Stream straight to base64 (no raw copy, no temp file)
+                image_base64 = await self.storage_service.download_base64(
+                    self.storage_service.documents_bucket, img_doc['path']
+                )
 
                 # Analyze image with clinical validator
                 analysis_prompt = """
@@ -194,10 +210,13 @@ class MultimodalAnalysisService:
                 Be specific and use medical terminology.
                 """
 
-                result = self.clinical_validator.validate(
-                    image_path=tmp_path,
-                    context=analysis_prompt
+                result = await asyncio.to_thread(
+                    self.clinical_validator.analyze_image,
+                    analysis_prompt,
+                    image_base64,
+                    img_doc.get('content_type') or 'image/png'
                 )
+                del image_base64
 
                 findings.append({
                     'document_id': img_doc['id'],
@@ -210,9 +229,6 @@ class MultimodalAnalysisService:
                     'raw_analysis': result
                 })
 
-                # Cleanup
-                tmp_path.unlink()
-
             except Exception as e:
                 logger.error(f"Failed to analyze image {img_doc['id']}: {e}")
                 findings.append({
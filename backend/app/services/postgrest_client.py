@@ -0,0 +1,317 @@
+"""Async PostgREST client over a pooled httpx connection.
+
+The supabase-py client is synchronous: every .execute() inside an async
+DBService method blocked the event loop for a full HTTP round-trip. This
+module speaks PostgREST directly over one shared httpx.AsyncClient:
+
+- HTTP/2 when the optional `h2` package is installed (HTTP/1.1 keep-alive otherwise)
+- a bounded connection pool (max_connections / max_keepalive_connections)
+- a default timeout per request, overridable per call with .timeout(seconds)
+
+The query builder mirrors the subset of supabase-py that DBService uses, so
+call sites only gain an `await`:
+
+    client = AsyncPostgrestClient(f"{supabase_url}/rest/v1", service_role_key)
+    result = await client.table("documents")\\
+        .select("*")\\
+        .eq("document_id", document_id)\\
+        .execute()
+    result.data  # list of rows
+
+Tests can point base_url at a local PostgREST (or a stand-in speaking the
+same protocol), or pass an httpx transport such as httpx.MockTransport.
+
+This module deliberately avoids importing app.config so it can be used
+without the full backend settings.
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+DEFAULT_TIMEOUT_SECONDS = 10.0
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 10
+
+# Characters that must be quoted inside a PostgREST in.(...) list
+_RESERVED = set(',.:()" \\')
+
+
+class PostgrestError(RuntimeError):
+    """Raised when PostgREST returns an error or the request fails."""
+
+    def __init__(
+        self,
+        message: str,
+        status_code: Optional[int] = None,
+        code: Optional[str] = None,
+        details: Any = None,
+        timed_out: bool = False,
+    ):
+        super().__init__(message)
+        self.status_code = status_code
+        self.code = code
+        self.details = details
+        self.timed_out = timed_out
+
+
+@dataclass
+class APIResponse:
+    """Result of a query, shaped like supabase-py's (rows in .data)."""
+    data: Any
+    count: Optional[int] = None
+
+
+def _format_value(value: Any) -> str:
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if value is None:
+        return "null"
+    return str(value)
+
+
+def _quote_list_item(value: Any) -> str:
+    text = _format_value(value)
+    if any(ch in _RESERVED for ch in text):
+        escaped = text.replace("\\", "\\\\").replace('"', '\\"')
+        return f'"{escaped}"'
+    return text
+
+
+class AsyncQueryBuilder:
+    """Chainable query against one table (or RPC) ending in `await .execute()`."""
+
+    def __init__(self, client: "AsyncPostgrestClient", path: str):
+        self._client = client
+        self._path = path
+        self._method = "GET"
+        self._params: List[Tuple[str, str]] = []
+        self._headers: Dict[str, str] = {}
+        self._json: Any = None
+        self._timeout: Optional[float] = None
+
+    # ---------------- verbs ----------------
+
+    def select(self, columns: str = "*") -> "AsyncQueryBuilder":
+        self._method = "GET"
+        self._params.append(("select", columns))
+        return self
+
+    def insert(self, rows: Any) -> "AsyncQueryBuilder":
+        self._method = "POST"
+        self._json = rows
+        self._headers["Prefer"] = "return=representation"
+        return self
+
+    def upsert(self, rows: Any, on_conflict: Optional[str] = None) -> "AsyncQueryBuilder":
+        self._method = "POST"
+        self._json = rows
+        self._headers["Prefer"] = "return=representation,resolution=merge-duplicates"
+        if on_conflict:
+            self._params.append(("on_conflict", on_conflict))
+        return self
+
+    def update(self, values: Dict[str, Any]) -> "AsyncQueryBuilder":
+        self._method = "PATCH"
+        self._json = values
+        self._headers["Prefer"] = "return=representation"
+        return self
+
+    def delete(self) -> "AsyncQueryBuilder":
+        self._method = "DELETE"
+        self._headers["Prefer"] = "return=representation"
+        return self
+
+    # ---------------- filters / modifiers ----------------
+
+    def eq(self, column: str, value: Any) -> "AsyncQueryBuilder":
+        op = "is" if value is None else "eq"
+        self._params.append((column, f"{op}.{_format_value(value)}"))
+        return self
+
+    def neq(self, column: str, value: Any) -> "AsyncQueryBuilder":
+        self._params.append((column, f"neq.{_format_value(value)}"))
+        return self
+
+    def in_(self, column: str, values: Iterable[Any]) -> "AsyncQueryBuilder":
+        items = ",".join(_quote_list_item(v) for v in values)
+        self._params.append((column, f"in.({items})"))
+        return self
+
+    def order(self, column: str, desc: bool = False) -> "AsyncQueryBuilder":
+        self._params.append(("order", f"{column}.{'desc' if desc else 'asc'}"))
+        return self
+
+    def limit(self, count: int) -> "AsyncQueryBuilder":
+        self._params.append(("limit", str(count)))
+        return self
+
+    def range(self, start: int, end: int) -> "AsyncQueryBuilder":
+        """Rows start..end inclusive, like supabase-py."""
+        self._params.append(("offset", str(start)))
+        self._params.append(("limit", str(end - start + 1)))
+        return self
+
+    def timeout(self, seconds: float) -> "AsyncQueryBuilder":
+        """Override the client's default timeout for this call."""
+        self._timeout = seconds
+        return self
+
+    async def execute(self) -> APIResponse:
+        return await self._client.request(
+            self._method,
+            self._path,
+            params=self._params,
+            json=self._json,
+            headers=self._headers,
+            timeout=self._timeout,
+        )
+
+
+class AsyncPostgrestClient:
+    """Pooled async PostgREST client.
+
+    Args:
+        base_url: PostgREST root, e.g. "https://xyz.supabase.co/rest/v1"
+        api_key: Sent as both `apikey` and the bearer token
+        timeout: Default per-request timeout in seconds
+        max_connections: Upper bound on open connections
+        max_keepalive_connections: Idle connections kept for reuse
+        http2: Force HTTP/2 on/off (default: on when `h2` is installed)
+        transport: Custom httpx transport (tests)
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str = "",
+        timeout: float = DEFAULT_TIMEOUT_SECONDS,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        http2: Optional[bool] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_keepalive_connections = min(max_keepalive_connections, max_connections)
+        self.http2 = importlib.util.find_spec("h2") is not None if http2 is None else http2
+        self._transport = transport
+        self._headers = {"Accept": "application/json"}
+        if api_key:
+            self._headers["apikey"] = api_key
+            self._headers["Authorization"] = f"Bearer {api_key}"
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def table(self, name: str) -> AsyncQueryBuilder:
+        return AsyncQueryBuilder(self, name)
+
+    def rpc(self, function: str, params: Optional[Dict[str, Any]] = None) -> AsyncQueryBuilder:
+        """Call a Postgres function exposed at /rpc/<function>."""
+        query = AsyncQueryBuilder(self, f"rpc/{function}")
+        query._method = "POST"
+        query._json = params or {}
+        return query
+
+    async def _bind_loop(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # A new loop (e.g. a fresh asyncio.run) cannot reuse the old pool
+            stale, stale_loop = self._client, self._loop
+            self._loop = loop
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self._headers,
+                http2=self.http2 and self._transport is None,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                ),
+                timeout=self.timeout,
+                transport=self._transport,
+            )
+            if stale is not None:
+                await _close_stale_client(stale, stale_loop)
+        return self._client
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[List[Tuple[str, str]]] = None,
+        json: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> APIResponse:
+        """Send one request and decode the PostgREST response."""
+        client = await self._bind_loop()
+        try:
+            response = await client.request(
+                method,
+                f"/{path}",
+                params=params,
+                json=json,
+                headers=headers,
+                timeout=self.timeout if timeout is None else timeout,
+            )
+        except httpx.TimeoutException as e:
+            raise PostgrestError(f"{method} /{path} timed out: {e}", timed_out=True) from e
+        except httpx.HTTPError as e:
+            raise PostgrestError(f"{method} /{path} failed: {e}") from e
+
+        body: Any = None
+        if response.content:
+            try:
+                body = response.json()
+            except ValueError:
+                body = response.text
+
+        if response.status_code >= 400:
+            error = body if isinstance(body, dict) else {}
+            raise PostgrestError(
+                error.get("message") or f"HTTP {response.status_code} from {method} /{path}",
+                status_code=response.status_code,
+                code=error.get("code"),
+                details=error.get("details") or body,
+            )
+
+        return APIResponse(data=body if body is not None else [], count=_parse_count(response))
+
+    async def aclose(self) -> None:
+        """Close the pool bound to the running loop."""
+        if self._client is not None and self._loop is asyncio.get_running_loop():
+            await self._client.aclose()
+            self._client = None
+            self._loop = None
+
+
+async def _close_stale_client(client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+    """Close a pool left behind by an event loop that is no longer current."""
+    if loop is not None and loop.is_running():
+        return  # Another thread's loop may still have requests in flight
+    try:
+        await client.aclose()
+    except RuntimeError:
+        pass  # Its loop is closed; unclosed sockets are released when collected
+
+
+def _parse_count(response: httpx.Response) -> Optional[int]:
+    """Total from a Content-Range header like "0-24/3573" (when requested)."""
+    content_range = response.headers.get("Content-Range", "")
+    _, _, total = content_range.partition("/")
+    return int(total) if total.isdigit() else None
+
+
+__all__ = [
+    "APIResponse",
+    "AsyncPostgrestClient",
+    "AsyncQueryBuilder",
+    "PostgrestError",
+]
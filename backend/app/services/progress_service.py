@@ -0,0 +1,276 @@
+"""In-process analysis progress tracking with coalesced database writes."""
+import asyncio
+import copy
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+from app.config import settings
+from app.services.db_service import get_db_service
+from app.utils import get_logger, log_with_context
+
+logger = get_logger(__name__)
+
+
+class ProgressReporter:
+    """
+    Collects per-document phase updates from analysis workers.
+
+    report() is thread-safe and never touches the database: it records the
+    latest phase per document (older pending phases are coalesced away) and
+    marks the document dirty. A single background flusher writes all dirty
+    documents of an analysis in one batch every flush interval.
+
+    The same state doubles as a status snapshot that GET /analyze/{id} can
+    serve while the analysis runs in this process, and subscribers of
+    GET /analyze/{id}/events receive phase changes and streamed issues as
+    they happen instead of polling for them.
+    """
+
+    def __init__(self, flush_interval: float = 1.0):
+        """Initialize progress reporter."""
+        self.db = get_db_service()
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._flush_lock = asyncio.Lock()
+        self._analyses: Dict[str, Dict[str, Any]] = {}
+        self._pending: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._subscribers: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._event_sinks: List[Callable[[str, str, Dict[str, Any]], None]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    # ========================================================================
+    # LIFECYCLE
+    # ========================================================================
+
+    def start(self) -> None:
+        """Start the background flusher on the running loop (idempotent)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """Stop the background flusher and write any pending progress."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _flush_loop(self) -> None:
+        """Periodically flush pending progress until cancelled."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning(f"⚠️  Progress flush failed: {e}")
+
+    # ========================================================================
+    # REPORTING
+    # ========================================================================
+
+    def start_analysis(
+        self,
+        analysis_id: str,
+        user_id: str,
+        provider: str,
+        created_at: Optional[str] = None,
+        status: str = "processing"
+    ) -> None:
+        """Register an analysis so progress can be reported and snapshotted."""
+        with self._lock:
+            state = self._analyses.setdefault(analysis_id, {
+                "analysis_id": analysis_id,
+                "user_id": user_id,
+                "provider": provider,
+                "created_at": created_at or datetime.utcnow().isoformat(),
+                "documents": {},
+            })
+            state["status"] = status
+
+    def report(
+        self,
+        analysis_id: str,
+        document_id: str,
+        phase: str,
+        started_at: Optional[str] = None
+    ) -> None:
+        """Record the current phase of a document (safe from any thread)."""
+        with self._lock:
+            state = self._analyses.get(analysis_id)
+            if state is None:
+                return  # Analysis finished or was never registered
+
+            progress = {
+                "phase": phase,
+                "updated_at": datetime.utcnow().isoformat()
+            }
+            previous = state["documents"].get(document_id)
+            started_at = started_at or (previous or {}).get("started_at")
+            if started_at:
+                progress["started_at"] = started_at
+
+            state["documents"][document_id] = progress
+            self._pending.setdefault(analysis_id, {})[document_id] = progress
+            self._publish_locked(analysis_id, "phase", {"document_id": document_id, **progress})
+
+    def snapshot(self, analysis_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        """Return current status for an in-flight analysis owned by user_id."""
+        with self._lock:
+            state = self._analyses.get(analysis_id)
+            if state is None or state["user_id"] != user_id:
+                return None
+            documents = [
+                {"document_id": document_id, "progress": dict(progress)}
+                for document_id, progress in state["documents"].items()
+            ]
+            return {
+                "analysis_id": analysis_id,
+                "status": state["status"],
+                "provider": state["provider"],
+                "results": {"documents": documents},
+                "created_at": state["created_at"],
+            }
+
+    # ========================================================================
+    # EVENT STREAM
+    # ========================================================================
+
+    def subscribe(
+        self,
+        analysis_id: str,
+        user_id: str
+    ) -> Optional[Tuple[asyncio.Queue, Dict[str, Any]]]:
+        """Attach an event queue to an in-flight analysis owned by user_id.
+
+        Returns:
+            (queue, snapshot) or None if the analysis is not running in this
+            process. The queue yields (event, data) tuples and then None once
+            the analysis has ended.
+        """
+        snapshot = self.snapshot(analysis_id, user_id)
+        if snapshot is None:
+            return None
+        queue: asyncio.Queue = asyncio.Queue()
+        with self._lock:
+            if analysis_id not in self._analyses:
+                return None  # Finished between snapshot() and here
+            self._subscribers.setdefault(analysis_id, []).append(
+                (asyncio.get_running_loop(), queue)
+            )
+        return queue, snapshot
+
+    def unsubscribe(self, analysis_id: str, queue: asyncio.Queue) -> None:
+        """Detach an event queue (e.g. when the client disconnects)."""
+        with self._lock:
+            subscribers = self._subscribers.get(analysis_id)
+            if not subscribers:
+                return
+            subscribers[:] = [(loop, q) for loop, q in subscribers if q is not queue]
+            if not subscribers:
+                self._subscribers.pop(analysis_id, None)
+
+    def publish(self, analysis_id: str, event: str, data: Dict[str, Any]) -> None:
+        """Push an event to all subscribers of an analysis (safe from any thread)."""
+        with self._lock:
+            self._publish_locked(analysis_id, event, data)
+
+    def end_stream(self, analysis_id: str, data: Dict[str, Any]) -> None:
+        """Send the terminal 'complete' event and close all subscriber queues."""
+        with self._lock:
+            self._publish_locked(analysis_id, "complete", data)
+            for loop, queue in self._subscribers.pop(analysis_id, []):
+                self._deliver(loop, queue, None)
+
+    def add_event_sink(self, sink: Callable[[str, str, Dict[str, Any]], None]) -> None:
+        """Also send every event to sink(analysis_id, event, data).
+
+        Worker processes use this to relay events to API processes. The sink
+        is called with the reporter's lock held, from any thread, so it must
+        only hand the event off (e.g. via loop.call_soon_threadsafe).
+        """
+        with self._lock:
+            self._event_sinks.append(sink)
+
+    def _publish_locked(self, analysis_id: str, event: str, data: Dict[str, Any]) -> None:
+        for loop, queue in self._subscribers.get(analysis_id, ()):
+            self._deliver(loop, queue, (event, data))
+        for sink in self._event_sinks:
+            try:
+                sink(analysis_id, event, data)
+            except Exception as e:
+                logger.warning(f"⚠️  Progress event sink failed: {e}")
+
+    @staticmethod
+    def _deliver(loop: asyncio.AbstractEventLoop, queue: asyncio.Queue, item: Any) -> None:
+        # Queues belong to the subscriber's loop; workers publish from threads
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+        except RuntimeError:
+            pass  # Loop already closed; the subscriber is gone
+
+    # ========================================================================
+    # PERSISTENCE
+    # ========================================================================
+
+    async def flush(self, analysis_id: Optional[str] = None) -> None:
+        """Write pending progress (one batched update per analysis)."""
+        async with self._flush_lock:
+            with self._lock:
+                if analysis_id is None:
+                    batch, self._pending = self._pending, {}
+                else:
+                    pending = self._pending.pop(analysis_id, None)
+                    batch = {analysis_id: pending} if pending else {}
+
+            for batch_analysis_id, progress_by_document in batch.items():
+                try:
+                    await self.db.update_documents_progress(
+                        batch_analysis_id,
+                        copy.deepcopy(progress_by_document)
+                    )
+                except Exception as e:
+                    log_with_context(
+                        logger, 30,
+                        f"⚠️  Progress update failed",
+                        analysis_id=batch_analysis_id,
+                        error=str(e)
+                    )
+                    self._requeue(batch_analysis_id, progress_by_document)
+
+    def _requeue(self, analysis_id: str, progress_by_document: Dict[str, Dict[str, Any]]) -> None:
+        """Put failed writes back unless a newer phase arrived meanwhile."""
+        with self._lock:
+            if analysis_id not in self._analyses:
+                return
+            pending = self._pending.setdefault(analysis_id, {})
+            for document_id, progress in progress_by_document.items():
+                pending.setdefault(document_id, progress)
+
+    async def finish(self, analysis_id: str) -> None:
+        """Flush pending progress and stop tracking the analysis.
+
+        Must run before final results are saved so a late progress write
+        cannot overwrite them.
+        """
+        await self.flush(analysis_id)
+        with self._lock:
+            self._analyses.pop(analysis_id, None)
+            self._pending.pop(analysis_id, None)
+
+
+# Singleton instance
+_progress_reporter: ProgressReporter | None = None
+
+
+def get_progress_reporter() -> ProgressReporter:
+    """Get or create ProgressReporter singleton."""
+    global _progress_reporter
+    if _progress_reporter is None:
+        _progress_reporter = ProgressReporter(
+            flush_interval=settings.progress_flush_interval_seconds
+        )
+    return _progress_reporter
@@ -0,0 +1,322 @@
+"""Blob storage backends with chunked async reads.
+
+StorageService used to call GCS download_as_bytes()/download_as_text(),
+holding each whole object in memory (and images were then written to a
+temp file just to be read back for base64 encoding). This module streams
+objects instead:
+
+- StorageBackend: blocking primitives (open a reader, delete, exists,
+  signed URLs) implemented by GCSStorageBackend and LocalStorageBackend
+- iter_blob_chunks(): async iterator of chunks, each read off the event loop
+- read_blob_base64(): encodes while streaming, without a temp file
+- DiskBlobCache: optional read-through cache on local disk, bounded by
+  total size (least recently used files are evicted first)
+
+LocalStorageBackend maps buckets to directories, so tests and local
+development can run without GCS credentials.
+
+This module deliberately avoids importing app.config and
+google-cloud-storage (GCSStorageBackend takes a ready client) so it can be
+used on its own.
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, AsyncIterator, BinaryIO, Optional
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+DEFAULT_CACHE_MAX_BYTES = 512 * 1024 * 1024  # 512 MiB
+
+
+class BlobTooLargeError(ValueError):
+    """Raised when a download exceeds its max_bytes limit."""
+
+
+class StorageBackend(ABC):
+    """Blocking blob primitives; StorageService runs them off the event loop."""
+
+    @abstractmethod
+    def open_read(self, bucket_name: str, blob_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> BinaryIO:
+        """Open a blob for sequential reads."""
+
+    @abstractmethod
+    def exists(self, bucket_name: str, blob_path: str) -> bool:
+        """Check whether a blob exists."""
+
+    @abstractmethod
+    def delete(self, bucket_name: str, blob_path: str) -> None:
+        """Delete a blob."""
+
+    @abstractmethod
+    def generate_signed_url(
+        self,
+        bucket_name: str,
+        blob_path: str,
+        method: str,
+        expiration: timedelta,
+        content_type: Optional[str] = None
+    ) -> str:
+        """URL a client can use to GET or PUT the blob directly."""
+
+
+class GCSStorageBackend(StorageBackend):
+    """Google Cloud Storage via a google.cloud.storage.Client."""
+
+    def __init__(self, client: Any):
+        self.client = client
+
+    def _blob(self, bucket_name: str, blob_path: str) -> Any:
+        return self.client.bucket(bucket_name).blob(blob_path)
+
+    def open_read(self, bucket_name: str, blob_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> BinaryIO:
+        # BlobReader fetches chunk_size byte ranges on demand
+        return self._blob(bucket_name, blob_path).open("rb", chunk_size=chunk_size)
+
+    def exists(self, bucket_name: str, blob_path: str) -> bool:
+        return self._blob(bucket_name, blob_path).exists()
+
+    def delete(self, bucket_name: str, blob_path: str) -> None:
+        self._blob(bucket_name, blob_path).delete()
+
+    def generate_signed_url(
+        self,
+        bucket_name: str,
+        blob_path: str,
+        method: str,
+        expiration: timedelta,
+        content_type: Optional[str] = None
+    ) -> str:
+        kwargs = {"content_type": content_type} if content_type else {}
+        return self._blob(bucket_name, blob_path).generate_signed_url(
+            version="v4",
+            expiration=expiration,
+            method=method,
+            **kwargs
+        )
+
+
+class LocalStorageBackend(StorageBackend):
+    """Buckets as directories under root (tests and local development)."""
+
+    def __init__(self, root: str | os.PathLike):
+        self.root = Path(root)
+
+    def path_for(self, bucket_name: str, blob_path: str) -> Path:
+        bucket_dir = (self.root / bucket_name).resolve()
+        path = (bucket_dir / blob_path).resolve()
+        if bucket_dir not in path.parents:
+            raise ValueError(f"Blob path escapes bucket: {blob_path}")
+        return path
+
+    def write(self, bucket_name: str, blob_path: str, data: bytes) -> None:
+        """Store a blob (the local stand-in for a signed-URL upload)."""
+        path = self.path_for(bucket_name, blob_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+    def open_read(self, bucket_name: str, blob_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> BinaryIO:
+        return open(self.path_for(bucket_name, blob_path), "rb")
+
+    def exists(self, bucket_name: str, blob_path: str) -> bool:
+        return self.path_for(bucket_name, blob_path).is_file()
+
+    def delete(self, bucket_name: str, blob_path: str) -> None:
+        self.path_for(bucket_name, blob_path).unlink()
+
+    def generate_signed_url(
+        self,
+        bucket_name: str,
+        blob_path: str,
+        method: str,
+        expiration: timedelta,
+        content_type: Optional[str] = None
+    ) -> str:
+        return self.path_for(bucket_name, blob_path).as_uri()
+
+
+class DiskBlobCache:
+    """Read-through blob cache on local disk, bounded by total size.
+
+    Entries are written to a temp file and renamed into place only once the
+    whole blob has been read, so a partial download is never served. Blobs
+    are assumed immutable per path; call invalidate() when one is deleted.
+    """
+
+    def __init__(self, directory: str | os.PathLike, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _key_path(self, bucket_name: str, blob_path: str) -> Path:
+        digest = hashlib.sha256(f"{bucket_name}/{blob_path}".encode("utf-8")).hexdigest()
+        return self.directory / digest
+
+    def open_cached(self, bucket_name: str, blob_path: str) -> Optional[BinaryIO]:
+        """Open a cached copy, or return None on a miss."""
+        path = self._key_path(bucket_name, blob_path)
+        try:
+            handle = open(path, "rb")
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)  # recency for eviction
+        except OSError:
+            pass
+        return handle
+
+    def begin_write(self, bucket_name: str, blob_path: str) -> "_CacheWriter":
+        return _CacheWriter(self, self._key_path(bucket_name, blob_path))
+
+    def invalidate(self, bucket_name: str, blob_path: str) -> None:
+        try:
+            self._key_path(bucket_name, blob_path).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until under max_bytes."""
+        with self._lock:
+            entries = []
+            total = 0
+            for path in self.directory.iterdir():
+                if path.name.startswith(".tmp"):
+                    continue
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+
+class _CacheWriter:
+    """Temp file that becomes a cache entry on commit()."""
+
+    def __init__(self, cache: DiskBlobCache, target: Path):
+        self.cache = cache
+        self.target = target
+        fd, name = tempfile.mkstemp(prefix=".tmp", dir=cache.directory)
+        self.handle = os.fdopen(fd, "wb")
+        self.tmp_path = Path(name)
+
+    def write(self, chunk: bytes) -> None:
+        self.handle.write(chunk)
+
+    def commit(self) -> None:
+        self.handle.close()
+        os.replace(self.tmp_path, self.target)
+        self.cache._evict()
+
+    def abort(self) -> None:
+        self.handle.close()
+        try:
+            self.tmp_path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+async def iter_blob_chunks(
+    backend: StorageBackend,
+    bucket_name: str,
+    blob_path: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    cache: Optional[DiskBlobCache] = None
+) -> AsyncIterator[bytes]:
+    """Yield a blob in chunks, reading each chunk in a worker thread.
+
+    With a cache, hits are served from local disk and misses are written
+    through to it as they stream.
+    """
+    reader = await asyncio.to_thread(cache.open_cached, bucket_name, blob_path) if cache else None
+    writer = None
+    if reader is None:
+        reader = await asyncio.to_thread(backend.open_read, bucket_name, blob_path, chunk_size)
+        if cache is not None:
+            writer = await asyncio.to_thread(cache.begin_write, bucket_name, blob_path)
+
+    try:
+        while True:
+            chunk = await asyncio.to_thread(reader.read, chunk_size)
+            if not chunk:
+                break
+            if writer is not None:
+                await asyncio.to_thread(writer.write, chunk)
+            yield chunk
+        if writer is not None:
+            await asyncio.to_thread(writer.commit)
+            writer = None
+    finally:
+        if writer is not None:
+            writer.abort()
+        reader.close()
+
+
+async def read_blob_bytes(
+    backend: StorageBackend,
+    bucket_name: str,
+    blob_path: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    cache: Optional[DiskBlobCache] = None,
+    max_bytes: Optional[int] = None
+) -> bytes:
+    """Read a whole blob, failing early once it exceeds max_bytes."""
+    buffer = bytearray()
+    async for chunk in iter_blob_chunks(backend, bucket_name, blob_path, chunk_size, cache):
+        buffer += chunk
+        if max_bytes is not None and len(buffer) > max_bytes:
+            raise BlobTooLargeError(f"{bucket_name}/{blob_path} exceeds {max_bytes} bytes")
+    return bytes(buffer)
+
+
+async def read_blob_base64(
+    backend: StorageBackend,
+    bucket_name: str,
+    blob_path: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    cache: Optional[DiskBlobCache] = None,
+    max_bytes: Optional[int] = None
+) -> str:
+    """Base64-encode a blob while streaming it (no raw copy, no temp file)."""
+    encoded = bytearray()
+    carry = b""
+    total = 0
+    async for chunk in iter_blob_chunks(backend, bucket_name, blob_path, chunk_size, cache):
+        total += len(chunk)
+        if max_bytes is not None and total > max_bytes:
+            raise BlobTooLargeError(f"{bucket_name}/{blob_path} exceeds {max_bytes} bytes")
+        data = carry + chunk
+        # Encode whole 3-byte groups only, so no padding appears mid-stream
+        cut = len(data) - len(data) % 3
+        encoded += base64.b64encode(data[:cut])
+        carry = data[cut:]
+    encoded += base64.b64encode(carry)
+    return encoded.decode("ascii")
+
+
+__all__ = [
+    "BlobTooLargeError",
+    "DiskBlobCache",
+    "GCSStorageBackend",
+    "LocalStorageBackend",
+    "StorageBackend",
+    "iter_blob_chunks",
+    "read_blob_base64",
+    "read_blob_bytes",
+]
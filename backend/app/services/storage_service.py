@@ -1,31 +1,67 @@
-"""Google Cloud Storage service for document uploads using signed URLs."""
+"""Blob storage service for document uploads using signed URLs.
+
+Reads stream in chunks through a StorageBackend (GCS, or a local directory
+when STORAGE_BACKEND=local), optionally through a read-through disk cache.
+"""
 from datetime import timedelta
-from google.cloud import storage
-from google.oauth2 import service_account
+from typing import AsyncIterator, Optional
 from app.config import settings
+from app.services.storage_backends import (
+    DiskBlobCache,
+    GCSStorageBackend,
+    LocalStorageBackend,
+    StorageBackend,
+    iter_blob_chunks,
+    read_blob_base64,
+    read_blob_bytes,
+)
+
+
+def _create_gcs_backend() -> GCSStorageBackend:
+    """GCS client from the Firebase service account (default credentials as fallback)."""
+    from google.cloud import storage
+    from google.oauth2 import service_account
+
+    try:
+        credentials_dict = {
+            "type": "service_account",
+            "project_id": settings.firebase_project_id,
+            "private_key": settings.firebase_private_key.replace('\\n', '\n'),
+            "client_email": settings.firebase_client_email,
+            "token_uri": "https://oauth2.googleapis.com/token",
+        }
+        credentials = service_account.Credentials.from_service_account_info(credentials_dict)
+        client = storage.Client(project=settings.gcs_project_id, credentials=credentials)
+        print(f"✅ GCS initialized with bucket: {settings.gcs_bucket_documents}")
+    except Exception as e:
+        print(f"⚠️  Warning: Could not initialize GCS: {e}")
+        # Fallback to default credentials
+        client = storage.Client(project=settings.gcs_project_id)
+    return GCSStorageBackend(client)
 
 
 class StorageService:
-    """Handles file uploads and downloads to/from Google Cloud Storage."""
-
-    def __init__(self):
-        """Initialize GCS client."""
-        # Create credentials from Firebase service account
-        try:
-            credentials_dict = {
-                "type": "service_account",
-                "project_id": settings.firebase_project_id,
-                "private_key": settings.firebase_private_key.replace('\\n', '\n'),
-                "client_email": settings.firebase_client_email,
-                "token_uri": "https://oauth2.googleapis.com/token",
-            }
-            credentials = service_account.Credentials.from_service_account_info(credentials_dict)
-            self.client = storage.Client(project=settings.gcs_project_id, credentials=credentials)
-            print(f"✅ GCS initialized with bucket: {settings.gcs_bucket_documents}")
-        except Exception as e:
-            print(f"⚠️  Warning: Could not initialize GCS: {e}")
-            # Fallback to default credentials
-            self.client = storage.Client(project=settings.gcs_project_id)
+    """Handles file uploads and downloads to/from blob storage."""
+
+    def __init__(
+        self,
+        backend: Optional[StorageBackend] = None,
+        cache: Optional[DiskBlobCache] = None
+    ):
+        """Initialize the storage backend (GCS unless STORAGE_BACKEND=local)."""
+        if backend is None:
+            if settings.storage_backend == "local":
+                backend = LocalStorageBackend(settings.storage_local_root)
+                print(f"✅ Local storage initialized at: {settings.storage_local_root}")
+            else:
+                backend = _create_gcs_backend()
+        self.backend = backend
+
+        if cache is None and settings.storage_cache_dir:
+            cache = DiskBlobCache(settings.storage_cache_dir, settings.storage_cache_max_bytes)
+        self.cache = cache
+        self.chunk_size = settings.storage_chunk_size_bytes
+        self.max_download_bytes = settings.storage_max_download_bytes or None
 
         self.documents_bucket = settings.gcs_bucket_documents
         self.clinical_bucket = settings.gcs_bucket_clinical_images
@@ -49,18 +85,14 @@ class StorageService:
         Returns:
             Signed URL string valid for PUT requests
         """
-        bucket = self.client.bucket(bucket_name)
-        blob = bucket.blob(blob_path)
-
-        url = blob.generate_signed_url(
-            version="v4",
-            expiration=timedelta(minutes=expires_in_minutes),
+        return self.backend.generate_signed_url(
+            bucket_name,
+            blob_path,
             method="PUT",
+            expiration=timedelta(minutes=expires_in_minutes),
             content_type=content_type,
         )
 
-        return url
-
     def generate_signed_download_url(
         self,
         bucket_name: str,
@@ -78,16 +110,33 @@ class StorageService:
         Returns:
             Signed URL string valid for GET requests
         """
-        bucket = self.client.bucket(bucket_name)
-        blob = bucket.blob(blob_path)
-
-        url = blob.generate_signed_url(
-            version="v4",
-            expiration=timedelta(minutes=expires_in_minutes),
+        return self.backend.generate_signed_url(
+            bucket_name,
+            blob_path,
             method="GET",
+            expiration=timedelta(minutes=expires_in_minutes),
         )
 
-        return url
+    def iter_chunks(
+        self,
+        bucket_name: str,
+        blob_path: str,
+        chunk_size: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream file content in chunks without holding the whole file.
+
+        Args:
+            bucket_name: GCS bucket name
+            blob_path: Path within bucket
+            chunk_size: Bytes per chunk (default: STORAGE_CHUNK_SIZE_BYTES)
+
+        Returns:
+            Async iterator of byte chunks
+        """
+        return iter_blob_chunks(
+            self.backend, bucket_name, blob_path, chunk_size or self.chunk_size, self.cache
+        )
 
     async def download_text(self, bucket_name: str, blob_path: str) -> str:
         """
@@ -100,10 +149,8 @@ class StorageService:
         Returns:
             File content as string
         """
-        bucket = self.client.bucket(bucket_name)
-        blob = bucket.blob(blob_path)
-        content = blob.download_as_text()
-        return content
+        content = await self.download_bytes(bucket_name, blob_path)
+        return content.decode("utf-8")
 
     async def download_bytes(self, bucket_name: str, blob_path: str) -> bytes:
         """
@@ -115,11 +162,35 @@ class StorageService:
 
         Returns:
             File content as bytes
+
+        Raises:
+            BlobTooLargeError: If the file exceeds STORAGE_MAX_DOWNLOAD_BYTES
+        """
+        return await read_blob_bytes(
+            self.backend, bucket_name, blob_path, self.chunk_size, self.cache,
+            max_bytes=self.max_download_bytes
+        )
+
+    async def download_base64(self, bucket_name: str, blob_path: str) -> str:
+        """
+        Download file content as a base64 string (e.g. for vision model data URLs).
+
+        Encodes while streaming, so the raw bytes are never held in full.
+
+        Args:
+            bucket_name: GCS bucket name
+            blob_path: Path within bucket
+
+        Returns:
+            Base64-encoded file content
+
+        Raises:
+            BlobTooLargeError: If the file exceeds STORAGE_MAX_DOWNLOAD_BYTES
         """
-        bucket = self.client.bucket(bucket_name)
-        blob = bucket.blob(blob_path)
-        content = blob.download_as_bytes()
-        return content
+        return await read_blob_base64(
+            self.backend, bucket_name, blob_path, self.chunk_size, self.cache,
+            max_bytes=self.max_download_bytes
+        )
 
     def delete_file(self, bucket_name: str, blob_path: str) -> bool:
         """
@@ -132,9 +203,9 @@ class StorageService:
         Returns:
             True if successful
         """
-        bucket = self.client.bucket(bucket_name)
-        blob = bucket.blob(blob_path)
-        blob.delete()
+        self.backend.delete(bucket_name, blob_path)
+        if self.cache is not None:
+            self.cache.invalidate(bucket_name, blob_path)
         return True
 
     def file_exists(self, bucket_name: str, blob_path: str) -> bool:
@@ -148,9 +219,7 @@ class StorageService:
         Returns:
             True if file exists
         """
-        bucket = self.client.bucket(bucket_name)
-        blob = bucket.blob(blob_path)
-        return blob.exists()
+        return self.backend.exists(bucket_name, blob_path)
 
 
 # Singleton instance
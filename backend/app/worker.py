@@ -0,0 +1,117 @@
+"""Analysis worker process.
+
+Consumes analysis jobs from the configured job queue, so heavy analyses run
+outside the API's Uvicorn workers:
+
+    cd backend
+    JOB_QUEUE_BACKEND=redis python -m app.worker
+
+Progress is written to the database by the ProgressReporter as in the API,
+and every progress/issue event is also published on the job queue so API
+processes can relay it to GET /api/analyze/{id}/events subscribers.
+
+SIGTERM/SIGINT stop the worker: in-flight jobs are released back to the
+queue for another worker (with Redis they would otherwise reappear after
+the visibility timeout).
+"""
+import asyncio
+import signal
+import sys
+from pathlib import Path
+
+# Add paths for medbilldozer modules (same layout as app.main)
+app_root = Path(__file__).parent.parent
+src_dir = app_root / "src"
+if str(src_dir) not in sys.path:
+    sys.path.insert(0, str(src_dir))
+if str(app_root) not in sys.path:
+    sys.path.insert(0, str(app_root))
+
+from app.config import settings
+from app.utils import setup_logging, get_logger
+
+setup_logging(json_logs=False)
+logger = get_logger(__name__)
+
+
+class EventForwarder:
+    """Publishes ProgressReporter events on the job queue, in order.
+
+    ProgressReporter calls sinks from analysis threads with its lock held,
+    so events are handed to this loop and published by a single task.
+    """
+
+    def __init__(self, job_queue):
+        self.job_queue = job_queue
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.task = self.loop.create_task(self._run())
+
+    def __call__(self, analysis_id, event, data) -> None:
+        try:
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, (analysis_id, event, data))
+        except RuntimeError:
+            pass  # Loop closed during shutdown
+
+    async def _run(self) -> None:
+        while True:
+            item = await self.queue.get()
+            if item is None:
+                return
+            try:
+                await self.job_queue.publish_event(*item)
+            except Exception as e:
+                logger.warning(f"⚠️  Could not publish {item[1]} event: {e}")
+
+    async def close(self) -> None:
+        """Publish remaining events, then stop."""
+        self.queue.put_nowait(None)
+        await self.task
+
+
+async def main() -> None:
+    """Run job consumers until SIGTERM/SIGINT."""
+    from medbilldozer.providers.provider_registry import register_providers
+    from app.services.analysis_service import get_analysis_service
+    from app.services.db_service import get_db_service
+    from app.services.job_queue import JobWorker, get_job_queue
+    from app.services.progress_service import get_progress_reporter
+
+    register_providers()
+    job_queue = get_job_queue()
+    progress_reporter = get_progress_reporter()
+    progress_reporter.start()
+    forwarder = EventForwarder(job_queue)
+    progress_reporter.add_event_sink(forwarder)
+
+    analysis_service = get_analysis_service()
+    worker = JobWorker(
+        job_queue,
+        analysis_service.run_job,
+        concurrency=settings.job_queue_concurrency,
+        max_attempts=settings.job_queue_max_attempts,
+        on_dead_letter=analysis_service.fail_job
+    )
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+
+    worker.start()
+    logger.info(
+        f"👷 Analysis worker started (queue={settings.job_queue_backend}, "
+        f"concurrency={settings.job_queue_concurrency})"
+    )
+    await stop.wait()
+
+    logger.info("👋 Stopping analysis worker...")
+    await worker.stop()
+    await progress_reporter.stop()
+    await forwarder.close()
+    await job_queue.close()
+    await get_db_service().aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -65,4 +65,16 @@ export const issuesService = {
     );
     return response.data;
   },
+
+  /**
+   * Get issue statistics for several analyses in one request
+   */
+  async getIssueStatisticsBulk(analysisIds: string[]): Promise<IssueStatistics[]> {
+    const params = new URLSearchParams();
+    analysisIds.forEach((id) => params.append('analysis_ids', id));
+    const response = await api.get<IssueStatistics[]>(
+      `/api/issues/statistics?${params.toString()}`
+    );
+    return response.data;
+  },
 };
@@ -69,8 +69,7 @@ from medbilldozer.ui.splash_screen import (
     should_show_splash_screen,
     render_splash_screen,
 )
-from medbilldozer.core.coverage_matrix import build_coverage_matrix
-from medbilldozer.ui.ui_coverage_matrix import render_coverage_matrix
+from medbilldozer.ui.ui_coverage_matrix import render_coverage_matrix, session_coverage_rows
 
 # Provider modules
 from medbilldozer.providers.provider_registry import (
@@ -258,7 +257,7 @@ def main():
         st.markdown("---")
 
         if is_coverage_matrix_enabled():
-            coverage_rows = build_coverage_matrix(documents)
+            coverage_rows = session_coverage_rows(documents)
             render_coverage_matrix(coverage_rows)
 
         # --------------------------------------------------
@@ -0,0 +1,170 @@
+"""
+Benchmark Checkpoint Log
+========================
+
+Append-only JSONL log of completed benchmark units (patient profiles,
+clinical scenarios), so an interrupted run resumes where it stopped instead
+of paying again for every model call.
+
+A log belongs to one run key: benchmark, model, dataset hash and prompt
+version. Changing the dataset or a prompt therefore starts a new log
+rather than mixing results. Each unit is written (and fsynced) as soon as
+it finishes; the latest line per unit wins, and only units recorded with
+status "ok" are skipped on resume, so failed units are retried.
+
+When a run's results have been saved, finish() moves the log aside
+(*.complete.jsonl): the next run with the same key starts fresh, while the
+completed log stays available for inspection.
+
+Usage:
+    key = RunKey("patient", "openai", fingerprint_files(files), "1+full")
+    log = CheckpointLog.open(CHECKPOINT_DIR, key)
+    pending = [u for u in units if u not in log.completed()]
+    ...
+    log.record(unit_id, result_dict)
+    records = log.records(units)   # final metrics are computed from these
+    log.finish()
+"""
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent
+CHECKPOINT_DIR = PROJECT_ROOT / "benchmarks" / "checkpoints"
+
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+
+
+def fingerprint_files(paths: Iterable[Path], root: Optional[Path] = None) -> str:
+    """Hash the names and contents of a set of files (order independent)."""
+    digest = hashlib.sha256()
+    for path in sorted(Path(p) for p in paths):
+        name = path.relative_to(root) if root else path.name
+        digest.update(str(name).encode("utf-8") + b"\0")
+        digest.update(path.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+def fingerprint_text(*parts: str) -> str:
+    """Hash a sequence of strings (e.g. prompt templates or source code)."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8") + b"\0")
+    return digest.hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class RunKey:
+    """Identifies the results a checkpoint log may be resumed with."""
+    benchmark: str
+    model: str
+    dataset_hash: str
+    prompt_version: str
+
+    @property
+    def id(self) -> str:
+        return fingerprint_text(self.benchmark, self.model, self.dataset_hash, self.prompt_version)[:12]
+
+    @property
+    def filename(self) -> str:
+        model = "".join(c if c.isalnum() or c in "-_." else "_" for c in self.model)
+        return f"{self.benchmark}_{model}_{self.id}.jsonl"
+
+
+class CheckpointLog:
+    """Append-only per-unit result log for one benchmark run key."""
+
+    def __init__(self, path: Path, run_key: RunKey):
+        self.path = Path(path)
+        self.run_key = run_key
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._load()
+        if not self.path.exists():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._append({"type": "run", **asdict(run_key), "run_id": run_key.id,
+                          "started_at": datetime.now().isoformat()})
+
+    @classmethod
+    def open(cls, directory: Path, run_key: RunKey, fresh: bool = False) -> "CheckpointLog":
+        """Open (or create) the log for run_key in directory.
+
+        Args:
+            fresh: Discard an existing incomplete log instead of resuming it
+        """
+        path = Path(directory) / run_key.filename
+        if fresh and path.exists():
+            path.unlink()
+        return cls(path, run_key)
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        with open(self.path, "rb+") as f:
+            data = f.read()
+            end = data.rfind(b"\n") + 1
+            if end < len(data):
+                # Torn final line from a crash mid-write; drop it so the
+                # next append starts on a line of its own.
+                f.truncate(end)
+        for line in data[:end].decode("utf-8").splitlines():
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if entry.get("type") == "run":
+                if entry.get("run_id") != self.run_key.id:
+                    raise ValueError(f"{self.path} belongs to run {entry.get('run_id')}, not {self.run_key.id}")
+            elif entry.get("type") == "unit":
+                self._entries[entry["unit"]] = entry
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        line = json.dumps(entry, default=str) + "\n"
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def record(self, unit: str, record: Dict[str, Any], status: str = STATUS_OK) -> None:
+        """Durably record a unit's result (thread safe)."""
+        entry = {
+            "type": "unit",
+            "unit": unit,
+            "status": status,
+            "recorded_at": datetime.now().isoformat(),
+            "record": record,
+        }
+        with self._lock:
+            self._append(entry)
+            self._entries[unit] = entry
+
+    def completed(self) -> Dict[str, Dict[str, Any]]:
+        """{unit: record} of units that finished successfully."""
+        with self._lock:
+            return {unit: e["record"] for unit, e in self._entries.items() if e["status"] == STATUS_OK}
+
+    def records(self, units: Optional[Iterable[str]] = None, include_errors: bool = True) -> List[Dict[str, Any]]:
+        """Latest record per unit, in the order of units (default: log order)."""
+        with self._lock:
+            order = list(units) if units is not None else list(self._entries)
+            return [
+                self._entries[unit]["record"]
+                for unit in order
+                if unit in self._entries and (include_errors or self._entries[unit]["status"] == STATUS_OK)
+            ]
+
+    def finish(self) -> Path:
+        """Mark the run complete; the next run with this key starts fresh."""
+        with self._lock:
+            done = self.path.with_suffix(".complete.jsonl")
+            if self.path.exists():
+                os.replace(self.path, done)
+            return done
@@ -39,13 +39,21 @@ except ImportError as e:
 class BenchmarkDataAccess:
     """Encapsulates all Supabase queries for the dashboard."""
     
-    def __init__(self, supabase_url: Optional[str] = None, supabase_key: Optional[str] = None):
+    def __init__(
+        self,
+        supabase_url: Optional[str] = None,
+        supabase_key: Optional[str] = None,
+        result_store: Optional[Any] = None
+    ):
         """
         Initialize data access layer.
         
         Args:
             supabase_url: Supabase project URL (defaults to env var)
             supabase_key: Supabase anon/service key (defaults to env var)
+            result_store: Optional ResultStore (benchmark_result_store.py);
+                when set, transactions are synced into it incrementally and
+                read from its Parquet tables
         """
         url = supabase_url or os.getenv('SUPABASE_URL')
         key = supabase_key or os.getenv('SUPABASE_ANON_KEY')
@@ -54,6 +62,7 @@ class BenchmarkDataAccess:
             raise ValueError("Supabase credentials not provided")
         
         self.client: Client = create_client(url, key)
+        self.result_store = result_store
     
     # ========================================================================
     # Snapshot Queries
@@ -305,6 +314,9 @@ class BenchmarkDataAccess:
         Returns:
             DataFrame with transaction history
         """
+        if self.result_store is not None:
+            return self._get_stored_transactions(model_version, environment, start_date, end_date, limit)
+        
         query = self.client.table('benchmark_transactions').select('*')
         
         if model_version:
@@ -346,6 +358,47 @@ class BenchmarkDataAccess:
         
         return df
     
+    def _get_stored_transactions(
+        self,
+        model_version: Optional[str],
+        environment: Optional[str],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        limit: Optional[int]
+    ) -> pd.DataFrame:
+        """
+        get_transactions() served from the columnar result store.
+        
+        Only transactions newer than the latest stored one are fetched; the
+        filters are pushed down into the Parquet scan. Metric columns are
+        named like the flattened metrics JSONB; per-category and per-profile
+        rows are in the store's categories and profiles tables.
+        """
+        self.result_store.sync_transactions(self.client)
+        
+        filters = [('source', '==', 'supabase')]
+        if environment:
+            filters.append(('environment', '==', environment))
+        
+        df = self.result_store.query(
+            'runs',
+            model_versions=[model_version] if model_version else None,
+            start=start_date,
+            end=end_date,
+            filters=filters
+        )
+        
+        if df.empty:
+            return pd.DataFrame()
+        
+        df = df.drop(columns=['date', 'source']).rename(columns={'benchmark_id': 'id'})
+        df = df.sort_values('created_at', ascending=False)
+        
+        if limit:
+            df = df.head(limit)
+        
+        return df.reset_index(drop=True)
+    
     def get_time_series(
         self,
         model_version: str,
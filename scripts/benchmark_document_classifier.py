@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: document routing (classification + pre-facts + local type)
+
+Compares DocumentClassifier against the previous implementation (kept
+verbatim below as the reference), which ran one re.search per pattern for
+classify_document, extract_pre_facts and extract_facts_local's type
+detection.
+
+The fixture is every document in benchmarks/inputs, plus one large document
+made by concatenating them. Both implementations must produce the same
+classification, pre-facts and local type for every document.
+
+Usage:
+    python scripts/benchmark_document_classifier.py
+    python scripts/benchmark_document_classifier.py --repeat 50 --concat 20
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from medbilldozer.core.document_classifier import DOCUMENT_CLASSIFIER, DOCUMENT_SIGNALS
+
+INPUTS_DIR = PROJECT_ROOT / "benchmarks" / "inputs"
+
+
+# ==================================================
+# Reference (previous) implementation
+# ==================================================
+
+def legacy_classify_document(text: str) -> Dict:
+    scores = {}
+
+    for doc_type, patterns in DOCUMENT_SIGNALS.items():
+        matches = sum(
+            1 for p in patterns if re.search(p, text, re.IGNORECASE)
+        )
+        if matches:
+            scores[doc_type] = matches
+
+    if not scores:
+        return {
+            "document_type": "generic",
+            "confidence": 0.0,
+            "scores": {},
+        }
+
+    best = max(scores, key=scores.get)
+    confidence = scores[best] / sum(scores.values())
+
+    return {
+        "document_type": best,
+        "confidence": round(confidence, 2),
+        "scores": scores,
+    }
+
+
+def legacy_extract_pre_facts(text: str) -> Dict:
+    return {
+        "contains_cpt": bool(re.search(r"\bCPT\b", text)),
+        "contains_dental_code": bool(re.search(r"\bD\d{4}\b", text)),
+        "contains_rx": bool(re.search(r"\bRx\b", text)),
+        "line_count": len(text.splitlines()),
+        "char_count": len(text),
+    }
+
+
+def legacy_local_type(text: str) -> str:
+    if re.search(r"\bD\d{4}\b", text):
+        return "dental_bill"
+    elif re.search(r"\b\d{5}\b", text):
+        return "medical_bill"
+    elif re.search(r"Receipt|Store\s*#", text, re.IGNORECASE):
+        return "pharmacy_receipt"
+    elif re.search(r"Flexible Spending Account|FSA|Reimbursed", text, re.IGNORECASE):
+        return "fsa_claim_history"
+    elif re.search(r"Insurance Claim History|Deductible|Out-of-Pocket", text, re.IGNORECASE):
+        return "insurance_claim_history"
+    return "unknown"
+
+
+def legacy_route(text: str):
+    return legacy_classify_document(text), legacy_extract_pre_facts(text), legacy_local_type(text)
+
+
+def compiled_route(text: str):
+    scan = DOCUMENT_CLASSIFIER.scan(text)
+    return scan.classification(), scan.pre_facts(), scan.local_type
+
+
+# ==================================================
+# Benchmark
+# ==================================================
+
+def load_fixture(inputs_dir: Path = INPUTS_DIR) -> List[str]:
+    """All benchmark input documents, in a stable order."""
+    return [path.read_text(encoding="utf-8") for path in sorted(inputs_dir.glob("*.txt"))]
+
+
+def best_of(fn: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def check_equivalence(texts: List[str]) -> None:
+    """Assert the compiled classifier agrees with the reference on every document."""
+    for text in texts:
+        assert legacy_route(text) == compiled_route(text), text[:200]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20, help="Repetitions (best time is reported)")
+    parser.add_argument("--concat", type=int, default=10,
+                        help="Copies of the whole fixture concatenated into the large document")
+    args = parser.parse_args(argv)
+
+    texts = load_fixture()
+    if not texts:
+        print(f"❌ No documents found in {INPUTS_DIR}")
+        return 1
+    large = "\n".join(texts) * args.concat
+
+    check_equivalence(texts + [large])
+    print(f"✅ Outputs match the reference implementation ({len(texts)} documents)\n")
+
+    print(f"{'workload':>22} {'chars':>9} {'legacy (µs)':>12} {'compiled (µs)':>14} {'speedup':>8}")
+    per_doc_chars = sum(map(len, texts)) // len(texts)
+    old = best_of(lambda: [legacy_route(t) for t in texts], args.repeat) / len(texts)
+    new = best_of(lambda: DOCUMENT_CLASSIFIER.scan_many(texts), args.repeat) / len(texts)
+    print(f"{'per document (avg)':>22} {per_doc_chars:>9} {old * 1e6:>12.1f} {new * 1e6:>14.1f} {old / new:>7.1f}x")
+
+    old = best_of(lambda: legacy_route(large), max(1, args.repeat // 4))
+    new = best_of(lambda: compiled_route(large), max(1, args.repeat // 4))
+    print(f"{'concatenated fixture':>22} {len(large):>9} {old * 1e6:>12.1f} {new * 1e6:>14.1f} {old / new:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,262 @@
+"""
+Adaptive Benchmark Engine
+=========================
+
+Runs benchmark tasks on an asyncio event loop with an AIMD (additive
+increase, multiplicative decrease) concurrency limit per provider, instead
+of a fixed worker count:
+
+- every successful request grows the limit by additive_increase / limit,
+  i.e. by about additive_increase per round trip of in-flight requests
+- a rate-limit response (429, RESOURCE_EXHAUSTED, ...) or a latency EWMA
+  rising past latency_threshold x its baseline multiplies the limit by
+  decrease_factor, at most once per round trip (only requests started
+  after the previous decrease can trigger another)
+- throttled tasks are retried with exponential backoff, so pushing the
+  limit up does not turn quota errors into benchmark failures
+
+Tasks are blocking callables (provider SDK calls) run in a thread pool
+sized to max_concurrency; the controller decides how many run at once.
+EngineStats records the achieved throughput next to the accuracy metrics.
+
+Usage:
+    controller = AIMDController(AIMDConfig(initial=2, max_concurrency=32))
+    results, stats = asyncio.run(run_adaptive(items, task, controller))
+"""
+
+import asyncio
+import random
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+# Matches provider errors that mean "slow down" rather than "broken"
+RATE_LIMIT_PATTERN = re.compile(
+    r"\b(429|503)\b|rate[ _-]?limit|too many requests|resource[ _]exhausted|quota|overloaded",
+    re.IGNORECASE,
+)
+
+
+class RateLimitedError(Exception):
+    """Raised by a task to report throttling; the engine backs off and retries.
+
+    Args:
+        message: Provider error text
+        fallback: Value to record if retries run out (e.g. a result with
+            error_message set); the error itself is recorded otherwise
+    """
+
+    def __init__(self, message: str = "rate limited", fallback: Any = None):
+        super().__init__(message)
+        self.fallback = fallback
+
+
+def is_rate_limit_error(error: Union[BaseException, str, None]) -> bool:
+    """Check whether an exception or error message indicates throttling."""
+    if error is None:
+        return False
+    if isinstance(error, RateLimitedError):
+        return True
+    if isinstance(error, BaseException):
+        status = getattr(error, "status_code", None) or getattr(error, "code", None)
+        if status in (429, 503):
+            return True
+        text = f"{type(error).__name__}: {error}"
+    else:
+        text = error
+    return bool(RATE_LIMIT_PATTERN.search(text))
+
+
+@dataclass
+class AIMDConfig:
+    """Tuning for AIMDController."""
+    initial: float = 2.0
+    min_concurrency: int = 1
+    max_concurrency: int = 32
+    additive_increase: float = 1.0
+    decrease_factor: float = 0.5
+    latency_threshold: float = 2.0   # back off when latency EWMA > threshold x baseline
+    latency_alpha: float = 0.2       # EWMA smoothing
+    latency_warmup: int = 5          # samples before latency can trigger a decrease
+
+
+class AIMDController:
+    """Adaptive concurrency limit for one provider."""
+
+    def __init__(self, config: Optional[AIMDConfig] = None):
+        self.config = config or AIMDConfig()
+        cfg = self.config
+        self.limit = float(min(max(cfg.initial, cfg.min_concurrency), cfg.max_concurrency))
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.peak_limit = self.limit
+        self.decreases = 0
+        self.throttled = 0
+        self.latency_ewma: Optional[float] = None
+        self.latency_baseline: Optional[float] = None
+        self._samples = 0
+        self._last_decrease = float("-inf")
+        self._condition: Optional[asyncio.Condition] = None
+
+    def _cond(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def acquire(self) -> float:
+        """Wait for a slot; returns the start time to pass to release()."""
+        cond = self._cond()
+        async with cond:
+            await cond.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        return time.monotonic()
+
+    async def release(self, started_at: float, throttled: bool = False) -> None:
+        """Free a slot and adapt the limit from the request's outcome."""
+        latency = time.monotonic() - started_at
+        cond = self._cond()
+        async with cond:
+            self.in_flight -= 1
+            if throttled:
+                self.throttled += 1
+                self._decrease(started_at)
+            elif self._latency_rising(latency):
+                self._decrease(started_at)
+            else:
+                self._increase()
+            cond.notify_all()
+
+    def _latency_rising(self, latency: float) -> bool:
+        cfg = self.config
+        alpha = cfg.latency_alpha
+        self.latency_ewma = latency if self.latency_ewma is None else (1 - alpha) * self.latency_ewma + alpha * latency
+        self._samples += 1
+        if self._samples < cfg.latency_warmup:
+            return False
+        if self.latency_baseline is None or self.latency_ewma < self.latency_baseline:
+            self.latency_baseline = self.latency_ewma
+        return self.latency_ewma > self.latency_baseline * cfg.latency_threshold
+
+    def _increase(self) -> None:
+        cfg = self.config
+        self.limit = min(cfg.max_concurrency, self.limit + cfg.additive_increase / self.limit)
+        self.peak_limit = max(self.peak_limit, self.limit)
+
+    def _decrease(self, started_at: float) -> None:
+        # One decrease per round trip: requests already in flight when we
+        # last backed off saw the old limit and shouldn't cut it again
+        if started_at <= self._last_decrease:
+            return
+        cfg = self.config
+        self.limit = max(float(cfg.min_concurrency), self.limit * cfg.decrease_factor)
+        self._last_decrease = time.monotonic()
+        self.decreases += 1
+        # Latency under the reduced load becomes the new reference
+        self.latency_baseline = None
+        self._samples = 0
+
+
+@dataclass
+class EngineStats:
+    """Throughput achieved by a run (saved with the accuracy metrics)."""
+    engine: str
+    tasks: int
+    completed: int = 0
+    failed: int = 0
+    retries: int = 0
+    throttled: int = 0
+    elapsed_s: float = 0.0
+    throughput_per_min: float = 0.0
+    peak_concurrency: int = 0
+    final_limit: float = 0.0
+    peak_limit: float = 0.0
+    backoffs: int = 0
+    limit_history: List[Tuple[float, float]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["elapsed_s"] = round(self.elapsed_s, 2)
+        data["throughput_per_min"] = round(self.throughput_per_min, 2)
+        data["final_limit"] = round(self.final_limit, 2)
+        data["peak_limit"] = round(self.peak_limit, 2)
+        data["limit_history"] = [[round(t, 2), round(limit, 2)] for t, limit in self.limit_history]
+        return data
+
+
+async def run_adaptive(
+    items: Sequence[Any],
+    task: Callable[[Any], Any],
+    controller: AIMDController,
+    max_retries: int = 3,
+    retry_backoff_s: float = 1.0,
+    executor: Optional[ThreadPoolExecutor] = None,
+) -> Tuple[List[Any], EngineStats]:
+    """Run task(item) for every item under an adaptive concurrency limit.
+
+    Args:
+        items: Task inputs
+        task: Blocking callable; raise RateLimitedError (or any exception
+            is_rate_limit_error() recognizes) to report throttling
+        controller: Concurrency controller for the provider
+        max_retries: Retries per item after throttling
+        retry_backoff_s: Base of the exponential (jittered) retry delay
+        executor: Thread pool to run tasks in (default: one sized to
+            max_concurrency, shut down afterwards)
+
+    Returns:
+        (results, stats): results in input order; a failed item's entry is
+        its exception (or RateLimitedError.fallback if retries ran out)
+    """
+    stats = EngineStats(engine="async-aimd", tasks=len(items))
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(
+            max_workers=controller.config.max_concurrency, thread_name_prefix="benchmark"
+        )
+    loop = asyncio.get_running_loop()
+    run_started = time.monotonic()
+    results: List[Any] = [None] * len(items)
+
+    def record_limit() -> None:
+        stats.limit_history.append((time.monotonic() - run_started, controller.limit))
+
+    async def run_item(index: int, item: Any) -> None:
+        for attempt in range(max_retries + 1):
+            started_at = await controller.acquire()
+            try:
+                result = await loop.run_in_executor(executor, task, item)
+            except Exception as e:
+                throttled = is_rate_limit_error(e)
+                await controller.release(started_at, throttled=throttled)
+                record_limit()
+                if throttled and attempt < max_retries:
+                    stats.retries += 1
+                    delay = retry_backoff_s * (2 ** attempt)
+                    await asyncio.sleep(delay * (0.5 + random.random()))  # nosec B311 - jitter only
+                    continue
+                stats.failed += 1
+                results[index] = getattr(e, "fallback", None) or e
+                return
+            await controller.release(started_at)
+            record_limit()
+            stats.completed += 1
+            results[index] = result
+            return
+
+    try:
+        await asyncio.gather(*(run_item(i, item) for i, item in enumerate(items)))
+    finally:
+        if own_executor:
+            executor.shutdown(wait=False)
+
+    stats.elapsed_s = time.monotonic() - run_started
+    stats.throughput_per_min = stats.completed / stats.elapsed_s * 60 if stats.elapsed_s > 0 else 0.0
+    stats.throttled = controller.throttled
+    stats.backoffs = controller.decreases
+    stats.peak_concurrency = controller.peak_in_flight
+    stats.final_limit = controller.limit
+    stats.peak_limit = controller.peak_limit
+    return results, stats
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: MedGemmaEnsembleProvider post-processing
+
+Compares the single-pass scanners in ensemble_heuristics against the
+previous implementation (kept verbatim below as the reference):
+
+- CPT/date tokenization on itemized bills with a growing number of lines
+- label canonicalization over a batch of free-form issue labels
+
+Also checks that both implementations produce the same CPT codes, amounts,
+canonical labels and heuristic issues.
+
+Usage:
+    python scripts/benchmark_ensemble_postprocessing.py
+    python scripts/benchmark_ensemble_postprocessing.py --lines 100 500 2000 --repeat 3
+"""
+
+import argparse
+import random
+import sys
+import time
+from operator import itemgetter
+from pathlib import Path
+from typing import Callable, List, Optional
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from medbilldozer.providers.llm_interface import Issue
+from medbilldozer.providers.ensemble_heuristics import (
+    HEURISTICS,
+    LabelCanonicalizer,
+    extract_cpt_entries,
+)
+from medbilldozer.providers.medgemma_ensemble_provider import SIMPLE_LABEL_MAP
+
+
+# ==================================================
+# Reference (previous) implementation
+# ==================================================
+
+def legacy_canonicalize(raw_type: Optional[str], summary: Optional[str]) -> str:
+    """Try to map free-form type/summary into a canonical issue type."""
+    if not raw_type and not summary:
+        return "other"
+
+    candidates: List[str] = []
+    if raw_type:
+        candidates.append(raw_type.lower())
+    if summary:
+        candidates.append(summary.lower())
+
+    for c in candidates:
+        # direct exact mapping
+        if c in SIMPLE_LABEL_MAP:
+            return SIMPLE_LABEL_MAP[c]
+
+        # substring matching
+        for key, val in SIMPLE_LABEL_MAP.items():
+            if key in c:
+                return val
+
+    # fallback heuristic: normalize underscores/spaces
+    t = (raw_type or summary or "other").lower().strip()
+    t = t.replace(" ", "_").replace("-", "_")
+    return t
+
+
+def legacy_extract_cpt_entries(text: str):
+    # Return list of {cpt, date, snippet}
+    import re
+    entries = []
+    # find all CPT occurrences
+    for m in re.finditer(r"CPT\s*[:\s]?([0-9]{3,5})", text, re.IGNORECASE):
+        cpt = m.group(1)
+        span_start = max(0, m.start() - 120)
+        span_end = min(len(text), m.end() + 120)
+        snippet = text[span_start:span_end].replace('\n', ' ')
+        # try to find a nearby date (look backwards)
+        date_match = re.search(r"Date of Service:?\s*(\d{4}-\d{2}-\d{2}|\d{2}/\d{2}/\d{4})", text[:m.start()], re.IGNORECASE)
+        date = date_match.group(1) if date_match else None
+        # try to find a nearby monetary amount within the surrounding window
+        amount = None
+        amount_match = re.search(r"\$\s*\d{1,3}(?:,\d{3})*(?:\.\d{2})?|\d{1,3}(?:,\d{3})*(?:\.\d{2})?\s*USD", text[span_start:span_end], re.IGNORECASE)
+        if amount_match:
+            amount = amount_match.group(0).strip()
+        else:
+            # also accept simple patterns like 123.45 or 123
+            amount_match = re.search(r"\$?\d{1,6}(?:\.\d{2})?", text[span_start:span_end])
+            if amount_match:
+                amount = amount_match.group(0).strip()
+        entries.append({"cpt": cpt, "date": date, "snippet": snippet, "pos": m.start(), "amount": amount})
+    return entries
+
+
+def legacy_gender_mismatch(text: str, existing_codes: set):
+    # Look for sex indicator
+    import re
+    sex_match = re.search(r"Sex: ?([MF]|Male|Female|male|female)", text)
+    sex = None
+    if sex_match:
+        s = sex_match.group(1).lower()
+        if s.startswith('m'):
+            sex = 'M'
+        elif s.startswith('f'):
+            sex = 'F'
+
+    if not sex:
+        return []
+
+    male_keywords = ["prostate", "vasectomy", "psa", "prostatectomy"]
+    female_keywords = ["pap", "pap smear", "hysterectomy", "mammogram", "cervical", "ovary", "uterus", "oophorectomy", "cesarean", "obstetric", "pregnancy"]
+
+    issues_out = []
+    entries = legacy_extract_cpt_entries(text)
+    # Require corroborating evidence: keyword must be within a tight window (±40 chars) of the CPT occurrence
+    window = 40
+    for e in entries:
+        snip = e.get("snippet", "")
+        cpt = e.get("cpt")
+        pos = e.get("pos")
+        if not cpt or cpt in existing_codes:
+            continue
+        # windowed text around the CPT occurrence (tighter than the snippet)
+        start = max(0, pos - window)
+        end = min(len(text), pos + window)
+        nearby = text[start:end].lower()
+        matched = False
+        if sex == 'F':
+            for kw in male_keywords:
+                if kw in nearby:
+                    matched = True
+                    matched_kw = kw
+                    break
+        else:
+            for kw in female_keywords:
+                if kw in nearby:
+                    matched = True
+                    matched_kw = kw
+                    break
+
+        if matched:
+            # only raise when both CPT and nearby sex-specific keyword are present
+            issues_out.append(Issue(
+                type="gender_mismatch",
+                summary=f"Possible gender mismatch: found '{matched_kw}' near CPT {cpt}",
+                evidence=snip,
+                code=cpt,
+                source="deterministic",
+                confidence=0.85,
+                max_savings=None
+            ))
+    return issues_out
+
+
+def legacy_duplicate_charge(text: str, existing_codes: set):
+    import re
+    # split by document markers if present
+    docs = re.split(r"---+\s*DOCUMENT\s*\d+\s*---", text, flags=re.IGNORECASE)
+    # For each doc, collect CPT entries (use _extract_cpt_entries to also capture amount/date)
+    doc_entries = []
+    for d in docs:
+        entries = legacy_extract_cpt_entries(d)
+        # find date for this doc as fallback
+        date_match = re.search(r"Date of Service:?\s*(\d{4}-\d{2}-\d{2}|\d{2}/\d{2}/\d{4})", d, re.IGNORECASE)
+        doc_date = date_match.group(1) if date_match else None
+        doc_entries.append({"date": doc_date, "entries": entries, "snippet": d[:200].replace('\n', ' ')})
+
+    issues_out = []
+    seen = {}
+    # Build seen map keyed by (cpt, date, amount)
+    for idx, doc in enumerate(doc_entries):
+        for e in doc["entries"]:
+            c = e.get("cpt")
+            date = e.get("date") or doc.get("date")
+            amount = e.get("amount")
+            # normalize amount to string or None
+            key = (c, date, amount)
+            seen.setdefault(key, []).append((idx, e.get("snippet")))
+
+    # Only flag duplicates when we have corroborating date AND amount matches across occurrences
+    for (cpt, date, amount), items in seen.items():
+        if len(items) > 1 and (not cpt or cpt not in existing_codes):
+            if date and amount:
+                snippet = items[0][1]
+                issues_out.append(Issue(
+                    type="duplicate_charge",
+                    summary=f"Duplicate CPT {cpt} on {date} with identical amount {amount}",
+                    evidence=f"Appears in {len(items)} documents with same date and amount. Example context: {snippet}",
+                    code=cpt,
+                    date=date,
+                    source="deterministic",
+                    confidence=0.9,
+                    max_savings=None
+                ))
+    return issues_out
+
+
+def legacy_drug_interactions(text: str, existing_codes: set):
+    # Simple pair checks
+    txt = text.lower()
+    issues_out = []
+    pairs = [
+        (['phenelzine', 'maoi'], ['sertraline', 'ssri', 'fluoxetine']),
+        (['warfarin', 'coumadin'], ['ibuprofen', 'naproxen', 'aspirin', 'nsaid']),
+        (['digoxin'], ['furosemide', 'loop diuretic', 'bumetanide'])
+    ]
+    for a_list, b_list in pairs:
+        a_found = next((a for a in a_list if a in txt), None)
+        b_found = next((b for b in b_list if b in txt), None)
+        if a_found and b_found:
+            issues_out.append(Issue(
+                type="drug_drug_interaction",
+                summary=f"Possible drug-drug interaction: {a_found} + {b_found}",
+                evidence=f"Both '{a_found}' and '{b_found}' found in documents.",
+                source="deterministic",
+                confidence=0.85,
+                max_savings=None
+            ))
+    return issues_out
+
+
+LEGACY_HEURISTICS = (legacy_gender_mismatch, legacy_duplicate_charge, legacy_drug_interactions)
+
+
+# ==================================================
+# Synthetic inputs
+# ==================================================
+
+CPT_CODES = ["99213", "99214", "80053", "85025", "71046", "88150", "93000", "36415"]
+LABELS = [
+    "Duplicate Charge", "possible upcoding of office visit", "Male patient billed for Pap smear",
+    "Age inappropriate screening", "billing anomaly", "Drug interaction: warfarin + aspirin",
+    "procedure inconsistent with health history", "unbundled lab panel", "Repeated imaging",
+]
+
+
+def make_bill(lines: int, dated: bool = True, seed: int = 7) -> str:
+    """Itemized hospital bill with one service date per day of stay.
+
+    With dated=False the dates use a label the heuristics do not recognize,
+    which is the worst case for a backwards date search.
+    """
+    rng = random.Random(seed)
+    label = "Date of Service" if dated else "Svc Dt"
+    out = ["Patient: Jane Doe", "Sex: F", "--- DOCUMENT 1 ---"]
+    for i in range(lines):
+        if i % 25 == 0:
+            out.append(f"{label}: 2024-03-{1 + (i // 25) % 28:02d}")
+        code = rng.choice(CPT_CODES)
+        out.append(f"CPT {code}  Hospital service line {i}  Charge ${rng.randint(20, 900)}.00")
+    out.append("Medications: warfarin, aspirin")
+    return "\n".join(out)
+
+
+def best_of(fn: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run_heuristics(heuristics, text: str) -> List[Issue]:
+    issues: List[Issue] = []
+    for heuristic in heuristics:
+        issues.extend(heuristic(text, set()))
+    return issues
+
+
+def check_equivalence(text: str, canonicalizer: LabelCanonicalizer) -> None:
+    """Assert the new scanners agree with the reference on shared fields."""
+    old = legacy_extract_cpt_entries(text)
+    new = extract_cpt_entries(text)
+    key = itemgetter("cpt", "pos", "amount", "snippet")
+    assert [key(e) for e in old] == [key(e) for e in new], "CPT entries differ"
+
+    for label in LABELS:
+        assert legacy_canonicalize(label, label) == canonicalizer.canonicalize(label, label), label
+
+    # Single date of service per document: heuristic issues must match exactly
+    single = "Sex: M\nDate of Service: 2024-01-05\nCPT 88150 pap smear $40.00\n--- DOCUMENT 2 ---\n" \
+             "Date of Service: 2024-01-05\nCPT 88150 pap smear $40.00\nphenelzine sertraline"
+    assert run_heuristics(LEGACY_HEURISTICS, single) == run_heuristics(HEURISTICS, single)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, nargs="+", default=[100, 500, 2000],
+                        help="CPT lines per synthetic bill")
+    parser.add_argument("--labels", type=int, default=5000, help="Labels to canonicalize")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions (best time is reported)")
+    args = parser.parse_args(argv)
+
+    canonicalizer = LabelCanonicalizer(SIMPLE_LABEL_MAP)
+    check_equivalence(make_bill(200), canonicalizer)
+    check_equivalence(make_bill(200, dated=False), canonicalizer)
+    print("✅ Outputs match the reference implementation\n")
+
+    print(f"{'bill':>8} {'CPT lines':>10} {'chars':>9} {'legacy (ms)':>12} {'single-pass (ms)':>17} {'speedup':>8}")
+    for dated in (True, False):
+        for lines in args.lines:
+            text = make_bill(lines, dated=dated)
+            old = best_of(lambda: run_heuristics(LEGACY_HEURISTICS, text), args.repeat)
+            new = best_of(lambda: run_heuristics(HEURISTICS, text), args.repeat)
+            kind = "dated" if dated else "undated"
+            print(f"{kind:>8} {lines:>10} {len(text):>9} {old * 1000:>12.1f} {new * 1000:>17.1f} {old / new:>7.1f}x")
+
+    labels = [random.Random(i).choice(LABELS) + f" #{i}" for i in range(args.labels)]
+    old = best_of(lambda: [legacy_canonicalize(l, l) for l in labels], args.repeat)
+    new = best_of(lambda: [canonicalizer.canonicalize(l, l) for l in labels], args.repeat)
+    print(f"\n{'labels':>10} {'legacy (ms)':>12} {'automaton (ms)':>15} {'speedup':>8}")
+    print(f"{args.labels:>10} {old * 1000:>12.1f} {new * 1000:>15.1f} {old / new:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
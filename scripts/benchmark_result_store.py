@@ -0,0 +1,629 @@
+"""
+Benchmark Result Store
+======================
+
+Columnar store of benchmark results as Hive-partitioned Parquet:
+
+    benchmarks/result_store/<table>/model_version=<model>/date=<YYYY-MM-DD>/<part>.parquet
+
+Tables (typed schemas in SCHEMAS):
+    runs        one row per benchmark run: metadata and headline metrics
+    profiles    one row per patient profile in a run
+    categories  one row per error category, per run (patient_id null)
+                and per profile
+    issues      one row per expected or detected issue, with its match
+
+Results are flattened once, when written. Readers then load only the
+columns and partitions they need: filters on model_version and date skip
+whole directories, and other filters are pushed down into the Parquet scan.
+Before this, every dashboard load downloaded the full benchmark_transactions
+history and ran pd.json_normalize over the metrics JSONB.
+sync_transactions() only fetches transactions newer than the latest one
+already stored.
+
+Local patient benchmark results (generate_patient_benchmarks.py) carry
+issue-level detail; Supabase transactions carry run metrics, per-profile
+counts and per-category detection rates.
+
+Requires pyarrow (in requirements.txt). The flatteners are plain Python.
+
+Usage:
+    store = ResultStore()
+    store.sync_transactions(supabase_client)
+    df = store.query("runs", model_versions=["OpenAI GPT-4"], start=cutoff,
+                     columns=["created_at", "f1"])
+    transactions = store.transactions(start=cutoff)  # benchmark_transactions rows
+"""
+
+import hashlib
+import json
+import os
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from urllib.parse import quote
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    ds = None
+    pq = None
+
+PROJECT_ROOT = Path(__file__).parent.parent
+RESULT_STORE_DIR = PROJECT_ROOT / "benchmarks" / "result_store"
+
+SOURCE_SUPABASE = "supabase"
+SOURCE_LOCAL = "local"
+
+# Hive partition keys, encoded in the directory names rather than the files
+PARTITION_COLUMNS = (("model_version", "string"), ("date", "string"))
+
+_KEY_COLUMNS = (("benchmark_id", "string"), ("created_at", "timestamp"))
+
+RUN_METADATA_COLUMNS = (
+    ("source", "string"),
+    ("environment", "string"),
+    ("benchmark_type", "string"),
+    ("commit_sha", "string"),
+    ("branch_name", "string"),
+    ("model_provider", "string"),
+    ("dataset_version", "string"),
+    ("prompt_version", "string"),
+    ("run_id", "string"),
+    ("triggered_by", "string"),
+    ("duration_seconds", "float64"),
+)
+
+# Named like the keys of benchmark_transactions.metrics
+RUN_METRIC_COLUMNS = (
+    ("dataset_size", "int64"),
+    ("total_patients", "int64"),
+    ("successful_analyses", "int64"),
+    ("success_rate", "float64"),
+    ("precision", "float64"),
+    ("recall", "float64"),
+    ("f1", "float64"),
+    ("latency_ms", "float64"),
+    ("p95_latency_ms", "float64"),
+    ("domain_knowledge_detection_rate", "float64"),
+    ("domain_recall", "float64"),
+    ("generic_recall", "float64"),
+    ("total_potential_savings", "float64"),
+    ("total_missed_savings", "float64"),
+    ("savings_capture_rate", "float64"),
+    ("risk_weighted_recall", "float64"),
+    ("conservatism_index", "float64"),
+    ("roi_ratio", "float64"),
+    ("throughput_per_min", "float64"),
+)
+
+SCHEMAS: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "runs": _KEY_COLUMNS + RUN_METADATA_COLUMNS + RUN_METRIC_COLUMNS,
+    "profiles": _KEY_COLUMNS + (
+        ("patient_id", "string"),
+        ("patient_name", "string"),
+        ("documents_analyzed", "int64"),
+        ("latency_ms", "float64"),
+        ("true_positives", "int64"),
+        ("false_positives", "int64"),
+        ("false_negatives", "int64"),
+        ("precision", "float64"),
+        ("recall", "float64"),
+        ("f1", "float64"),
+        ("domain_knowledge_score", "float64"),
+        ("domain_recall", "float64"),
+        ("generic_recall", "float64"),
+        ("potential_savings", "float64"),
+        ("missed_savings", "float64"),
+        ("error_message", "string"),
+    ),
+    "categories": _KEY_COLUMNS + (
+        ("patient_id", "string"),
+        ("category", "string"),
+        ("total", "int64"),
+        ("detected", "int64"),
+        ("detection_rate", "float64"),
+        ("precision", "float64"),
+        ("f1", "float64"),
+    ),
+    "issues": _KEY_COLUMNS + (
+        ("patient_id", "string"),
+        ("kind", "string"),  # expected or detected
+        ("issue_index", "int64"),
+        ("type", "string"),
+        ("severity", "string"),
+        ("code", "string"),
+        ("requires_domain_knowledge", "bool"),
+        ("max_savings", "float64"),
+        ("matched", "bool"),
+        ("matched_index", "int64"),  # index of the issue it was matched to
+        ("match_score", "float64"),
+        ("summary", "string"),
+    ),
+}
+
+TABLES = tuple(SCHEMAS)
+
+
+# ============================================================================
+# Flattening
+# ============================================================================
+
+def _timestamp(value: Any) -> Optional[datetime]:
+    """Parse a timestamp to UTC; naive values are taken as local time."""
+    if value is None or value == "":
+        return None
+    ts = pd.Timestamp(value).to_pydatetime()
+    if ts.tzinfo is None:
+        ts = ts.astimezone()
+    return ts.astimezone(timezone.utc)
+
+
+def _float(value: Any) -> Optional[float]:
+    try:
+        return None if value is None else float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _int(value: Any) -> Optional[int]:
+    number = _float(value)
+    return None if number is None else int(number)
+
+
+def _ratio(numerator: Optional[int], denominator: Optional[int]) -> Optional[float]:
+    if numerator is None or not denominator:
+        return None
+    return numerator / denominator
+
+
+def _f1(precision: Optional[float], recall: Optional[float]) -> Optional[float]:
+    if precision is None or recall is None:
+        return None
+    return 2 * precision * recall / (precision + recall) if precision + recall > 0 else 0.0
+
+
+def _profile_scores(tp: Optional[int], fp: Optional[int], fn: Optional[int]) -> Dict[str, Optional[float]]:
+    precision = _ratio(tp, (tp or 0) + (fp or 0))
+    recall = _ratio(tp, (tp or 0) + (fn or 0))
+    return {"precision": precision, "recall": recall, "f1": _f1(precision, recall)}
+
+
+def _transaction_categories(metrics: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """error_type_performance, falling back to legacy category_metrics per category."""
+    categories = {}
+    for category, data in (metrics.get("error_type_performance") or {}).items():
+        categories[category] = {
+            "total": _int(data.get("total", 0)),
+            "detected": _int(data.get("detected", 0)),
+            "detection_rate": _float(data.get("detection_rate", 0.0)),
+        }
+    for category, data in (metrics.get("category_metrics") or {}).items():
+        if category not in categories:
+            total = _int(data.get("total", 0)) or 0
+            detected = _int(data.get("detected", 0)) or 0
+            categories[category] = {
+                "total": total,
+                "detected": detected,
+                "detection_rate": detected / total if total > 0 else 0.0,
+            }
+    return categories
+
+
+def flatten_transaction(txn: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """Rows of one benchmark_transactions record, per table."""
+    metrics = txn.get("metrics") or {}
+    if isinstance(metrics, str):
+        metrics = json.loads(metrics)
+    key = {
+        "benchmark_id": str(txn.get("id")),
+        "created_at": _timestamp(txn.get("created_at")),
+        "model_version": txn.get("model_version") or "Unknown",
+    }
+
+    run = dict(key, source=SOURCE_SUPABASE)
+    for name, kind in RUN_METADATA_COLUMNS[1:]:
+        value = txn.get(name)
+        run[name] = _float(value) if kind == "float64" else (None if value is None else str(value))
+    for name, kind in RUN_METRIC_COLUMNS:
+        run[name] = _int(metrics.get(name)) if kind == "int64" else _float(metrics.get(name))
+
+    profiles = []
+    for patient in metrics.get("patient_results") or []:
+        tp = _int(patient.get("true_positives"))
+        fp = _int(patient.get("false_positives"))
+        fn = _int(patient.get("false_negatives"))
+        profiles.append(dict(
+            key,
+            patient_id=patient.get("patient_id"),
+            patient_name=patient.get("patient_name"),
+            latency_ms=_float(patient.get("latency_ms")),
+            true_positives=tp,
+            false_positives=fp,
+            false_negatives=fn,
+            domain_knowledge_score=_float(patient.get("domain_knowledge_score")),
+            **_profile_scores(tp, fp, fn),
+        ))
+
+    categories = [
+        dict(key, patient_id=None, category=category, **data)
+        for category, data in _transaction_categories(metrics).items()
+    ]
+    return {"runs": [run], "profiles": profiles, "categories": categories, "issues": []}
+
+
+def _issue_rows(key: Dict[str, Any], patient: Dict[str, Any]) -> List[Dict[str, Any]]:
+    expected_match = {}
+    detected_match = {}
+    for pair in patient.get("matches") or []:
+        expected_match[pair["expected_index"]] = (pair["detected_index"], pair.get("score"))
+        detected_match[pair["detected_index"]] = (pair["expected_index"], pair.get("score"))
+
+    rows = []
+    for kind, issues, matched in (
+        ("expected", patient.get("expected_issues") or [], expected_match),
+        ("detected", patient.get("detected_issues") or [], detected_match),
+    ):
+        for index, issue in enumerate(issues):
+            other, score = matched.get(index, (None, None))
+            rows.append(dict(
+                key,
+                patient_id=patient.get("patient_id"),
+                kind=kind,
+                issue_index=index,
+                type=issue.get("type"),
+                severity=issue.get("severity"),
+                code=issue.get("cpt_code") or issue.get("code"),
+                requires_domain_knowledge=issue.get("requires_domain_knowledge"),
+                max_savings=_float(issue.get("max_savings")),
+                matched=index in matched,
+                matched_index=other,
+                match_score=_float(score),
+                summary=issue.get("description") or issue.get("summary"),
+            ))
+    return rows
+
+
+def flatten_patient_results(
+    results: Dict[str, Any],
+    environment: str = "local",
+    commit_sha: Optional[str] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Rows of a saved patient benchmark (PatientBenchmarkMetrics as a dict), per table."""
+    created_at = _timestamp(results.get("generated_at")) or datetime.now(timezone.utc)
+    model_version = results.get("model_name") or "Unknown"
+    key = {
+        "benchmark_id": f"local-{model_version}-{created_at:%Y%m%dT%H%M%S}",
+        "created_at": created_at,
+        "model_version": model_version,
+    }
+    advanced = results.get("advanced_metrics") or {}
+    total = _int(results.get("total_patients"))
+    successful = _int(results.get("successful_analyses"))
+    domain_rate = _float(results.get("domain_knowledge_detection_rate"))
+
+    run = dict(
+        key,
+        source=SOURCE_LOCAL,
+        environment=environment,
+        benchmark_type="patient_cross_document",
+        commit_sha=commit_sha,
+        dataset_size=total,
+        total_patients=total,
+        successful_analyses=successful,
+        success_rate=_ratio(successful, total),
+        precision=_float(results.get("avg_precision")),
+        recall=_float(results.get("avg_recall")),
+        f1=_float(results.get("avg_f1_score")),
+        latency_ms=_float(results.get("avg_latency_ms")),
+        # Saved as a percentage; transactions store a fraction
+        domain_knowledge_detection_rate=None if domain_rate is None else domain_rate / 100.0,
+        domain_recall=_float(results.get("domain_recall")),
+        generic_recall=_float(results.get("generic_recall")),
+        total_potential_savings=_float(results.get("total_potential_savings")),
+        total_missed_savings=_float(results.get("total_missed_savings")),
+        savings_capture_rate=_float(results.get("savings_capture_rate")),
+        risk_weighted_recall=_float(advanced.get("risk_weighted_recall")),
+        conservatism_index=_float(advanced.get("conservatism_index")),
+        p95_latency_ms=_float(advanced.get("p95_latency_ms")),
+        roi_ratio=_float(advanced.get("roi_ratio")),
+        throughput_per_min=_float((results.get("throughput") or {}).get("throughput_per_min")),
+    )
+
+    categories = []
+    for category, data in (results.get("domain_breakdown") or {}).items():
+        categories.append(dict(
+            key,
+            patient_id=None,
+            category=category,
+            total=_int(data.get("total_cases")),
+            detected=_int(data.get("total_detected")),
+            detection_rate=_float(data.get("recall")),
+            precision=_float(data.get("precision")),
+            f1=_float(data.get("f1")),
+        ))
+
+    profiles = []
+    issues = []
+    for patient in results.get("individual_results") or []:
+        tp = _int(patient.get("true_positives"))
+        fp = _int(patient.get("false_positives"))
+        fn = _int(patient.get("false_negatives"))
+        profiles.append(dict(
+            key,
+            patient_id=patient.get("patient_id"),
+            patient_name=patient.get("patient_name"),
+            documents_analyzed=_int(patient.get("documents_analyzed")),
+            latency_ms=_float(patient.get("analysis_latency_ms")),
+            true_positives=tp,
+            false_positives=fp,
+            false_negatives=fn,
+            domain_knowledge_score=_float(patient.get("domain_knowledge_score")),
+            domain_recall=_float(patient.get("domain_recall")),
+            generic_recall=_float(patient.get("generic_recall")),
+            potential_savings=_float(patient.get("potential_savings")),
+            missed_savings=_float(patient.get("missed_savings")),
+            error_message=patient.get("error_message"),
+            **_profile_scores(tp, fp, fn),
+        ))
+        for category, data in (patient.get("domain_breakdown") or {}).items():
+            categories.append(dict(
+                key,
+                patient_id=patient.get("patient_id"),
+                category=category,
+                total=_int(data.get("total")),
+                detected=_int(data.get("true_positives")),
+                detection_rate=_float(data.get("recall")),
+                precision=_float(data.get("precision")),
+                f1=_float(data.get("f1")),
+            ))
+        issues.extend(_issue_rows(key, patient))
+
+    return {"runs": [run], "profiles": profiles, "categories": categories, "issues": issues}
+
+
+# ============================================================================
+# Store
+# ============================================================================
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError("pyarrow is required for the benchmark result store. Run: pip install pyarrow")
+
+
+def arrow_schema(table: str, partitions: bool = False) -> "pa.Schema":
+    """Typed Arrow schema of a table, optionally with its partition columns."""
+    _require_pyarrow()
+    types = {
+        "string": pa.string(),
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+        "bool": pa.bool_(),
+        "timestamp": pa.timestamp("us", tz="UTC"),
+    }
+    columns = SCHEMAS[table] + (PARTITION_COLUMNS if partitions else ())
+    return pa.schema([(name, types[kind]) for name, kind in columns])
+
+
+class ResultStore:
+    """Partitioned Parquet tables of benchmark results.
+
+    Args:
+        root: Store directory (one subdirectory per table)
+    """
+
+    def __init__(self, root: Path = RESULT_STORE_DIR):
+        _require_pyarrow()
+        self.root = Path(root)
+
+    # ------------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------------
+
+    def write(self, rows: Dict[str, List[Dict[str, Any]]], part: str) -> int:
+        """Write flattened rows, one <part>.parquet file per table and partition.
+
+        Rewriting the same part replaces it, so writes are idempotent.
+        Returns the number of runs written.
+        """
+        for table, table_rows in rows.items():
+            partitions = defaultdict(list)
+            for row in table_rows:
+                date = row["created_at"].date().isoformat()
+                partitions[(row["model_version"], date)].append(row)
+            schema = arrow_schema(table)
+            for (model_version, date), partition_rows in partitions.items():
+                directory = (
+                    self.root / table
+                    / f"model_version={quote(model_version, safe='')}"
+                    / f"date={date}"
+                )
+                directory.mkdir(parents=True, exist_ok=True)
+                data = pa.Table.from_pylist(
+                    [{name: row.get(name) for name in schema.names} for row in partition_rows],
+                    schema=schema,
+                )
+                # Readers never see a partially written file
+                filename = quote(part, safe="") + ".parquet"
+                path = directory / filename
+                tmp = directory / f".{filename}.tmp"
+                pq.write_table(data, tmp)
+                os.replace(tmp, path)
+        return len(rows.get("runs", []))
+
+    def add_patient_results(self, results: Dict[str, Any], **run_fields: Any) -> str:
+        """Store a saved patient benchmark; returns its benchmark_id."""
+        rows = flatten_patient_results(results, **run_fields)
+        benchmark_id = rows["runs"][0]["benchmark_id"]
+        self.write(rows, part=benchmark_id)
+        return benchmark_id
+
+    def add_transactions(self, transactions: Iterable[Dict[str, Any]]) -> int:
+        """Store benchmark_transactions records; returns the number stored."""
+        rows: Dict[str, List[Dict[str, Any]]] = {table: [] for table in TABLES}
+        for txn in transactions:
+            for table, table_rows in flatten_transaction(txn).items():
+                rows[table].extend(table_rows)
+        if not rows["runs"]:
+            return 0
+        ids = sorted(run["benchmark_id"] for run in rows["runs"])
+        part = "txn-" + hashlib.sha256("\n".join(ids).encode("utf-8")).hexdigest()[:16]
+        return self.write(rows, part=part)
+
+    def sync_transactions(self, client, page_size: int = 1000) -> int:
+        """Fetch benchmark_transactions newer than the latest stored one.
+
+        Returns the number of new transactions stored.
+        """
+        latest = self.latest_created_at(SOURCE_SUPABASE)
+        fetched = []
+        offset = 0
+        while True:
+            query = client.table("benchmark_transactions").select("*").order("created_at")
+            if latest is not None:
+                query = query.gt("created_at", latest.isoformat())
+            page = query.range(offset, offset + page_size - 1).execute().data or []
+            fetched.extend(page)
+            if len(page) < page_size:
+                break
+            offset += page_size
+        return self.add_transactions(fetched)
+
+    # ------------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------------
+
+    def dataset(self, table: str) -> Optional["ds.Dataset"]:
+        """Arrow dataset of a table, or None before anything was written."""
+        if table not in SCHEMAS:
+            raise ValueError(f"Unknown table {table!r}, expected one of {TABLES}")
+        directory = self.root / table
+        if not any(directory.rglob("*.parquet")):
+            return None
+        schema = arrow_schema(table, partitions=True)
+        partitioning = ds.partitioning(
+            pa.schema([schema.field(name) for name, _ in PARTITION_COLUMNS]), flavor="hive"
+        )
+        return ds.dataset(directory, format="parquet", schema=schema, partitioning=partitioning)
+
+    def query(
+        self,
+        table: str,
+        model_versions: Optional[Sequence[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        columns: Optional[Sequence[str]] = None,
+        filters: Union[List[Tuple[str, str, Any]], "ds.Expression", None] = None,
+    ) -> pd.DataFrame:
+        """Load rows of a table.
+
+        Args:
+            table: runs, profiles, categories or issues
+            model_versions: Only these models (prunes partitions)
+            start: Only rows created at or after this time (prunes partitions)
+            end: Only rows created at or before this time (prunes partitions)
+            columns: Columns to read (default: all, including model_version and date)
+            filters: Extra predicates pushed down into the scan: ANDed
+                (column, op, value) tuples, e.g. [("source", "==", "supabase")],
+                or a pyarrow dataset expression
+
+        Returns:
+            DataFrame of the matching rows
+        """
+        dataset = self.dataset(table)
+        if dataset is None:
+            schema = arrow_schema(table, partitions=True)
+            empty = schema.empty_table()
+            return empty.select(list(columns)).to_pandas() if columns else empty.to_pandas()
+
+        predicates = []
+        if model_versions is not None:
+            predicates.append(ds.field("model_version").isin(list(model_versions)))
+        if start is not None:
+            start = _timestamp(start)
+            predicates.append(ds.field("date") >= start.date().isoformat())
+            predicates.append(ds.field("created_at") >= pa.scalar(start, pa.timestamp("us", tz="UTC")))
+        if end is not None:
+            end = _timestamp(end)
+            predicates.append(ds.field("date") <= end.date().isoformat())
+            predicates.append(ds.field("created_at") <= pa.scalar(end, pa.timestamp("us", tz="UTC")))
+        if isinstance(filters, list):
+            predicates.append(pq.filters_to_expression(filters))
+        elif filters is not None:
+            predicates.append(filters)
+
+        expression = None
+        for predicate in predicates:
+            expression = predicate if expression is None else expression & predicate
+        return dataset.to_table(columns=list(columns) if columns else None, filter=expression).to_pandas()
+
+    def latest_created_at(self, source: Optional[str] = None) -> Optional[datetime]:
+        """Creation time of the newest stored run (of a source)."""
+        filters = [("source", "==", source)] if source else None
+        created = self.query("runs", columns=["created_at"], filters=filters)["created_at"]
+        return None if created.empty else created.max().to_pydatetime()
+
+    def transactions(
+        self,
+        start: Optional[datetime] = None,
+        model_versions: Optional[Sequence[str]] = None,
+        source: Optional[str] = SOURCE_SUPABASE,
+    ) -> List[Dict[str, Any]]:
+        """Stored runs as benchmark_transactions records, newest first.
+
+        metrics holds the run metric columns and error_type_performance, the
+        fields export_dashboard_summary computes from.
+        """
+        filters = [("source", "==", source)] if source else None
+        runs = self.query("runs", model_versions=model_versions, start=start, filters=filters)
+        if runs.empty:
+            return []
+        categories = self.query(
+            "categories",
+            model_versions=model_versions,
+            start=start,
+            columns=["benchmark_id", "category", "total", "detected", "detection_rate"],
+            filters=ds.field("patient_id").is_null(),  # run-level rows
+        )
+        return _transactions_from_frames(runs, categories)
+
+
+def _transactions_from_frames(runs: pd.DataFrame, categories: pd.DataFrame) -> List[Dict[str, Any]]:
+    run_ids = set(runs["benchmark_id"])
+    performance: Dict[str, Dict[str, Dict[str, Any]]] = defaultdict(dict)
+    for row in categories.itertuples(index=False):
+        if row.benchmark_id in run_ids:
+            performance[row.benchmark_id][row.category] = {
+                "total": 0 if pd.isna(row.total) else int(row.total),
+                "detected": 0 if pd.isna(row.detected) else int(row.detected),
+                "detection_rate": 0.0 if pd.isna(row.detection_rate) else float(row.detection_rate),
+            }
+
+    metric_kinds = dict(RUN_METRIC_COLUMNS)
+    transactions = []
+    for run in runs.sort_values("created_at", ascending=False).to_dict("records"):
+        metrics = {}
+        for name, kind in metric_kinds.items():
+            value = run.get(name)
+            if value is not None and not pd.isna(value):
+                metrics[name] = int(value) if kind == "int64" else float(value)
+        if run["benchmark_id"] in performance:
+            metrics["error_type_performance"] = performance[run["benchmark_id"]]
+        record = {
+            name: (None if run.get(name) is None or pd.isna(run.get(name)) else run.get(name))
+            for name, _ in RUN_METADATA_COLUMNS
+        }
+        record.update(
+            id=run["benchmark_id"],
+            model_version=run["model_version"],
+            created_at=run["created_at"].isoformat(),
+            metrics=metrics,
+        )
+        transactions.append(record)
+    return transactions
@@ -0,0 +1,242 @@
+"""
+Detection Matching
+==================
+
+Matches detected issues to expected issues for benchmark scoring.
+
+A detection is a candidate for an expected issue when its serialized text
+contains the expected CPT code, or any keyword of the expected issue type
+(type split on "_"), the same rule evaluate_detection always used. What
+changed:
+
+- expected issues are indexed once per profile by CPT code and type
+  keyword, and each detection is serialized once, so checking a detection
+  costs one substring test per distinct code/keyword instead of one per
+  expected issue and keyword
+- candidates are scored (CPT hit = 1.0, plus the fraction of type
+  keywords present) and assigned optimally: the most matches, then the
+  highest total score (Hungarian algorithm). Results no longer depend on
+  the order in which a model lists its findings
+- match scores are exposed per pair
+
+Strategies:
+    optimal  maximum matching with the highest total score (default)
+    greedy   highest-scoring pairs first
+    first    legacy first-match in detection order (re-score old runs)
+
+Usage:
+    matcher = DetectionMatcher(expected_issues)
+    match = matcher.match(detected_issues)
+    match.pairs  # [MatchPair(detected_index, expected_index, score), ...]
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Sequence
+
+from medbilldozer.utils.serialization import dumps_json
+
+MATCH_STRATEGIES = ("optimal", "greedy", "first")
+
+CPT_MATCH_SCORE = 1.0
+
+
+@dataclass
+class MatchPair:
+    """A detected issue matched to an expected issue."""
+    detected_index: int
+    expected_index: int
+    score: float
+
+
+@dataclass
+class DetectionMatch:
+    """Assignment of detected issues to expected issues."""
+    pairs: List[MatchPair] = field(default_factory=list)
+    candidates: int = 0  # candidate (detected, expected) pairs considered
+
+    @property
+    def matched_expected(self) -> set:
+        return {pair.expected_index for pair in self.pairs}
+
+    @property
+    def matched_detected(self) -> set:
+        return {pair.detected_index for pair in self.pairs}
+
+    def to_dict(self) -> List[Dict[str, Any]]:
+        return [
+            {'detected_index': p.detected_index, 'expected_index': p.expected_index, 'score': round(p.score, 4)}
+            for p in self.pairs
+        ]
+
+
+def _keywords(issue_type: str) -> List[str]:
+    # Empty keywords would match every detection
+    return [kw for kw in dict.fromkeys((issue_type or '').lower().split('_')) if kw]
+
+
+def _issue_text(detected_issue: Any) -> str:
+    return dumps_json(detected_issue).decode('utf-8').lower()
+
+
+class DetectionMatcher:
+    """Expected issues of one profile, indexed for matching detections.
+
+    Args:
+        expected: Expected issues (objects with type and cpt_code)
+        strategy: optimal, greedy or first (see module docstring)
+    """
+
+    def __init__(self, expected: Sequence[Any], strategy: str = "optimal"):
+        if strategy not in MATCH_STRATEGIES:
+            raise ValueError(f"Unknown match strategy {strategy!r}, expected one of {MATCH_STRATEGIES}")
+        self.expected = list(expected)
+        self.strategy = strategy
+        self._cpt_index: Dict[str, List[int]] = {}
+        self._keyword_index: Dict[str, List[int]] = {}
+        self._keyword_counts: List[int] = []
+        for exp_idx, issue in enumerate(self.expected):
+            if issue.cpt_code:
+                self._cpt_index.setdefault(issue.cpt_code.lower(), []).append(exp_idx)
+            keywords = _keywords(issue.type)
+            self._keyword_counts.append(len(keywords))
+            for keyword in keywords:
+                self._keyword_index.setdefault(keyword, []).append(exp_idx)
+
+    def scores(self, issue_text: str) -> Dict[int, float]:
+        """{expected index: score} of the expected issues a detection text matches."""
+        cpt_hits: Dict[int, float] = {}
+        for code, postings in self._cpt_index.items():
+            if code in issue_text:
+                for exp_idx in postings:
+                    cpt_hits[exp_idx] = CPT_MATCH_SCORE
+        keyword_hits: Dict[int, int] = {}
+        for keyword, postings in self._keyword_index.items():
+            if keyword in issue_text:
+                for exp_idx in postings:
+                    keyword_hits[exp_idx] = keyword_hits.get(exp_idx, 0) + 1
+        scores = dict(cpt_hits)
+        for exp_idx, hits in keyword_hits.items():
+            scores[exp_idx] = scores.get(exp_idx, 0.0) + hits / self._keyword_counts[exp_idx]
+        return scores
+
+    def match(self, detected: Sequence[Any]) -> DetectionMatch:
+        """Assign detected issues to expected issues."""
+        edges = [self.scores(_issue_text(issue)) for issue in detected]
+        candidates = sum(len(row) for row in edges)
+        if self.strategy == "first":
+            pairs = _first_match(edges)
+        elif self.strategy == "greedy":
+            pairs = _greedy_match(edges)
+        else:
+            pairs = _optimal_match(edges)
+        pairs.sort(key=lambda p: p.detected_index)
+        return DetectionMatch(pairs=pairs, candidates=candidates)
+
+
+def _first_match(edges: List[Dict[int, float]]) -> List[MatchPair]:
+    """Legacy behavior: each detection takes its lowest-index free candidate."""
+    taken = set()
+    pairs = []
+    for det_idx, row in enumerate(edges):
+        for exp_idx in sorted(row):
+            if exp_idx not in taken:
+                taken.add(exp_idx)
+                pairs.append(MatchPair(det_idx, exp_idx, row[exp_idx]))
+                break
+    return pairs
+
+
+def _greedy_match(edges: List[Dict[int, float]]) -> List[MatchPair]:
+    ranked = sorted(
+        ((score, det_idx, exp_idx) for det_idx, row in enumerate(edges) for exp_idx, score in row.items()),
+        key=lambda e: (-e[0], e[1], e[2]),
+    )
+    used_det, used_exp = set(), set()
+    pairs = []
+    for score, det_idx, exp_idx in ranked:
+        if det_idx not in used_det and exp_idx not in used_exp:
+            used_det.add(det_idx)
+            used_exp.add(exp_idx)
+            pairs.append(MatchPair(det_idx, exp_idx, score))
+    return pairs
+
+
+def _optimal_match(edges: List[Dict[int, float]]) -> List[MatchPair]:
+    """Maximum-cardinality matching with the highest total score."""
+    # Only detections/expected issues that have a candidate take part
+    rows = [det_idx for det_idx, row in enumerate(edges) if row]
+    cols = sorted({exp_idx for row in edges for exp_idx in row})
+    if not rows:
+        return []
+    size = max(len(rows), len(cols))
+    max_score = max(score for row in edges for score in row.values())
+    # A match is always worth more than any difference in total score
+    bonus = max_score * size + 1.0
+    col_pos = {exp_idx: j for j, exp_idx in enumerate(cols)}
+    weights = [[0.0] * size for _ in range(size)]
+    for i, det_idx in enumerate(rows):
+        for exp_idx, score in edges[det_idx].items():
+            weights[i][col_pos[exp_idx]] = bonus + score
+
+    assignment = _hungarian_max(weights)
+    pairs = []
+    for i, j in enumerate(assignment):
+        if i < len(rows) and j < len(cols) and weights[i][j] > 0:
+            det_idx, exp_idx = rows[i], cols[j]
+            pairs.append(MatchPair(det_idx, exp_idx, edges[det_idx][exp_idx]))
+    return pairs
+
+
+def _hungarian_max(weights: List[List[float]]) -> List[int]:
+    """Hungarian algorithm (O(n^3)) on a square matrix, maximizing the total.
+
+    Returns the column assigned to each row.
+    """
+    n = len(weights)
+    top = max(max(row) for row in weights)
+    inf = float('inf')
+    # Minimize cost = top - weight; 1-based arrays with a virtual column 0
+    u = [0.0] * (n + 1)
+    v = [0.0] * (n + 1)
+    owner = [0] * (n + 1)  # owner[j] = row assigned to column j
+    way = [0] * (n + 1)
+    for i in range(1, n + 1):
+        owner[0] = i
+        j0 = 0
+        minv = [inf] * (n + 1)
+        used = [False] * (n + 1)
+        while True:
+            used[j0] = True
+            i0 = owner[j0]
+            delta = inf
+            j1 = 0
+            for j in range(1, n + 1):
+                if used[j]:
+                    continue
+                cur = (top - weights[i0 - 1][j - 1]) - u[i0] - v[j]
+                if cur < minv[j]:
+                    minv[j] = cur
+                    way[j] = j0
+                if minv[j] < delta:
+                    delta = minv[j]
+                    j1 = j
+            for j in range(n + 1):
+                if used[j]:
+                    u[owner[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if owner[j0] == 0:
+                break
+        while True:
+            j1 = way[j0]
+            owner[j0] = owner[j1]
+            j0 = j1
+            if j0 == 0:
+                break
+    assignment = [0] * n
+    for j in range(1, n + 1):
+        assignment[owner[j] - 1] = j - 1
+    return assignment
+
@@ -9,6 +9,7 @@ Usage:
     python3 scripts/export_dashboard_summary.py
     python3 scripts/export_dashboard_summary.py --output report.json
     python3 scripts/export_dashboard_summary.py --days 30
+    python3 scripts/export_dashboard_summary.py --store   # incremental sync into the Parquet result store
 """
 
 import os
@@ -49,6 +50,18 @@ def fetch_transactions(client, days=None):
     return response.data
 
 
+def load_stored_transactions(client, days=None):
+    """Sync new transactions into the result store and load them from it."""
+    from scripts.benchmark_result_store import ResultStore
+    
+    store = ResultStore()
+    new = store.sync_transactions(client)
+    print(f"🗄️  Result store: {new} new transactions synced")
+    
+    start = datetime.now() - timedelta(days=days) if days else None
+    return store.transactions(start=start)
+
+
 def is_failed_run(txn):
     """Check if a transaction represents a failed run."""
     metrics = txn.get('metrics', {})
@@ -410,12 +423,15 @@ def compute_leaderboard(model_summary):
     return leaderboard
 
 
-def generate_report(client, days=None):
+def generate_report(client, days=None, use_store=False):
     """Generate complete dashboard summary report."""
     print("📊 Generating dashboard summary report...")
     
     # Fetch transactions
-    transactions = fetch_transactions(client, days)
+    if use_store:
+        transactions = load_stored_transactions(client, days)
+    else:
+        transactions = fetch_transactions(client, days)
     print(f"✅ Loaded {len(transactions)} transactions")
     
     # Compute summaries
@@ -476,13 +492,15 @@ def main():
     parser = argparse.ArgumentParser(description='Export dashboard summary report')
     parser.add_argument('--output', '-o', default=None, help='Output file path (default: auto-generated)')
     parser.add_argument('--days', '-d', type=int, default=None, help='Only include last N days of data')
+    parser.add_argument('--store', action='store_true',
+                        help='Read from the local Parquet result store, fetching only new transactions')
     args = parser.parse_args()
     
     # Get client
     client = get_supabase_client()
     
     # Generate report
-    report = generate_report(client, args.days)
+    report = generate_report(client, args.days, use_store=args.store)
     
     # Determine output filename
     if args.output:
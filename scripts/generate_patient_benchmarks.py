@@ -13,10 +13,13 @@ Metrics tracked:
 - Detection accuracy (precision, recall, F1)
 - Domain knowledge utilization
 - Cost savings potential from error detection
+- Throughput (profiles/min) under adaptive per-provider concurrency
 
 MedGemma should excel due to its healthcare-specific training.
 """
 
+import asyncio
+import inspect
 import json
 import sys
 import time
@@ -37,12 +40,34 @@ load_dotenv(override=True)
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from medbilldozer.providers.medgemma_hosted_provider import MedGemmaHostedProvider
+from medbilldozer.providers.medgemma_hosted_provider import HF_MODEL_URL, MedGemmaHostedProvider
+from medbilldozer.providers.hf_transport import get_hf_transport
 from medbilldozer.providers.gemma3_hosted_provider import Gemma3HostedProvider
 from medbilldozer.providers.openai_analysis_provider import OpenAIAnalysisProvider
 from medbilldozer.providers.gemini_analysis_provider import GeminiAnalysisProvider
 from medbilldozer.providers.llm_interface import LocalHeuristicProvider
 from medbilldozer.providers.medgemma_ensemble_provider import MedGemmaEnsembleProvider
+from medbilldozer.providers.result_cache import CachingProvider, result_cache_from_env
+from medbilldozer.providers.cassette import MODE_REPLAY, Cassette, CassetteProvider
+
+from scripts.benchmark_checkpoint import (
+    CHECKPOINT_DIR,
+    STATUS_ERROR,
+    STATUS_OK,
+    CheckpointLog,
+    RunKey,
+    fingerprint_files,
+    fingerprint_text,
+)
+from scripts.benchmark_engine import (
+    AIMDConfig,
+    AIMDController,
+    RateLimitedError,
+    is_rate_limit_error,
+    run_adaptive,
+)
+from scripts.detection_matching import MATCH_STRATEGIES, DetectionMatch, DetectionMatcher
+from scripts.benchmark_result_store import ResultStore
 
 # Import advanced metrics module
 try:
@@ -100,6 +125,8 @@ class PatientBenchmarkResult:
     # NEW: Cost savings metrics
     potential_savings: float = 0.0  # Total $ from detected issues
     missed_savings: float = 0.0  # Total $ from undetected issues
+    # Detected/expected issue pairs with match scores
+    matches: List[Dict[str, Any]] = field(default_factory=list)
 
 
 @dataclass
@@ -129,6 +156,8 @@ class PatientBenchmarkMetrics:
     total_missed_savings: float = 0.0
     avg_savings_per_patient: float = 0.0
     savings_capture_rate: float = 0.0  # % of potential savings captured
+    # Achieved throughput (engine, elapsed_s, throughput_per_min, concurrency, throttling)
+    throughput: Dict[str, Any] = field(default_factory=dict)
 
 
 class PatientBenchmarkRunner:
@@ -146,25 +175,51 @@ class PatientBenchmarkRunner:
         'patient_035',  # Hysterectomy + uterine procedure billing
     ]
     
-    def __init__(self, model: str, subset: Optional[str] = None, workers: int = 1, fast_mode: bool = False):
+    # Ceiling for the adaptive engine; API rate limits are discovered at
+    # runtime, only hard endpoint limits belong here. MedGemma calls share
+    # the HF transport's per-endpoint slots, so its ceiling is the
+    # transport's limit (HF_ENDPOINT_CONCURRENCY / HF_ENDPOINT_LIMITS).
+    HF_ENDPOINT_MODELS = ('medgemma', 'medgemma-ensemble')
+    DEFAULT_MAX_CONCURRENCY = 16
+    
+    def __init__(self, model: str, subset: Optional[str] = None, workers: int = 1, fast_mode: bool = False,
+                 engine: str = 'async', max_concurrency: Optional[int] = None,
+                 checkpoint: bool = True, fresh: bool = False,
+                 cassette_mode: Optional[str] = None, cassette_dir: Optional[Path] = None,
+                 match_strategy: str = 'optimal'):
         self.model = model
+        self.match_strategy = match_strategy
         self.subset = subset
         self.fast_mode = fast_mode
+        self.engine = engine
+        # Replays are cheap and exist to re-score; never skip profiles from a checkpoint
+        self.use_checkpoint = checkpoint and cassette_mode != MODE_REPLAY
+        self.fresh = fresh
+        self.cassette_mode = cassette_mode
+        self.cassette_dir = cassette_dir or PROJECT_ROOT / "benchmarks" / "cassettes"
+        self.checkpoint: Optional[CheckpointLog] = None
         
-        # Respect model-specific worker limits
-        # OpenAI has rate limits that work best with max 2 concurrent workers
-        model_max_workers = {
-            'openai': 2,  # OpenAI rate limits
-            'gemini': 2,  # Gemini also has rate limits
-            'medgemma': 10,  # HuggingFace endpoint concurrency limit
-            'medgemma-ensemble': 10,  # HuggingFace endpoint concurrency limit
-        }
-        max_allowed = model_max_workers.get(model, workers)
-        self.workers = min(workers, max_allowed)
-        
-        # Notify if workers were capped
-        if self.workers < workers:
-            print(f"ℹ️  Note: {model} limited to {self.workers} workers (requested {workers}) due to API rate limits")
+        if engine == 'async':
+            # --workers is the starting concurrency; AIMD finds the sustainable level
+            ceiling = self._max_concurrency_for(model)
+            self.max_concurrency = max(1, min(max_concurrency or ceiling, ceiling))
+            self.workers = max(1, min(workers, self.max_concurrency))
+        else:
+            # Respect model-specific worker limits
+            # OpenAI has rate limits that work best with max 2 concurrent workers
+            model_max_workers = {
+                'openai': 2,  # OpenAI rate limits
+                'gemini': 2,  # Gemini also has rate limits
+            }
+            if model in self.HF_ENDPOINT_MODELS:
+                model_max_workers[model] = self._max_concurrency_for(model)
+            max_allowed = model_max_workers.get(model, workers)
+            self.workers = min(workers, max_allowed)
+            self.max_concurrency = self.workers
+            
+            # Notify if workers were capped
+            if self.workers < workers:
+                print(f"ℹ️  Note: {model} limited to {self.workers} workers (requested {workers}) due to API rate limits")
         
         self.benchmarks_dir = PROJECT_ROOT / "benchmarks"
         self.profiles_dir = self.benchmarks_dir / "patient_profiles"
@@ -175,8 +230,40 @@ class PatientBenchmarkRunner:
         # Initialize provider
         self.provider = self._init_provider()
     
+    @classmethod
+    def _max_concurrency_for(cls, model: str) -> int:
+        """Concurrency ceiling for a model (more would only queue on the endpoint)."""
+        if model in cls.HF_ENDPOINT_MODELS:
+            return get_hf_transport().limit_for(HF_MODEL_URL)
+        return cls.DEFAULT_MAX_CONCURRENCY
+
     def _init_provider(self):
-        """Initialize the analysis provider."""
+        """Initialize the analysis provider (cassette or PROVIDER_CACHE=1 cache)."""
+        if self.cassette_mode:
+            return self._init_cassette_provider()
+        provider = self._create_provider()
+        cache = result_cache_from_env()
+        if cache is not None:
+            print(f"ℹ️  Provider result cache enabled for {self.model}")
+            return CachingProvider(provider, cache)
+        return provider
+
+    def _init_cassette_provider(self) -> CassetteProvider:
+        """Wrap the provider to record to / replay from benchmarks/cassettes."""
+        cassette = Cassette(self.cassette_dir / f"patient_{self.model}.jsonl.gz", mode=self.cassette_mode)
+        try:
+            provider = self._create_provider()
+        except Exception as e:
+            if self.cassette_mode != MODE_REPLAY:
+                raise
+            # Replays need no credentials: use the identity recorded in the cassette
+            print(f"ℹ️  {self.model} provider unavailable ({e}); replaying recorded identity")
+            provider = None
+        print(f"📼 Cassette {self.cassette_mode}: {cassette.path.name} ({len(cassette)} recorded responses)")
+        return CassetteProvider(provider, cassette)
+
+    def _create_provider(self):
+        """Create the analysis provider for the selected model."""
         if self.model == "medgemma":
             return MedGemmaHostedProvider()
         if self.model == "medgemma-ensemble":
@@ -902,61 +989,47 @@ Use format: "ERROR TYPE: [type] | CPT: [code] | REASONING: [why this is problema
         
         return aggregated
     
-    def evaluate_detection(self, expected: List[ExpectedIssue], detected: List[Dict]) -> tuple:
+    def match_detections(self, expected: List[ExpectedIssue], detected: List[Dict]) -> DetectionMatch:
+        """Assign detected issues to expected issues (see scripts/detection_matching.py)."""
+        return DetectionMatcher(expected, strategy=self.match_strategy).match(detected)
+
+    def evaluate_detection(self, expected: List[ExpectedIssue], detected: List[Dict],
+                           match: Optional[DetectionMatch] = None) -> tuple:
         """
         Evaluate detection accuracy with domain subcategory tracking and cost savings.
         
+        Args:
+            match: Precomputed match_detections() result (computed if omitted)
+        
         Returns: (true_positives, false_positives, false_negatives, domain_knowledge_score, 
                   domain_breakdown, domain_recall, generic_recall, cross_document_recall,
                   potential_savings, missed_savings)
         """
         if not expected:
             # No issues expected, any detection is false positive
-            return 0, len(detected), 0, 0.0, {}, 0.0, 0.0, 0.0
+            return 0, len(detected), 0, 0.0, {}, 0.0, 0.0, 0.0, 0.0, 0.0
+        
+        if match is None:
+            match = self.match_detections(expected, detected)
         
         # Track which expected issues were matched to avoid double-counting
-        matched_expected_indices = set()
-        matched_detected_indices = set()
+        matched_expected_indices = match.matched_expected
+        matched_detected_indices = match.matched_detected
         domain_knowledge_detections = 0
         
         # NEW: Track detection by domain subcategory
         category_stats = {}  # {category: {'tp': X, 'fn': Y, 'total': Z}}
         
-        # For each detected issue, try to match it to an expected issue
-        for det_idx, detected_issue in enumerate(detected):
-            issue_text = json.dumps(detected_issue).lower()
+        for pair in match.pairs:
+            expected_issue = expected[pair.expected_index]
+            if expected_issue.requires_domain_knowledge:
+                domain_knowledge_detections += 1
             
-            # Try to match to an expected issue
-            for exp_idx, expected_issue in enumerate(expected):
-                if exp_idx in matched_expected_indices:
-                    continue  # Already matched
-                
-                matched = False
-                
-                # Check for CPT code match
-                if expected_issue.cpt_code and expected_issue.cpt_code.lower() in issue_text:
-                    matched = True
-                
-                # Check for keyword matches (gender, age, inappropriate)
-                if not matched:
-                    keywords = expected_issue.type.split('_')
-                    if any(keyword in issue_text for keyword in keywords):
-                        matched = True
-                
-                # If matched, record it
-                if matched:
-                    matched_expected_indices.add(exp_idx)
-                    matched_detected_indices.add(det_idx)
-                    if expected_issue.requires_domain_knowledge:
-                        domain_knowledge_detections += 1
-                    
-                    # NEW: Track by category
-                    category = expected_issue.type
-                    if category not in category_stats:
-                        category_stats[category] = {'tp': 0, 'fn': 0, 'fp': 0, 'total': 0}
-                    category_stats[category]['tp'] += 1
-                    
-                    break  # Move to next detected issue
+            # NEW: Track by category
+            category = expected_issue.type
+            if category not in category_stats:
+                category_stats[category] = {'tp': 0, 'fn': 0, 'fp': 0, 'total': 0}
+            category_stats[category]['tp'] += 1
         
         # Track false negatives by category
         for exp_idx, expected_issue in enumerate(expected):
@@ -1005,9 +1078,8 @@ Use format: "ERROR TYPE: [type] | CPT: [code] | REASONING: [why this is problema
         
         # NEW: Calculate cost savings from detected issues
         potential_savings = sum(
-            detected_issue.get('max_savings', 0) or 0
-            for detected_issue in detected
-            if detected.index(detected_issue) in matched_detected_indices
+            detected[det_idx].get('max_savings', 0) or 0
+            for det_idx in matched_detected_indices
         )
         
         # Calculate missed savings from undetected expected issues
@@ -1046,9 +1118,10 @@ Use format: "ERROR TYPE: [type] | CPT: [code] | REASONING: [why this is problema
             return result
 
         # Evaluate detection with enhanced metrics
+        match = self.match_detections(expected_issues, detected_issues)
         (tp, fp, fn, domain_score, domain_breakdown,
          domain_recall, generic_recall, cross_document_recall,
-         potential_savings, missed_savings) = self.evaluate_detection(expected_issues, detected_issues)
+         potential_savings, missed_savings) = self.evaluate_detection(expected_issues, detected_issues, match=match)
 
         precision = tp / (tp + fp) if (tp + fp) > 0 else 0.0
         recall = tp / (tp + fn) if (tp + fn) > 0 else 0.0
@@ -1071,7 +1144,8 @@ Use format: "ERROR TYPE: [type] | CPT: [code] | REASONING: [why this is problema
             generic_recall=generic_recall,
             cross_document_recall=cross_document_recall,
             potential_savings=potential_savings,
-            missed_savings=missed_savings
+            missed_savings=missed_savings,
+            matches=match.to_dict()
         )
 
         status = "✅" if fn == 0 else "⚠️"
@@ -1079,6 +1153,73 @@ Use format: "ERROR TYPE: [type] | CPT: [code] | REASONING: [why this is problema
 
         return result
     
+    def _run_key(self) -> RunKey:
+        """Checkpoint key: model, dataset (profiles + documents) and prompt version."""
+        dataset_files = list(self.profiles_dir.glob("patient_*.json"))
+        dataset_files += [p for p in self.inputs_dir.rglob("*") if p.is_file()]
+        # Prompts live both in the provider and in this script's multi-pass analysis
+        prompt_version = "+".join([
+            str(getattr(self.provider, 'prompt_version', '1')),
+            'fast' if self.fast_mode else 'full',
+            fingerprint_text(inspect.getsource(PatientBenchmarkRunner.analyze_patient_documents)),
+            # Checkpointed results are scored, so the matching strategy is part of the key
+            f"match-{self.match_strategy}",
+        ])
+        return RunKey(
+            benchmark="patient",
+            model=self.model,
+            dataset_hash=fingerprint_files(dataset_files, root=self.benchmarks_dir),
+            prompt_version=prompt_version,
+        )
+
+    def _run_profile(self, profile_file: Path, index: int, total: int) -> PatientBenchmarkResult:
+        """Process a profile and record the result in the checkpoint log."""
+        result = self._process_single_profile(profile_file, index, total)
+        if self.checkpoint is not None:
+            status = STATUS_ERROR if result.error_message else STATUS_OK
+            self.checkpoint.record(profile_file.stem, asdict(result), status=status)
+        return result
+
+    @staticmethod
+    def _result_from_record(record: Dict[str, Any]) -> PatientBenchmarkResult:
+        record = dict(record)
+        record['expected_issues'] = [ExpectedIssue(**issue) for issue in record['expected_issues']]
+        return PatientBenchmarkResult(**record)
+
+    def _run_adaptive(self, profile_files: List[Path]) -> tuple:
+        """Process profiles with the asyncio engine under AIMD concurrency control.
+
+        Rate-limited analyses are reported to the controller and retried with
+        backoff instead of being scored as failures.
+
+        Returns:
+            (results, throughput): results in profile order, throughput stats dict
+        """
+        total = len(profile_files)
+        controller = AIMDController(AIMDConfig(initial=self.workers, max_concurrency=self.max_concurrency))
+        print(f"⚡ Adaptive execution: starting at {self.workers}, up to {self.max_concurrency} concurrent profiles")
+
+        def process(item):
+            index, profile_file = item
+            result = self._run_profile(profile_file, index, total)
+            if result.error_message and is_rate_limit_error(result.error_message):
+                raise RateLimitedError(result.error_message, fallback=result)
+            return result
+
+        outcomes, stats = asyncio.run(run_adaptive(list(enumerate(profile_files, 1)), process, controller))
+
+        results = []
+        for profile_file, outcome in zip(profile_files, outcomes):
+            if isinstance(outcome, Exception):
+                print(f"\n❌ Error processing {profile_file}: {outcome}")
+            else:
+                results.append(outcome)
+
+        print(f"\n🚦 Throughput: {stats.throughput_per_min:.1f} profiles/min | "
+              f"peak concurrency {stats.peak_concurrency} | final limit {stats.final_limit:.1f} | "
+              f"{stats.throttled} throttled, {stats.retries} retried")
+        return results, stats.to_dict()
+    
     def run_benchmarks(self) -> PatientBenchmarkMetrics:
         """Run benchmarks on all patient profiles."""
         precise_name = self._get_precise_model_name()
@@ -1102,57 +1243,79 @@ Use format: "ERROR TYPE: [type] | CPT: [code] | REASONING: [why this is problema
         else:
             print(f"📋 Found {len(profile_files)} patient profiles\n")
         
+        all_profile_files = profile_files
+        if self.use_checkpoint:
+            # Resume: skip profiles already completed under the same run key
+            self.checkpoint = CheckpointLog.open(CHECKPOINT_DIR, self._run_key(), fresh=self.fresh)
+            completed = self.checkpoint.completed()
+            profile_files = [f for f in profile_files if f.stem not in completed]
+            resumed = len(all_profile_files) - len(profile_files)
+            if resumed:
+                print(f"↩️  Resuming from {self.checkpoint.path.name}: {resumed} profiles already completed, "
+                      f"{len(profile_files)} remaining\n")
+        
         results = []
         total_precision = 0
         total_recall = 0
         total_f1 = 0
         total_domain_score = 0
         successful = 0
+        run_started = time.monotonic()
+        throughput = None
         
+        if self.engine == 'async':
+            results, throughput = self._run_adaptive(profile_files)
         # If workers > 1, run profiles in parallel
-        if self.workers > 1:
+        elif self.workers > 1:
             print(f"⚡ Parallel execution with {self.workers} workers")
             futures = {}
             with ThreadPoolExecutor(max_workers=self.workers) as ex:
                 for i, profile_file in enumerate(profile_files, 1):
-                    futures[ex.submit(self._process_single_profile, profile_file, i, len(profile_files))] = profile_file
+                    futures[ex.submit(self._run_profile, profile_file, i, len(profile_files))] = profile_file
 
                 for fut in as_completed(futures):
                     try:
-                        result = fut.result()
-                        results.append(result)
-                        if not result.error_message:
-                            # accumulate metrics
-                            tp = result.true_positives
-                            fp = result.false_positives
-                            fn = result.false_negatives
-                            precision = tp / (tp + fp) if (tp + fp) > 0 else 0.0
-                            recall = tp / (tp + fn) if (tp + fn) > 0 else 0.0
-                            f1 = 2 * (precision * recall) / (precision + recall) if (precision + recall) > 0 else 0.0
-                            total_precision += precision
-                            total_recall += recall
-                            total_f1 += f1
-                            total_domain_score += result.domain_knowledge_score
-                            successful += 1
+                        results.append(fut.result())
                     except Exception as e:
                         profile_file = futures.get(fut)
                         print(f"\n❌ Error processing {profile_file}: {e}")
         else:
             for i, profile_file in enumerate(profile_files, 1):
-                result = self._process_single_profile(profile_file, i, len(profile_files))
-                results.append(result)
-                if not result.error_message:
-                    tp = result.true_positives
-                    fp = result.false_positives
-                    fn = result.false_negatives
-                    precision = tp / (tp + fp) if (tp + fp) > 0 else 0.0
-                    recall = tp / (tp + fn) if (tp + fn) > 0 else 0.0
-                    f1 = 2 * (precision * recall) / (precision + recall) if (precision + recall) > 0 else 0.0
-                    total_precision += precision
-                    total_recall += recall
-                    total_f1 += f1
-                    total_domain_score += result.domain_knowledge_score
-                    successful += 1
+                results.append(self._run_profile(profile_file, i, len(profile_files)))
+        
+        if throughput is None:
+            elapsed_s = time.monotonic() - run_started
+            throughput = {
+                'engine': 'threads' if self.workers > 1 else 'sequential',
+                'tasks': len(profile_files),
+                'completed': len(results),
+                'elapsed_s': round(elapsed_s, 2),
+                'throughput_per_min': round(len(results) / elapsed_s * 60, 2) if elapsed_s > 0 else 0.0,
+                'peak_concurrency': self.workers,
+            }
+        
+        if self.checkpoint is not None:
+            # Metrics cover the whole run, including profiles from earlier attempts
+            throughput['resumed'] = len(all_profile_files) - len(profile_files)
+            results = [
+                self._result_from_record(record)
+                for record in self.checkpoint.records(f.stem for f in all_profile_files)
+            ]
+        
+        for result in results:
+            if not result.error_message:
+                # accumulate metrics
+                tp = result.true_positives
+                fp = result.false_positives
+                fn = result.false_negatives
+                precision = tp / (tp + fp) if (tp + fp) > 0 else 0.0
+                recall = tp / (tp + fn) if (tp + fn) > 0 else 0.0
+                f1 = 2 * (precision * recall) / (precision + recall) if (precision + recall) > 0 else 0.0
+                total_precision += precision
+                total_recall += recall
+                total_f1 += f1
+                total_domain_score += result.domain_knowledge_score
+                successful += 1
         
         # Calculate aggregated metrics
         avg_precision = total_precision / successful if successful > 0 else 0.0
@@ -1182,7 +1345,7 @@ Use format: "ERROR TYPE: [type] | CPT: [code] | REASONING: [why this is problema
         
         metrics = PatientBenchmarkMetrics(
             model_name=self._get_precise_model_name(),
-            total_patients=len(profile_files),
+            total_patients=len(all_profile_files),
             successful_analyses=successful,
             avg_precision=avg_precision,
             avg_recall=avg_recall,
@@ -1200,7 +1363,8 @@ Use format: "ERROR TYPE: [type] | CPT: [code] | REASONING: [why this is problema
             total_potential_savings=total_potential_savings,
             total_missed_savings=total_missed_savings,
             avg_savings_per_patient=avg_savings_per_patient,
-            savings_capture_rate=savings_capture_rate
+            savings_capture_rate=savings_capture_rate,
+            throughput=throughput
         )
         
         # ====================================================================
@@ -1297,6 +1461,13 @@ Use format: "ERROR TYPE: [type] | CPT: [code] | REASONING: [why this is problema
         print(f"  Avg Precision:          {metrics.avg_precision:.3f}")
         print(f"  Avg Recall:             {metrics.avg_recall:.3f}")
         print(f"  Avg Analysis Time:      {metrics.avg_latency_ms:.0f}ms ({metrics.avg_latency_ms/1000:.2f}s)")
+        if metrics.throughput:
+            tp = metrics.throughput
+            print(f"  Throughput:             {tp['throughput_per_min']:.1f} profiles/min "
+                  f"({tp['engine']}, peak concurrency {tp['peak_concurrency']}, {tp['elapsed_s']:.0f}s wall)")
+            if 'throttled' in tp:
+                print(f"  Rate Limiting:          {tp['throttled']} throttled, {tp['retries']} retried, "
+                      f"{tp['backoffs']} backoffs, final limit {tp['final_limit']}")
         print()
         print("💰 COST SAVINGS METRICS:")
         print(f"  Total Potential Savings:   ${metrics.total_potential_savings:,.2f}")
@@ -1341,6 +1512,19 @@ Use format: "ERROR TYPE: [type] | CPT: [code] | REASONING: [why this is problema
             json.dump(results_dict, f, indent=2)
         
         print(f"\n💾 Results saved to: {output_file}")
+        
+        # Columnar copy (profiles, categories, issues) for dashboard queries
+        try:
+            benchmark_id = ResultStore().add_patient_results(results_dict)
+            print(f"🗄️  Result store updated: {benchmark_id}")
+        except ImportError as e:
+            print(f"⚠️  Result store not updated: {e}")
+        
+        # Results are safe on disk; the next run with this key starts fresh
+        if self.checkpoint is not None:
+            self.checkpoint.finish()
+        if isinstance(self.provider, CassetteProvider) and self.cassette_mode != MODE_REPLAY:
+            self.provider.cassette.compact()
 
 
 def update_readme(all_metrics: List[PatientBenchmarkMetrics]):
@@ -1458,7 +1642,48 @@ def main():
         '--workers',
         type=int,
         default=1,
-        help='Number of parallel workers to run (default: 1)'
+        help='Number of parallel workers; starting concurrency for --engine async (default: 1)'
+    )
+    parser.add_argument(
+        '--engine',
+        type=str,
+        default='async',
+        choices=['async', 'threads'],
+        help='async: adaptive (AIMD) concurrency per provider; threads: fixed --workers pool (default: async)'
+    )
+    parser.add_argument(
+        '--fresh',
+        action='store_true',
+        help='Discard an interrupted run\'s checkpoint instead of resuming it'
+    )
+    parser.add_argument(
+        '--no-checkpoint',
+        action='store_true',
+        help='Do not record per-profile checkpoints (results are only written at the end)'
+    )
+    parser.add_argument(
+        '--match-strategy',
+        type=str,
+        default='optimal',
+        choices=list(MATCH_STRATEGIES),
+        help='How detections are assigned to expected issues; "first" reproduces the legacy first-match scoring (default: optimal)'
+    )
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument(
+        '--record',
+        action='store_true',
+        help='Record provider responses to benchmarks/cassettes/ for later --replay'
+    )
+    cassette_group.add_argument(
+        '--replay',
+        action='store_true',
+        help='Replay recorded provider responses (offline, no credentials needed)'
+    )
+    parser.add_argument(
+        '--max-concurrency',
+        type=int,
+        default=None,
+        help='Upper bound for adaptive concurrency (default: HF_ENDPOINT_CONCURRENCY for MedGemma, 16 for rate-limited APIs)'
     )
     parser.add_argument(
         '--fast',
@@ -1485,7 +1710,18 @@ def main():
     
     for model in models_to_run:
         try:
-            runner = PatientBenchmarkRunner(model, subset=args.subset, workers=args.workers, fast_mode=args.fast)
+            runner = PatientBenchmarkRunner(
+                model,
+                subset=args.subset,
+                workers=args.workers,
+                fast_mode=args.fast,
+                engine=args.engine,
+                max_concurrency=args.max_concurrency,
+                checkpoint=not args.no_checkpoint,
+                fresh=args.fresh,
+                cassette_mode='record' if args.record else 'replay' if args.replay else None,
+                match_strategy=args.match_strategy
+            )
             metrics = runner.run_benchmarks()
             
             if metrics:
@@ -19,9 +19,16 @@ Images sourced from Kaggle datasets with proper attribution via manifest.json.
 Usage:
     python3 scripts/run_clinical_validation_benchmarks.py --model gpt-4o-mini
     python3 scripts/run_clinical_validation_benchmarks.py --model all --push-to-supabase
+
+Completed scenarios are checkpointed under benchmarks/checkpoints/; an
+interrupted run resumes where it stopped (--fresh starts over).
+
+--record stores model responses in benchmarks/cassettes/; --replay reruns
+the scoring from them offline (no API keys or downloaded images needed).
 """
 
 import argparse
+import inspect
 import json
 import os
 import sys
@@ -38,6 +45,20 @@ sys.path.insert(0, str(PROJECT_ROOT))
 from dotenv import load_dotenv
 load_dotenv()
 
+from medbilldozer.providers.cassette import (
+    MODE_REPLAY,
+    Cassette,
+    CassetteMissError,
+    request_fingerprint,
+)
+from scripts.benchmark_checkpoint import (
+    CHECKPOINT_DIR,
+    CheckpointLog,
+    RunKey,
+    fingerprint_files,
+    fingerprint_text,
+)
+
 # Import existing utilities
 try:
     from scripts.benchmark_data_access import BenchmarkDataAccess
@@ -1368,21 +1389,36 @@ def call_medgemma(image_path: Path, prompt: str, ensemble: bool = False, scenari
         return "ERROR - Treatment does not match imaging"
 
 
-def call_model(model: str, image_path: Path, prompt: str, scenario: Dict = None) -> str:
+def _call_model_live(model: str, image_path: Path, prompt: str, scenario: Dict = None) -> str:
     """Route to appropriate model API."""
+    if model.startswith('gpt-'):
+        return call_openai_vision(image_path, prompt, model)
+    elif model.startswith('claude-'):
+        return call_claude_vision(image_path, prompt, model)
+    elif model.startswith('gemini-'):
+        return call_gemini_vision(image_path, prompt, model)
+    elif model == 'medgemma':
+        return call_medgemma(image_path, prompt, ensemble=False, scenario=scenario)
+    elif model == 'medgemma-ensemble':
+        return call_medgemma(image_path, prompt, ensemble=True, scenario=scenario)
+    else:
+        raise ValueError(f"Unknown model: {model}")
+
+
+def call_model(model: str, image_path: Path, prompt: str, scenario: Dict = None,
+               cassette: Optional[Cassette] = None) -> str:
+    """Route to appropriate model API, recording/replaying through a cassette if given.
+
+    Recorded calls are keyed by model, image file name, prompt and scenario,
+    so replays work without the downloaded images.
+    """
     try:
-        if model.startswith('gpt-'):
-            return call_openai_vision(image_path, prompt, model)
-        elif model.startswith('claude-'):
-            return call_claude_vision(image_path, prompt, model)
-        elif model.startswith('gemini-'):
-            return call_gemini_vision(image_path, prompt, model)
-        elif model == 'medgemma':
-            return call_medgemma(image_path, prompt, ensemble=False, scenario=scenario)
-        elif model == 'medgemma-ensemble':
-            return call_medgemma(image_path, prompt, ensemble=True, scenario=scenario)
-        else:
-            raise ValueError(f"Unknown model: {model}")
+        if cassette is None:
+            return _call_model_live(model, image_path, prompt, scenario)
+        key = request_fingerprint(model=model, image=image_path.name, prompt=prompt, scenario=scenario)
+        return cassette.call(key, lambda: _call_model_live(model, image_path, prompt, scenario))
+    except CassetteMissError:
+        raise
     except Exception as e:
         print(f"  ❌ Error calling {model}: {e}")
         # Return expected answer as fallback
@@ -1415,10 +1451,38 @@ def verify_images_exist(manifest: Dict, scenarios: Dict) -> tuple[bool, List[str
     return len(missing) == 0, missing
 
 
-def run_clinical_validation(model: str, scenarios: Dict, manifest: Dict) -> Dict:
+def clinical_run_key(model: str, scenarios: Dict) -> RunKey:
+    """Checkpoint key for a model over the scenarios, their images and prompts."""
+    images_dir = PROJECT_ROOT / 'benchmarks/clinical_images/kaggle_datasets/selected'
+    image_files = {images_dir / scenario['image_file'] for scenario in scenarios.values()}
+    dataset_hash = fingerprint_text(
+        json.dumps(scenarios, sort_keys=True),
+        fingerprint_files(image_files),
+    )
+    prompt_version = fingerprint_text(
+        inspect.getsource(create_clinical_prompt),
+        inspect.getsource(create_icd_prompt),
+    )
+    return RunKey(
+        benchmark="clinical",
+        model=model,
+        dataset_hash=dataset_hash,
+        prompt_version=prompt_version,
+    )
+
+
+def run_clinical_validation(model: str, scenarios: Dict, manifest: Dict,
+                            checkpoint: Optional[CheckpointLog] = None,
+                            cassette: Optional[Cassette] = None) -> Dict:
     """
     Run clinical validation benchmarks for a given model.
     
+    Args:
+        checkpoint: Log of completed scenarios; scenarios already in it are
+            not sent to the model again, and each new one is recorded as
+            soon as it finishes
+        cassette: Record model responses to / replay them from this cassette
+    
     Returns:
         Dict with results including accuracy, error detection rate, etc.
     """
@@ -1462,8 +1526,16 @@ def run_clinical_validation(model: str, scenarios: Dict, manifest: Dict) -> Dict
         validation_type = scenario.get('validation_type', 'treatment_matching')
         results['scenarios_by_validation_type'][validation_type] = results['scenarios_by_validation_type'].get(validation_type, 0) + 1
     
+    completed = checkpoint.completed() if checkpoint is not None else {}
+    if completed:
+        print(f"↩️  Resuming from {checkpoint.path.name}: "
+              f"{sum(1 for sid in scenarios if sid in completed)} scenarios already completed\n")
+    
     # Process each scenario
     for scenario_id, scenario in scenarios.items():
+        if scenario_id in completed:
+            continue
+        
         # Detect validation type
         validation_type = scenario.get('validation_type', 'treatment_matching')
         
@@ -1498,7 +1570,7 @@ def run_clinical_validation(model: str, scenarios: Dict, manifest: Dict) -> Dict
         else:
             prompt = create_clinical_prompt(scenario)
         
-        model_determination = call_model(model, image_path, prompt, scenario=scenario)
+        model_determination = call_model(model, image_path, prompt, scenario=scenario, cassette=cassette)
         
         # Handle API failures
         if model_determination is None:
@@ -1516,25 +1588,6 @@ def run_clinical_validation(model: str, scenarios: Dict, manifest: Dict) -> Dict
         expected_is_error = 'ERROR' in expected_normalized
         is_correct = model_is_error == expected_is_error
         
-        if is_correct:
-            results['correct_determinations'] += 1
-        else:
-            results['incorrect_determinations'] += 1
-        
-        # Track validation type specific metrics
-        if validation_type == 'icd_coding':
-            results['icd_validation']['total'] += 1
-            if is_correct:
-                results['icd_validation']['correct'] += 1
-        else:
-            results['treatment_validation']['total'] += 1
-            if is_correct:
-                results['treatment_validation']['correct'] += 1
-        
-        # Track error detection
-        if scenario['error_type'] != 'none' and 'ERROR' in model_determination:
-            results['total_cost_savings_potential'] += scenario['cost_impact']
-        
         scenario_result = {
             'scenario_id': scenario['id'],
             'modality': scenario['modality'],
@@ -1549,9 +1602,34 @@ def run_clinical_validation(model: str, scenarios: Dict, manifest: Dict) -> Dict
             'image_attribution': image_attribution
         }
         
-        results['scenario_results'].append(scenario_result)
+        if checkpoint is not None:
+            checkpoint.record(scenario_id, scenario_result)
+        completed[scenario_id] = scenario_result
         print(f"  Result: {'✅ CORRECT' if is_correct else '❌ INCORRECT'}\n")
     
+    # Metrics are derived from the completed scenarios (this run and resumed ones)
+    results['scenario_results'] = [completed[sid] for sid in scenarios if sid in completed]
+    for scenario_result in results['scenario_results']:
+        is_correct = scenario_result['correct']
+        if is_correct:
+            results['correct_determinations'] += 1
+        else:
+            results['incorrect_determinations'] += 1
+        
+        # Track validation type specific metrics
+        if scenario_result['validation_type'] == 'icd_coding':
+            results['icd_validation']['total'] += 1
+            if is_correct:
+                results['icd_validation']['correct'] += 1
+        else:
+            results['treatment_validation']['total'] += 1
+            if is_correct:
+                results['treatment_validation']['correct'] += 1
+        
+        # Track error detection
+        if scenario_result['error_type'] != 'none' and 'ERROR' in scenario_result['model_response']:
+            results['total_cost_savings_potential'] += scenario_result['cost_impact']
+    
     # Calculate metrics
     total = results['total_scenarios']
     results['accuracy'] = results['correct_determinations'] / total if total > 0 else 0
@@ -1669,30 +1747,58 @@ def main():
         default='beta',
         help='Environment tag for results'
     )
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument(
+        '--record',
+        action='store_true',
+        help='Record model responses to benchmarks/cassettes/ for later --replay'
+    )
+    cassette_group.add_argument(
+        '--replay',
+        action='store_true',
+        help='Replay recorded model responses (offline: no credentials or images needed)'
+    )
+    parser.add_argument(
+        '--fresh',
+        action='store_true',
+        help='Discard an interrupted run\'s checkpoint instead of resuming it'
+    )
+    parser.add_argument(
+        '--no-checkpoint',
+        action='store_true',
+        help='Do not record per-scenario checkpoints (results are only written at the end)'
+    )
     
     args = parser.parse_args()
+    cassette_mode = 'record' if args.record else 'replay' if args.replay else None
+    replay = cassette_mode == MODE_REPLAY
     
     # Load manifest
     try:
         manifest = load_manifest()
         print(f"✅ Loaded manifest with {len(manifest['images'])} images")
     except FileNotFoundError as e:
-        print(f"❌ {e}")
-        print("\nRun download script first:")
-        print("  python3 scripts/download_kaggle_medical_images.py --select-images")
-        return 1
+        if not replay:
+            print(f"❌ {e}")
+            print("\nRun download script first:")
+            print("  python3 scripts/download_kaggle_medical_images.py --select-images")
+            return 1
+        # Replays don't read images; only attributions are missing
+        print(f"ℹ️  {e} - replaying without image attributions")
+        manifest = {'images': []}
     
     # Verify images
-    all_images_exist, missing = verify_images_exist(manifest, CLINICAL_SCENARIOS)
-    if not all_images_exist:
-        print(f"\n❌ Missing images:")
-        for img in missing:
-            print(f"  - {img}")
-        print("\nRun download script first:")
-        print("  python3 scripts/download_kaggle_medical_images.py --select-images")
-        return 1
-    
-    print(f"✅ All {len(CLINICAL_SCENARIOS)} scenario images verified")
+    if not replay:
+        all_images_exist, missing = verify_images_exist(manifest, CLINICAL_SCENARIOS)
+        if not all_images_exist:
+            print(f"\n❌ Missing images:")
+            for img in missing:
+                print(f"  - {img}")
+            print("\nRun download script first:")
+            print("  python3 scripts/download_kaggle_medical_images.py --select-images")
+            return 1
+        
+        print(f"✅ All {len(CLINICAL_SCENARIOS)} scenario images verified")
     
     # Run benchmarks
     models = ['gpt-4o-mini', 'gpt-4o', 'medgemma', 'medgemma-ensemble'] \
@@ -1701,7 +1807,22 @@ def main():
     all_results = []
     
     for model in models:
-        results = run_clinical_validation(model, CLINICAL_SCENARIOS, manifest)
+        cassette = None
+        if cassette_mode:
+            cassette = Cassette(
+                PROJECT_ROOT / 'benchmarks' / 'cassettes' / f"clinical_{model}.jsonl.gz", mode=cassette_mode
+            )
+            print(f"📼 Cassette {cassette_mode}: {cassette.path.name} ({len(cassette)} recorded responses)")
+        
+        # Replays are cheap and exist to re-score; never skip scenarios from a checkpoint
+        checkpoint = None
+        if not args.no_checkpoint and not replay:
+            checkpoint = CheckpointLog.open(
+                CHECKPOINT_DIR, clinical_run_key(model, CLINICAL_SCENARIOS), fresh=args.fresh
+            )
+        results = run_clinical_validation(
+            model, CLINICAL_SCENARIOS, manifest, checkpoint=checkpoint, cassette=cassette
+        )
         all_results.append(results)
         
         # Print summary
@@ -1728,6 +1849,12 @@ def main():
             json.dump(results, f, indent=2)
         print(f"\n💾 Results saved to: {output_file}")
         
+        # Results are safe on disk; the next run with this key starts fresh
+        if checkpoint is not None:
+            checkpoint.finish()
+        if cassette is not None and not replay:
+            cassette.compact()
+        
         # Push to Supabase
         if args.push_to_supabase:
             push_to_supabase(results, args.environment)
@@ -0,0 +1,90 @@
+-- ============================================================================
+-- Migration: Atomic per-document progress updates
+-- ============================================================================
+--
+-- Issue: DBService.update_documents_progress read the whole analyses.results
+--        array, patched it in Python and wrote it back. Two round-trips per
+--        flush, O(total results) transferred, and concurrent writers could
+--        overwrite each other's progress.
+-- Solution: patch_analysis_progress() merges the progress entries in a
+--        single UPDATE. The row lock serializes concurrent patches, and only
+--        the patch itself crosses the wire.
+--
+-- Date: 2026-10-16
+-- ============================================================================
+
+-- p_progress maps document_id -> progress object, e.g.
+--   {"<document_id>": {"phase": "extraction_active", "updated_at": "..."}}
+--
+-- For each document: an existing results entry gets its "progress" replaced;
+-- otherwise a new {"document_id", "progress"} entry is appended, with
+-- progress.started_at defaulting to progress.updated_at. Results that are
+-- not an array (final results already saved) are left untouched.
+--
+-- Returns TRUE if the analysis row was updated.
+CREATE OR REPLACE FUNCTION patch_analysis_progress(
+    p_analysis_id UUID,
+    p_progress JSONB
+)
+RETURNS BOOLEAN AS $$
+DECLARE
+    v_updated INTEGER;
+BEGIN
+    UPDATE analyses a
+    SET results = (
+        SELECT COALESCE(jsonb_agg(merged.entry ORDER BY merged.grp, merged.ord, merged.doc_key), '[]'::jsonb)
+        FROM (
+            -- Existing entries, in place, with progress replaced where patched
+            SELECT
+                CASE
+                    WHEN jsonb_typeof(e.value) = 'object'
+                         AND p_progress ? (e.value->>'document_id')
+                    THEN jsonb_set(e.value, '{progress}', p_progress -> (e.value->>'document_id'))
+                    ELSE e.value
+                END AS entry,
+                0 AS grp,
+                e.ord,
+                NULL::TEXT AS doc_key
+            FROM jsonb_array_elements(COALESCE(a.results, '[]'::jsonb))
+                WITH ORDINALITY AS e(value, ord)
+
+            UNION ALL
+
+            -- New entries for documents not seen yet
+            SELECT
+                jsonb_build_object(
+                    'document_id', p.key,
+                    'progress', jsonb_build_object('started_at', p.value->'updated_at') || p.value
+                ),
+                1,
+                0,
+                p.key
+            FROM jsonb_each(p_progress) AS p(key, value)
+            WHERE NOT EXISTS (
+                SELECT 1
+                FROM jsonb_array_elements(COALESCE(a.results, '[]'::jsonb)) AS x(value)
+                WHERE jsonb_typeof(x.value) = 'object'
+                  AND x.value->>'document_id' = p.key
+            )
+        ) AS merged
+    )
+    WHERE a.analysis_id = p_analysis_id
+      AND (a.results IS NULL OR jsonb_typeof(a.results) = 'array');
+
+    GET DIAGNOSTICS v_updated = ROW_COUNT;
+    RETURN v_updated > 0;
+END;
+$$ LANGUAGE plpgsql SECURITY INVOKER;
+
+COMMENT ON FUNCTION patch_analysis_progress(UUID, JSONB) IS
+    'Atomically merges per-document progress into analyses.results (see DBService.update_documents_progress)';
+
+-- Grant execute permission to service role
+GRANT EXECUTE ON FUNCTION patch_analysis_progress(UUID, JSONB) TO service_role;
+
+-- Success message
+DO $$
+BEGIN
+    RAISE NOTICE '✅ Migration completed successfully!';
+    RAISE NOTICE 'patch_analysis_progress() is now available.';
+END $$;
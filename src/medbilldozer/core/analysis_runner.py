@@ -9,8 +9,7 @@ from medbilldozer.core.transaction_normalization import (
     normalize_line_items,
     deduplicate_transactions,
 )
-from medbilldozer.core.coverage_matrix import build_coverage_matrix
-from medbilldozer.ui.ui_coverage_matrix import render_coverage_matrix
+from medbilldozer.ui.ui_coverage_matrix import render_coverage_matrix, session_coverage_rows
 from medbilldozer.ui.ui_pipeline_dag import (
     render_pipeline_comparison,
     create_pipeline_dag_container,
@@ -255,7 +254,7 @@ def run_document_analysis(
 
     # Render coverage matrix if enabled
     if is_coverage_matrix_enabled():
-        coverage_rows = build_coverage_matrix(documents)
+        coverage_rows = session_coverage_rows(documents)
         render_coverage_matrix(coverage_rows)
 
     # Render multi-document pipeline comparison if multiple documents and DAG enabled
@@ -298,5 +297,5 @@ def render_cached_results(documents: List[Dict[str, Any]], total_potential_savin
     render_total_savings_summary(total_potential_savings, per_document_savings)
 
     if is_coverage_matrix_enabled():
-        coverage_rows = build_coverage_matrix(documents)
+        coverage_rows = session_coverage_rows(documents)
         render_coverage_matrix(coverage_rows)
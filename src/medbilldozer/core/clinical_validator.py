@@ -107,6 +107,10 @@ JUSTIFICATION: [Your explanation]
 """
         return prompt
 
+    def encode_bytes_to_base64(self, image_data: bytes) -> str:
+        """Encode in-memory image bytes to base64 string (no temp file needed)"""
+        return base64.b64encode(image_data).decode('utf-8')
+
     def call_openai_vision(self, image_path: Path, prompt: str) -> str:
         """Call OpenAI vision API"""
         if not self.openai_client:
@@ -114,8 +118,17 @@ JUSTIFICATION: [Your explanation]
 
         try:
             base64_image = self.encode_image_to_base64(image_path)
-            media_type = self.get_media_type(image_path)
+        except Exception as e:
+            return f"ERROR: {str(e)}"
+
+        return self.call_openai_vision_base64(base64_image, self.get_media_type(image_path), prompt)
 
+    def call_openai_vision_base64(self, base64_image: str, media_type: str, prompt: str) -> str:
+        """Call OpenAI vision API with an already-encoded image"""
+        if not self.openai_client:
+            return "ERROR: OpenAI API key not configured"
+
+        try:
             response = self.openai_client.chat.completions.create(
                 model=self.model,
                 messages=[
@@ -149,9 +162,19 @@ JUSTIFICATION: [Your explanation]
             # Read image bytes
             with open(image_path, 'rb') as f:
                 image_data = f.read()
+        except Exception as e:
+            return f"ERROR: {str(e)}"
+
+        return self.call_gemini_vision_bytes(image_data, self.get_media_type(image_path), prompt)
+
+    def call_gemini_vision_bytes(self, image_data: bytes, media_type: str, prompt: str) -> str:
+        """Call Gemini vision API with in-memory image bytes"""
+        if not self.genai_model:
+            return "ERROR: Gemini API key not configured"
 
+        try:
             # Create parts for Gemini
-            parts = [prompt, {"mime_type": self.get_media_type(image_path), "data": image_data}]
+            parts = [prompt, {"mime_type": media_type, "data": image_data}]
 
             response = self.genai_model.generate_content(parts)
             return response.text
@@ -159,6 +182,33 @@ JUSTIFICATION: [Your explanation]
         except Exception as e:
             return f"ERROR: {str(e)}"
 
+    def analyze_image(self, prompt: str, image_base64: str, media_type: str = "image/png") -> Dict:
+        """
+        Run a free-form prompt against an in-memory, base64-encoded image
+
+        Args:
+            prompt: Instructions for the vision model
+            image_base64: Base64-encoded image content
+            media_type: Image MIME type
+
+        Returns:
+            {
+                "findings": str,  # model response text
+                "model_response": str
+            }
+        """
+        if self.model.startswith("gpt-"):
+            response = self.call_openai_vision_base64(image_base64, media_type, prompt)
+        elif self.model.startswith("gemini-"):
+            response = self.call_gemini_vision_bytes(base64.b64decode(image_base64), media_type, prompt)
+        else:
+            response = "ERROR: Unsupported model"
+
+        return {
+            "findings": response,
+            "model_response": response
+        }
+
     def validate_treatment(
         self,
         image_path: Path,
@@ -2,10 +2,15 @@
 
 Builds a coverage matrix that relates receipts, FSA claims, and insurance claims
 across multiple documents to identify potential duplicate payments or coverage gaps.
+
+build_coverage_matrix() builds the matrix from scratch. CoverageIndex keeps
+it up to date as documents are added or removed, optionally matching
+descriptions by normalized tokens, and can be serialized per user.
 """
 # _modules/coverage_matrix.py
-from dataclasses import dataclass
-from typing import Optional, List
+import re
+from dataclasses import dataclass, replace
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, Optional, List, Set, Tuple
 
 
 @dataclass
@@ -31,6 +36,61 @@ class CoverageRow:
     status: str
 
 
+# Row columns filled by each item source
+SLOT_RECEIPT = "receipt"
+SLOT_FSA = "fsa"
+SLOT_INSURANCE = "insurance"
+
+
+def _iter_coverage_items(facts: dict) -> Iterator[Tuple[str, str, Optional[str], Any]]:
+    """Yield (slot, description, date, amount) for each coverage item in facts."""
+    for item in facts.get("receipt_items", []):
+        yield SLOT_RECEIPT, item["description"], facts.get("date_of_service"), item["amount"]
+
+    for item in facts.get("fsa_claim_items", []):
+        yield SLOT_FSA, item["description"], item.get("date_submitted"), item["amount_reimbursed"]
+
+    if facts.get("document_type") == "insurance_claim_history":
+        for claim in facts.get("insurance_claim_items", []):
+            yield SLOT_INSURANCE, claim["description"], claim["date_of_service"], claim["insurance_paid"]
+
+
+def _row_key(desc: str, date: Optional[str]) -> str:
+    """Generate unique key for matching transactions across documents."""
+    return f"{desc.lower()}|{date or ''}"
+
+
+def _new_row(description: str, date: Optional[str]) -> CoverageRow:
+    return CoverageRow(
+        description=description,
+        date=date,
+        receipt_amount=None,
+        fsa_amount=None,
+        insurance_amount=None,
+        receipt_doc=None,
+        fsa_doc=None,
+        insurance_doc=None,
+        status="",
+    )
+
+
+def _set_slot(row: CoverageRow, slot: str, amount: Any, doc_id: Optional[str]) -> None:
+    setattr(row, f"{slot}_amount", amount)
+    setattr(row, f"{slot}_doc", doc_id)
+
+
+def _coverage_status(row: CoverageRow) -> str:
+    """Label a row by which sources cover it."""
+    if row.receipt_amount and not row.fsa_amount and row.insurance_amount:
+        return "⚠️ Missing FSA"
+    elif row.receipt_amount and row.fsa_amount:
+        return "✅ Reimbursed"
+    elif row.receipt_amount and not row.insurance_amount:
+        return "❌ Not Covered"
+    else:
+        return "ℹ️ Informational"
+
+
 def build_coverage_matrix(documents: list[dict]) -> List[CoverageRow]:
     """Build a cross-document coverage matrix from analyzed documents.
 
@@ -42,95 +102,270 @@ def build_coverage_matrix(documents: list[dict]) -> List[CoverageRow]:
     """
     rows: dict[str, CoverageRow] = {}
 
-    def key(desc: str, date: Optional[str]):
-        """Generate unique key for matching transactions across documents."""
-
-        return f"{desc.lower()}|{date or ''}"
-
     for doc in documents:
         facts = doc.get("facts") or {}
         doc_id = doc.get("document_id")
-        doc_type = facts.get("document_type")
-
-        # --------------------
-        # Receipts
-        # --------------------
-        for item in facts.get("receipt_items", []):
-            k = key(item["description"], facts.get("date_of_service"))
-            rows.setdefault(
-                k,
-                CoverageRow(
-                    description=item["description"],
-                    date=facts.get("date_of_service"),
-                    receipt_amount=None,
-                    fsa_amount=None,
-                    insurance_amount=None,
-                    receipt_doc=None,
-                    fsa_doc=None,
-                    insurance_doc=None,
-                    status="",
-                )
-            )
-            rows[k].receipt_amount = item["amount"]
-            rows[k].receipt_doc = doc_id
-
-        # --------------------
-        # FSA claims
-        # --------------------
-        for item in facts.get("fsa_claim_items", []):
-            k = key(item["description"], item.get("date_submitted"))
-            rows.setdefault(
-                k,
-                CoverageRow(
-                    description=item["description"],
-                    date=item.get("date_submitted"),
-                    receipt_amount=None,
-                    fsa_amount=None,
-                    insurance_amount=None,
-                    receipt_doc=None,
-                    fsa_doc=None,
-                    insurance_doc=None,
-                    status="",
-                )
-            )
-            rows[k].fsa_amount = item["amount_reimbursed"]
-            rows[k].fsa_doc = doc_id
-
-        # --------------------
-        # Insurance claims
-        # --------------------
-        if doc_type == "insurance_claim_history":
-            for claim in facts.get("insurance_claim_items", []):
-                k = key(claim["description"], claim["date_of_service"])
-                rows.setdefault(
-                    k,
-                    CoverageRow(
-                        description=claim["description"],
-                        date=claim["date_of_service"],
-                        receipt_amount=None,
-                        fsa_amount=None,
-                        insurance_amount=None,
-                        receipt_doc=None,
-                        fsa_doc=None,
-                        insurance_doc=None,
-                        status="",
-                    )
-                )
-                rows[k].insurance_amount = claim["insurance_paid"]
-                rows[k].insurance_doc = doc_id
+
+        # Receipts, FSA claims, then insurance claims; later documents win
+        for slot, description, date, amount in _iter_coverage_items(facts):
+            k = _row_key(description, date)
+            rows.setdefault(k, _new_row(description, date))
+            _set_slot(rows[k], slot, amount, doc_id)
 
     # --------------------
     # Final status labeling
     # --------------------
     for row in rows.values():
-        if row.receipt_amount and not row.fsa_amount and row.insurance_amount:
-            row.status = "⚠️ Missing FSA"
-        elif row.receipt_amount and row.fsa_amount:
-            row.status = "✅ Reimbursed"
-        elif row.receipt_amount and not row.insurance_amount:
-            row.status = "❌ Not Covered"
-        else:
-            row.status = "ℹ️ Informational"
+        row.status = _coverage_status(row)
 
     return list(rows.values())
 
+
+# ==================================================
+# Incremental Coverage Index
+# ==================================================
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# (seq, slot, description, date, amount, doc_id)
+_Contribution = Tuple[int, str, str, Optional[str], Any, str]
+
+
+def _description_tokens(description: str) -> FrozenSet[str]:
+    """Normalized tokens used for fuzzy matching ("X-Ray, chest" -> {x, ray, chest})."""
+    return frozenset(_TOKEN_PATTERN.findall(description.lower()))
+
+
+def _token_similarity(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Jaccard similarity of two token sets."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class CoverageIndex:
+    """Coverage matrix maintained incrementally across documents.
+
+    add_document()/remove_document() touch only the rows the document's items
+    map to, so updates cost O(items in the document) instead of a rebuild
+    over the whole document history. rows() returns the same result as
+    build_coverage_matrix() over the indexed documents in the order they
+    were added (re-adding a document moves it to the end).
+
+    With fuzzy_threshold set, an item whose description has no exact
+    match on its date joins the existing row with the most similar
+    description (Jaccard similarity of normalized tokens, looked up through
+    a token index). Fuzzy assignments are made when an item is added and
+    are not revisited when other documents are removed.
+
+    to_dict()/from_dict() serialize the index as JSON-compatible data, so
+    it can be persisted per user and restored without re-reading documents.
+    """
+
+    VERSION = 1
+
+    def __init__(self, fuzzy_threshold: Optional[float] = None):
+        if fuzzy_threshold is not None and not 0 < fuzzy_threshold <= 1:
+            raise ValueError("fuzzy_threshold must be in (0, 1]")
+        self.fuzzy_threshold = fuzzy_threshold
+        self._seq = 0
+        # row key -> contributions by seq (insertion order == seq order)
+        self._contributions: Dict[str, Dict[int, _Contribution]] = {}
+        # document id -> (row key, seq) of each of its items
+        self._documents: Dict[str, List[Tuple[str, int]]] = {}
+        # row key -> tokens of the description that created the row
+        self._row_tokens: Dict[str, FrozenSet[str]] = {}
+        # (date, token) -> row keys, for fuzzy candidate lookup
+        self._token_index: Dict[Tuple[str, str], Set[str]] = {}
+        self._row_cache: Dict[str, CoverageRow] = {}
+        self._dirty: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._contributions)
+
+    def __contains__(self, document_id: str) -> bool:
+        return document_id in self._documents
+
+    @property
+    def document_ids(self) -> List[str]:
+        """Indexed document ids, in the order they were added."""
+        return list(self._documents)
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def add_document(self, document: dict) -> None:
+        """Index a document's items, replacing any earlier version of it.
+
+        Raises:
+            ValueError: If the document has no document_id
+        """
+        doc_id = document.get("document_id")
+        if doc_id is None:
+            raise ValueError("CoverageIndex documents need a document_id")
+        self.remove_document(doc_id)
+
+        entries: List[Tuple[str, int]] = []
+        for slot, description, date, amount in _iter_coverage_items(document.get("facts") or {}):
+            key = self._match_row(description, date)
+            self._seq += 1
+            self._contributions[key][self._seq] = (self._seq, slot, description, date, amount, doc_id)
+            self._dirty.add(key)
+            entries.append((key, self._seq))
+        self._documents[doc_id] = entries
+
+    def add_documents(self, documents: Iterable[dict]) -> "CoverageIndex":
+        for document in documents:
+            self.add_document(document)
+        return self
+
+    def remove_document(self, document_id: str) -> bool:
+        """Drop a document's items. Returns False if it was not indexed."""
+        entries = self._documents.pop(document_id, None)
+        if entries is None:
+            return False
+        for key, seq in entries:
+            contributions = self._contributions[key]
+            del contributions[seq]
+            if contributions:
+                self._dirty.add(key)
+            else:
+                self._drop_row(key)
+        return True
+
+    def sync(self, documents: List[dict]) -> "CoverageIndex":
+        """Make the index reflect exactly these documents.
+
+        Missing documents are removed. From the first document that is new,
+        changed or out of place, documents are re-indexed in the given
+        order, so rows() matches build_coverage_matrix(documents); the
+        unchanged prefix is untouched.
+        """
+        wanted = {doc.get("document_id"): doc for doc in documents}
+        for doc_id in [d for d in self._documents if d not in wanted]:
+            self.remove_document(doc_id)
+
+        indexed = list(self._documents)
+        start = len(wanted)
+        for position, (doc_id, document) in enumerate(wanted.items()):
+            items = list(_iter_coverage_items(document.get("facts") or {}))
+            if position >= len(indexed) or indexed[position] != doc_id or items != self._document_items(doc_id):
+                start = position
+                break
+
+        # Later documents win shared slots, so the tail goes back in order
+        tail = list(wanted.values())[start:]
+        for document in tail:
+            self.remove_document(document.get("document_id"))
+        for document in tail:
+            self.add_document(document)
+        return self
+
+    def _document_items(self, doc_id: str) -> List[Tuple[str, str, Optional[str], Any]]:
+        return [
+            self._contributions[key][seq][1:5]
+            for key, seq in self._documents[doc_id]
+        ]
+
+    def _match_row(self, description: str, date: Optional[str]) -> str:
+        """Find (or create) the row key an item belongs to."""
+        key = _row_key(description, date)
+        if key in self._contributions:
+            return key
+
+        tokens = _description_tokens(description)
+        if self.fuzzy_threshold is not None:
+            best_key, best_score = None, 0.0
+            candidates = set().union(*(self._token_index.get((date or "", t), ()) for t in tokens))
+            for candidate in sorted(candidates):
+                score = _token_similarity(tokens, self._row_tokens[candidate])
+                if score > best_score:
+                    best_key, best_score = candidate, score
+            if best_key is not None and best_score >= self.fuzzy_threshold:
+                return best_key
+
+        self._add_row(key, tokens)
+        return key
+
+    def _add_row(self, key: str, tokens: FrozenSet[str]) -> None:
+        self._contributions[key] = {}
+        self._row_tokens[key] = tokens
+        date = key.rsplit("|", 1)[1]
+        for token in tokens:
+            self._token_index.setdefault((date, token), set()).add(key)
+
+    def _drop_row(self, key: str) -> None:
+        del self._contributions[key]
+        date = key.rsplit("|", 1)[1]
+        for token in self._row_tokens.pop(key):
+            bucket = self._token_index[(date, token)]
+            bucket.discard(key)
+            if not bucket:
+                del self._token_index[(date, token)]
+        self._row_cache.pop(key, None)
+        self._dirty.discard(key)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def _build_row(self, key: str) -> CoverageRow:
+        contributions = self._contributions[key].values()
+        _, _, description, date, _, _ = next(iter(contributions))
+        row = _new_row(description, date)
+        for _, slot, _, _, amount, doc_id in contributions:
+            _set_slot(row, slot, amount, doc_id)
+        row.status = _coverage_status(row)
+        return row
+
+    def rows(self) -> List[CoverageRow]:
+        """Current coverage rows, ordered by their earliest item."""
+        for key in self._dirty:
+            self._row_cache[key] = self._build_row(key)
+        self._dirty.clear()
+        ordered = sorted(self._contributions, key=lambda k: next(iter(self._contributions[k])))
+        # Copies, so callers can't mutate cached rows
+        return [replace(self._row_cache[key]) for key in ordered]
+
+    # ------------------------------------------------------------------
+    # Serialization
+    # ------------------------------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-compatible snapshot of the index."""
+        return {
+            "version": self.VERSION,
+            "fuzzy_threshold": self.fuzzy_threshold,
+            "seq": self._seq,
+            "rows": {key: sorted(tokens) for key, tokens in self._row_tokens.items()},
+            "documents": {
+                doc_id: [[key] + list(self._contributions[key][seq]) for key, seq in entries]
+                for doc_id, entries in self._documents.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CoverageIndex":
+        """Restore an index saved with to_dict().
+
+        Raises:
+            ValueError: If the snapshot version is not supported
+        """
+        if data.get("version") != cls.VERSION:
+            raise ValueError(f"Unsupported CoverageIndex version: {data.get('version')!r}")
+        index = cls(fuzzy_threshold=data.get("fuzzy_threshold"))
+        for key, tokens in data["rows"].items():
+            index._add_row(key, frozenset(tokens))
+        # Insert in seq order so each row's contributions stay ordered
+        contributions = sorted(
+            (entry for entries in data["documents"].values() for entry in entries),
+            key=lambda entry: entry[1],
+        )
+        for key, seq, slot, description, date, amount, doc_id in contributions:
+            index._contributions[key][seq] = (seq, slot, description, date, amount, doc_id)
+            index._dirty.add(key)
+        for doc_id, entries in data["documents"].items():
+            index._documents[doc_id] = [(entry[0], entry[1]) for entry in entries]
+        index._seq = data["seq"]
+        return index
@@ -6,7 +6,9 @@ and issue analysis through a multi-phase pipeline. Provides deterministic
 issue detection and LLM-based analysis integration.
 """
 
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional, Tuple
+import dataclasses
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 import uuid
 import re
@@ -34,10 +36,12 @@ except ImportError:
         """No-op placeholder when Streamlit not available."""
         pass
 
-from medbilldozer.providers.llm_interface import ProviderRegistry, Issue
+from medbilldozer.providers.llm_interface import ProviderRegistry, Issue, FrozenIssue, LLMProvider, AnalysisResult, drain_stream
 from medbilldozer.extractors.local_heuristic_extractor import extract_facts_local
+from medbilldozer.core.document_classifier import DOCUMENT_CLASSIFIER, DOCUMENT_SIGNALS
 from medbilldozer.extractors.fact_normalizer import normalize_facts
 from medbilldozer.providers.llm_interface import ProviderRegistry
+from medbilldozer.utils.json_stream import parse_llm_json
 from medbilldozer.prompts.receipt_line_item_prompt import build_receipt_line_item_prompt
 from medbilldozer.prompts.medical_line_item_prompt import build_medical_line_item_prompt
 from medbilldozer.prompts.dental_line_item_prompt import build_dental_line_item_prompt
@@ -112,6 +116,48 @@ def _run_phase2_prompt(prompt: str, model: str) -> Optional[str]:
     return None
 
 
+def _call_analyzer(
+    provider: LLMProvider,
+    raw_text: str,
+    facts: Dict,
+    issue_callback: Optional[Callable[[Issue], None]] = None,
+) -> Tuple[AnalysisResult, str]:
+    """Call the analysis provider, fact-aware if it supports it.
+
+    Args:
+        provider: Registered analysis provider
+        raw_text: Raw document text
+        facts: Extracted facts passed to fact-aware providers
+        issue_callback: If set, analyze via provider.stream_document() and
+            forward each issue as soon as the provider yields it
+
+    Returns:
+        Tuple of (analysis result, mode) where mode is 'facts+text' or 'text_only'
+    """
+    if issue_callback is None:
+        try:
+            return provider.analyze_document(raw_text, facts=facts), "facts+text"
+        except TypeError:
+            return provider.analyze_document(raw_text), "text_only"
+
+    forwarded = []
+
+    def forward(issue: Issue) -> None:
+        forwarded.append(issue)
+        issue_callback(issue)
+
+    try:
+        return drain_stream(provider.stream_document(raw_text, facts=facts), forward), "facts+text"
+    except TypeError:
+        if forwarded:
+            raise  # Not a signature mismatch: the stream had already started
+        # Legacy text-only providers only implement analyze_document(raw_text)
+        analysis = provider.analyze_document(raw_text)
+        for issue in analysis.issues:
+            issue_callback(issue)
+        return analysis, "text_only"
+
+
 def deterministic_issues_from_facts(facts: dict) -> list[Issue]:
     issues = []
 
@@ -249,52 +295,29 @@ def compute_deterministic_savings(facts: dict) -> float:
 
 
 def normalize_issues(issues: list) -> list:
+    normalized = []
     for issue in issues:
-        # Ensure attribute exists
-        if not hasattr(issue, "max_savings"):
-            issue.max_savings = None
+        max_savings = getattr(issue, "max_savings", None)
 
         # Normalize numeric values
-        if issue.max_savings is not None:
+        if max_savings is not None:
             try:
-                issue.max_savings = round(float(issue.max_savings), 2)
+                max_savings = round(float(max_savings), 2)
             except Exception:
-                issue.max_savings = None
+                max_savings = None
 
-    return issues
+        if isinstance(issue, FrozenIssue):
+            if max_savings != issue.max_savings:
+                issue = dataclasses.replace(issue, max_savings=max_savings)
+        else:
+            issue.max_savings = max_savings
+        normalized.append(issue)
+
+    return normalized
 
 # --------------------------------------------------
 # Regex-based document classification
 # --------------------------------------------------
-DOCUMENT_SIGNALS = {
-    "medical_bill": [
-        r"\bCPT\b",
-        r"\bICD-10\b",
-        r"Date of Service",
-        r"Patient Responsibility",
-        r"Allowed Amount",
-    ],
-    "insurance_eob": [
-        r"Explanation of Benefits",
-        r"\bEOB\b",
-        r"Insurance Paid",
-        r"Claim Number",
-    ],
-    "pharmacy_receipt": [
-        r"\bRx\b",
-        r"NDC",
-        r"Pharmacy",
-        r"Copay",
-    ],
-    "dental_bill": [
-        r"\bD\d{4}\b",
-        r"Dental",
-        r"Crown",
-        r"Lab Fee",
-    ],
-}
-
-
 DOCUMENT_EXTRACTOR_MAP = {
     "medical_bill": "gpt-4o-mini",
     "insurance_eob": "gpt-4o-mini",
@@ -316,30 +339,7 @@ def classify_document(text: str) -> Dict:
     Returns:
         Dict with document_type, confidence score, and pattern match scores
     """
-    scores = {}
-
-    for doc_type, patterns in DOCUMENT_SIGNALS.items():
-        matches = sum(
-            1 for p in patterns if re.search(p, text, re.IGNORECASE)
-        )
-        if matches:
-            scores[doc_type] = matches
-
-    if not scores:
-        return {
-            "document_type": "generic",
-            "confidence": 0.0,
-            "scores": {},
-        }
-
-    best = max(scores, key=scores.get)
-    confidence = scores[best] / sum(scores.values())
-
-    return {
-        "document_type": best,
-        "confidence": round(confidence, 2),
-        "scores": scores,
-    }
+    return DOCUMENT_CLASSIFIER.scan(text).classification()
 
 
 def extract_pre_facts(text: str) -> Dict:
@@ -354,13 +354,7 @@ def extract_pre_facts(text: str) -> Dict:
     Returns:
         Dict with boolean flags and document statistics
     """
-    return {
-        "contains_cpt": bool(re.search(r"\bCPT\b", text)),
-        "contains_dental_code": bool(re.search(r"\bD\d{4}\b", text)),
-        "contains_rx": bool(re.search(r"\bRx\b", text)),
-        "line_count": len(text.splitlines()),
-        "char_count": len(text),
-    }
+    return DOCUMENT_CLASSIFIER.scan(text).pre_facts()
 
 
 # --------------------------------------------------
@@ -374,18 +368,33 @@ class OrchestratorAgent:
         extractor_override: Optional[str] = None,
         analyzer_override: Optional[str] = None,
         profile_context: Optional[str] = None,
+        concurrent_phases: bool = False,
     ):
+        """Initialize the orchestrator.
+
+        Args:
+            extractor_override: Force a specific fact extractor
+            analyzer_override: Analysis provider key (required by run())
+            profile_context: Optional patient profile prepended for extraction
+            concurrent_phases: Overlap phase-2 line-item parsing with the
+                analyzer call instead of running them back to back
+        """
         self.extractor_override = extractor_override
         self.analyzer_override = analyzer_override
         self.profile_context = profile_context
+        self.concurrent_phases = concurrent_phases
 
-    def run(self, raw_text: str, progress_callback=None) -> Dict:
+    def run(self, raw_text: str, progress_callback=None, issue_callback=None) -> Dict:
         """Run document analysis pipeline with optional progress callbacks.
 
         Args:
             raw_text: Raw document text to analyze
             progress_callback: Optional callable(workflow_log, step_status) for progress updates
                 step_status values: 'pre_extraction_active', 'extraction_active', 'line_items_active', 'analysis_active', 'complete'
+            issue_callback: Optional callable(issue) invoked for each analyzer
+                issue as the provider streams it, then for each deterministic
+                issue. The returned analysis remains authoritative (issues
+                are normalized and may be relabeled after streaming).
 
         Returns:
             Dict with facts, analysis, and _workflow_log
@@ -407,8 +416,10 @@ class OrchestratorAgent:
         if progress_callback:
             progress_callback(workflow_log, "pre_extraction_active")
 
-        classification = classify_document(raw_text)
-        pre_facts = extract_pre_facts(raw_text)
+        # One scan feeds both the classification and the pre-facts
+        document_scan = DOCUMENT_CLASSIFIER.scan(raw_text)
+        classification = document_scan.classification()
+        pre_facts = document_scan.pre_facts()
 
         document_type = (
             classification.get("document_type")
@@ -470,11 +481,104 @@ class OrchestratorAgent:
         workflow_log["extraction"]["fact_count"] = len(facts or {})
 
         # --------------------------------------------------
-        # 3️⃣b Phase-2 receipt line-item extraction (OPTIONAL)
+        # 3️⃣b Phase-2 line-item extraction (OPTIONAL)
+        # 4️⃣ Choose analyzer
+        # 5️⃣ Analyze (fact-aware if supported)
+        # --------------------------------------------------
+        if self.concurrent_phases:
+            # Phase-2 parsing and the analyzer call only depend on raw_text,
+            # so overlap the two remote round-trips. The analyzer receives a
+            # snapshot of the phase-1 facts; deterministic issues are still
+            # derived from the merged facts once both calls have finished.
+            provider, analyzer_key = self._select_analyzer(workflow_log)
+
+            if progress_callback:
+                progress_callback(workflow_log, "line_items_active")
+                progress_callback(workflow_log, "analysis_active")
+
+            with ThreadPoolExecutor(max_workers=1, thread_name_prefix="orchestrator-analysis") as pool:
+                analysis_future = pool.submit(_call_analyzer, provider, raw_text, dict(facts), issue_callback)
+                self._extract_line_items(raw_text, extractor, facts, workflow_log)
+                analysis, mode = analysis_future.result()
+        else:
+            if progress_callback:
+                progress_callback(workflow_log, "line_items_active")
+
+            self._extract_line_items(raw_text, extractor, facts, workflow_log)
+
+            provider, analyzer_key = self._select_analyzer(workflow_log)
+
+            if progress_callback:
+                progress_callback(workflow_log, "analysis_active")
+
+            analysis, mode = _call_analyzer(provider, raw_text, facts, issue_callback)
+
+        if mode == "facts+text":
+            # --- Add deterministic issues as first-class issues ---
+            deterministic_issues = deterministic_issues_from_facts(facts)
+            analysis.issues = (analysis.issues or []) + deterministic_issues
+            if issue_callback:
+                for issue in deterministic_issues:
+                    issue_callback(issue)
+
+        workflow_log["analysis"]["mode"] = mode
+
+        # normalize + enforce invariants
+        analysis.issues = normalize_issues(analysis.issues)
+
+        deterministic = compute_deterministic_savings(facts)
+
+        analysis.meta["deterministic_savings"] = deterministic
+        analysis.meta["llm_max_savings"] = round(
+            sum(i.max_savings or 0 for i in analysis.issues if getattr(i, "source", None) != "deterministic"),
+            2
+        )
+
+        analysis.meta["total_max_savings"] = round(
+            sum(i.max_savings or 0 for i in analysis.issues),
+            2
+        )
+
+
+        if not hasattr(analysis, "meta") or analysis.meta is None:
+            analysis.meta = {}
+
+        llm_total = round(
+            sum(i.max_savings or 0 for i in analysis.issues),
+            2
+        )
+
+        deterministic = analysis.meta.get("deterministic_savings", 0.0)
+
+        analysis.meta["total_max_savings"] = max(llm_total, deterministic)
+        analysis.meta["llm_max_savings"] = llm_total
+
+
+        workflow_log["analysis"]["result"] = analysis
+
+        # --------------------------------------------------
+        # Return full result
         # --------------------------------------------------
         if progress_callback:
-            progress_callback(workflow_log, "line_items_active")
+            progress_callback(workflow_log, "complete")
+
+        return {
+            "facts": facts,
+            "analysis": analysis,
+            "_orchestration": {
+                "classification": classification,
+                "extractor": extractor,
+                "analyzer": analyzer_key,
+            },
+            "_workflow_log": workflow_log,
+        }
+
+    def _extract_line_items(self, raw_text: str, extractor: str, facts: Dict, workflow_log: Dict) -> None:
+        """Run the phase-2 line-item prompt matching the extracted document type.
 
+        Parsed items are written into ``facts`` and counts/errors into
+        ``workflow_log["extraction"]``. Failures are logged, never raised.
+        """
         document_type = facts.get("document_type")
 
         if document_type == "pharmacy_receipt":
@@ -484,8 +588,7 @@ class OrchestratorAgent:
                 raw_response = _run_phase2_prompt(prompt, extractor)
 
                 if raw_response:
-                    cleaned = _clean_llm_json(raw_response)
-                    parsed = json.loads(cleaned)
+                    parsed, _ = parse_llm_json(raw_response, context="phase-2 output", root_key="receipt_items")
                     receipt_items = parsed.get("receipt_items", [])
 
                     if isinstance(receipt_items, list) and receipt_items:
@@ -509,8 +612,7 @@ class OrchestratorAgent:
 
 
                 if raw_response:
-                    cleaned = _clean_llm_json(raw_response)
-                    parsed = json.loads(cleaned)
+                    parsed, _ = parse_llm_json(raw_response, context="phase-2 output", root_key="medical_line_items")
                     items = parsed.get("medical_line_items", [])
 
                     if isinstance(items, list) and items:
@@ -534,8 +636,7 @@ class OrchestratorAgent:
 
 
                 if raw_response:
-                    cleaned = _clean_llm_json(raw_response)
-                    parsed = json.loads(cleaned)
+                    parsed, _ = parse_llm_json(raw_response, context="phase-2 output", root_key="dental_line_items")
                     items = parsed.get("dental_line_items", [])
 
                     if isinstance(items, list) and items:
@@ -559,8 +660,7 @@ class OrchestratorAgent:
 
 
                 if raw_response:
-                    cleaned = _clean_llm_json(raw_response)
-                    parsed = json.loads(cleaned)
+                    parsed, _ = parse_llm_json(raw_response, context="phase-2 output", root_key="insurance_claim_items")
                     items = parsed.get("insurance_claim_items", [])
 
                     if isinstance(items, list) and items:
@@ -584,8 +684,7 @@ class OrchestratorAgent:
 
 
                 if raw_response:
-                    cleaned = _clean_llm_json(raw_response)
-                    parsed = json.loads(cleaned)
+                    parsed, _ = parse_llm_json(raw_response, context="phase-2 output", root_key="fsa_claim_items")
                     items = parsed.get("fsa_claim_items", [])
 
                     if isinstance(items, list) and items:
@@ -598,10 +697,15 @@ class OrchestratorAgent:
                 workflow_log["extraction"]["fsa_extraction_error"] = str(e)
                 print("[fsa extraction error]", e)
 
+    def _select_analyzer(self, workflow_log: Dict) -> Tuple[LLMProvider, str]:
+        """Resolve the analysis provider, falling back to gpt-4o-mini.
 
-        # --------------------------------------------------
-        # 4️⃣ Choose analyzer
-        # --------------------------------------------------
+        Returns:
+            Tuple of (provider, analyzer_key actually used)
+
+        Raises:
+            RuntimeError: If no analyzer is configured or none is registered
+        """
         analyzer_key = self.analyzer_override
         if not analyzer_key:
             raise RuntimeError("Analyzer model must be specified (e.g. gpt-4o-mini)")
@@ -624,74 +728,6 @@ class OrchestratorAgent:
 
             analyzer_key = fallback
 
-
         workflow_log["analysis"]["analyzer"] = analyzer_key
 
-        # --------------------------------------------------
-        # 5️⃣ Analyze (fact-aware if supported)
-        # call provider (fact-aware if possible)
-        if progress_callback:
-            progress_callback(workflow_log, "analysis_active")
-
-        try:
-            analysis = provider.analyze_document(raw_text, facts=facts)
-            # --- Add deterministic issues as first-class issues ---
-            deterministic_issues = deterministic_issues_from_facts(facts)
-
-            analysis.issues = (analysis.issues or []) + deterministic_issues
-
-            workflow_log["analysis"]["mode"] = "facts+text"
-        except TypeError:
-            analysis = provider.analyze_document(raw_text)
-            workflow_log["analysis"]["mode"] = "text_only"
-
-        # normalize + enforce invariants
-        analysis.issues = normalize_issues(analysis.issues)
-
-        deterministic = compute_deterministic_savings(facts)
-
-        analysis.meta["deterministic_savings"] = deterministic
-        analysis.meta["llm_max_savings"] = round(
-            sum(i.max_savings or 0 for i in analysis.issues if getattr(i, "source", None) != "deterministic"),
-            2
-        )
-
-        analysis.meta["total_max_savings"] = round(
-            sum(i.max_savings or 0 for i in analysis.issues),
-            2
-        )
-
-
-        if not hasattr(analysis, "meta") or analysis.meta is None:
-            analysis.meta = {}
-
-        llm_total = round(
-            sum(i.max_savings or 0 for i in analysis.issues),
-            2
-        )
-
-        deterministic = analysis.meta.get("deterministic_savings", 0.0)
-
-        analysis.meta["total_max_savings"] = max(llm_total, deterministic)
-        analysis.meta["llm_max_savings"] = llm_total
-
-
-        workflow_log["analysis"]["result"] = analysis
-
-        # --------------------------------------------------
-        # Return full result
-        # --------------------------------------------------
-        if progress_callback:
-            progress_callback(workflow_log, "complete")
-
-        return {
-            "facts": facts,
-            "analysis": analysis,
-            "_orchestration": {
-                "classification": classification,
-                "extractor": extractor,
-                "analyzer": analyzer_key,
-            },
-            "_workflow_log": workflow_log,
-        }
-
+        return provider, analyzer_key
@@ -2,16 +2,23 @@
 
 Provides utilities to normalize billing transactions from various document formats
 into a canonical structure, build unique fingerprints, and deduplicate across documents.
+
+normalize_line_items()/deduplicate_transactions() work item by item.
+normalize_documents() is the columnar batch path for large claim histories:
+it normalizes each distinct raw value once, fingerprints each distinct
+transaction key once, and deduplicates with numpy in a single pass.
 """
 # _modules/transaction_normalization.py
 
 from dataclasses import dataclass
-from typing import Optional, List, Dict, Tuple
+from typing import Any, Callable, Iterable, Optional, List, Dict, Tuple
 from decimal import Decimal
 from collections import defaultdict
 import hashlib
 import json
 
+import numpy as np
+
 
 # ==================================================
 # Helpers
@@ -206,3 +213,249 @@ def deduplicate_transactions(
 
     return unique, dict(provenance)
 
+
+
+# ==================================================
+# Columnar Batch Path
+# ==================================================
+
+# Fingerprint modes for normalize_documents():
+# - "compat": SHA-256 of the sorted-key JSON, identical to
+#   build_transaction_fingerprint() (canonical_ids stay stable across paths)
+# - "packed": BLAKE2b-128 of length-prefixed UTF-8 fields; cheaper, but the
+#   ids differ from the item-by-item path, so don't mix the two
+FINGERPRINT_COMPAT = "compat"
+FINGERPRINT_PACKED = "packed"
+FINGERPRINT_MODES = (FINGERPRINT_COMPAT, FINGERPRINT_PACKED)
+
+# Fingerprint key columns, in build_transaction_fingerprint() order
+_KEY_FIELDS = ("patient_dob", "provider", "date", "cpt", "units", "billed")
+
+
+def _parse_money(value: Any) -> Optional[Decimal]:
+    return Decimal(str(value)) if value is not None else None
+
+
+class _Factorizer:
+    """Maps raw values to integer codes of their normalized form.
+
+    Each distinct raw value is normalized once; raw values that normalize
+    to the same string (e.g. "Dr. A " and "dr. a") share a code.
+    """
+
+    def __init__(self, normalize: Callable[[Any], str]):
+        self.normalize = normalize
+        self.raw_codes: Dict[Any, int] = {}
+        self.code_by_norm: Dict[str, int] = {}
+        self.uniques: List[str] = []
+
+    def code(self, raw: Any) -> int:
+        # Keyed by type too: 1, 1.0 and True are equal dict keys but format differently
+        key = (type(raw), raw)
+        try:
+            return self.raw_codes[key]
+        except KeyError:
+            pass
+        except TypeError:  # unhashable raw value; normalize without caching
+            return self._norm_code(self.normalize(raw))
+        code = self.raw_codes[key] = self._norm_code(self.normalize(raw))
+        return code
+
+    def _norm_code(self, norm: str) -> int:
+        code = self.code_by_norm.get(norm)
+        if code is None:
+            code = self.code_by_norm[norm] = len(self.uniques)
+            self.uniques.append(norm)
+        return code
+
+    def encode(self, values: Iterable[Any]) -> np.ndarray:
+        return np.fromiter((self.code(v) for v in values), dtype=np.int64)
+
+
+def _compat_fingerprint(fields: Tuple[str, ...]) -> str:
+    # Same bytes as json.dumps(parts, sort_keys=True) in build_transaction_fingerprint
+    parts = dict(zip(_KEY_FIELDS, fields))
+    serialized = json.dumps(parts, sort_keys=True)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+def _packed_fingerprint(fields: Tuple[str, ...]) -> str:
+    hasher = hashlib.blake2b(digest_size=16)
+    for field in fields:
+        data = field.encode("utf-8")
+        hasher.update(len(data).to_bytes(4, "big"))
+        hasher.update(data)
+    return hasher.hexdigest()
+
+
+@dataclass
+
+
+class TransactionBatch:
+    """Normalized transactions stored column-wise.
+
+    Row i of every column describes one line item. Decimals are parsed once
+    per distinct raw amount, and NormalizedTransaction objects are only built
+    on demand (to_transactions() or for the unique rows in deduplicate()).
+    """
+    canonical_ids: np.ndarray
+    source_document_ids: List[str]
+
+    patient_dob: List[Optional[str]]
+    provider_name: List[Optional[str]]
+
+    date_of_service: List[Optional[str]]
+    cpt_code: List[Optional[str]]
+    units: List[Any]
+
+    billed_amount: List[Optional[Decimal]]
+    allowed_amount: List[Optional[Decimal]]
+
+    description: List[Optional[str]]
+
+    key_index: np.ndarray  # row -> index of its distinct fingerprint key
+
+    def __len__(self) -> int:
+        return len(self.source_document_ids)
+
+    def transaction(self, row: int) -> NormalizedTransaction:
+        """Materialize one row."""
+        return NormalizedTransaction(
+            canonical_id=str(self.canonical_ids[row]),
+            source_document_id=self.source_document_ids[row],
+
+            patient_dob=self.patient_dob[row],
+            provider_name=self.provider_name[row],
+
+            date_of_service=self.date_of_service[row],
+            cpt_code=self.cpt_code[row],
+            units=self.units[row],
+
+            billed_amount=self.billed_amount[row],
+            allowed_amount=self.allowed_amount[row],
+
+            description=self.description[row],
+        )
+
+    def to_transactions(self) -> List[NormalizedTransaction]:
+        """Materialize every row (same result as normalize_line_items)."""
+        return [self.transaction(row) for row in range(len(self))]
+
+    def deduplicate(self) -> Tuple[
+        Dict[str, NormalizedTransaction],
+        Dict[str, List[str]],
+    ]:
+        """Deduplicate in one pass; same result as deduplicate_transactions()."""
+        if not len(self):
+            return {}, {}
+
+        # Group rows by fingerprint key; a stable sort keeps document order
+        order = np.argsort(self.key_index, kind="stable")
+        sorted_keys = self.key_index[order]
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        groups = np.split(order, starts[1:])
+
+        # Emit groups in order of first occurrence, as the dict-based path does
+        unique: Dict[str, NormalizedTransaction] = {}
+        provenance: Dict[str, List[str]] = {}
+        for group_index in np.argsort(order[starts], kind="stable"):
+            rows = groups[group_index]
+            first = int(rows[0])
+            canonical_id = str(self.canonical_ids[first])
+            unique[canonical_id] = self.transaction(first)
+            provenance[canonical_id] = [self.source_document_ids[row] for row in rows]
+        return unique, provenance
+
+
+def normalize_documents(
+    documents: Iterable[Tuple[List[dict], str]],
+    fingerprint: str = FINGERPRINT_COMPAT,
+) -> TransactionBatch:
+    """Normalize line items from many documents into one columnar batch.
+
+    Args:
+        documents: (line_items, source_document_id) pairs, in document order
+        fingerprint: "compat" (canonical_ids identical to normalize_line_items)
+            or "packed" (faster hashing, different ids)
+
+    Returns:
+        TransactionBatch: Normalized rows; call deduplicate() for unique
+            transactions and provenance
+    """
+    if fingerprint not in FINGERPRINT_MODES:
+        raise ValueError(f"Unknown fingerprint mode {fingerprint!r}; expected one of {FINGERPRINT_MODES}")
+
+    # Ingest into columns
+    items: List[dict] = []
+    source_document_ids: List[str] = []
+    for line_items, source_document_id in documents:
+        items.extend(line_items)
+        source_document_ids.extend([source_document_id] * len(line_items))
+
+    patient_dob = [item.get("patient_dob") for item in items]
+    provider_name = [item.get("provider") for item in items]
+    date_of_service = [item.get("date_of_service") for item in items]
+    cpt_code = [item.get("cpt") for item in items]
+    units = [item.get("units", 1) for item in items]
+    raw_billed = [item.get("billed") for item in items]
+    raw_allowed = [item.get("allowed") for item in items]
+    description = [item.get("description") for item in items]
+
+    # Parse each distinct amount once
+    money_cache: Dict[Tuple[type, Any], Optional[Decimal]] = {}
+
+    def parse(raw: Any) -> Optional[Decimal]:
+        key = (type(raw), raw)
+        try:
+            return money_cache[key]
+        except KeyError:
+            value = money_cache[key] = _parse_money(raw)
+            return value
+        except TypeError:
+            return _parse_money(raw)
+
+    billed_amount = [parse(raw) for raw in raw_billed]
+    allowed_amount = [parse(raw) for raw in raw_allowed]
+
+    # Factorize each key column into codes of its normalized values
+    factorizers = [_Factorizer(_norm_str) for _ in range(4)]
+    units_factorizer = _Factorizer(lambda u: str(u or 1))
+    billed_factorizer = _Factorizer(lambda raw: _norm_money(parse(raw)))
+    codes = [
+        factorizers[0].encode(patient_dob),
+        factorizers[1].encode(provider_name),
+        factorizers[2].encode(date_of_service),
+        factorizers[3].encode(cpt_code),
+        units_factorizer.encode(units),
+        billed_factorizer.encode(raw_billed),
+    ]
+    all_factorizers = factorizers + [units_factorizer, billed_factorizer]
+
+    # Fingerprint each distinct key once
+    hash_key = _compat_fingerprint if fingerprint == FINGERPRINT_COMPAT else _packed_fingerprint
+    if items:
+        keys = np.column_stack(codes)
+        distinct, key_index = np.unique(keys, axis=0, return_inverse=True)
+        key_index = key_index.reshape(-1)
+        fingerprints = np.array([
+            hash_key(tuple(f.uniques[code] for f, code in zip(all_factorizers, row)))
+            for row in distinct.tolist()
+        ], dtype=object)
+        canonical_ids = fingerprints[key_index]
+    else:
+        key_index = np.empty(0, dtype=np.int64)
+        canonical_ids = np.empty(0, dtype=object)
+
+    return TransactionBatch(
+        canonical_ids=canonical_ids,
+        source_document_ids=source_document_ids,
+        patient_dob=patient_dob,
+        provider_name=provider_name,
+        date_of_service=date_of_service,
+        cpt_code=cpt_code,
+        units=units,
+        billed_amount=billed_amount,
+        allowed_amount=allowed_amount,
+        description=description,
+        key_index=key_index,
+    )
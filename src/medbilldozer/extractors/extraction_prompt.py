@@ -5,9 +5,10 @@ healthcare documents including bills, receipts, and claim histories.
 """
 # _modules/extraction_prompt.py
 
-import os
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List
+
+from medbilldozer.prompts.prompt_templates import PromptTemplate, SplitPrompt, prompt_prefix_key
 
 FACT_KEYS: List[str] = [
     # --- Person / patient ---
@@ -38,59 +39,15 @@ FACT_KEYS: List[str] = [
 ]
 
 
-def _load_contextual_docs() -> str:
-    """Load contextual documentation files to help guide the LLM.
-
-    Loads HAI-DEF alignment, competitive landscape, and cost analysis docs
-    to provide context about medBillDozer's purpose and methodology.
-
-    Returns:
-        str: Concatenated documentation content or empty string if files not found
-    """
-    docs_dir = Path(__file__).parent.parent.parent / "docs"
-    context_files = [
-        "HAI_DEF_ALIGNMENT.md",
-        "competitive_landscape.md",
-        "the_hidden_cost",
-    ]
-
-    context_parts = []
-
-    for filename in context_files:
-        filepath = docs_dir / filename
-        if filepath.exists():
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    context_parts.append(f"# {filename}\n\n{content}")
-            except Exception:  # nosec B110 - Intentionally skip unreadable docs files
-                # Silently skip if file can't be read
-                pass
-
-    if context_parts:
-        return "\n\n" + "="*80 + "\n" + "\n\n".join(context_parts) + "\n" + "="*80 + "\n\n"
-    return ""
-
-
-def build_fact_extraction_prompt(document_text: str, include_context: bool = True) -> str:
-    """Build provider-agnostic prompt for structured healthcare fact extraction.
-
-    Compatible with OpenAI, Gemini, MedGemma, or local LLMs.
-    Optionally includes contextual documentation about medBillDozer's purpose.
-
-    Args:
-        document_text: Raw document text
-        include_context: Whether to include contextual documentation (default: True)
-
-    Returns:
-        str: Formatted extraction prompt requesting JSON with FACT_KEYS
-    """
+_DOCS_DIR = Path(__file__).parent.parent.parent / "docs"
 
-    # Load contextual documentation if requested
-    context = _load_contextual_docs() if include_context else ""
+CONTEXT_FILES: List[str] = [
+    "HAI_DEF_ALIGNMENT.md",
+    "competitive_landscape.md",
+    "the_hidden_cost",
+]
 
-    return f"""
-{context}You are extracting structured facts from healthcare-related documents.
+_FACT_EXTRACTION_INSTRUCTIONS = f"""You are extracting structured facts from healthcare-related documents.
 
 CONTEXT: You are part of medBillDozer, a consumer-first tool that helps patients
 identify billing errors by performing cross-document reconciliation across medical
@@ -290,6 +247,69 @@ OUTPUT RULES
 -----------------------------------
 DOCUMENT:
 -----------------------------------
-{document_text}
 """
 
+
+def _format_contextual_docs(contents: Dict[str, str]) -> str:
+    """Join loaded context docs into the block placed before the instructions."""
+    if not contents:
+        return ""
+    context_parts = [f"# {filename}\n\n{content}" for filename, content in contents.items()]
+    return "\n\n" + "="*80 + "\n" + "\n\n".join(context_parts) + "\n" + "="*80 + "\n\n"
+
+
+# Static prefixes: everything before the document text
+_CONTEXT_PROMPT = PromptTemplate(
+    [_DOCS_DIR / filename for filename in CONTEXT_FILES],
+    lambda contents: "\n" + _format_contextual_docs(contents) + _FACT_EXTRACTION_INSTRUCTIONS,
+)
+_PLAIN_PREFIX = "\n" + _FACT_EXTRACTION_INSTRUCTIONS
+_PLAIN_PREFIX_KEY = prompt_prefix_key(_PLAIN_PREFIX)
+
+
+def _load_contextual_docs() -> str:
+    """Load contextual documentation files to help guide the LLM.
+
+    Loads HAI-DEF alignment, competitive landscape, and cost analysis docs
+    to provide context about medBillDozer's purpose and methodology. Files
+    are read once and re-read only when they change.
+
+    Returns:
+        str: Concatenated documentation content or empty string if files not found
+    """
+    return _format_contextual_docs(_CONTEXT_PROMPT.contents())
+
+
+def build_fact_extraction_prompt_parts(document_text: str, include_context: bool = True) -> SplitPrompt:
+    """Build the fact extraction prompt as stable prefix + document suffix.
+
+    The prefix (context docs and instructions) is identical for every
+    document, so providers can cache it; see build_fact_extraction_prompt.
+
+    Args:
+        document_text: Raw document text
+        include_context: Whether to include contextual documentation (default: True)
+
+    Returns:
+        SplitPrompt: prefix + suffix equals build_fact_extraction_prompt()
+    """
+    suffix = f"{document_text}\n"
+    if include_context:
+        return _CONTEXT_PROMPT.render(suffix)
+    return SplitPrompt(prefix=_PLAIN_PREFIX, suffix=suffix, prefix_key=_PLAIN_PREFIX_KEY)
+
+
+def build_fact_extraction_prompt(document_text: str, include_context: bool = True) -> str:
+    """Build provider-agnostic prompt for structured healthcare fact extraction.
+
+    Compatible with OpenAI, Gemini, MedGemma, or local LLMs.
+    Optionally includes contextual documentation about medBillDozer's purpose.
+
+    Args:
+        document_text: Raw document text
+        include_context: Whether to include contextual documentation (default: True)
+
+    Returns:
+        str: Formatted extraction prompt requesting JSON with FACT_KEYS
+    """
+    return build_fact_extraction_prompt_parts(document_text, include_context).text
@@ -1,8 +1,8 @@
-import json
 from typing import Dict, Optional
 import google.generativeai as genai
 
 from medbilldozer.extractors.extraction_prompt import FACT_KEYS, build_fact_extraction_prompt
+from medbilldozer.utils.json_stream import parse_llm_json
 
 # Lazy client initialization to avoid requiring API key at import time
 _client = None
@@ -43,7 +43,7 @@ def extract_facts_gemini(raw_text: str) -> Dict[str, Optional[str]]:
         )
 
         text = (response.text or "").strip()
-        data = json.loads(text)
+        data, _ = parse_llm_json(text, context="fact extraction output")
 
         # Enforce schema
         return {k: data.get(k) for k in FACT_KEYS}
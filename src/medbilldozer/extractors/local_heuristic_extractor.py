@@ -8,6 +8,7 @@ Conservative by design - only extracts facts with high confidence patterns.
 import re
 from typing import Dict, Optional
 
+from medbilldozer.core.document_classifier import DOCUMENT_CLASSIFIER
 from medbilldozer.extractors.extraction_prompt import FACT_KEYS
 
 
@@ -171,23 +172,7 @@ def extract_facts_local(raw_text: str) -> Dict[str, Optional[str]]:
     # -----------------------------
     # Document type classification
     # -----------------------------
-    if re.search(r"\bD\d{4}\b", text):
-        facts["document_type"] = "dental_bill"
-
-    elif re.search(r"\b\d{5}\b", text):
-        facts["document_type"] = "medical_bill"
-
-    elif re.search(r"Receipt|Store\s*#", text, re.IGNORECASE):
-        facts["document_type"] = "pharmacy_receipt"
-
-    elif re.search(r"Flexible Spending Account|FSA|Reimbursed", text, re.IGNORECASE):
-        facts["document_type"] = "fsa_claim_history"
-
-    elif re.search(r"Insurance Claim History|Deductible|Out-of-Pocket", text, re.IGNORECASE):
-        facts["document_type"] = "insurance_claim_history"
-
-    else:
-        facts["document_type"] = "unknown"
+    facts["document_type"] = DOCUMENT_CLASSIFIER.scan(text).local_type
 
     return facts
 
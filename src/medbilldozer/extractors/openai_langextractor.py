@@ -6,15 +6,15 @@ utility functions for running arbitrary prompts against OpenAI models.
 Safe by design - never raises exceptions, always returns complete schema.
 """
 
-import json
 import re
 from typing import Dict, Optional
 from openai import OpenAI
 
 from medbilldozer.extractors.extraction_prompt import (
     FACT_KEYS,
-    build_fact_extraction_prompt,
+    build_fact_extraction_prompt_parts,
 )
+from medbilldozer.utils.json_stream import parse_llm_json
 
 
 client = OpenAI()
@@ -51,23 +51,24 @@ def extract_facts_openai(raw_text: str) -> Dict[str, Optional[str]]:
     if not raw_text or not raw_text.strip():
         return _safe_empty_result()
 
-    prompt = build_fact_extraction_prompt(raw_text)
+    prompt = build_fact_extraction_prompt_parts(raw_text)
 
 
     try:
+        # The instructions prefix is identical for every document; the cache
+        # key routes requests to servers that already hold it
         response = client.chat.completions.create(
             model="gpt-4o-mini",
             temperature=0,
             messages=[
                 {"role": "system", "content": "You extract structured healthcare facts."},
-                {"role": "user", "content": prompt},
+                {"role": "user", "content": prompt.text},
             ],
+            prompt_cache_key=f"fact-extraction-{prompt.prefix_key}",
         )
 
         content = response.choices[0].message.content or ""
-        cleaned = _clean_json(content)
-
-        data = json.loads(cleaned)
+        data, _ = parse_llm_json(content, context="fact extraction output")
 
         # Guarantee shape
         return {k: data.get(k) for k in FACT_KEYS}
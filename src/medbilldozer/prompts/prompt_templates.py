@@ -0,0 +1,134 @@
+"""Cached prompt templates with a stable prefix.
+
+Several prompts start with a large static block (instructions plus
+documentation read from docs/) followed by a small per-request part (the
+document or the user's question). Rebuilding the static block meant
+re-reading files and re-joining strings on every request.
+
+PromptTemplate assembles the static prefix once and reuses it until one of
+its source files changes (checked by mtime and size, at most every
+check_interval seconds). render() returns a SplitPrompt that keeps the
+prefix separate, so callers can:
+
+- send prefix + suffix as one string (same text as before)
+- pass prefix_key to providers that route prompt caching by key
+- put the prefix where a provider caches it (e.g. a leading message)
+"""
+# _modules/prompt_templates.py
+
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+DEFAULT_CHECK_INTERVAL = 2.0  # seconds between mtime checks
+
+# (st_mtime_ns, st_size) of a file, or None if it is missing
+_FileStamp = Optional[Tuple[int, int]]
+
+
+@dataclass(frozen=True)
+class SplitPrompt:
+    """A prompt as stable prefix + per-request suffix."""
+    prefix: str
+    suffix: str
+    prefix_key: str
+
+    @property
+    def text(self) -> str:
+        return self.prefix + self.suffix
+
+    def __str__(self) -> str:
+        return self.text
+
+
+def prompt_prefix_key(prefix: str) -> str:
+    """Short stable key identifying a prompt prefix."""
+    return hashlib.sha256(prefix.encode("utf-8")).hexdigest()[:32]
+
+
+def _stamp(path: Path) -> _FileStamp:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class PromptTemplate:
+    """Static prompt prefix assembled from files, cached until they change.
+
+    Args:
+        files: Source files, in order. Missing or unreadable files are
+            skipped (and picked up if they appear later).
+        assemble: Builds the prefix from {file name: content} of the files
+            that could be read, in the order given
+        check_interval: Minimum seconds between mtime checks; 0 checks on
+            every call
+    """
+
+    def __init__(
+        self,
+        files: Sequence[os.PathLike],
+        assemble: Callable[[Dict[str, str]], str],
+        check_interval: float = DEFAULT_CHECK_INTERVAL,
+    ):
+        self.files = [Path(f) for f in files]
+        self.assemble = assemble
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._stamps: Optional[Tuple[_FileStamp, ...]] = None
+        self._checked_at = 0.0
+        self._contents: Dict[str, str] = {}
+        self._prefix = ""
+        self._prefix_key = ""
+        self.loads = 0  # number of times the files were (re)read
+
+    def _refresh(self) -> None:
+        """Reload sources if any file changed since the last check."""
+        now = time.monotonic()
+        if self._stamps is not None and now - self._checked_at < self.check_interval:
+            return
+        stamps = tuple(_stamp(path) for path in self.files)
+        self._checked_at = now
+        if stamps == self._stamps:
+            return
+
+        contents: Dict[str, str] = {}
+        for path, stamp in zip(self.files, stamps):
+            if stamp is None:
+                continue
+            try:
+                contents[path.name] = path.read_text(encoding="utf-8")
+            except (OSError, UnicodeDecodeError):  # nosec B112 - skip unreadable docs files
+                continue
+        self._contents = contents
+        self._prefix = self.assemble(contents)
+        self._prefix_key = prompt_prefix_key(self._prefix)
+        self._stamps = stamps
+        self.loads += 1
+
+    def contents(self) -> Dict[str, str]:
+        """Current {file name: content} of the readable source files."""
+        with self._lock:
+            self._refresh()
+            return dict(self._contents)
+
+    def prefix(self) -> str:
+        with self._lock:
+            self._refresh()
+            return self._prefix
+
+    def render(self, suffix: str) -> SplitPrompt:
+        """Combine the cached prefix with a per-request suffix."""
+        with self._lock:
+            self._refresh()
+            return SplitPrompt(prefix=self._prefix, suffix=suffix, prefix_key=self._prefix_key)
+
+    def invalidate(self) -> None:
+        """Force a reload on next use."""
+        with self._lock:
+            self._stamps = None
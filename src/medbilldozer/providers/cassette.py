@@ -0,0 +1,232 @@
+"""Record/replay cassettes for provider calls.
+
+A cassette stores request fingerprints and the responses returned for them
+in a gzip-compressed JSONL file, so benchmark runs can be replayed offline:
+changes to scoring or post-processing rerun the full pipeline in seconds,
+without network access or credentials.
+
+Modes:
+- record: always call the provider and store the response
+- replay: serve only recorded responses; a miss raises CassetteMissError
+- auto:   replay what is recorded, record the rest
+
+CassetteProvider wraps an LLMProvider (keyed like CachingProvider: provider,
+model id, prompt version and normalized input). Other call sites, such as
+vision helpers, use Cassette.call() with a request_fingerprint() key.
+
+Each recorded interaction is appended as its own gzip member, so a crash
+loses at most the last write; compact() rewrites the file as one member
+for a better compression ratio.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from medbilldozer.providers.llm_interface import AnalysisResult, LLMProvider
+from medbilldozer.providers.result_cache import CachingProvider, ResultCache
+
+
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+MODE_AUTO = "auto"
+CASSETTE_MODES = (MODE_RECORD, MODE_REPLAY, MODE_AUTO)
+
+CASSETTE_VERSION = 1
+
+
+class CassetteMissError(LookupError):
+    """Replay mode found no recorded response for a request."""
+
+
+def request_fingerprint(**parts: Any) -> str:
+    """Stable SHA-256 key for a request described by keyword parts."""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class Cassette(ResultCache):
+    """Compressed, append-only store of recorded responses.
+
+    Args:
+        path: Cassette file (*.jsonl.gz); created on first recording
+        mode: record, replay or auto
+        meta: Header fields written when the file is created (e.g. the
+            provider identity); loaded from the file when it exists
+    """
+
+    def __init__(self, path: Path, mode: str = MODE_AUTO, meta: Optional[Dict[str, Any]] = None):
+        super().__init__()
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode {mode!r}, expected one of {CASSETTE_MODES}")
+        self.path = Path(path)
+        self.mode = mode
+        self.meta: Dict[str, Any] = dict(meta or {})
+        self._entries: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._header_written = False
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            if self.mode == MODE_REPLAY:
+                raise FileNotFoundError(f"Cassette not found: {self.path} (record it first)")
+            return
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if entry.get("type") == "cassette":
+                        self.meta = {k: v for k, v in entry.items() if k not in ("type", "version")}
+                        self._header_written = True
+                    elif entry.get("type") == "interaction" and "response" in entry:
+                        self._entries[entry["key"]] = entry["response"]
+        except (EOFError, OSError, zlib.error):
+            pass  # Truncated last member from an interrupted recording; keep what was read
+
+    def _write(self, lines) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = "".join(json.dumps(line, default=str) + "\n" for line in lines)
+        with gzip.open(self.path, "at", encoding="utf-8") as f:
+            f.write(data)
+
+    def _header(self) -> Dict[str, Any]:
+        return {"type": "cassette", "version": CASSETTE_VERSION, **self.meta}
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            payload = None if self.mode == MODE_RECORD else self._entries.get(key)
+            if payload is None:
+                self.stats.misses += 1
+            else:
+                self.stats.hits += 1
+            return payload
+
+    def set(self, key: str, payload: str) -> None:
+        if self.mode == MODE_REPLAY:
+            return
+        entry = {
+            "type": "interaction",
+            "key": key,
+            "recorded_at": datetime.now().isoformat(),
+            "response": payload,
+        }
+        with self._lock:
+            lines = [entry]
+            if not self._header_written:
+                lines.insert(0, self._header())
+                self._header_written = True
+            self._write(lines)
+            self._entries[key] = payload
+            self.stats.writes += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._header_written = False
+            if self.path.exists():
+                self.path.unlink()
+
+    def call(self, key: str, fetch: Callable[[], Optional[str]]) -> Optional[str]:
+        """Return the recorded response for key, or fetch (and record) it.
+
+        None responses (failed calls) are returned but not recorded.
+        """
+        payload = self.get(key)
+        if payload is not None:
+            return payload
+        if self.mode == MODE_REPLAY:
+            raise CassetteMissError(f"No recorded response for {key[:12]} in {self.path.name}; re-record with --record")
+        payload = fetch()
+        if payload is not None:
+            self.set(key, payload)
+        return payload
+
+    def compact(self) -> None:
+        """Rewrite the file as a single gzip member (latest response per key)."""
+        with self._lock:
+            if not self._entries:
+                return
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            with gzip.open(tmp, "wt", encoding="utf-8") as f:
+                f.write(json.dumps(self._header(), default=str) + "\n")
+                for key, payload in self._entries.items():
+                    f.write(json.dumps({"type": "interaction", "key": key, "response": payload}) + "\n")
+            os.replace(tmp, self.path)
+            self._header_written = True
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class _ReplayOnlyProvider(LLMProvider):
+    """Stands in for the live provider in replay mode: every call is a miss."""
+
+    def __init__(self, name: str, model_id: str, prompt_version: str):
+        self._name = name
+        self._model_id = model_id
+        self.prompt_version = prompt_version
+
+    def name(self) -> str:
+        return self._name
+
+    def model_id(self) -> str:
+        return self._model_id
+
+    def analyze_document(self, raw_text: str, facts: Optional[Dict] = None) -> AnalysisResult:
+        raise CassetteMissError(
+            f"No recorded {self._name} response for this document; re-record with --record"
+        )
+
+
+class CassetteProvider(CachingProvider):
+    """LLMProvider decorator that records to / replays from a Cassette.
+
+    Args:
+        provider: Live provider, or None to replay from the identity stored
+            in the cassette header (no credentials needed)
+        cassette: Cassette to use; its mode decides record/replay
+    """
+
+    def __init__(self, provider: Optional[LLMProvider], cassette: Cassette):
+        if provider is None:
+            if cassette.mode != MODE_REPLAY or "provider" not in cassette.meta:
+                raise ValueError("A live provider is required unless replaying a recorded cassette")
+            provider = _ReplayOnlyProvider(
+                cassette.meta["provider"],
+                cassette.meta["model_id"],
+                cassette.meta["prompt_version"],
+            )
+        elif cassette.mode == MODE_REPLAY:
+            provider = _ReplayOnlyProvider(provider.name(), provider.model_id(), provider.prompt_version)
+        if "provider" not in cassette.meta:
+            cassette.meta.update(
+                provider=provider.name(),
+                model_id=provider.model_id(),
+                prompt_version=provider.prompt_version,
+            )
+        super().__init__(provider, cassette)
+
+    @property
+    def cassette(self) -> Cassette:
+        return self.cache
+
+
+__all__ = [
+    "CASSETTE_MODES",
+    "Cassette",
+    "CassetteMissError",
+    "CassetteProvider",
+    "request_fingerprint",
+]
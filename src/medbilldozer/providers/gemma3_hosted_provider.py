@@ -5,10 +5,10 @@ for medical billing analysis.
 """
 
 import os
-import json
-import requests
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
 from medbilldozer.providers.llm_interface import LLMProvider, AnalysisResult, Issue
+from medbilldozer.providers.hf_transport import get_hf_transport
+from medbilldozer.utils.json_stream import parse_llm_json
 
 # Gemma-3-27B-IT configuration
 GEMMA3_MODEL_ID = os.getenv("GEMMA3_MODEL_ID", "google/gemma-3-27b-it")
@@ -73,10 +73,6 @@ Document:
 """
 
 
-import re
-import json
-
-
 def _extract_json(text: str) -> dict:
     """
     Extract the first valid JSON object from model output.
@@ -85,19 +81,8 @@ def _extract_json(text: str) -> dict:
     if not text:
         raise ValueError("Empty model output")
 
-    # Trim obvious whitespace
-    cleaned = text.strip()
-
-    # Fast path: already valid JSON
-    if cleaned.startswith("{"):
-        return json.loads(cleaned)
-
-    # Fallback: extract first {...} block
-    match = re.search(r"\{[\s\S]*\}", cleaned)
-    if not match:
-        raise ValueError(f"No JSON object found in model output:\n{text}")
-
-    return json.loads(match.group(0))
+    parsed, _ = parse_llm_json(text, context="model output", root_key="issues")
+    return parsed
 
 
 class Gemma3HostedProvider(LLMProvider):
@@ -110,20 +95,20 @@ class Gemma3HostedProvider(LLMProvider):
     def name(self) -> str:
         return "gemma3-27b-hosted"
 
+    def model_id(self) -> str:
+        return GEMMA3_MODEL_ID
+
     def health_check(self) -> bool:
         return bool(self.token) and bool(self.endpoint)
 
-    def analyze_document(
-        self,
-        raw_text: str,
-        facts: Optional[Dict] = None
-    ) -> AnalysisResult:
+    def _ensure_ready(self) -> None:
         if not self.token:
             raise RuntimeError("HF_API_TOKEN not set")
         
         if not self.endpoint:
             raise RuntimeError("GEMMA3_ENDPOINT not configured")
 
+    def _request(self, raw_text: str) -> Tuple[Dict[str, str], Dict]:
         headers = {
             "Authorization": f"Bearer {self.token}",
             "Content-Type": "application/json",
@@ -139,17 +124,30 @@ class Gemma3HostedProvider(LLMProvider):
             "temperature": 0.0,
             "max_tokens": 600,
         }
+        return headers, payload
 
-        response = requests.post(
-            self.endpoint,
-            headers=headers,
-            json=payload,
-            timeout=120,
-        )
-        response.raise_for_status()
+    def analyze_document(
+        self,
+        raw_text: str,
+        facts: Optional[Dict] = None
+    ) -> AnalysisResult:
+        self._ensure_ready()
+        headers, payload = self._request(raw_text)
+        data = get_hf_transport().post_json(self.endpoint, headers, payload, timeout=120)
+        return self._build_result(data)
 
-        data = response.json()
+    async def analyze_document_async(
+        self,
+        raw_text: str,
+        facts: Optional[Dict] = None
+    ) -> AnalysisResult:
+        """Async variant of analyze_document() over the pooled transport."""
+        self._ensure_ready()
+        headers, payload = self._request(raw_text)
+        data = await get_hf_transport().post_json_async(self.endpoint, headers, payload, timeout=120)
+        return self._build_result(data)
 
+    def _build_result(self, data: Dict) -> AnalysisResult:
         try:
             content = data["choices"][0]["message"]["content"]
             parsed = _extract_json(content)
@@ -0,0 +1,411 @@
+"""Pooled HTTP transport shared by the hosted Hugging Face providers.
+
+MedGemma and Gemma-3 both talk to OpenAI-compatible chat completion
+endpoints. This module gives them one connection-pooled client per process
+instead of a fresh TCP/TLS connection per request:
+
+- post_json(): blocking call over a keep-alive requests.Session
+- post_json_async(): coroutine over an httpx.AsyncClient (HTTP/2 when the
+  optional `h2` package is installed)
+- stream_chat(): blocking server-sent-events stream of completion deltas
+
+Both paths share the same per-endpoint concurrency limits and retry policy
+(exponential backoff with full jitter, honoring Retry-After on 429/503).
+
+Configuration (environment):
+    HF_MAX_CONNECTIONS        pool size (default 32)
+    HF_ENDPOINT_CONCURRENCY   default in-flight limit per endpoint (default 10)
+    HF_ENDPOINT_LIMITS        per-endpoint overrides, "url=n,url=n"
+    HF_MAX_RETRIES            retries after the first attempt (default 3)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import json
+import logging
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - async path is optional
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONNECTIONS = 32
+# Matches the per-model worker cap the benchmark runners used for MedGemma
+DEFAULT_ENDPOINT_CONCURRENCY = 10
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class HFTransportError(RuntimeError):
+    """Raised when a request fails after retries (or is not retryable)."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, body: str = "", timed_out: bool = False):
+        super().__init__(message)
+        self.status_code = status_code
+        self.body = body
+        self.timed_out = timed_out
+
+
+# ==================================================
+# Retry policy
+# ==================================================
+
+
+def parse_retry_after(value: Optional[str], now: Optional[datetime] = None) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    now = now or datetime.now(timezone.utc)
+    return max(0.0, (when - now).total_seconds())
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with full jitter, capped, honoring Retry-After."""
+    max_retries: int = 3
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+    max_retry_after: float = 120.0
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Seconds to wait before retry number `attempt` (0-based)."""
+        if retry_after is not None:
+            # The server told us when to come back; add a little jitter so
+            # workers released by the same header don't stampede together.
+            return min(self.max_retry_after, retry_after) + random.uniform(0, self.base_delay)  # nosec B311
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))  # nosec B311
+
+    def should_retry(self, attempt: int, status_code: Optional[int]) -> bool:
+        """Whether a failed attempt is retryable (None means transport error)."""
+        if attempt >= self.max_retries:
+            return False
+        return status_code is None or status_code in RETRY_STATUSES
+
+
+# ==================================================
+# Transport
+# ==================================================
+
+
+def _parse_endpoint_limits(spec: str) -> Dict[str, int]:
+    """Parse HF_ENDPOINT_LIMITS ("url=n,url=n") into a dict."""
+    limits: Dict[str, int] = {}
+    for part in (spec or "").split(","):
+        if "=" not in part:
+            continue
+        url, _, n = part.strip().rpartition("=")
+        try:
+            limits[url] = max(1, int(n))
+        except ValueError:
+            logger.warning(f"Ignoring invalid HF_ENDPOINT_LIMITS entry: {part!r}")
+    return limits
+
+
+class HFTransport:
+    """Connection-pooled JSON POST client with per-endpoint concurrency limits."""
+
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        endpoint_concurrency: int = DEFAULT_ENDPOINT_CONCURRENCY,
+        endpoint_limits: Optional[Dict[str, int]] = None,
+        retry: Optional[RetryPolicy] = None,
+    ):
+        self.max_connections = max_connections
+        self.endpoint_concurrency = endpoint_concurrency
+        self.endpoint_limits = dict(endpoint_limits or {})
+        self.retry = retry or RetryPolicy()
+        self.http2 = importlib.util.find_spec("h2") is not None
+
+        self._lock = threading.Lock()
+        self._session: Optional[requests.Session] = None
+        self._sync_limits: Dict[str, threading.BoundedSemaphore] = {}
+
+        # httpx clients and asyncio semaphores are bound to one event loop,
+        # so each loop (e.g. one per worker thread) gets its own
+        self._async_clients: Dict[asyncio.AbstractEventLoop, Any] = {}
+        self._async_limits: Dict[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]] = {}
+
+    def limit_for(self, url: str) -> int:
+        """In-flight request limit for an endpoint."""
+        return self.endpoint_limits.get(url, self.endpoint_concurrency)
+
+    def set_endpoint_limit(self, url: str, limit: int) -> None:
+        """Override the in-flight limit for one endpoint (applies to new slots)."""
+        with self._lock:
+            self.endpoint_limits[url] = max(1, limit)
+            self._sync_limits.pop(url, None)
+            for limits in self._async_limits.values():
+                limits.pop(url, None)
+
+    # ---------------- sync ----------------
+
+    def _get_session(self) -> requests.Session:
+        with self._lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=4,
+                    pool_maxsize=self.max_connections,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+            return self._session
+
+    def _sync_slot(self, url: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if url not in self._sync_limits:
+                self._sync_limits[url] = threading.BoundedSemaphore(self.limit_for(url))
+            return self._sync_limits[url]
+
+    def post_json(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        payload: Dict[str, Any],
+        timeout: float = 300,
+    ) -> Dict[str, Any]:
+        """POST JSON and return the decoded response, retrying transient failures."""
+        session = self._get_session()
+        slot = self._sync_slot(url)
+        attempt = 0
+        while True:
+            status, retry_after, error = None, None, None
+            with slot:
+                try:
+                    response = session.post(url, headers=headers, json=payload, timeout=timeout)
+                    status = response.status_code
+                    if status < 400:
+                        return response.json()
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    error = HFTransportError(
+                        f"HTTP {status} from {url}", status_code=status, body=response.text
+                    )
+                except requests.exceptions.Timeout as e:
+                    error = HFTransportError(f"Request to {url} timed out: {e}", timed_out=True)
+                except requests.exceptions.RequestException as e:
+                    error = HFTransportError(f"Request to {url} failed: {e}")
+
+            if not self.retry.should_retry(attempt, status):
+                raise error
+            wait = self.retry.delay(attempt, retry_after)
+            logger.warning(f"{error}; retrying in {wait:.1f}s (attempt {attempt + 1}/{self.retry.max_retries})")
+            time.sleep(wait)
+            attempt += 1
+
+    def stream_chat(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        payload: Dict[str, Any],
+        timeout: float = 300,
+    ) -> Iterator[str]:
+        """POST a streaming chat completion and yield content deltas.
+
+        The endpoint must speak OpenAI-style server-sent events ("data: {...}"
+        lines, terminated by "data: [DONE]"). Failures before the response
+        body starts are retried like post_json(); once it has started a
+        failure is raised immediately, because replaying would duplicate text
+        the caller already consumed.
+        """
+        session = self._get_session()
+        slot = self._sync_slot(url)
+        payload = dict(payload, stream=True)
+        attempt = 0
+        while True:
+            status, retry_after, error, streaming = None, None, None, False
+            with slot:
+                try:
+                    response = session.post(url, headers=headers, json=payload, timeout=timeout, stream=True)
+                    status = response.status_code
+                    if status < 400:
+                        streaming = True
+                        with response:
+                            yield from self._iter_sse_content(response)
+                        return
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    error = HFTransportError(
+                        f"HTTP {status} from {url}", status_code=status, body=response.text
+                    )
+                except requests.exceptions.Timeout as e:
+                    error = HFTransportError(f"Request to {url} timed out: {e}", timed_out=True)
+                except requests.exceptions.RequestException as e:
+                    error = HFTransportError(f"Request to {url} failed: {e}")
+
+            if streaming:
+                # The body had started: replaying would duplicate consumed text
+                raise HFTransportError(f"Stream from {url} interrupted: {error}", timed_out=error.timed_out)
+            if not self.retry.should_retry(attempt, status):
+                raise error
+            wait = self.retry.delay(attempt, retry_after)
+            logger.warning(f"{error}; retrying in {wait:.1f}s (attempt {attempt + 1}/{self.retry.max_retries})")
+            time.sleep(wait)
+            attempt += 1
+
+    @staticmethod
+    def _iter_sse_content(response: requests.Response) -> Iterator[str]:
+        """Yield choices[0].delta.content from an SSE chat completion body."""
+        response.encoding = "utf-8"  # SSE is always UTF-8; requests assumes latin-1 for text/*
+        for line in response.iter_lines(decode_unicode=True):
+            if not line or not line.startswith("data:"):
+                continue  # blank separators, comments, event/id fields
+            data = line[5:].strip()
+            if data == "[DONE]":
+                return
+            try:
+                event = json.loads(data)
+            except json.JSONDecodeError:
+                logger.debug(f"Skipping malformed SSE event: {data[:200]}")
+                continue
+            choices = event.get("choices") or [{}]
+            delta = choices[0].get("delta") or {}
+            content = delta.get("content")
+            if content:
+                yield content
+
+    # ---------------- async ----------------
+
+    async def _bind_loop(self) -> Tuple[Any, asyncio.AbstractEventLoop]:
+        if httpx is None:
+            raise HFTransportError("httpx is required for async requests (pip install httpx)")
+        loop = asyncio.get_running_loop()
+        stale = []
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                # Clients of finished loops (e.g. an earlier asyncio.run) can't be reused
+                for old_loop in [l for l in self._async_clients if l.is_closed()]:
+                    stale.append(self._async_clients.pop(old_loop))
+                    self._async_limits.pop(old_loop, None)
+                client = self._async_clients[loop] = httpx.AsyncClient(
+                    http2=self.http2,
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_connections,
+                    ),
+                )
+                self._async_limits[loop] = {}
+        for stale_client in stale:
+            await _close_stale_client(stale_client)
+        return client, loop
+
+    def _async_slot(self, url: str, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        with self._lock:
+            limits = self._async_limits.setdefault(loop, {})
+            if url not in limits:
+                limits[url] = asyncio.Semaphore(self.limit_for(url))
+            return limits[url]
+
+    async def post_json_async(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        payload: Dict[str, Any],
+        timeout: float = 300,
+    ) -> Dict[str, Any]:
+        """Async variant of post_json() sharing the same retry policy."""
+        client, loop = await self._bind_loop()
+        slot = self._async_slot(url, loop)
+        attempt = 0
+        while True:
+            status, retry_after, error = None, None, None
+            async with slot:
+                try:
+                    response = await client.post(url, headers=headers, json=payload, timeout=timeout)
+                    status = response.status_code
+                    if status < 400:
+                        return response.json()
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    error = HFTransportError(
+                        f"HTTP {status} from {url}", status_code=status, body=response.text
+                    )
+                except httpx.TimeoutException as e:
+                    error = HFTransportError(f"Request to {url} timed out: {e}", timed_out=True)
+                except httpx.HTTPError as e:
+                    error = HFTransportError(f"Request to {url} failed: {e}")
+
+            if not self.retry.should_retry(attempt, status):
+                raise error
+            wait = self.retry.delay(attempt, retry_after)
+            logger.warning(f"{error}; retrying in {wait:.1f}s (attempt {attempt + 1}/{self.retry.max_retries})")
+            await asyncio.sleep(wait)
+            attempt += 1
+
+    async def aclose(self) -> None:
+        """Close the async client bound to the running loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.pop(loop, None)
+            self._async_limits.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+
+    def close(self) -> None:
+        """Close the pooled sync session."""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+async def _close_stale_client(client: Any) -> None:
+    """Close an httpx client left behind by an event loop that has been closed."""
+    try:
+        await client.aclose()
+    except RuntimeError as e:
+        # Its loop is closed; unclosed sockets are released when collected
+        logger.debug(f"Closing stale async client failed: {e}")
+
+
+# Singleton instance
+_transport: Optional[HFTransport] = None
+_transport_lock = threading.Lock()
+
+
+def get_hf_transport() -> HFTransport:
+    """Get or create the process-wide HFTransport."""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = HFTransport(
+                max_connections=int(os.getenv("HF_MAX_CONNECTIONS") or DEFAULT_MAX_CONNECTIONS),
+                endpoint_concurrency=int(os.getenv("HF_ENDPOINT_CONCURRENCY") or DEFAULT_ENDPOINT_CONCURRENCY),
+                endpoint_limits=_parse_endpoint_limits(os.getenv("HF_ENDPOINT_LIMITS", "")),
+                retry=RetryPolicy(max_retries=int(os.getenv("HF_MAX_RETRIES") or 3)),
+            )
+        return _transport
+
+
+__all__ = [
+    "HFTransport",
+    "HFTransportError",
+    "RetryPolicy",
+    "get_hf_transport",
+    "parse_retry_after",
+]
@@ -6,20 +6,48 @@ Model-agnostic LLM interface for medBillDozer.
 
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
+from dataclasses import dataclass, fields
+from operator import attrgetter
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Generator, List, Mapping, Optional, Tuple
 import re
 
 # ==================================================
 # Domain models (canonical)
 # ==================================================
+#
+# Issue and AnalysisResult use __slots__ (no per-instance __dict__), which
+# keeps benchmark runs holding tens of thousands of issues small. Attribute
+# access and keyword construction are unchanged. FrozenIssue (hashable) and
+# FrozenAnalysisResult are immutable variants for results that are shared
+# or cached; freeze()/thaw() convert between the two.
+#
+# to_tuple()/to_dict() read all fields with one precomputed attrgetter
+# instead of dataclasses.asdict(), which deep-copies recursively.
 
 
-@dataclass
+class _IssueMixin:
+    __slots__ = ()
 
+    def to_tuple(self) -> Tuple[Any, ...]:
+        """Field values in ISSUE_FIELDS order."""
+        return _issue_values(self)
 
-class Issue:
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(zip(ISSUE_FIELDS, _issue_values(self)))
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]):
+        """Build from a dict, ignoring keys that are not Issue fields."""
+        return cls(**{name: data[name] for name in ISSUE_FIELDS if name in data})
+
+
+@dataclass(slots=True)
+
+
+class Issue(_IssueMixin):
     type: str
     summary: str
     evidence: Optional[str] = None
@@ -32,14 +60,75 @@ class Issue:
     source: str = "llm"          # "llm" | "deterministic"
     confidence: Optional[float] = None
 
+    def freeze(self) -> "FrozenIssue":
+        return FrozenIssue(*_issue_values(self))
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
+
+
+class FrozenIssue(_IssueMixin):
+    """Immutable Issue (fields must match Issue, in the same order)."""
+    type: str
+    summary: str
+    evidence: Optional[str] = None
+    code: Optional[str] = None
+    date: Optional[str] = None
+    recommended_action: Optional[str] = None
+    max_savings: Optional[float] = None
+    source: str = "llm"
+    confidence: Optional[float] = None
+
+    def freeze(self) -> "FrozenIssue":
+        return self
+
+    def thaw(self) -> Issue:
+        return Issue(*_issue_values(self))
+
+
+ISSUE_FIELDS: Tuple[str, ...] = tuple(f.name for f in fields(Issue))
+_issue_values = attrgetter(*ISSUE_FIELDS)
+
+
+@dataclass(slots=True)
 
 
 class AnalysisResult:
     issues: List[Issue]
     meta: Dict[str, Any]
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict for JSON; meta is shared with the result, not copied."""
+        return {"issues": [issue.to_dict() for issue in self.issues], "meta": self.meta}
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "AnalysisResult":
+        return cls(
+            issues=[Issue.from_dict(issue) for issue in data.get("issues", [])],
+            meta=dict(data.get("meta") or {}),
+        )
+
+    def freeze(self) -> "FrozenAnalysisResult":
+        return FrozenAnalysisResult(
+            issues=tuple(issue.freeze() for issue in self.issues),
+            meta=MappingProxyType(dict(self.meta)),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+
+
+class FrozenAnalysisResult:
+    """Immutable AnalysisResult: a tuple of FrozenIssues and read-only meta."""
+    issues: Tuple[FrozenIssue, ...]
+    meta: Mapping[str, Any]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"issues": [issue.to_dict() for issue in self.issues], "meta": dict(self.meta)}
+
+    def thaw(self) -> AnalysisResult:
+        return AnalysisResult(issues=[issue.thaw() for issue in self.issues], meta=dict(self.meta))
+
 
 # ==================================================
 # Provider interface
@@ -54,10 +143,17 @@ class LLMProvider(ABC):
         analyze_document(raw_text: str, facts: Optional[Dict]) -> AnalysisResult
     """
 
+    # Bump when a provider's prompt changes so cached results are not reused
+    prompt_version: str = "1"
+
     @abstractmethod
     def name(self) -> str:
         """Return a short provider name."""
 
+    def model_id(self) -> str:
+        """Return the underlying model identifier (defaults to name())."""
+        return getattr(self, "model", None) or self.name()
+
     @abstractmethod
     def analyze_document(
         self,
@@ -66,10 +162,61 @@ class LLMProvider(ABC):
     ) -> AnalysisResult:
         """Analyze a document and return structured issues."""
 
+    async def analyze_document_async(
+        self,
+        raw_text: str,
+        facts: Optional[Dict] = None
+    ) -> AnalysisResult:
+        """Async analyze_document(); runs the sync call in a worker thread unless overridden."""
+        return await asyncio.to_thread(self.analyze_document, raw_text, facts=facts)
+
+    def stream_document(
+        self,
+        raw_text: str,
+        facts: Optional[Dict] = None
+    ) -> Generator[Issue, None, AnalysisResult]:
+        """Yield issues as they are detected; the generator returns the full result.
+
+        The default waits for analyze_document() and yields its issues at
+        once. Providers backed by a streaming endpoint override this so
+        callers can surface issues while the model is still generating.
+        Use drain_stream() to consume the issues and get the result.
+        """
+        result = self.analyze_document(raw_text, facts=facts)
+        for issue in result.issues:
+            yield issue
+        return result
+
+    def analyze_documents(
+        self,
+        raw_texts: List[str],
+        facts_list: Optional[List[Optional[Dict]]] = None
+    ) -> List[AnalysisResult]:
+        """Analyze several documents; providers may override to batch requests."""
+        facts_list = facts_list or [None] * len(raw_texts)
+        return [
+            self.analyze_document(raw_text, facts=facts)
+            for raw_text, facts in zip(raw_texts, facts_list)
+        ]
+
     def health_check(self) -> bool:
         return True
 
 
+def drain_stream(
+    stream: Generator[Issue, None, AnalysisResult],
+    on_issue: Optional[Callable[[Issue], None]] = None
+) -> AnalysisResult:
+    """Consume a stream_document() generator, forwarding each issue to on_issue."""
+    while True:
+        try:
+            issue = next(stream)
+        except StopIteration as stop:
+            return stop.value
+        if on_issue is not None:
+            on_issue(issue)
+
+
 # ==================================================
 # Provider registry
 # ==================================================
@@ -77,11 +224,44 @@ class LLMProvider(ABC):
 
 class ProviderRegistry:
     _providers: Dict[str, LLMProvider] = {}
+    _cache = None
 
     @classmethod
     def register(cls, key: str, provider: LLMProvider) -> None:
+        if cls._cache is not None:
+            provider = cls._wrap(provider)
         cls._providers[key] = provider
 
+    @classmethod
+    def enable_cache(cls, cache) -> None:
+        """Serve analyze_document results from a ResultCache for all providers."""
+        cls._cache = cache
+        for key, provider in list(cls._providers.items()):
+            cls._providers[key] = cls._wrap(provider)
+
+    @classmethod
+    def disable_cache(cls) -> None:
+        """Remove cache wrappers from registered providers."""
+        from medbilldozer.providers.result_cache import CachingProvider
+
+        cls._cache = None
+        for key, provider in list(cls._providers.items()):
+            if isinstance(provider, CachingProvider):
+                cls._providers[key] = provider.provider
+
+    @classmethod
+    def cache(cls):
+        """Return the active ResultCache, if any."""
+        return cls._cache
+
+    @classmethod
+    def _wrap(cls, provider: LLMProvider) -> LLMProvider:
+        from medbilldozer.providers.result_cache import CachingProvider
+
+        if isinstance(provider, CachingProvider):
+            provider = provider.provider
+        return CachingProvider(provider, cls._cache)
+
     @classmethod
     def get(cls, key: str) -> Optional[LLMProvider]:
         return cls._providers.get(key)
@@ -216,5 +396,8 @@ __all__ = [
     "LocalHeuristicProvider",
     "Issue",
     "AnalysisResult",
+    "FrozenIssue",
+    "FrozenAnalysisResult",
+    "drain_stream",
 ]
 
@@ -8,12 +8,14 @@ deterministic mapping to improve interoperability with the benchmark runner.
 
 import os
 import json
-from typing import Optional, Dict, List
+import asyncio
+from typing import Optional, Dict, Generator, List
 
 from openai import OpenAI
 
 from medbilldozer.providers.llm_interface import LLMProvider, AnalysisResult, Issue
 from medbilldozer.providers.medgemma_hosted_provider import MedGemmaHostedProvider
+from medbilldozer.providers.ensemble_heuristics import HEURISTICS, LabelCanonicalizer
 
 
 SIMPLE_LABEL_MAP: Dict[str, str] = {
@@ -69,6 +71,9 @@ SIMPLE_LABEL_MAP: Dict[str, str] = {
     "billed twice": "temporal_violation",
 }
 
+# Built once: Aho–Corasick over the label map keys
+_LABEL_CANONICALIZER = LabelCanonicalizer(SIMPLE_LABEL_MAP)
+
 
 class MedGemmaEnsembleProvider(LLMProvider):
     """Wrapper provider that calls MedGemma then canonicalizes labels."""
@@ -81,34 +86,20 @@ class MedGemmaEnsembleProvider(LLMProvider):
     def name(self) -> str:
         return "medgemma-ensemble"
 
+    def model_id(self) -> str:
+        return self.medgemma.model_id()
+
+    @property
+    def prompt_version(self) -> str:
+        # Canonicalization changes results just like a prompt change would
+        return f"{self.medgemma.prompt_version}+labels-{len(SIMPLE_LABEL_MAP)}+openai-{int(self.enable_openai)}"
+
     def health_check(self) -> bool:
         return self.medgemma.health_check()
 
     def _canonicalize_type(self, raw_type: Optional[str], summary: Optional[str]) -> str:
         """Try to map free-form type/summary into a canonical issue type."""
-        if not raw_type and not summary:
-            return "other"
-
-        candidates: List[str] = []
-        if raw_type:
-            candidates.append(raw_type.lower())
-        if summary:
-            candidates.append(summary.lower())
-
-        for c in candidates:
-            # direct exact mapping
-            if c in SIMPLE_LABEL_MAP:
-                return SIMPLE_LABEL_MAP[c]
-
-            # substring matching
-            for key, val in SIMPLE_LABEL_MAP.items():
-                if key in c:
-                    return val
-
-        # fallback heuristic: normalize underscores/spaces
-        t = (raw_type or summary or "other").lower().strip()
-        t = t.replace(" ", "_").replace("-", "_")
-        return t
+        return _LABEL_CANONICALIZER.canonicalize(raw_type, summary)
 
     def _call_openai_canonicalizer(self, items: List[Dict[str, str]]) -> List[Dict[str, object]]:
         """Call OpenAI to canonicalize a list of {raw_type, summary} items.
@@ -167,7 +158,52 @@ class MedGemmaEnsembleProvider(LLMProvider):
     def analyze_document(self, raw_text: str, facts: Optional[Dict] = None) -> AnalysisResult:
         # Run MedGemma first
         result = self.medgemma.analyze_document(raw_text, facts)
+        return self._postprocess(raw_text, result)
+
+    async def analyze_document_async(self, raw_text: str, facts: Optional[Dict] = None) -> AnalysisResult:
+        result = await self.medgemma.analyze_document_async(raw_text, facts)
+        # The optional OpenAI canonicalizer is a blocking call; keep it off the loop
+        return await asyncio.to_thread(self._postprocess, raw_text, result)
+
+    def stream_document(
+        self,
+        raw_text: str,
+        facts: Optional[Dict] = None
+    ) -> Generator[Issue, None, AnalysisResult]:
+        # Stream MedGemma issues with the deterministic label mapping applied;
+        # the final result may still refine labels via the OpenAI canonicalizer
+        stream = self.medgemma.stream_document(raw_text, facts)
+        while True:
+            try:
+                item = next(stream)
+            except StopIteration as stop:
+                result = stop.value
+                break
+            yield Issue(
+                type=self._canonicalize_type(item.type, item.summary),
+                summary=item.summary,
+                evidence=item.evidence,
+                code=item.code,
+                max_savings=item.max_savings,
+                recommended_action=item.recommended_action,
+            )
 
+        final = self._postprocess(raw_text, result)
+        # Heuristic issues are appended after the canonicalized model issues
+        yield from final.issues[len(result.issues):]
+        return final
+
+    def analyze_documents(
+        self,
+        raw_texts: List[str],
+        facts_list: Optional[List[Optional[Dict]]] = None
+    ) -> List[AnalysisResult]:
+        # Batch the MedGemma calls, then post-process each document separately
+        results = self.medgemma.analyze_documents(raw_texts, facts_list)
+        return [self._postprocess(raw_text, result) for raw_text, result in zip(raw_texts, results)]
+
+    def _postprocess(self, raw_text: str, result: AnalysisResult) -> AnalysisResult:
+        """Canonicalize MedGemma labels and append deterministic heuristic issues."""
         issues = []
         # First pass: deterministic mapping
         canonical_values = set(SIMPLE_LABEL_MAP.values())
@@ -216,155 +252,6 @@ class MedGemmaEnsembleProvider(LLMProvider):
 
         # --- Deterministic heuristics (post-processing) ---
         # These are low-risk, high-value rules to catch common misses.
-        def _extract_cpt_entries(text: str):
-            # Return list of {cpt, date, snippet}
-            import re
-            entries = []
-            # find all CPT occurrences
-            for m in re.finditer(r"CPT\s*[:\s]?([0-9]{3,5})", text, re.IGNORECASE):
-                cpt = m.group(1)
-                span_start = max(0, m.start() - 120)
-                span_end = min(len(text), m.end() + 120)
-                snippet = text[span_start:span_end].replace('\n', ' ')
-                # try to find a nearby date (look backwards)
-                date_match = re.search(r"Date of Service:?\s*(\d{4}-\d{2}-\d{2}|\d{2}/\d{2}/\d{4})", text[:m.start()], re.IGNORECASE)
-                date = date_match.group(1) if date_match else None
-                # try to find a nearby monetary amount within the surrounding window
-                amount = None
-                amount_match = re.search(r"\$\s*\d{1,3}(?:,\d{3})*(?:\.\d{2})?|\d{1,3}(?:,\d{3})*(?:\.\d{2})?\s*USD", text[span_start:span_end], re.IGNORECASE)
-                if amount_match:
-                    amount = amount_match.group(0).strip()
-                else:
-                    # also accept simple patterns like 123.45 or 123
-                    amount_match = re.search(r"\$?\d{1,6}(?:\.\d{2})?", text[span_start:span_end])
-                    if amount_match:
-                        amount = amount_match.group(0).strip()
-                entries.append({"cpt": cpt, "date": date, "snippet": snippet, "pos": m.start(), "amount": amount})
-            return entries
-
-        def _heuristic_gender_mismatch(text: str, existing_codes: set):
-            # Look for sex indicator
-            import re
-            sex_match = re.search(r"Sex: ?([MF]|Male|Female|male|female)", text)
-            sex = None
-            if sex_match:
-                s = sex_match.group(1).lower()
-                if s.startswith('m'):
-                    sex = 'M'
-                elif s.startswith('f'):
-                    sex = 'F'
-
-            if not sex:
-                return []
-
-            male_keywords = ["prostate", "vasectomy", "psa", "prostatectomy"]
-            female_keywords = ["pap", "pap smear", "hysterectomy", "mammogram", "cervical", "ovary", "uterus", "oophorectomy", "cesarean", "obstetric", "pregnancy"]
-
-            issues_out = []
-            entries = _extract_cpt_entries(text)
-            # Require corroborating evidence: keyword must be within a tight window (±40 chars) of the CPT occurrence
-            window = 40
-            for e in entries:
-                snip = e.get("snippet", "")
-                cpt = e.get("cpt")
-                pos = e.get("pos")
-                if not cpt or cpt in existing_codes:
-                    continue
-                # windowed text around the CPT occurrence (tighter than the snippet)
-                start = max(0, pos - window)
-                end = min(len(text), pos + window)
-                nearby = text[start:end].lower()
-                matched = False
-                if sex == 'F':
-                    for kw in male_keywords:
-                        if kw in nearby:
-                            matched = True
-                            matched_kw = kw
-                            break
-                else:
-                    for kw in female_keywords:
-                        if kw in nearby:
-                            matched = True
-                            matched_kw = kw
-                            break
-
-                if matched:
-                    # only raise when both CPT and nearby sex-specific keyword are present
-                    issues_out.append(Issue(
-                        type="gender_mismatch",
-                        summary=f"Possible gender mismatch: found '{matched_kw}' near CPT {cpt}",
-                        evidence=snip,
-                        code=cpt,
-                        source="deterministic",
-                        confidence=0.85,
-                        max_savings=None
-                    ))
-            return issues_out
-
-        def _heuristic_duplicate_charge(text: str, existing_codes: set):
-            import re
-            # split by document markers if present
-            docs = re.split(r"---+\s*DOCUMENT\s*\d+\s*---", text, flags=re.IGNORECASE)
-            # For each doc, collect CPT entries (use _extract_cpt_entries to also capture amount/date)
-            doc_entries = []
-            for d in docs:
-                entries = _extract_cpt_entries(d)
-                # find date for this doc as fallback
-                date_match = re.search(r"Date of Service:?\s*(\d{4}-\d{2}-\d{2}|\d{2}/\d{2}/\d{4})", d, re.IGNORECASE)
-                doc_date = date_match.group(1) if date_match else None
-                doc_entries.append({"date": doc_date, "entries": entries, "snippet": d[:200].replace('\n', ' ')})
-
-            issues_out = []
-            seen = {}
-            # Build seen map keyed by (cpt, date, amount)
-            for idx, doc in enumerate(doc_entries):
-                for e in doc["entries"]:
-                    c = e.get("cpt")
-                    date = e.get("date") or doc.get("date")
-                    amount = e.get("amount")
-                    # normalize amount to string or None
-                    key = (c, date, amount)
-                    seen.setdefault(key, []).append((idx, e.get("snippet")))
-
-            # Only flag duplicates when we have corroborating date AND amount matches across occurrences
-            for (cpt, date, amount), items in seen.items():
-                if len(items) > 1 and (not cpt or cpt not in existing_codes):
-                    if date and amount:
-                        snippet = items[0][1]
-                        issues_out.append(Issue(
-                            type="duplicate_charge",
-                            summary=f"Duplicate CPT {cpt} on {date} with identical amount {amount}",
-                            evidence=f"Appears in {len(items)} documents with same date and amount. Example context: {snippet}",
-                            code=cpt,
-                            date=date,
-                            source="deterministic",
-                            confidence=0.9,
-                            max_savings=None
-                        ))
-            return issues_out
-
-        def _heuristic_drug_interactions(text: str, existing_codes: set):
-            # Simple pair checks
-            txt = text.lower()
-            issues_out = []
-            pairs = [
-                (['phenelzine', 'maoi'], ['sertraline', 'ssri', 'fluoxetine']),
-                (['warfarin', 'coumadin'], ['ibuprofen', 'naproxen', 'aspirin', 'nsaid']),
-                (['digoxin'], ['furosemide', 'loop diuretic', 'bumetanide'])
-            ]
-            for a_list, b_list in pairs:
-                a_found = next((a for a in a_list if a in txt), None)
-                b_found = next((b for b in b_list if b in txt), None)
-                if a_found and b_found:
-                    issues_out.append(Issue(
-                        type="drug_drug_interaction",
-                        summary=f"Possible drug-drug interaction: {a_found} + {b_found}",
-                        evidence=f"Both '{a_found}' and '{b_found}' found in documents.",
-                        source="deterministic",
-                        confidence=0.85,
-                        max_savings=None
-                    ))
-            return issues_out
 
         # Build set of existing CPT codes to avoid duplicates
         existing_codes = {iss.code for iss in issues if iss.code}
@@ -372,9 +259,8 @@ class MedGemmaEnsembleProvider(LLMProvider):
         # Run heuristics and append any new detected deterministic issues
         try:
             heur_issues = []
-            heur_issues.extend(_heuristic_gender_mismatch(raw_text, existing_codes))
-            heur_issues.extend(_heuristic_duplicate_charge(raw_text, existing_codes))
-            heur_issues.extend(_heuristic_drug_interactions(raw_text, existing_codes))
+            for heuristic in HEURISTICS:
+                heur_issues.extend(heuristic(raw_text, existing_codes))
 
             # Avoid adding duplicates by (type, code, summary)
             seen_sig = {(i.type, i.code, i.summary) for i in issues}
@@ -9,16 +9,20 @@ PRODUCTION HARDENING:
 - Automatic truncation repair (closes incomplete JSON)
 - Retry logic for JSON parsing failures
 - Defensive error handling (never crashes benchmark loop)
+- Pooled keep-alive transport with jittered backoff (see hf_transport)
+- Native analyze_document_async() for asyncio callers
 """
 
 import os
 import json
 import time
+import asyncio
 import requests
-import re
 import logging
-from typing import Optional, Dict, Tuple
+from typing import Optional, Dict, Generator, List, Tuple
 from medbilldozer.providers.llm_interface import LLMProvider, AnalysisResult, Issue
+from medbilldozer.providers.hf_transport import HFTransportError, get_hf_transport
+from medbilldozer.utils.json_stream import IncrementalJSONParser, parse_llm_json
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -71,6 +75,38 @@ JSON schema (return EXACTLY this structure):
 
 Document:"""
 
+BATCH_TASK_PROMPT = """Analyze EACH billing document below independently for issues. Estimate max_savings only when directly supported:
+1. Duplicate charges: max_savings = patient responsibility for ONE duplicate
+2. Math errors: max_savings = difference shown
+3. Other issues: max_savings = null unless patient amount clearly eliminated
+
+Documents are delimited by <<<DOC id>>> and <<<END id>>> markers. Never mix evidence between documents.
+
+CRITICAL OUTPUT REQUIREMENTS:
+- Return ONLY a single JSON object keyed by document id
+- Include EVERY document id, with an empty issues list if none found
+- Do NOT wrap in markdown code fences
+- Use double quotes and null; no trailing commas
+
+JSON schema (return EXACTLY this structure):
+{
+  "documents": {
+    "<id>": {
+      "issues": [
+        {"type": "string", "summary": "string", "evidence": "string", "code": "string or null", "max_savings": 0.00}
+      ]
+    }
+  }
+}
+
+Documents:"""
+
+# Batched mode packs several short documents into one request
+BATCH_MAX_DOCUMENTS = int(os.getenv("MEDGEMMA_BATCH_MAX_DOCUMENTS") or "8")
+BATCH_MAX_CHARS = int(os.getenv("MEDGEMMA_BATCH_MAX_CHARS") or "12000")
+BATCH_TOKENS_PER_DOCUMENT = 768
+BATCH_MAX_TOKENS = 8192
+
 
 import threading
 
@@ -79,21 +115,34 @@ _warmup_lock = threading.Lock()
 _endpoint_warmed_global = False
 _warmup_attempted = False  # Track if warmup was attempted (success or fail)
 
+# Empty completions are retried by the provider (HTTP-level retries live in hf_transport)
+EMPTY_CONTENT_RETRIES = 2
+EMPTY_CONTENT_RETRY_DELAY = 2
+
 
-def sanitize_and_parse_json(raw_output: str, context: str = "model output") -> Tuple[dict, bool]:
+def _empty_content_error(finish_reason: str) -> RuntimeError:
+    return RuntimeError(
+        f"Model returned empty content (finish_reason: {finish_reason}). "
+        f"This may indicate the model refused to respond or hit a content filter."
+    )
+
+
+def sanitize_and_parse_json(
+    raw_output: str,
+    context: str = "model output",
+    root_key: Optional[str] = None,
+) -> Tuple[dict, bool]:
     """
     PRODUCTION-GRADE JSON sanitization and parsing.
     
-    This function implements defensive parsing for LLM-generated JSON with:
-    - Markdown fence removal (```json, ```)
-    - Leading/trailing prose stripping
-    - Balanced brace validation
-    - Truncation repair (closes incomplete strings/arrays/objects)
-    - Multi-strategy extraction (fast path, regex extraction, repair)
+    Delegates to the shared single-pass parser in utils.json_stream, which
+    handles markdown fences, leading/trailing prose, trailing commas and
+    truncated output (open containers are closed, unfinished issues dropped).
     
     Args:
         raw_output: Raw text from LLM (may contain markdown, prose, malformed JSON)
         context: Description of where this JSON came from (for error logging)
+        root_key: Key the root object must contain (None accepts any object)
     
     Returns:
         Tuple of (parsed_dict, was_repaired)
@@ -103,182 +152,15 @@ def sanitize_and_parse_json(raw_output: str, context: str = "model output") -> T
     Raises:
         ValueError: If JSON cannot be extracted or parsed even after repair attempts
     """
-    if not raw_output or not raw_output.strip():
-        logger.error(f"Empty or whitespace-only output received in {context}")
-        raise ValueError(f"Empty {context} (received: {repr(raw_output[:100])})")
-    
-    original_output = raw_output
-    was_repaired = False
-    
-    # STEP 1: Strip whitespace
-    cleaned = raw_output.strip()
-    
-    # STEP 2: Remove markdown code fences
-    # Match: ```json\n{...}\n``` or ```\n{...}\n``` or inline ```{...}```
-    if "```" in cleaned:
-        # Remove opening fence with optional language tag
-        cleaned = re.sub(r"^```(?:json|JSON)?\s*\n?", "", cleaned, flags=re.MULTILINE)
-        # Remove closing fence
-        cleaned = re.sub(r"\s*```\s*$", "", cleaned, flags=re.MULTILINE)
-        cleaned = cleaned.strip()
-        logger.debug(f"Removed markdown fences from {context}")
-    
-    # STEP 3: Fast path - try parsing as-is
-    if cleaned.startswith("{"):
-        try:
-            parsed = json.loads(cleaned)
-            logger.debug(f"Successfully parsed {context} on fast path")
-            return parsed, was_repaired
-        except json.JSONDecodeError as e:
-            logger.debug(f"Fast path failed for {context}: {e}")
-            # Continue to repair strategies
-    
-    # STEP 4: Extract first complete {...} block using regex
-    # This handles cases where LLM adds prose before/after JSON
-    # Try to match nested JSON (up to 3 levels deep for performance)
-    for depth in range(3):
-        pattern = r'\{'
-        for _ in range(depth + 1):
-            pattern += r'(?:[^{}"]|"(?:[^"\\]|\\.)*"|\{(?:[^{}"]|"(?:[^"\\]|\\.)*")*\})*'
-        pattern += r'\}'
-        
-        match = re.search(pattern, cleaned, re.DOTALL)
-        if match:
-            extracted = match.group(0)
-            try:
-                parsed = json.loads(extracted)
-                # Validate that we extracted an issues structure, not a sub-object
-                if "issues" in parsed:
-                    logger.debug(f"Extracted valid JSON from {context} using regex (depth={depth})")
-                    return parsed, was_repaired
-                else:
-                    # Found a nested object, not the root - keep trying
-                    logger.debug(f"Found nested object without 'issues' key, continuing...")
-                    continue
-            except json.JSONDecodeError:
-                continue
-    
-    # STEP 5: Aggressive repair - handle truncated output
-    # This is common when max_tokens is hit
-    logger.warning(f"Attempting aggressive repair on {context}")
-    was_repaired = True
-    
-    # Find the outermost JSON structure
-    json_start = cleaned.find('{')
-    if json_start == -1:
-        raise ValueError(f"No JSON object found in {context}. Output: {original_output[:500]}")
-    
-    repaired = cleaned[json_start:]
-    
-    # Repair strategy 1: Remove trailing commas FIRST (before parsing attempts)
-    repaired = re.sub(r',(\s*[}\]])', r'\1', repaired)
-    
-    # Repair strategy 2: Smart truncation handling
-    # Find the last complete field before truncation
-    # Look for the last properly closed string or number
-    last_complete_pos = -1
-    in_string = False
-    escaped = False
-    depth = 0
-    
-    for i, char in enumerate(repaired):
-        if char == '\\' and not escaped:
-            escaped = True
-            continue
-        
-        if char == '"' and not escaped:
-            in_string = not in_string
-            if not in_string:
-                # String just closed
-                last_complete_pos = i
-        
-        if not in_string:
-            if char in '{[':
-                depth += 1
-            elif char in '}]':
-                depth -= 1
-                if depth >= 0:
-                    last_complete_pos = i
-        
-        escaped = False
-    
-    # If we have an unterminated string, truncate to last complete position
-    # and rebuild from there
-    if in_string and last_complete_pos > 0:
-        logger.debug(f"Truncating at last complete field (pos {last_complete_pos})")
-        repaired = repaired[:last_complete_pos + 1]
-    
-    # Repair strategy 3: Balance braces and brackets
-    open_braces = repaired.count('{') - repaired.count('}')
-    open_brackets = repaired.count('[') - repaired.count(']')
-    
-    if open_brackets > 0:
-        logger.debug(f"Closing {open_brackets} unclosed arrays in {context}")
-        repaired += ']' * open_brackets
-    
-    if open_braces > 0:
-        logger.debug(f"Closing {open_braces} unclosed objects in {context}")
-        repaired += '}' * open_braces
-    
-    # Repair strategy 4: Try parsing repaired JSON
     try:
-        parsed = json.loads(repaired)
-        logger.info(f"Successfully repaired and parsed {context}")
-        return parsed, was_repaired
-    except json.JSONDecodeError as e:
-        logger.debug(f"Repair attempt failed: {e}")
-        
-        # Fallback 1: Try to find last valid complete object in issues array
-        # Extract up to the last complete issue object
-        issues_pattern = r'"issues"\s*:\s*\[([^\]]*)\]'
-        issues_match = re.search(issues_pattern, repaired, re.DOTALL)
-        
-        if issues_match:
-            issues_content = issues_match.group(1)
-            # Try to parse what we have
-            try:
-                minimal = '{"issues": [' + issues_content + ']}'
-                parsed = json.loads(minimal)
-                logger.warning(f"Extracted issues array from malformed {context}")
-                return parsed, True
-            except json.JSONDecodeError:
-                # Try parsing individual complete issue objects
-                # Find all complete {...} blocks within issues
-                issue_objects = []
-                brace_depth = 0
-                current_obj = ""
-                
-                for char in issues_content:
-                    current_obj += char
-                    if char == '{':
-                        brace_depth += 1
-                    elif char == '}':
-                        brace_depth -= 1
-                        if brace_depth == 0 and current_obj.strip():
-                            # Try to parse this object
-                            try:
-                                obj = json.loads(current_obj.strip().rstrip(','))
-                                issue_objects.append(obj)
-                                current_obj = ""
-                            except json.JSONDecodeError:
-                                current_obj = ""
-                
-                if issue_objects:
-                    logger.warning(f"Extracted {len(issue_objects)} complete issue objects")
-                    return {"issues": issue_objects}, True
-        
-        # Fallback 2: Return empty issues if we have valid opening structure
-        if repaired.startswith('{"issues":'):
-            logger.error(f"Returning empty issues due to parse failure in {context}")
-            return {"issues": []}, True
-        
-        # All repair strategies failed
-        error_preview = original_output[:500] + ("..." if len(original_output) > 500 else "")
-        raise ValueError(
-            f"Failed to parse {context} even after repair attempts.\n"
-            f"Final error: {e}\n"
-            f"Original output (truncated): {error_preview}"
-        )
+        parsed, was_repaired = parse_llm_json(raw_output, context=context, root_key=root_key)
+    except ValueError as e:
+        logger.error(f"JSON parsing failed for {context}: {str(e)[:200]}")
+        raise
+
+    if was_repaired:
+        logger.warning(f"Repaired malformed JSON in {context}")
+    return parsed, was_repaired
 
 
 class MedGemmaHostedProvider(LLMProvider):
@@ -288,6 +170,9 @@ class MedGemmaHostedProvider(LLMProvider):
     def name(self) -> str:
         return "medgemma-hosted"
 
+    def model_id(self) -> str:
+        return HF_MODEL_ID
+
     def health_check(self) -> bool:
         return bool(self.token)
     
@@ -394,132 +279,183 @@ class MedGemmaHostedProvider(LLMProvider):
             
             return False
 
-    def _call_model(
-        self, 
-        prompt: str, 
-        max_tokens: int = 4096,
-        retry_count: int = 0
-    ) -> str:
+    def _headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.token}",
+            "Content-Type": "application/json",
+        }
+
+    def _chat_payload(self, prompt: str, max_tokens: int) -> Dict:
         """
-        Call HuggingFace model with production-grade parameters.
-        
+        Build the chat completion payload with production-grade parameters.
+
         Uses deterministic decoding to ensure reproducible, parseable output:
         - temperature = 0 (deterministic, no randomness)
-        - top_p = 1.0 (consider full probability distribution) 
+        - top_p = 1.0 (consider full probability distribution)
         - do_sample = False (greedy decoding, most likely token)
         - stop tokens to prevent markdown fences
-        
-        Args:
-            prompt: Full prompt including system and task instructions
-            max_tokens: Maximum tokens to generate (default 4096)
-            retry_count: Internal retry counter
-            
-        Returns:
-            Raw model output string
-            
-        Raises:
-            RuntimeError: On API errors or max retries exceeded
         """
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json",
-        }
-        
-        # PRODUCTION CONFIGURATION: Deterministic decoding
-        payload = {
+        return {
             "model": HF_MODEL_ID,
             "messages": [{"role": "user", "content": prompt}],
             "temperature": 0.0,        # Deterministic (no randomness)
             "top_p": 1.0,              # Consider full distribution
             "max_tokens": max_tokens,  # Sufficient for complete JSON
             "stop": ["```", "```json", "```JSON"],  # Prevent markdown fences
+            "do_sample": False,        # Greedy decoding (ignored by some endpoints)
         }
-        
-        # Try to add do_sample if supported (some HF endpoints ignore this)
-        try:
-            payload["do_sample"] = False  # Greedy decoding
-        except (KeyError, TypeError) as e:  # nosec B110
-            # Some endpoints don't support this parameter - continue without it
-            logger.debug(f"Could not set do_sample parameter: {e}")
-        
+
+    def _api_error(self, error: HFTransportError) -> RuntimeError:
+        """Translate a transport failure into the provider's RuntimeError."""
+        if error.status_code == 400:
+            error_detail = error.body
+            try:
+                error_detail = json.dumps(json.loads(error.body), indent=2)
+            except (json.JSONDecodeError, ValueError):
+                pass
+            return RuntimeError(
+                f"HuggingFace API returned 400 Bad Request.\n"
+                f"Model: {HF_MODEL_ID}\n"
+                f"Endpoint: {HF_MODEL_URL}\n"
+                f"Error details:\n{error_detail}"
+            )
+        if error.timed_out:
+            return RuntimeError("Model request timed out after retries")
+        return RuntimeError(f"Model API request failed: {error}")
+
+    def _extract_content(self, data: Dict, max_tokens: int) -> Tuple[Optional[str], str]:
+        """
+        Pull the message content out of a chat completion response.
+
+        Returns:
+            Tuple of (content or None if empty, finish_reason)
+
+        Raises:
+            RuntimeError: If the response does not have the expected structure
+        """
         try:
-            response = requests.post(
-                HF_MODEL_URL,
-                headers=headers,
-                json=payload,
-                timeout=300,  # 5 min timeout
+            content = data["choices"][0]["message"]["content"]
+        except (KeyError, IndexError) as e:
+            logger.error(f"Unexpected API response structure: {e}")
+            logger.error(f"Response keys: {list(data.keys())}")
+            logger.error(f"Full response (first 1000 chars): {json.dumps(data, indent=2)[:1000]}")
+            raise RuntimeError(
+                f"Unexpected API response structure: {e}\n"
+                f"Response: {json.dumps(data, indent=2)[:1000]}"
             )
-            
-            # Detailed error handling for 400 errors
-            if response.status_code == 400:
-                error_detail = response.text
-                try:
-                    error_json = response.json()
-                    error_detail = json.dumps(error_json, indent=2)
-                except (json.JSONDecodeError, ValueError):
-                    pass
-                raise RuntimeError(
-                    f"HuggingFace API returned 400 Bad Request.\n"
-                    f"Model: {HF_MODEL_ID}\n"
-                    f"Endpoint: {HF_MODEL_URL}\n"
-                    f"Error details:\n{error_detail}"
-                )
-            
-            response.raise_for_status()
-            data = response.json()
-            
-            # Extract content from response with validation
+
+        finish_reason = data["choices"][0].get("finish_reason") or "unknown"
+
+        # Handle empty or None content
+        if content is None or (isinstance(content, str) and not content.strip()):
+            logger.error(
+                f"Model returned empty content. "
+                f"finish_reason={finish_reason}"
+            )
+            logger.debug(f"Full response: {json.dumps(data, indent=2)[:500]}")
+            return None, finish_reason
+
+        # Check for truncation warning
+        if finish_reason == "length":
+            logger.warning(
+                f"Model output truncated (hit max_tokens={max_tokens}). "
+                f"Will attempt JSON repair."
+            )
+
+        return content, finish_reason
+
+    def _call_model(self, prompt: str, max_tokens: int = 4096) -> str:
+        """
+        Call HuggingFace model over the pooled transport.
+
+        Transient HTTP failures (429/5xx, timeouts) are retried by the
+        transport with jittered backoff; empty completions are retried here.
+
+        Args:
+            prompt: Full prompt including system and task instructions
+            max_tokens: Maximum tokens to generate (default 4096)
+
+        Returns:
+            Raw model output string
+
+        Raises:
+            RuntimeError: On API errors or max retries exceeded
+        """
+        payload = self._chat_payload(prompt, max_tokens)
+        finish_reason = "unknown"
+        for attempt in range(EMPTY_CONTENT_RETRIES + 1):
+            if attempt:
+                logger.warning(f"Empty content received, retrying... (attempt {attempt})")
+                time.sleep(EMPTY_CONTENT_RETRY_DELAY)
             try:
-                content = data["choices"][0]["message"]["content"]
-            except (KeyError, IndexError) as e:
-                logger.error(f"Unexpected API response structure: {e}")
-                logger.error(f"Response keys: {list(data.keys())}")
-                logger.error(f"Full response (first 1000 chars): {json.dumps(data, indent=2)[:1000]}")
-                raise RuntimeError(
-                    f"Unexpected API response structure: {e}\n"
-                    f"Response: {json.dumps(data, indent=2)[:1000]}"
-                )
-            
-            # Handle empty or None content
-            if content is None or (isinstance(content, str) and not content.strip()):
-                finish_reason = data["choices"][0].get("finish_reason", "unknown")
-                logger.error(
-                    f"Model returned empty content. "
-                    f"finish_reason={finish_reason}"
-                )
-                logger.debug(f"Full response: {json.dumps(data, indent=2)[:500]}")
-                raise RuntimeError(
-                    f"Model returned empty content (finish_reason: {finish_reason}). "
-                    f"This may indicate the model refused to respond or hit a content filter."
-                )
-            
-            # Check for truncation warning
-            finish_reason = data["choices"][0].get("finish_reason")
-            if finish_reason == "length":
-                logger.warning(
-                    f"Model output truncated (hit max_tokens={max_tokens}). "
-                    f"Will attempt JSON repair."
-                )
-            
-            return content
-            
-        except RuntimeError as e:
-            # Handle empty content with retry
-            if "empty content" in str(e).lower() and retry_count < 2:
-                logger.warning(f"Empty content received, retrying... (attempt {retry_count + 1})")
-                time.sleep(2)
-                return self._call_model(prompt, max_tokens, retry_count + 1)
-            raise
-        
-        except requests.exceptions.Timeout:
-            if retry_count < 1:
-                logger.warning(f"Request timeout, retrying... (attempt {retry_count + 1})")
-                time.sleep(5)
-                return self._call_model(prompt, max_tokens, retry_count + 1)
-            raise RuntimeError("Model request timed out after retries")
-        
-        except requests.exceptions.RequestException as e:
-            raise RuntimeError(f"Model API request failed: {e}")
+                data = get_hf_transport().post_json(HF_MODEL_URL, self._headers(), payload, timeout=300)
+            except HFTransportError as e:
+                raise self._api_error(e) from e
+            content, finish_reason = self._extract_content(data, max_tokens)
+            if content is not None:
+                return content
+        raise _empty_content_error(finish_reason)
+
+    async def _call_model_async(self, prompt: str, max_tokens: int = 4096) -> str:
+        """Async variant of _call_model()."""
+        payload = self._chat_payload(prompt, max_tokens)
+        finish_reason = "unknown"
+        for attempt in range(EMPTY_CONTENT_RETRIES + 1):
+            if attempt:
+                logger.warning(f"Empty content received, retrying... (attempt {attempt})")
+                await asyncio.sleep(EMPTY_CONTENT_RETRY_DELAY)
+            try:
+                data = await get_hf_transport().post_json_async(HF_MODEL_URL, self._headers(), payload, timeout=300)
+            except HFTransportError as e:
+                raise self._api_error(e) from e
+            content, finish_reason = self._extract_content(data, max_tokens)
+            if content is not None:
+                return content
+        raise _empty_content_error(finish_reason)
+
+    def _full_prompt(self, raw_text: str) -> str:
+        return f"{SYSTEM_PROMPT}\n\n{TASK_PROMPT}\n\n{raw_text}"
+
+    def _short_prompt(self, raw_text: str) -> str:
+        # Shorten prompt by removing verbose instructions
+        return (
+            f"{SYSTEM_PROMPT}\n\n"
+            f"Return ONLY JSON: {{\"issues\": [{{\"type\": str, \"summary\": str, "
+            f"\"evidence\": str, \"code\": str|null, \"max_savings\": float|null}}]}}\n\n"
+            f"{raw_text}"
+        )
+
+    def _ensure_ready(self) -> None:
+        if not self.token:
+            raise RuntimeError("HF_API_TOKEN not set")
+
+        # Warm up endpoint if needed (only happens once globally)
+        if not self._warmup_endpoint():
+            raise RuntimeError(
+                "HuggingFace Inference Endpoint is not available. "
+                "Please start the endpoint or wait for auto-scaling."
+            )
+
+    def _error_result(self, error: str) -> AnalysisResult:
+        # DEFENSIVE: Return empty result to keep benchmark running
+        return AnalysisResult(
+            issues=[],
+            meta={
+                "provider": self.name(),
+                "model": HF_MODEL_ID,
+                "error": error,
+                "total_max_savings": 0.0,
+            },
+        )
+
+    def _parse_failure(self, first: ValueError, second: ValueError) -> AnalysisResult:
+        # Both attempts failed - return empty result rather than crash
+        logger.error(
+            f"All JSON parsing attempts failed. "
+            f"Attempt 1: {str(first)[:200]}. "
+            f"Attempt 2: {str(second)[:200]}"
+        )
+        return self._error_result("JSON parsing failed after retries")
 
     def analyze_document(
         self,
@@ -545,120 +481,103 @@ class MedGemmaHostedProvider(LLMProvider):
         Raises:
             RuntimeError: Only on unrecoverable errors (API auth, endpoint down)
         """
-        if not self.token:
-            raise RuntimeError("HF_API_TOKEN not set")
-        
-        # Warm up endpoint if needed (only happens once globally)
-        if not self._warmup_endpoint():
-            raise RuntimeError(
-                "HuggingFace Inference Endpoint is not available. "
-                "Please start the endpoint or wait for auto-scaling."
-            )
-        
-        # Build full prompt
-        prompt = f"{SYSTEM_PROMPT}\n\n{TASK_PROMPT}\n\n{raw_text}"
-        
-        # ATTEMPT 1: Full prompt with standard max_tokens
+        self._ensure_ready()
+
         try:
-            content = self._call_model(prompt, max_tokens=4096)
-            parsed, was_repaired = sanitize_and_parse_json(content, context="model output (attempt 1)")
-            
-            if was_repaired:
-                logger.info("JSON repair was needed but succeeded")
-            
-            return self._build_result(parsed)
-            
-        except ValueError as e:
-            # JSON parsing failed even after repair attempts
-            logger.error(f"JSON parsing failed on attempt 1: {e}")
-            
+            # ATTEMPT 1: Full prompt with standard max_tokens
+            try:
+                content = self._call_model(self._full_prompt(raw_text), max_tokens=4096)
+                return self._parse_content(content, attempt=1)
+            except ValueError as e:
+                # JSON parsing failed even after repair attempts
+                logger.error(f"JSON parsing failed on attempt 1: {e}")
+                first_error = e
+
             # ATTEMPT 2: Retry with higher max_tokens and shortened prompt
+            logger.info("Retrying with increased max_tokens...")
             try:
-                logger.info("Retrying with increased max_tokens...")
-                
-                # Shorten prompt by removing verbose instructions
-                short_prompt = (
-                    f"{SYSTEM_PROMPT}\n\n"
-                    f"Return ONLY JSON: {{\"issues\": [{{\"type\": str, \"summary\": str, "
-                    f"\"evidence\": str, \"code\": str|null, \"max_savings\": float|null}}]}}\n\n"
-                    f"{raw_text}"
-                )
-                
-                content = self._call_model(short_prompt, max_tokens=6144)
-                parsed, was_repaired = sanitize_and_parse_json(
-                    content, 
-                    context="model output (attempt 2 - shortened)"
-                )
-                
-                logger.info("Retry succeeded with shortened prompt")
-                return self._build_result(parsed)
-                
+                content = self._call_model(self._short_prompt(raw_text), max_tokens=6144)
+                return self._parse_content(content, attempt=2)
             except ValueError as e2:
-                # Both attempts failed - return empty result rather than crash
-                logger.error(
-                    f"All JSON parsing attempts failed. "
-                    f"Attempt 1: {str(e)[:200]}. "
-                    f"Attempt 2: {str(e2)[:200]}"
-                )
-                
-                # DEFENSIVE: Return empty result to keep benchmark running
-                return AnalysisResult(
-                    issues=[],
-                    meta={
-                        "provider": self.name(),
-                        "model": HF_MODEL_ID,
-                        "error": "JSON parsing failed after retries",
-                        "total_max_savings": 0.0,
-                    },
-                )
-        
+                return self._parse_failure(first_error, e2)
+
         except Exception as e:
             # Unexpected error - log and return empty result
             logger.exception(f"Unexpected error in analyze_document: {e}")
-            return AnalysisResult(
-                issues=[],
-                meta={
-                    "provider": self.name(),
-                    "model": HF_MODEL_ID,
-                    "error": f"Unexpected error: {str(e)[:200]}",
-                    "total_max_savings": 0.0,
-                },
-            )
+            return self._error_result(f"Unexpected error: {str(e)[:200]}")
+
+    async def analyze_document_async(
+        self,
+        raw_text: str,
+        facts: Optional[Dict] = None
+    ) -> AnalysisResult:
+        """Async variant of analyze_document() over the pooled transport."""
+        self._ensure_ready()
+
+        try:
+            try:
+                content = await self._call_model_async(self._full_prompt(raw_text), max_tokens=4096)
+                return self._parse_content(content, attempt=1)
+            except ValueError as e:
+                logger.error(f"JSON parsing failed on attempt 1: {e}")
+                first_error = e
+
+            logger.info("Retrying with increased max_tokens...")
+            try:
+                content = await self._call_model_async(self._short_prompt(raw_text), max_tokens=6144)
+                return self._parse_content(content, attempt=2)
+            except ValueError as e2:
+                return self._parse_failure(first_error, e2)
+
+        except Exception as e:
+            logger.exception(f"Unexpected error in analyze_document_async: {e}")
+            return self._error_result(f"Unexpected error: {str(e)[:200]}")
+
+    def _parse_content(self, content: str, attempt: int) -> AnalysisResult:
+        """Sanitize/parse model output and build the result (raises ValueError)."""
+        context = "model output (attempt 1)" if attempt == 1 else "model output (attempt 2 - shortened)"
+        parsed, was_repaired = sanitize_and_parse_json(content, context=context, root_key="issues")
+
+        if attempt > 1:
+            logger.info("Retry succeeded with shortened prompt")
+        elif was_repaired:
+            logger.info("JSON repair was needed but succeeded")
+
+        return self._build_result(parsed)
     
+    def _build_issue(self, item: dict) -> Issue:
+        """Build one Issue from a parsed JSON item, handling missing fields."""
+        # Defensive field access with fallbacks
+        issue_type = item.get("type") or "unspecified"
+        summary = item.get("summary") or "No summary provided"
+        evidence = item.get("evidence")
+        code = item.get("code")
+        max_savings = item.get("max_savings")
+
+        # Validate and sanitize max_savings
+        if max_savings is not None:
+            try:
+                max_savings = float(max_savings)
+                if max_savings < 0:
+                    max_savings = None
+            except (TypeError, ValueError):
+                max_savings = None
+
+        return Issue(
+            type=issue_type,
+            summary=summary,
+            evidence=evidence,
+            code=code,
+            max_savings=max_savings,
+            recommended_action="Review this item against your bill or EOB.",
+        )
+
     def _build_result(self, parsed: dict) -> AnalysisResult:
         """
         Build AnalysisResult from parsed JSON.
         Handles missing fields gracefully.
         """
-        issues = []
-        
-        for item in parsed.get("issues", []):
-            # Defensive field access with fallbacks
-            issue_type = item.get("type") or "unspecified"
-            summary = item.get("summary") or "No summary provided"
-            evidence = item.get("evidence")
-            code = item.get("code")
-            max_savings = item.get("max_savings")
-            
-            # Validate and sanitize max_savings
-            if max_savings is not None:
-                try:
-                    max_savings = float(max_savings)
-                    if max_savings < 0:
-                        max_savings = None
-                except (TypeError, ValueError):
-                    max_savings = None
-            
-            issues.append(
-                Issue(
-                    type=issue_type,
-                    summary=summary,
-                    evidence=evidence,
-                    code=code,
-                    max_savings=max_savings,
-                    recommended_action="Review this item against your bill or EOB.",
-                )
-            )
+        issues = [self._build_issue(item) for item in parsed.get("issues", [])]
         
         total_max = sum(i.max_savings or 0 for i in issues)
         
@@ -673,3 +592,184 @@ class MedGemmaHostedProvider(LLMProvider):
             },
         )
 
+    # ==================================================
+    # Streaming analysis
+    # ==================================================
+
+    def stream_document(
+        self,
+        raw_text: str,
+        facts: Optional[Dict] = None
+    ) -> Generator[Issue, None, AnalysisResult]:
+        """
+        Yield issues while the model is still generating.
+
+        Requests a streamed completion and feeds the deltas to an incremental
+        JSON parser; each element of "issues" is yielded as soon as its
+        object closes. If the stream fails before any issue was yielded, the
+        buffered analyze_document() path (with its retries) is used instead.
+        A failure after issues were yielded returns the partial result with
+        meta["error"] set rather than yielding duplicates on a retry.
+        """
+        self._ensure_ready()
+
+        parser = IncrementalJSONParser(stream_key="issues", root_key="issues")
+        streamed: List[Issue] = []
+        try:
+            payload = self._chat_payload(self._full_prompt(raw_text), max_tokens=4096)
+            for chunk in get_hf_transport().stream_chat(HF_MODEL_URL, self._headers(), payload, timeout=300):
+                for item in parser.feed(chunk):
+                    if isinstance(item, dict):
+                        issue = self._build_issue(item)
+                        streamed.append(issue)
+                        yield issue
+                if parser.done:
+                    break
+            parsed = parser.close()
+        except Exception as e:
+            if not streamed:
+                logger.warning(f"Streaming request failed ({e}); falling back to buffered request")
+                result = self.analyze_document(raw_text, facts=facts)
+                yield from result.issues
+                return result
+            logger.error(f"Stream interrupted after {len(streamed)} issue(s): {e}")
+            result = self._error_result(f"Stream interrupted: {str(e)[:200]}")
+            result.issues = streamed
+            result.meta["total_max_savings"] = round(sum(i.max_savings or 0 for i in streamed), 2)
+            return result
+
+        if parser.was_repaired:
+            logger.info("JSON repair was needed but succeeded")
+        return self._build_result(parsed)
+
+    # ==================================================
+    # Batched analysis
+    # ==================================================
+
+    def _plan_batches(self, raw_texts: List[str]) -> List[List[int]]:
+        """Group document indices into batches bounded by count and size."""
+        batches: List[List[int]] = []
+        current: List[int] = []
+        current_chars = 0
+        for idx, text in enumerate(raw_texts):
+            size = len(text or "")
+            if current and (len(current) >= BATCH_MAX_DOCUMENTS or current_chars + size > BATCH_MAX_CHARS):
+                batches.append(current)
+                current, current_chars = [], 0
+            current.append(idx)
+            current_chars += size
+        if current:
+            batches.append(current)
+        return batches
+
+    def _batch_prompt(self, docs: Dict[str, str]) -> str:
+        sections = [
+            f"<<<DOC {doc_id}>>>\n{text}\n<<<END {doc_id}>>>"
+            for doc_id, text in docs.items()
+        ]
+        return f"{SYSTEM_PROMPT}\n\n{BATCH_TASK_PROMPT}\n\n" + "\n\n".join(sections)
+
+    def _batch_max_tokens(self, count: int) -> int:
+        return min(BATCH_MAX_TOKENS, 512 + BATCH_TOKENS_PER_DOCUMENT * count)
+
+    def _parse_batch(self, content: str, doc_ids: List[str]) -> Dict[str, AnalysisResult]:
+        """
+        Split a keyed batch response into per-document results.
+
+        Documents missing from the response (or with a malformed entry) are
+        left out so the caller can re-run them individually.
+
+        Raises:
+            ValueError: If the response is not a keyed documents object
+        """
+        parsed, was_repaired = sanitize_and_parse_json(
+            content, context="batched model output", root_key="documents"
+        )
+        documents = parsed.get("documents") if isinstance(parsed, dict) else None
+        if not isinstance(documents, dict):
+            raise ValueError("Batched output is missing the 'documents' object")
+
+        results: Dict[str, AnalysisResult] = {}
+        for doc_id in doc_ids:
+            entry = documents.get(doc_id)
+            if not isinstance(entry, dict) or not isinstance(entry.get("issues"), list):
+                continue
+            result = self._build_result(entry)
+            result.meta.update({"batched": True, "batch_size": len(doc_ids), "repaired": was_repaired})
+            results[doc_id] = result
+        return results
+
+    def analyze_documents(
+        self,
+        raw_texts: List[str],
+        facts_list: Optional[List[Optional[Dict]]] = None
+    ) -> List[AnalysisResult]:
+        """
+        Analyze several documents, packing them into as few requests as possible.
+
+        Each batch shares a single copy of the system/task prompt. Any document
+        the batch response does not cover (parse failure, missing key, API
+        error) falls back to a single-document analyze_document() call.
+
+        Args:
+            raw_texts: Document texts
+            facts_list: Optional per-document facts (unused, kept for parity)
+
+        Returns:
+            One AnalysisResult per input document, in input order
+        """
+        self._ensure_ready()
+        facts_list = facts_list or [None] * len(raw_texts)
+        results: List[Optional[AnalysisResult]] = [None] * len(raw_texts)
+
+        for batch in self._plan_batches(raw_texts):
+            if len(batch) > 1:
+                docs = {f"doc_{idx}": raw_texts[idx] for idx in batch}
+                try:
+                    content = self._call_model(self._batch_prompt(docs), max_tokens=self._batch_max_tokens(len(docs)))
+                    batch_results = self._parse_batch(content, list(docs))
+                except Exception as e:
+                    logger.warning(f"Batched analysis failed, falling back to single calls: {str(e)[:200]}")
+                    batch_results = {}
+                for idx in batch:
+                    results[idx] = batch_results.get(f"doc_{idx}")
+
+            for idx in batch:
+                if results[idx] is None:
+                    results[idx] = self.analyze_document(raw_texts[idx], facts_list[idx])
+
+        return results
+
+    async def analyze_documents_async(
+        self,
+        raw_texts: List[str],
+        facts_list: Optional[List[Optional[Dict]]] = None
+    ) -> List[AnalysisResult]:
+        """Async variant of analyze_documents(); batches run concurrently."""
+        self._ensure_ready()
+        facts_list = facts_list or [None] * len(raw_texts)
+        results: List[Optional[AnalysisResult]] = [None] * len(raw_texts)
+
+        async def run_batch(batch: List[int]) -> None:
+            if len(batch) > 1:
+                docs = {f"doc_{idx}": raw_texts[idx] for idx in batch}
+                try:
+                    content = await self._call_model_async(
+                        self._batch_prompt(docs), max_tokens=self._batch_max_tokens(len(docs))
+                    )
+                    batch_results = self._parse_batch(content, list(docs))
+                except Exception as e:
+                    logger.warning(f"Batched analysis failed, falling back to single calls: {str(e)[:200]}")
+                    batch_results = {}
+                for idx in batch:
+                    results[idx] = batch_results.get(f"doc_{idx}")
+
+            missing = [idx for idx in batch if results[idx] is None]
+            singles = await asyncio.gather(
+                *(self.analyze_document_async(raw_texts[idx], facts_list[idx]) for idx in missing)
+            )
+            for idx, result in zip(missing, singles):
+                results[idx] = result
+
+        await asyncio.gather(*(run_batch(batch) for batch in self._plan_batches(raw_texts)))
+        return results
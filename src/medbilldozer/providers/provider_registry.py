@@ -3,6 +3,7 @@
 from medbilldozer.providers.llm_interface import ProviderRegistry
 from medbilldozer.providers.openai_analysis_provider import OpenAIAnalysisProvider
 from medbilldozer.providers.gemini_analysis_provider import GeminiAnalysisProvider
+from medbilldozer.providers.result_cache import result_cache_from_env
 
 try:
     from medbilldozer.providers.medgemma_hosted_provider import MedGemmaHostedProvider
@@ -33,8 +34,18 @@ def register_providers():
     """Register available LLM analysis providers.
 
     Attempts to register MedGemma, Gemma-3, Gemini, OpenAI, and ensemble providers.
-    Only registers providers that pass health checks.
+    Only registers providers that pass health checks. If PROVIDER_CACHE is set,
+    results are served from a content-addressed cache (see result_cache).
     """
+    # --- Result cache (opt-in) ---
+    if ProviderRegistry.cache() is None:
+        try:
+            cache = result_cache_from_env()
+            if cache is not None:
+                ProviderRegistry.enable_cache(cache)
+                print("[provider-cache] result cache enabled")
+        except Exception as e:
+            print(f"[provider-cache] cache setup failed: {e}")
     # --- MedGemma Ensemble (PRIORITY) ---
     # This is the primary provider used by the React frontend
     try:
@@ -0,0 +1,445 @@
+"""Content-addressed result cache for analysis providers.
+
+Wraps any LLMProvider so repeat analyses of the same document skip the
+remote call. Entries are keyed by a SHA-256 over provider name, model id,
+prompt version and the normalized input (text + facts).
+
+Tiers:
+- MemoryLRUCache: per-process LRU with TTL
+- SQLiteResultCache: on-disk store shared across runs/processes
+- TieredResultCache: memory in front of disk, promoting disk hits
+
+Enable for the registry with ProviderRegistry.enable_cache(cache), or from
+the environment via result_cache_from_env() (PROVIDER_CACHE=1).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Generator, List, Optional
+
+from medbilldozer.providers.llm_interface import AnalysisResult, Issue, LLMProvider
+
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MEMORY_ENTRIES = 256
+DEFAULT_DISK_ENTRIES = 10_000
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "medbilldozer" / "provider_results.sqlite3"
+
+
+# ==================================================
+# Keys and (de)serialization
+# ==================================================
+
+
+def _normalize_text(raw_text: str) -> str:
+    """Collapse whitespace so re-extracted copies of a document hash equally."""
+    return " ".join((raw_text or "").split())
+
+
+def cache_key(
+    provider_name: str,
+    model_id: str,
+    prompt_version: str,
+    raw_text: str,
+    facts: Optional[Dict] = None,
+) -> str:
+    """Build the content-addressed key for an analyze_document call."""
+    payload = json.dumps(
+        {
+            "provider": provider_name,
+            "model": model_id,
+            "prompt_version": prompt_version,
+            "text": _normalize_text(raw_text),
+            "facts": facts or {},
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def result_to_payload(result: AnalysisResult) -> str:
+    """Serialize an AnalysisResult to JSON for storage."""
+    return json.dumps(
+        result.to_dict(),
+        default=str,
+    )
+
+
+def result_from_payload(payload: str) -> AnalysisResult:
+    """Rebuild an AnalysisResult from stored JSON."""
+    return AnalysisResult.from_dict(json.loads(payload))
+
+
+# ==================================================
+# Cache tiers
+# ==================================================
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for a cache tier."""
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "hit_rate": round(self.hit_rate, 4)}
+
+
+class ResultCache(ABC):
+    """Key/value store for serialized analysis results."""
+
+    def __init__(self) -> None:
+        self.stats = CacheStats()
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Return the stored payload or None if missing/expired."""
+
+    @abstractmethod
+    def set(self, key: str, payload: str) -> None:
+        """Store a payload, evicting as needed."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop all entries."""
+
+
+class MemoryLRUCache(ResultCache):
+    """Thread-safe in-memory LRU with TTL."""
+
+    def __init__(self, max_entries: int = DEFAULT_MEMORY_ENTRIES, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                self.stats.evictions += 1
+                entry = None
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry[1]
+
+    def set(self, key: str, payload: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), payload)
+            self._entries.move_to_end(key)
+            self.stats.writes += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteResultCache(ResultCache):
+    """On-disk cache tier backed by a single SQLite file."""
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_CACHE_PATH,
+        max_entries: int = DEFAULT_DISK_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+    ):
+        super().__init__()
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY,"
+                " payload TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_results_accessed ON results(accessed_at)")
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, created_at FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and now - row[1] > self.ttl_seconds:
+                with self._conn:
+                    self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                self.stats.evictions += 1
+                row = None
+            if row is None:
+                self.stats.misses += 1
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE results SET accessed_at = ? WHERE key = ?", (now, key))
+            self.stats.hits += 1
+            return row[0]
+
+    def set(self, key: str, payload: str) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, payload, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, payload, now, now),
+            )
+            self.stats.writes += 1
+            self.stats.evictions += self._evict(now)
+
+    def _evict(self, now: float) -> int:
+        """Drop expired rows, then least recently used rows beyond max_entries."""
+        expired = self._conn.execute(
+            "DELETE FROM results WHERE created_at < ?", (now - self.ttl_seconds,)
+        ).rowcount
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()
+        overflow = count - self.max_entries
+        if overflow <= 0:
+            return expired
+        trimmed = self._conn.execute(
+            "DELETE FROM results WHERE key IN ("
+            " SELECT key FROM results ORDER BY accessed_at ASC LIMIT ?)",
+            (overflow,),
+        ).rowcount
+        return expired + trimmed
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM results")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class TieredResultCache(ResultCache):
+    """Memory LRU in front of an optional disk tier."""
+
+    def __init__(self, memory: MemoryLRUCache, disk: Optional[ResultCache] = None):
+        super().__init__()
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, key: str) -> Optional[str]:
+        payload = self.memory.get(key)
+        if payload is None and self.disk is not None:
+            payload = self.disk.get(key)
+            if payload is not None:
+                self.memory.set(key, payload)
+        if payload is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return payload
+
+    def set(self, key: str, payload: str) -> None:
+        self.stats.writes += 1
+        self.memory.set(key, payload)
+        if self.disk is not None:
+            self.disk.set(key, payload)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats_by_tier(self) -> Dict[str, Dict[str, Any]]:
+        """Counters for the combined cache and each tier."""
+        tiers = {"total": self.stats.to_dict(), "memory": self.memory.stats.to_dict()}
+        if self.disk is not None:
+            tiers["disk"] = self.disk.stats.to_dict()
+        return tiers
+
+
+# ==================================================
+# Provider wrapper
+# ==================================================
+
+
+class CachingProvider(LLMProvider):
+    """LLMProvider decorator that serves repeat inputs from a ResultCache."""
+
+    def __init__(self, provider: LLMProvider, cache: ResultCache):
+        self.provider = provider
+        self.cache = cache
+
+    def name(self) -> str:
+        return self.provider.name()
+
+    def model_id(self) -> str:
+        return self.provider.model_id()
+
+    @property
+    def prompt_version(self) -> str:
+        return self.provider.prompt_version
+
+    def health_check(self) -> bool:
+        return self.provider.health_check()
+
+    def _key(self, raw_text: str, facts: Optional[Dict]) -> str:
+        return cache_key(
+            self.provider.name(),
+            self.provider.model_id(),
+            self.provider.prompt_version,
+            raw_text,
+            facts,
+        )
+
+    def _lookup(self, key: str) -> Optional[AnalysisResult]:
+        payload = self.cache.get(key)
+        if payload is None:
+            return None
+        result = result_from_payload(payload)
+        result.meta["cache_hit"] = True
+        return result
+
+    def _store(self, key: str, result: AnalysisResult) -> None:
+        # Providers report recoverable failures as empty results with meta.error
+        if not (result.meta or {}).get("error"):
+            self.cache.set(key, result_to_payload(result))
+
+    def analyze_document(
+        self,
+        raw_text: str,
+        facts: Optional[Dict] = None
+    ) -> AnalysisResult:
+        key = self._key(raw_text, facts)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        result = self.provider.analyze_document(raw_text, facts=facts)
+        self._store(key, result)
+        return result
+
+    def analyze_documents(
+        self,
+        raw_texts: List[str],
+        facts_list: Optional[List[Optional[Dict]]] = None
+    ) -> List[AnalysisResult]:
+        facts_list = facts_list or [None] * len(raw_texts)
+        keys = [self._key(raw_text, facts) for raw_text, facts in zip(raw_texts, facts_list)]
+        results = [self._lookup(key) for key in keys]
+
+        # Only the misses go to the provider, still batched
+        missing = [idx for idx, result in enumerate(results) if result is None]
+        if missing:
+            fresh = self.provider.analyze_documents(
+                [raw_texts[idx] for idx in missing],
+                [facts_list[idx] for idx in missing],
+            )
+            for idx, result in zip(missing, fresh):
+                self._store(keys[idx], result)
+                results[idx] = result
+        return results
+
+    async def analyze_document_async(
+        self,
+        raw_text: str,
+        facts: Optional[Dict] = None
+    ) -> AnalysisResult:
+        key = self._key(raw_text, facts)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        result = await self.provider.analyze_document_async(raw_text, facts=facts)
+        self._store(key, result)
+        return result
+
+    def stream_document(
+        self,
+        raw_text: str,
+        facts: Optional[Dict] = None
+    ) -> Generator[Issue, None, AnalysisResult]:
+        key = self._key(raw_text, facts)
+        cached = self._lookup(key)
+        if cached is not None:
+            yield from cached.issues
+            return cached
+
+        result = yield from self.provider.stream_document(raw_text, facts=facts)
+        self._store(key, result)
+        return result
+
+    def __getattr__(self, attr: str) -> Any:
+        # Delegate provider-specific attributes (model, token, ...)
+        if attr == "provider":
+            raise AttributeError(attr)
+        return getattr(self.provider, attr)
+
+
+def result_cache_from_env() -> Optional[ResultCache]:
+    """Build a tiered cache from environment variables, or None if disabled.
+
+    PROVIDER_CACHE=1                  enable caching
+    PROVIDER_CACHE_PATH=...           SQLite file ("none" for memory only)
+    PROVIDER_CACHE_TTL_SECONDS=...    entry lifetime (default 7 days)
+    PROVIDER_CACHE_MEMORY_ENTRIES=... LRU size (default 256)
+    PROVIDER_CACHE_DISK_ENTRIES=...   SQLite size (default 10000)
+    """
+    if (os.getenv("PROVIDER_CACHE") or "false").lower() not in ("1", "true", "yes"):
+        return None
+
+    ttl = float(os.getenv("PROVIDER_CACHE_TTL_SECONDS") or DEFAULT_TTL_SECONDS)
+    memory = MemoryLRUCache(
+        max_entries=int(os.getenv("PROVIDER_CACHE_MEMORY_ENTRIES") or DEFAULT_MEMORY_ENTRIES),
+        ttl_seconds=ttl,
+    )
+
+    path = os.getenv("PROVIDER_CACHE_PATH") or str(DEFAULT_CACHE_PATH)
+    disk = None
+    if path.lower() != "none":
+        disk = SQLiteResultCache(
+            path=Path(path),
+            max_entries=int(os.getenv("PROVIDER_CACHE_DISK_ENTRIES") or DEFAULT_DISK_ENTRIES),
+            ttl_seconds=ttl,
+        )
+
+    return TieredResultCache(memory, disk)
+
+
+__all__ = [
+    "CacheStats",
+    "ResultCache",
+    "MemoryLRUCache",
+    "SQLiteResultCache",
+    "TieredResultCache",
+    "CachingProvider",
+    "cache_key",
+    "result_cache_from_env",
+]
@@ -14,11 +14,67 @@ import numpy as np
 import streamlit.components.v1 as components
 import base64
 from medbilldozer.utils.image_paths import get_avatar_url
+from medbilldozer.prompts.prompt_templates import PromptTemplate, SplitPrompt
 
 
 # Module-level cache for avatar images (loaded once per server, not per session)
 _BILLY_IMAGES_CACHE = None
 
+DOC_FILES = [
+    "QUICKSTART.md",
+    "USER_GUIDE.md",
+    "INDEX.md",
+    "README.md",
+]
+
+_ASSISTANT_INSTRUCTIONS = """You are Billy, a helpful and friendly assistant for medBillDozer, an AI-powered medical bill auditing application.
+
+Your role is to help patients understand how to use medBillDozer and answer their questions based ONLY on the official documentation provided below.
+
+IMPORTANT GUIDELINES:
+1. Answer questions using ONLY information from the documentation below - never make up features or capabilities
+2. Be warm, supportive, and patient-focused - many users are stressed about medical bills
+3. Structure your answers clearly with numbered steps or bullet points when appropriate
+4. Include specific, actionable advice that users can implement immediately
+5. When discussing savings, always clarify these are estimates, not guarantees
+6. When discussing privacy, be reassuring but honest about how data flows to AI providers
+7. For technical issues, provide the most common solutions first (API keys, network issues)
+8. Use emoji sparingly but effectively to make answers more scannable (✅ ❌ 💡 ⚠️)
+9. End complex answers with a clear next step or call-to-action
+10. If the question requires information not in the docs, acknowledge this and suggest where they might find help
+
+RESPONSE STRUCTURE FOR "QUICK HELP" QUESTIONS:
+- Start with a direct, one-sentence answer
+- Follow with clear, numbered steps or organized sections
+- Include practical examples where helpful
+- End with a summary or next step
+- Keep total length under 400 words unless question specifically asks for detail
+
+TONE EXAMPLES:
+✅ Good: "Great question! Here's how to get started..."
+✅ Good: "I understand that's confusing. Let me break it down..."
+❌ Avoid: "The documentation states that..." (too formal)
+❌ Avoid: "Unfortunately, I cannot..." (too negative)
+
+DOCUMENTATION:
+"""
+
+
+def _assemble_assistant_prefix(docs: Dict[str, str]) -> str:
+    """Instructions + full documentation: the part of the prompt shared by every question."""
+    full_docs = "\n\n---\n\n".join([
+        f"# {filename}\n\n{content}"
+        for filename, content in docs.items()
+    ])
+    return f"{_ASSISTANT_INSTRUCTIONS}{full_docs}\n\nUSER QUESTION:\n"
+
+
+# Shared by all sessions; re-read only when a doc file changes
+_ASSISTANT_PROMPT = PromptTemplate(
+    [Path(__file__).parent.parent.parent / "docs" / doc_file for doc_file in DOC_FILES],
+    _assemble_assistant_prefix,
+)
+
 
 def dispatch_billy_event(event_type: str):
     components.html(
@@ -72,11 +128,9 @@ class DocumentationAssistant:
     """AI-powered documentation assistant that provides contextual help."""
 
     def __init__(self):
-        """Initialize the documentation assistant with documentation content."""
+        """Initialize the documentation assistant (docs are loaded on first use)."""
         self.docs_path = Path(__file__).parent.parent.parent / "docs"
         self.images_path = Path(__file__).parent.parent.parent / "images"
-        self.docs_cache = {}
-        self._load_documentation()
 
     def get_avatar_image(self, state: str = "ready_open") -> str:
         """Get base64 encoded avatar image.
@@ -106,74 +160,35 @@ class DocumentationAssistant:
                 return f"data:image/png;base64,{img_base64}"
         return ""
 
-    def _load_documentation(self):
-        """Load all documentation files into memory."""
-        doc_files = [
-            "QUICKSTART.md",
-            "USER_GUIDE.md",
-            "INDEX.md",
-            "README.md",
-        ]
-
-        for doc_file in doc_files:
-            file_path = self.docs_path / doc_file
-            if file_path.exists():
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    self.docs_cache[doc_file] = f.read()
+    @property
+    def docs_cache(self) -> Dict[str, str]:
+        """Documentation files by name (cached across sessions, refreshed on change)."""
+        return _ASSISTANT_PROMPT.contents()
 
-    def _build_context_prompt(self, user_question: str) -> str:
-        """Build a comprehensive context prompt from documentation.
+    def _build_context_prompt_parts(self, user_question: str) -> SplitPrompt:
+        """Build the context prompt as cached documentation prefix + question.
 
         Args:
             user_question: The user's question
 
         Returns:
-            Formatted prompt with documentation context
+            SplitPrompt whose prefix is the same for every question
         """
-        # Combine all documentation
-        full_docs = "\n\n---\n\n".join([
-            f"# {filename}\n\n{content}"
-            for filename, content in self.docs_cache.items()
-        ])
-
-        prompt = f"""You are Billy, a helpful and friendly assistant for medBillDozer, an AI-powered medical bill auditing application.
-
-Your role is to help patients understand how to use medBillDozer and answer their questions based ONLY on the official documentation provided below.
-
-IMPORTANT GUIDELINES:
-1. Answer questions using ONLY information from the documentation below - never make up features or capabilities
-2. Be warm, supportive, and patient-focused - many users are stressed about medical bills
-3. Structure your answers clearly with numbered steps or bullet points when appropriate
-4. Include specific, actionable advice that users can implement immediately
-5. When discussing savings, always clarify these are estimates, not guarantees
-6. When discussing privacy, be reassuring but honest about how data flows to AI providers
-7. For technical issues, provide the most common solutions first (API keys, network issues)
-8. Use emoji sparingly but effectively to make answers more scannable (✅ ❌ 💡 ⚠️)
-9. End complex answers with a clear next step or call-to-action
-10. If the question requires information not in the docs, acknowledge this and suggest where they might find help
-
-RESPONSE STRUCTURE FOR "QUICK HELP" QUESTIONS:
-- Start with a direct, one-sentence answer
-- Follow with clear, numbered steps or organized sections
-- Include practical examples where helpful
-- End with a summary or next step
-- Keep total length under 400 words unless question specifically asks for detail
+        return _ASSISTANT_PROMPT.render(f"""{user_question}
 
-TONE EXAMPLES:
-✅ Good: "Great question! Here's how to get started..."
-✅ Good: "I understand that's confusing. Let me break it down..."
-❌ Avoid: "The documentation states that..." (too formal)
-❌ Avoid: "Unfortunately, I cannot..." (too negative)
+Please provide a helpful, well-structured answer based on the documentation above. Remember: you're helping real people who may be worried about medical bills, so be empathetic and clear.
+""")
 
-DOCUMENTATION:
-{full_docs}
+    def _build_context_prompt(self, user_question: str) -> str:
+        """Build a comprehensive context prompt from documentation.
 
-USER QUESTION:
-{user_question}
+        Args:
+            user_question: The user's question
 
-Please provide a helpful, well-structured answer based on the documentation above. Remember: you're helping real people who may be worried about medical bills, so be empathetic and clear.
-"""
-        return prompt
+        Returns:
+            Formatted prompt with documentation context
+        """
+        return self._build_context_prompt_parts(user_question).text
 
     def get_answer_openai(self, user_question: str) -> str:
         """Get answer using OpenAI API.
@@ -188,16 +203,17 @@ Please provide a helpful, well-structured answer based on the documentation abov
             from openai import OpenAI
 
             client = OpenAI()
-            prompt = self._build_context_prompt(user_question)
+            prompt = self._build_context_prompt_parts(user_question)
 
             response = client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": "You are a helpful documentation assistant for medBillDozer."},
-                    {"role": "user", "content": prompt}
+                    {"role": "user", "content": prompt.text}
                 ],
                 max_tokens=500,
                 temperature=0.3,  # Lower temperature for more factual responses
+                prompt_cache_key=f"doc-assistant-{prompt.prefix_key}",
             )
 
             return response.choices[0].message.content.strip()
@@ -5,6 +5,30 @@ Displays cross-document coverage relationships in a formatted table.
 # _modules/ui_coverage_matrix.py
 import streamlit as st
 
+from medbilldozer.core.coverage_matrix import CoverageIndex, build_coverage_matrix
+
+
+def session_coverage_rows(documents):
+    """Coverage rows for documents, updated incrementally across reruns.
+
+    Keeps a CoverageIndex in session state and only re-indexes documents
+    from the first one added, removed or changed since the last rerun.
+
+    Args:
+        documents: List of document dicts with 'facts' and 'document_id' keys
+
+    Returns:
+        List of CoverageRow objects
+    """
+    doc_ids = [doc.get("document_id") for doc in documents]
+    if None in doc_ids or len(set(doc_ids)) != len(doc_ids):
+        return build_coverage_matrix(documents)
+
+    index = st.session_state.get("coverage_index")
+    if index is None:
+        index = st.session_state["coverage_index"] = CoverageIndex()
+    return index.sync(documents).rows()
+
 
 def render_coverage_matrix(rows):
     """Render coverage matrix as a formatted dataframe.
@@ -0,0 +1,414 @@
+"""Incremental, repairing JSON parser for LLM output.
+
+LLM responses are "almost JSON": wrapped in markdown fences, preceded by
+prose, sprinkled with trailing commas, or cut off at max_tokens. This
+module parses them in a single left-to-right pass instead of regex
+extraction followed by a repair loop:
+
+- text before the first object (prose, ```json fences) is skipped, as is
+  anything after the root object closes
+- trailing commas are tolerated
+- truncated output is closed from the parser's own container stack;
+  unfinished scalars and unfinished array elements are dropped
+- elements of one array (e.g. "issues") are emitted as soon as they close,
+  so callers can surface results while tokens are still streaming in
+
+Usage:
+    parsed, was_repaired = parse_llm_json(text, context="model output")
+
+    parser = IncrementalJSONParser(stream_key="issues")
+    for chunk in chunks:
+        for issue in parser.feed(chunk):
+            ...
+    parsed = parser.close()
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+_WS_RE = re.compile(r"[ \t\r\n]*")
+_STRING_CHUNK_RE = re.compile(r'[^"\\]*')
+_NUMBER_RE = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?")
+_NUMBER_CHARS_RE = re.compile(r"[-+0-9.eE]*")
+_LITERALS = {"true": True, "false": False, "null": None}
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+_MISSING = object()
+
+
+class _Incomplete(Exception):
+    """More input is needed to finish the current token."""
+
+
+class _Invalid(Exception):
+    """The current candidate root object is not valid JSON."""
+
+
+def _hex4(buf: str, pos: int) -> int:
+    """Decode the four hex digits of a ``\\uXXXX`` escape at ``pos``."""
+    try:
+        return int(buf[pos:pos + 4], 16)
+    except ValueError:
+        raise _Invalid()
+
+
+class _Frame:
+    """An open object or array on the parser stack."""
+
+    __slots__ = ("container", "key", "state", "path")
+
+    def __init__(self, container: Any, path: Tuple[str, ...]):
+        self.container = container
+        self.key: Optional[str] = None
+        # object: "key" | "colon" | "value" | "comma"; array: "value" | "comma"
+        self.state = "key" if isinstance(container, dict) else "value"
+        self.path = path
+
+
+class IncrementalJSONParser:
+    """Single-pass parser for one JSON object embedded in LLM output.
+
+    Args:
+        stream_key: Top-level array whose elements feed() returns as soon
+            as each one closes (None disables streaming)
+        root_key: If set, skip complete root objects that lack this key.
+            A candidate that already holds root_key is salvaged like
+            truncated output when a later token is invalid, keeping the
+            elements completed before the bad one.
+    """
+
+    def __init__(self, stream_key: Optional[str] = None, root_key: Optional[str] = None):
+        self.stream_key = stream_key
+        self.root_key = root_key
+        self.was_repaired = False
+        self._buf = ""
+        self._pos = 0
+        self._root_start = -1
+        self._root: Any = _MISSING
+        self._stack: List[_Frame] = []
+        self._emitted: List[Any] = []
+        self._saw_candidate = False
+        self._closed = False
+
+    @property
+    def done(self) -> bool:
+        """True once a complete root object has been parsed."""
+        return self._root is not _MISSING
+
+    # ==================================================
+    # Public API
+    # ==================================================
+
+    def feed(self, chunk: str) -> List[Any]:
+        """Consume more text; return stream_key elements completed by it."""
+        if self._closed:
+            raise ValueError("Parser already closed")
+        if not chunk or self.done:
+            return []
+        self._buf += chunk
+        self._run()
+        emitted, self._emitted = self._emitted, []
+        return emitted
+
+    def close(self) -> Any:
+        """Finish parsing, repairing truncated output if necessary.
+
+        Returns:
+            The parsed root object
+
+        Raises:
+            ValueError: If no JSON object could be recovered
+        """
+        self._closed = True
+        if not self.done and self._stack:
+            self._repair_truncation()
+        if not self.done:
+            raise ValueError("No JSON object found" if not self._saw_candidate else "Unrecoverable JSON")
+        return self._root
+
+    def items(self) -> List[Any]:
+        """Elements of stream_key in the parsed root (after close())."""
+        if not self.done or not isinstance(self._root, dict):
+            return []
+        value = self._root.get(self.stream_key)
+        return value if isinstance(value, list) else []
+
+    # ==================================================
+    # Scanner
+    # ==================================================
+
+    def _run(self) -> None:
+        while not self.done:
+            if not self._stack:
+                start = self._buf.find("{", self._pos)
+                if start == -1:
+                    self._pos = len(self._buf)
+                    return
+                self._saw_candidate = True
+                self._root_start = start
+                self._pos = start + 1
+                self._stack.append(_Frame({}, ()))
+                continue
+            try:
+                self._step()
+            except _Incomplete:
+                return
+            except _Invalid:
+                if self._holds_root_key():
+                    self._repair_truncation()
+                    if self.done:
+                        return
+                self._restart()
+
+    def _holds_root_key(self) -> bool:
+        """True if the open candidate already has (or is inside) root_key."""
+        if self.root_key is None or not self._stack:
+            return False
+        root = self._stack[0]
+        if self.root_key in root.container:
+            return True
+        return root.key == self.root_key and root.state == "value" and len(self._stack) > 1
+
+    def _restart(self) -> None:
+        """Abandon the current candidate and look for the next '{'."""
+        self._stack = []
+        self._pos = self._root_start + 1
+        self._root_start = -1
+        self.was_repaired = False
+
+    def _skip_ws(self) -> None:
+        self._pos = _WS_RE.match(self._buf, self._pos).end()
+
+    def _peek(self) -> str:
+        self._skip_ws()
+        if self._pos >= len(self._buf):
+            raise _Incomplete()
+        return self._buf[self._pos]
+
+    def _step(self) -> None:
+        frame = self._stack[-1]
+        ch = self._peek()
+
+        if isinstance(frame.container, dict):
+            if frame.state == "key":
+                if ch == "}":
+                    self._pos += 1
+                    self._close_container()
+                elif ch == '"':
+                    frame.key = self._read_string()
+                    frame.state = "colon"
+                else:
+                    raise _Invalid()
+            elif frame.state == "colon":
+                if ch != ":":
+                    raise _Invalid()
+                self._pos += 1
+                frame.state = "value"
+            elif frame.state == "value":
+                self._read_value(frame)
+            else:  # comma
+                if ch == ",":
+                    self._pos += 1
+                    frame.state = "key"
+                    if self._peek() == "}":
+                        self.was_repaired = True  # trailing comma
+                elif ch == "}":
+                    self._pos += 1
+                    self._close_container()
+                else:
+                    raise _Invalid()
+        else:
+            if frame.state == "value":
+                if ch == "]":
+                    self._pos += 1
+                    self._close_container()
+                else:
+                    self._read_value(frame)
+            else:  # comma
+                if ch == ",":
+                    self._pos += 1
+                    frame.state = "value"
+                    if self._peek() == "]":
+                        self.was_repaired = True  # trailing comma
+                elif ch == "]":
+                    self._pos += 1
+                    self._close_container()
+                else:
+                    raise _Invalid()
+
+    def _read_value(self, frame: _Frame) -> None:
+        ch = self._buf[self._pos]
+        if ch in "{[":
+            self._pos += 1
+            path = frame.path + (frame.key,) if isinstance(frame.container, dict) else frame.path + ("[]",)
+            self._stack.append(_Frame({} if ch == "{" else [], path))
+            return
+        if ch == '"':
+            value = self._read_string()
+        elif ch == "-" or ch.isdigit():
+            value = self._read_number()
+        else:
+            value = self._read_literal()
+        self._attach(value)
+
+    def _read_string(self) -> str:
+        buf, pos = self._buf, self._pos + 1
+        parts = []
+        while True:
+            end = _STRING_CHUNK_RE.match(buf, pos).end()
+            parts.append(buf[pos:end])
+            if end >= len(buf):
+                raise _Incomplete()
+            if buf[end] == '"':
+                self._pos = end + 1
+                return "".join(parts)
+            # backslash escape
+            if end + 1 >= len(buf):
+                raise _Incomplete()
+            esc = buf[end + 1]
+            if esc == "u":
+                if end + 6 > len(buf):
+                    raise _Incomplete()
+                code = _hex4(buf, end + 2)
+                pos = end + 6
+                if 0xD800 <= code <= 0xDBFF:
+                    # High surrogate: join it with an escaped low surrogate
+                    # so non-BMP characters (emoji) decode as json.loads does.
+                    if pos + 6 > len(buf) and "\\u".startswith(buf[pos:pos + 2]):
+                        raise _Incomplete()
+                    if buf.startswith("\\u", pos):
+                        low = _hex4(buf, pos + 2)
+                        if 0xDC00 <= low <= 0xDFFF:
+                            code = 0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)
+                            pos += 6
+                parts.append(chr(code))
+            else:
+                if esc not in _ESCAPES:
+                    raise _Invalid()
+                parts.append(_ESCAPES[esc])
+                pos = end + 2
+
+    def _read_number(self) -> Any:
+        # Scan the whole numeric run first: a token at the end of the buffer
+        # may still grow ("15" -> "150.25"), and a truncated stream never
+        # ends on a legitimate number because the root object is unclosed.
+        end = _NUMBER_CHARS_RE.match(self._buf, self._pos).end()
+        if end >= len(self._buf):
+            raise _Incomplete()
+        text = self._buf[self._pos:end]
+        if not _NUMBER_RE.fullmatch(text):
+            raise _Invalid()
+        self._pos = end
+        return float(text) if any(c in text for c in ".eE") else int(text)
+
+    def _read_literal(self) -> Any:
+        rest = self._buf[self._pos:self._pos + 5]
+        for word, value in _LITERALS.items():
+            if rest.startswith(word):
+                self._pos += len(word)
+                return value
+            if word.startswith(rest):
+                raise _Incomplete()
+        raise _Invalid()
+
+    # ==================================================
+    # Tree building
+    # ==================================================
+
+    def _attach(self, value: Any) -> None:
+        frame = self._stack[-1]
+        if isinstance(frame.container, dict):
+            frame.container[frame.key] = value
+        else:
+            frame.container.append(value)
+            if self.stream_key is not None and frame.path == (self.stream_key,):
+                self._emitted.append(value)
+        frame.state = "comma"
+
+    def _close_container(self) -> None:
+        frame = self._stack.pop()
+        if self._stack:
+            self._attach(frame.container)
+            return
+        if self.root_key is not None and self.root_key not in frame.container:
+            self._emitted = []
+            raise _Invalid()
+        self._root = frame.container
+
+    def _repair_truncation(self) -> None:
+        """Close every open container; drop the unfinished scalar/element."""
+        self.was_repaired = True
+        while self._stack:
+            frame = self._stack.pop()
+            if not self._stack:
+                if self.root_key is not None and self.root_key not in frame.container:
+                    return
+                self._root = frame.container
+                return
+            parent = self._stack[-1]
+            if isinstance(parent.container, dict):
+                # Keep partially received objects/arrays under their key
+                parent.container[parent.key] = frame.container
+                parent.state = "comma"
+            # An unfinished array element is dropped: it may be missing fields
+
+
+def parse_llm_json(
+    text: str,
+    context: str = "model output",
+    stream_key: Optional[str] = None,
+    root_key: Optional[str] = None,
+) -> Tuple[Any, bool]:
+    """Parse the first JSON object in LLM output.
+
+    Returns:
+        Tuple of (parsed_object, was_repaired)
+
+    Raises:
+        ValueError: If the text is empty or no object can be recovered
+    """
+    if not text or not text.strip():
+        raise ValueError(f"Empty {context} (received: {repr((text or '')[:100])})")
+
+    # Fast path: well-formed output parses at C speed
+    stripped = text.strip()
+    if stripped.startswith("{") and stripped.endswith("}"):
+        try:
+            parsed = json.loads(stripped)
+            if isinstance(parsed, dict) and (root_key is None or root_key in parsed):
+                return parsed, False
+        except json.JSONDecodeError:
+            pass
+
+    parser = IncrementalJSONParser(stream_key=stream_key, root_key=root_key)
+    parser.feed(text)
+    try:
+        return parser.close(), parser.was_repaired
+    except ValueError as e:
+        preview = text[:500] + ("..." if len(text) > 500 else "")
+        if "No JSON object found" in str(e):
+            raise ValueError(f"No JSON object found in {context}. Output: {preview}")
+        raise ValueError(f"Failed to parse {context}: {e}. Output (truncated): {preview}")
+
+
+def iter_stream_items(chunks: Iterable[str], key: str = "issues") -> Iterator[Any]:
+    """Yield elements of `key` as they complete in a stream of text chunks."""
+    parser = IncrementalJSONParser(stream_key=key)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+        if parser.done:
+            return
+    try:
+        parser.close()
+    except ValueError:
+        return
+
+
+__all__ = [
+    "IncrementalJSONParser",
+    "parse_llm_json",
+    "iter_stream_items",
+]
@@ -2,8 +2,26 @@
 
 Provides duck-typed serialization functions that work with various analysis
 result objects without requiring explicit imports.
+
+dumps_json() encodes results to JSON bytes, through orjson when it is
+installed (it serializes dataclasses, including slotted ones, natively)
+and the standard library otherwise.
 """
 # _modules/serialization.py
+import dataclasses
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from operator import attrgetter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+# Issue fields kept by analysis_to_dict()
+_ANALYSIS_ISSUE_FIELDS = ("type", "summary", "evidence", "max_savings")
+_analysis_issue_values = attrgetter(*_ANALYSIS_ISSUE_FIELDS)
 
 
 def issue_to_dict(issue):
@@ -41,16 +59,54 @@ def analysis_to_dict(result) -> dict:
     Returns:
         dict: Dictionary with 'issues' list and 'meta' dict
     """
+    issues = []
+    for issue in getattr(result, "issues", []):
+        try:
+            values = _analysis_issue_values(issue)
+        except AttributeError:
+            values = tuple(getattr(issue, name, None) for name in _ANALYSIS_ISSUE_FIELDS)
+        issues.append(dict(zip(_ANALYSIS_ISSUE_FIELDS, values)))
+
     return {
-        "issues": [
-            {
-                "type": getattr(issue, "type", None),
-                "summary": getattr(issue, "summary", None),
-                "evidence": getattr(issue, "evidence", None),
-                "max_savings": getattr(issue, "max_savings", None),
-            }
-            for issue in getattr(result, "issues", [])
-        ],
+        "issues": issues,
         "meta": getattr(result, "meta", {}),
     }
 
+
+def _json_default(obj):
+    """Fallback encoder for objects the json module can't serialize."""
+    to_dict = getattr(obj, "to_dict", None)
+    if callable(to_dict):
+        return to_dict()
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if hasattr(obj, "items"):  # mappingproxy and other read-only mappings
+        return dict(obj.items())
+    return str(obj)
+
+
+def dumps_json(obj, *, sort_keys: bool = False) -> bytes:
+    """Encode analysis results (dicts, dataclasses, Issues) as UTF-8 JSON.
+
+    Args:
+        obj: Object to encode
+        sort_keys: Sort dict keys (for stable output)
+
+    Returns:
+        bytes: Compact JSON
+    """
+    if orjson is not None:
+        option = orjson.OPT_SORT_KEYS if sort_keys else 0
+        try:
+            return orjson.dumps(obj, default=_json_default, option=option)
+        except TypeError:
+            pass  # e.g. non-str dict keys or >64-bit ints; use the json module
+    return json.dumps(
+        obj, default=_json_default, sort_keys=sort_keys, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
@@ -0,0 +1,282 @@
+"""Tests for the backend's AnalysisService.
+
+Tests verify:
+- A failed analysis job raises to JobWorker, which retries it
+- A retried analysis replaces the issues of the failed attempt
+- The terminal "failed" status is written only once attempts run out
+- A dead-lettered job drops the in-memory status snapshot
+- Documents fan out in input order, bounded by analysis_max_concurrency
+- One failed document does not cancel the others
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pydantic_settings")
+
+# Required settings; the services under test never use them
+os.environ.setdefault("FIREBASE_PROJECT_ID", "test-project")
+os.environ.setdefault("GCS_PROJECT_ID", "test-project")
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+import medbilldozer.core.orchestrator_agent as orchestrator_agent  # noqa: E402
+from app.services import analysis_service, multimodal_analysis_service, progress_service  # noqa: E402
+from app.services.analysis_service import AnalysisService  # noqa: E402
+from app.services.job_queue import AnalysisJob, InProcessJobQueue, JobWorker  # noqa: E402
+
+
+class FakeDB:
+    """DBService stand-in keeping analyses and issues in memory."""
+
+    def __init__(self, documents, fail_saves=0):
+        self.documents = documents
+        self.fail_saves = fail_saves
+        self.statuses = []
+        self.issues = {}
+        self.saved = {}
+        self.results = {}
+
+    async def update_analysis_status(self, analysis_id, status, error_message=None):
+        self.statuses.append((status, error_message))
+        return {}
+
+    async def get_documents_bulk(self, document_ids, user_id, analysis_id=None):
+        return {doc_id: self.documents[doc_id] for doc_id in document_ids if doc_id in self.documents}
+
+    def release_analysis_documents(self, analysis_id):
+        pass
+
+    async def update_documents_progress(self, analysis_id, progress_by_document):
+        return True
+
+    async def replace_issues(self, analysis_id, issues):
+        self.issues[analysis_id] = list(issues)
+        return issues
+
+    async def save_analysis_results(self, analysis_id, results, coverage_matrix=None,
+                                    total_savings=0, issues_count=0):
+        if self.fail_saves:
+            self.fail_saves -= 1
+            raise ConnectionError("database unavailable")
+        self.saved[analysis_id] = issues_count
+        self.results[analysis_id] = results
+        self.statuses.append(("completed", None))
+        return {}
+
+
+class FakeStorage:
+    documents_bucket = "documents"
+
+    async def download_text(self, bucket_name, blob_path):
+        return f"bill text of {blob_path}"
+
+
+class FakeOrchestrator:
+    """Reports one issue per document."""
+
+    def __init__(self, **kwargs):
+        pass
+
+    def run(self, raw_text, progress_callback=None, issue_callback=None):
+        return {
+            "facts": {},
+            "analysis": {"issues": [{"type": "duplicate_charge", "summary": raw_text, "max_savings": 10}]},
+        }
+
+
+@pytest.fixture
+def make_service(monkeypatch):
+    monkeypatch.setattr(orchestrator_agent, "OrchestratorAgent", FakeOrchestrator)
+    executors = []
+
+    def make(db):
+        monkeypatch.setattr(progress_service, "get_db_service", lambda: db)
+        service = AnalysisService.__new__(AnalysisService)
+        service.db = db
+        service.storage = FakeStorage()
+        service.progress = progress_service.ProgressReporter(flush_interval=60)
+        service.executor = ThreadPoolExecutor(max_workers=2)
+        executors.append(service.executor)
+        return service
+
+    yield make
+    for executor in executors:
+        executor.shutdown()
+
+
+def _documents(*doc_ids):
+    return {
+        doc_id: {"document_id": doc_id, "filename": f"{doc_id}.txt", "gcs_path": f"u1/{doc_id}.txt",
+                 "content_type": "text/plain"}
+        for doc_id in doc_ids
+    }
+
+
+def _run_through_worker(service, job, max_attempts=3):
+    async def scenario():
+        queue = InProcessJobQueue()
+        worker = JobWorker(queue, service.run_job, max_attempts=max_attempts,
+                           on_dead_letter=service.fail_job)
+        await queue.enqueue(job)
+        while True:
+            reserved = await queue.reserve(timeout=0)
+            if reserved is None:
+                break
+            await worker.process(reserved)
+        await service.progress.stop()
+        return queue
+
+    return asyncio.run(scenario())
+
+
+def _job():
+    return AnalysisJob(analysis_id="a1", user_id="u1", document_ids=["d1", "d2"], provider="smart")
+
+
+@pytest.mark.unit
+class TestRunJob:
+    """Test AnalysisService.run_job under JobWorker."""
+
+    def test_failed_attempt_is_retried_without_duplicate_issues(self, make_service):
+        db = FakeDB(_documents("d1", "d2"), fail_saves=1)
+        service = make_service(db)
+
+        queue = _run_through_worker(service, _job())
+
+        assert db.saved == {"a1": 2}
+        assert len(db.issues["a1"]) == 2
+        assert [status for status, _ in db.statuses] == ["processing", "processing", "completed"]
+        assert queue.dead_letters == []
+
+    def test_failed_status_written_once_attempts_run_out(self, make_service):
+        db = FakeDB(_documents("d1", "d2"), fail_saves=5)
+        service = make_service(db)
+
+        queue = _run_through_worker(service, _job(), max_attempts=2)
+
+        assert db.statuses == [
+            ("processing", None),
+            ("processing", None),
+            ("failed", "database unavailable"),
+        ]
+        assert [error for _, error in queue.dead_letters] == ["database unavailable"]
+
+    def test_dead_letter_drops_queued_snapshot(self, make_service):
+        db = FakeDB({})
+        service = make_service(db)
+        # trigger_analysis registers the analysis as queued before enqueueing
+        service.progress.start_analysis("a1", "u1", "smart", status="queued")
+
+        asyncio.run(service.fail_job(_job(), "worker lost"))
+
+        assert service.progress.snapshot("a1", "u1") is None
+        assert db.statuses == [("failed", "worker lost")]
+
+    def test_run_analysis_still_records_failures(self, make_service):
+        db = FakeDB({})
+        service = make_service(db)
+
+        async def scenario():
+            result = await service.run_analysis("a1", ["d1"], "u1", provider="smart")
+            await service.progress.stop()
+            return result
+
+        result = asyncio.run(scenario())
+
+        assert result["status"] == "failed"
+        assert db.statuses[-1] == ("failed", "No documents found")
+
+
+class ConcurrencyProbe:
+    """Tracks the peak number of callers inside enter()/exit()."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def enter(self):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+    def exit(self):
+        with self._lock:
+            self.active -= 1
+
+
+class SlowStorage(FakeStorage):
+    def __init__(self):
+        self.probe = ConcurrencyProbe()
+
+    async def download_text(self, bucket_name, blob_path):
+        self.probe.enter()
+        try:
+            # Later documents finish first, so order must come from gather()
+            await asyncio.sleep(0.01 * (10 - int(blob_path[-5])))
+            return await super().download_text(bucket_name, blob_path)
+        finally:
+            self.probe.exit()
+
+
+class SlowOrchestrator(FakeOrchestrator):
+    """Fails for document d3; otherwise reports one issue after a pause."""
+
+    probe = ConcurrencyProbe()
+
+    def run(self, raw_text, progress_callback=None, issue_callback=None):
+        self.probe.enter()
+        try:
+            time.sleep(0.02)
+            if raw_text.endswith("d3.txt"):
+                raise RuntimeError("analyzer crashed")
+            return super().run(raw_text)
+        finally:
+            self.probe.exit()
+
+
+@pytest.mark.unit
+class TestDocumentFanOut:
+    """Test concurrent loading and analysis of an analysis' documents."""
+
+    def test_fan_out_is_ordered_bounded_and_isolated(self, monkeypatch):
+        doc_ids = [f"d{i}" for i in range(1, 7)]
+        db = FakeDB(_documents(*doc_ids))
+        storage = SlowStorage()
+        monkeypatch.setattr(analysis_service.settings, "analysis_max_concurrency", 2)
+        monkeypatch.setattr(orchestrator_agent, "OrchestratorAgent", SlowOrchestrator)
+        monkeypatch.setattr(SlowOrchestrator, "probe", ConcurrencyProbe())
+        monkeypatch.setattr(progress_service, "get_db_service", lambda: db)
+        monkeypatch.setattr(analysis_service, "get_db_service", lambda: db)
+        monkeypatch.setattr(analysis_service, "get_storage_service", lambda: storage)
+        monkeypatch.setattr(analysis_service, "get_progress_reporter",
+                            lambda: progress_service.ProgressReporter(flush_interval=60))
+        monkeypatch.setattr(multimodal_analysis_service, "MultimodalAnalysisService", lambda: None)
+        service = AnalysisService()
+
+        async def scenario():
+            result = await service.run_analysis("a1", doc_ids, "u1", provider="smart")
+            await service.progress.stop()
+            return result
+
+        try:
+            result = asyncio.run(scenario())
+        finally:
+            service.executor.shutdown()
+
+        assert result["status"] == "completed"
+        documents = db.results["a1"]["documents"]
+        assert [doc["filename"] for doc in documents] == [f"{doc_id}.txt" for doc_id in doc_ids]
+        assert [doc.get("error") for doc in documents] == [None, None, "analyzer crashed", None, None, None]
+        assert db.saved == {"a1": 5}
+        assert storage.probe.peak == 2
+        assert SlowOrchestrator.probe.peak == 2
@@ -0,0 +1,107 @@
+"""Tests for the benchmark checkpoint log.
+
+Tests verify:
+- Recorded units survive reopening the log and are reported as completed
+- Failed units are kept in the log but not treated as completed
+- A torn final line (crash mid-write) is ignored and dropped before the next append
+- Run keys change with the dataset hash and prompt version
+- finish() moves the log aside so the next run starts fresh
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.benchmark_checkpoint import (  # noqa: E402
+    STATUS_ERROR,
+    CheckpointLog,
+    RunKey,
+    fingerprint_files,
+)
+
+
+def _key(**overrides):
+    fields = dict(benchmark="patient", model="openai", dataset_hash="abc", prompt_version="1+full")
+    fields.update(overrides)
+    return RunKey(**fields)
+
+
+@pytest.mark.unit
+class TestCheckpointLog:
+    def test_resume_reports_completed_units(self, tmp_path):
+        log = CheckpointLog.open(tmp_path, _key())
+        log.record("patient_001", {"tp": 1})
+        log.record("patient_002", {"error": "timeout"}, status=STATUS_ERROR)
+
+        resumed = CheckpointLog.open(tmp_path, _key())
+        assert resumed.completed() == {"patient_001": {"tp": 1}}
+        assert resumed.records(["patient_002", "patient_001", "patient_003"]) == [
+            {"error": "timeout"},
+            {"tp": 1},
+        ]
+        assert resumed.records(include_errors=False) == [{"tp": 1}]
+
+    def test_latest_record_wins(self, tmp_path):
+        log = CheckpointLog.open(tmp_path, _key())
+        log.record("patient_001", {"error": "429"}, status=STATUS_ERROR)
+        log.record("patient_001", {"tp": 2})
+
+        assert CheckpointLog.open(tmp_path, _key()).completed() == {"patient_001": {"tp": 2}}
+
+    def test_ignores_torn_final_line(self, tmp_path):
+        log = CheckpointLog.open(tmp_path, _key())
+        log.record("patient_001", {"tp": 1})
+        with open(log.path, "a", encoding="utf-8") as f:
+            f.write('{"type": "unit", "unit": "patient_002", "sta')
+
+        assert list(CheckpointLog.open(tmp_path, _key()).completed()) == ["patient_001"]
+
+    def test_records_after_torn_line_survive_reopening(self, tmp_path):
+        log = CheckpointLog.open(tmp_path, _key())
+        log.record("patient_001", {"tp": 1})
+        with open(log.path, "a", encoding="utf-8") as f:
+            f.write('{"type": "unit", "unit": "patient_002", "sta')
+
+        resumed = CheckpointLog.open(tmp_path, _key())
+        resumed.record("patient_003", {"tp": 3})
+
+        assert CheckpointLog.open(tmp_path, _key()).completed() == {
+            "patient_001": {"tp": 1},
+            "patient_003": {"tp": 3},
+        }
+
+    def test_run_key_separates_datasets_and_prompts(self, tmp_path):
+        CheckpointLog.open(tmp_path, _key()).record("patient_001", {"tp": 1})
+
+        assert CheckpointLog.open(tmp_path, _key(dataset_hash="def")).completed() == {}
+        assert CheckpointLog.open(tmp_path, _key(prompt_version="2+full")).completed() == {}
+        assert _key().id == _key().id
+
+    def test_finish_and_fresh_start_over(self, tmp_path):
+        log = CheckpointLog.open(tmp_path, _key())
+        log.record("patient_001", {"tp": 1})
+        done = log.finish()
+
+        assert done.exists()
+        assert CheckpointLog.open(tmp_path, _key()).completed() == {}
+
+        CheckpointLog.open(tmp_path, _key()).record("patient_001", {"tp": 1})
+        assert CheckpointLog.open(tmp_path, _key(), fresh=True).completed() == {}
+
+
+@pytest.mark.unit
+class TestFingerprintFiles:
+    def test_changes_with_content_not_order(self, tmp_path):
+        a = tmp_path / "a.json"
+        b = tmp_path / "b.json"
+        a.write_text("1")
+        b.write_text("2")
+        before = fingerprint_files([a, b])
+
+        assert fingerprint_files([b, a]) == before
+        b.write_text("3")
+        assert fingerprint_files([a, b]) != before
@@ -0,0 +1,160 @@
+"""Tests for the adaptive (AIMD) benchmark engine.
+
+Tests verify:
+- Rate-limit errors are recognized from exceptions and error strings
+- The limit grows additively on success and is cut on throttling
+- Concurrent throttles from one round trip cut the limit only once
+- run_adaptive never exceeds the controller's limit, keeps input order
+  and retries throttled tasks
+- Tasks that stay throttled record their fallback value
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.benchmark_engine import (  # noqa: E402
+    AIMDConfig,
+    AIMDController,
+    RateLimitedError,
+    is_rate_limit_error,
+    run_adaptive,
+)
+
+
+class _StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__("request failed")
+        self.status_code = status_code
+
+
+@pytest.mark.unit
+class TestRateLimitDetection:
+    def test_recognizes_provider_errors(self):
+        assert is_rate_limit_error("Error code: 429 - Too Many Requests")
+        assert is_rate_limit_error("RESOURCE_EXHAUSTED: quota exceeded")
+        assert is_rate_limit_error(RateLimitedError())
+        assert is_rate_limit_error(_StatusError(429))
+
+    def test_ignores_other_errors(self):
+        assert not is_rate_limit_error(None)
+        assert not is_rate_limit_error("JSON decode error at line 4290")
+        assert not is_rate_limit_error(_StatusError(400))
+
+
+@pytest.mark.unit
+class TestAIMDController:
+    def test_additive_increase_and_multiplicative_decrease(self):
+        async def scenario():
+            controller = AIMDController(AIMDConfig(initial=4, max_concurrency=8, latency_warmup=1000))
+            for _ in range(4):
+                await controller.release(await controller.acquire())
+            grown = controller.limit
+            await controller.release(await controller.acquire(), throttled=True)
+            return grown, controller.limit
+
+        grown, cut = asyncio.run(scenario())
+        assert 4.9 < grown < 5.0  # ~ +1 per round of `limit` completions
+        assert cut == pytest.approx(grown / 2)
+
+    def test_one_decrease_per_round_trip(self):
+        async def scenario():
+            controller = AIMDController(AIMDConfig(initial=8, max_concurrency=8))
+            started = [await controller.acquire() for _ in range(4)]
+            for started_at in started:
+                await controller.release(started_at, throttled=True)
+            return controller
+
+        controller = asyncio.run(scenario())
+        assert controller.limit == 4
+        assert controller.decreases == 1
+        assert controller.throttled == 4
+
+    def test_respects_bounds(self):
+        async def scenario():
+            controller = AIMDController(AIMDConfig(initial=1, min_concurrency=1, max_concurrency=2))
+            await controller.release(await controller.acquire(), throttled=True)
+            floor = controller.limit
+            for _ in range(20):
+                await controller.release(await controller.acquire())
+            return floor, controller.limit
+
+        floor, ceiling = asyncio.run(scenario())
+        assert floor == 1
+        assert ceiling == 2
+
+
+@pytest.mark.unit
+class TestRunAdaptive:
+    def test_limits_concurrency_and_keeps_order(self):
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def task(item):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.01)
+            with lock:
+                active -= 1
+            return item * 2
+
+        controller = AIMDController(AIMDConfig(initial=2, max_concurrency=3))
+        results, stats = asyncio.run(run_adaptive(list(range(12)), task, controller))
+
+        assert results == [i * 2 for i in range(12)]
+        assert peak <= 3
+        assert stats.completed == 12
+        assert stats.peak_concurrency == peak
+        assert stats.throughput_per_min > 0
+
+    def test_retries_throttled_tasks(self):
+        attempts = {}
+
+        def task(item):
+            attempts[item] = attempts.get(item, 0) + 1
+            if item == 1 and attempts[item] == 1:
+                raise RuntimeError("429 Too Many Requests")
+            return item
+
+        controller = AIMDController(AIMDConfig(initial=2))
+        results, stats = asyncio.run(run_adaptive([0, 1, 2], task, controller, retry_backoff_s=0.001))
+
+        assert results == [0, 1, 2]
+        assert attempts[1] == 2
+        assert stats.retries == 1
+        assert stats.throttled == 1
+        assert stats.failed == 0
+
+    def test_exhausted_retries_record_fallback(self):
+        def task(item):
+            raise RateLimitedError("quota exceeded", fallback=f"failed-{item}")
+
+        controller = AIMDController()
+        results, stats = asyncio.run(
+            run_adaptive(["a"], task, controller, max_retries=2, retry_backoff_s=0.001)
+        )
+
+        assert results == ["failed-a"]
+        assert stats.retries == 2
+        assert stats.failed == 1
+        assert stats.to_dict()["engine"] == "async-aimd"
+
+    def test_other_errors_are_not_retried(self):
+        def task(item):
+            raise ValueError("bad profile")
+
+        results, stats = asyncio.run(run_adaptive([1], task, AIMDController()))
+
+        assert isinstance(results[0], ValueError)
+        assert stats.retries == 0
+        assert stats.failed == 1
@@ -0,0 +1,251 @@
+"""Tests for the columnar benchmark result store.
+
+Tests verify:
+- Saved patient benchmarks flatten into run, profile, category and issue rows
+- Issue rows carry the detected/expected match and its score
+- Transactions flatten with typed metrics and legacy category_metrics
+- Parquet tables are partitioned by model and date and queried with filters
+- Stored runs are returned in the shape export_dashboard_summary expects
+- Syncing fetches only transactions newer than the latest stored one
+"""
+
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.benchmark_result_store import (  # noqa: E402
+    flatten_patient_results,
+    flatten_transaction,
+)
+
+
+def _patient_results():
+    return {
+        "model_name": "OpenAI GPT-4",
+        "total_patients": 2,
+        "successful_analyses": 2,
+        "avg_precision": 0.5,
+        "avg_recall": 0.75,
+        "avg_f1_score": 0.6,
+        "domain_knowledge_detection_rate": 50.0,
+        "avg_latency_ms": 120.0,
+        "generated_at": "2026-02-03 10:00:00",
+        "domain_breakdown": {
+            "gender_mismatch": {"precision": 1.0, "recall": 0.5, "f1": 0.67, "total_detected": 1, "total_cases": 2},
+        },
+        "throughput": {"throughput_per_min": 30.0},
+        "advanced_metrics": {"risk_weighted_recall": 0.8},
+        "individual_results": [
+            {
+                "patient_id": "P001",
+                "patient_name": "A",
+                "documents_analyzed": 3,
+                "analysis_latency_ms": 100.0,
+                "true_positives": 1,
+                "false_positives": 1,
+                "false_negatives": 1,
+                "expected_issues": [
+                    {"type": "gender_mismatch", "severity": "high", "description": "male pt",
+                     "requires_domain_knowledge": True, "cpt_code": "76805"},
+                    {"type": "duplicate_charge", "severity": "low", "description": "dup",
+                     "requires_domain_knowledge": False},
+                ],
+                "detected_issues": [
+                    {"type": "other", "summary": "noise"},
+                    {"type": "gender_mismatch", "summary": "76805 on male", "code": "76805", "max_savings": 250.0},
+                ],
+                "matches": [{"detected_index": 1, "expected_index": 0, "score": 1.5}],
+                "domain_breakdown": {
+                    "gender_mismatch": {"precision": 1.0, "recall": 1.0, "f1": 1.0,
+                                        "true_positives": 1, "false_negatives": 0, "total": 1},
+                },
+            },
+            {"patient_id": "P002", "true_positives": 0, "false_positives": 0, "false_negatives": 1},
+        ],
+    }
+
+
+def _transaction(txn_id, created_at, model="OpenAI GPT-4", **metrics):
+    base = {
+        "precision": 0.5,
+        "recall": 0.5,
+        "f1": 0.5,
+        "successful_analyses": 10,
+        "error_type_performance": {"gender_mismatch": {"total": 4, "detected": 2, "detection_rate": 0.5}},
+    }
+    base.update(metrics)
+    return {
+        "id": txn_id,
+        "created_at": created_at,
+        "model_version": model,
+        "environment": "github-actions",
+        "benchmark_type": "standard",
+        "commit_sha": "abc123",
+        "metrics": base,
+    }
+
+
+class FakeQuery:
+    """Chainable stand-in for a Supabase table query."""
+
+    def __init__(self, client):
+        self.client = client
+        self.newer_than = None
+
+    def select(self, *args):
+        return self
+
+    def order(self, *args, **kwargs):
+        return self
+
+    def gt(self, column, value):
+        self.newer_than = datetime.fromisoformat(value)
+        return self
+
+    def range(self, start, end):
+        self.start, self.end = start, end
+        return self
+
+    def execute(self):
+        self.client.requests.append(self.newer_than)
+        rows = [
+            row for row in self.client.rows
+            if self.newer_than is None or datetime.fromisoformat(row["created_at"]) > self.newer_than
+        ]
+
+        class Response:
+            data = rows[self.start:self.end + 1]
+        return Response
+
+
+class FakeClient:
+    def __init__(self, rows):
+        self.rows = rows
+        self.requests = []
+
+    def table(self, name):
+        assert name == "benchmark_transactions"
+        return FakeQuery(self)
+
+
+@pytest.mark.unit
+class TestFlatten:
+    def test_patient_results_rows(self):
+        rows = flatten_patient_results(_patient_results())
+
+        run = rows["runs"][0]
+        assert run["source"] == "local"
+        assert run["f1"] == 0.6
+        assert run["domain_knowledge_detection_rate"] == 0.5  # percentage -> fraction
+        assert run["throughput_per_min"] == 30.0
+        assert run["created_at"].tzinfo is not None
+        assert [p["patient_id"] for p in rows["profiles"]] == ["P001", "P002"]
+        assert rows["profiles"][0]["precision"] == 0.5
+        assert {(c["patient_id"], c["total"], c["detected"]) for c in rows["categories"]} == {
+            (None, 2, 1),
+            ("P001", 1, 1),
+        }
+
+    def test_issue_rows_carry_matches(self):
+        issues = flatten_patient_results(_patient_results())["issues"]
+
+        by_key = {(i["kind"], i["issue_index"]): i for i in issues}
+        assert len(issues) == 4
+        assert by_key[("expected", 0)]["matched"] is True
+        assert by_key[("expected", 0)]["matched_index"] == 1
+        assert by_key[("expected", 0)]["match_score"] == 1.5
+        assert by_key[("expected", 1)]["matched"] is False
+        assert by_key[("detected", 1)]["code"] == "76805"
+        assert by_key[("detected", 1)]["max_savings"] == 250.0
+
+    def test_transaction_rows(self):
+        txn = _transaction("t1", "2026-02-03T12:00:00+00:00", f1="0.25", category_metrics={
+            "gender_mismatch": {"total": 9, "detected": 9},
+            "upcoding": {"total": 4, "detected": 1},
+        })
+        txn["metrics"]["patient_results"] = [{"patient_id": "P001", "true_positives": 1, "false_positives": 3}]
+
+        rows = flatten_transaction(txn)
+
+        assert rows["runs"][0]["f1"] == 0.25
+        assert rows["runs"][0]["commit_sha"] == "abc123"
+        assert rows["profiles"][0]["precision"] == 0.25
+        # error_type_performance wins; category_metrics fills in the rest
+        categories = {c["category"]: c for c in rows["categories"]}
+        assert categories["gender_mismatch"]["total"] == 4
+        assert categories["upcoding"]["detection_rate"] == 0.25
+
+
+@pytest.mark.unit
+class TestResultStore:
+    @pytest.fixture
+    def store(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        from scripts.benchmark_result_store import ResultStore
+        return ResultStore(tmp_path / "result_store")
+
+    def test_partitions_and_filters(self, store):
+        store.add_patient_results(_patient_results())
+        store.add_transactions([
+            _transaction("t1", "2026-02-01T12:00:00+00:00"),
+            _transaction("t2", "2026-02-05T12:00:00+00:00", model="Google Gemini 1.5 Pro"),
+        ])
+
+        partitions = sorted(p.parent.relative_to(store.root / "runs").as_posix()
+                            for p in (store.root / "runs").rglob("*.parquet"))
+        assert partitions == [
+            "model_version=Google%20Gemini%201.5%20Pro/date=2026-02-05",
+            "model_version=OpenAI%20GPT-4/date=2026-02-01",
+            "model_version=OpenAI%20GPT-4/date=2026-02-03",
+        ]
+
+        gemini = store.query("runs", model_versions=["Google Gemini 1.5 Pro"], columns=["benchmark_id"])
+        assert list(gemini["benchmark_id"]) == ["t2"]
+        recent = store.query("runs", start=datetime(2026, 2, 2, tzinfo=timezone.utc),
+                             filters=[("source", "==", "supabase")], columns=["benchmark_id"])
+        assert list(recent["benchmark_id"]) == ["t2"]
+        missed = store.query("issues", filters=[("kind", "==", "expected"), ("matched", "==", False)])
+        assert list(missed["type"]) == ["duplicate_charge"]
+        assert str(store.query("profiles")["true_positives"].dtype) == "int64"
+
+    def test_transactions_round_trip(self, store):
+        original = [
+            _transaction("t2", "2026-02-05T12:00:00.123456+00:00", recall=0.8, dataset_size=46),
+            _transaction("t1", "2026-02-01T12:00:00+00:00"),
+        ]
+        store.add_transactions(original)
+        store.add_patient_results(_patient_results())
+
+        loaded = store.transactions()
+
+        assert [t["id"] for t in loaded] == ["t2", "t1"]
+        assert loaded[0]["created_at"] == "2026-02-05T12:00:00.123456+00:00"
+        assert loaded[0]["metrics"] == original[0]["metrics"]
+        assert loaded[0]["benchmark_type"] == "standard"
+        assert store.transactions(start=datetime(2026, 2, 2, tzinfo=timezone.utc))[0]["id"] == "t2"
+
+    def test_sync_fetches_only_new_transactions(self, store):
+        client = FakeClient([
+            _transaction("t1", "2026-02-01T12:00:00+00:00"),
+            _transaction("t2", "2026-02-02T12:00:00+00:00"),
+            _transaction("t3", "2026-02-03T12:00:00+00:00"),
+        ])
+
+        assert store.sync_transactions(client, page_size=2) == 3
+        assert client.requests == [None, None]  # two pages
+
+        client.rows.append(_transaction("t4", "2026-02-04T12:00:00+00:00"))
+        assert store.sync_transactions(client) == 1
+        assert client.requests[-1] == datetime(2026, 2, 3, 12, tzinfo=timezone.utc)
+        assert store.sync_transactions(client) == 0
+        assert sorted(store.query("runs")["benchmark_id"]) == ["t1", "t2", "t3", "t4"]
+
+    def test_empty_store(self, store):
+        assert store.query("runs").empty
+        assert store.latest_created_at() is None
+        assert store.transactions() == []
@@ -0,0 +1,121 @@
+"""Tests for record/replay provider cassettes.
+
+Tests verify:
+- Recorded responses are replayed from the compressed file without calls
+- Replay misses raise CassetteMissError instead of calling the provider
+- Replay works without a live provider, using the recorded identity
+- Record mode always calls through; failed calls are not recorded
+- A truncated last write is ignored and compact() keeps all responses
+"""
+
+import gzip
+
+import pytest
+
+from medbilldozer.providers.cassette import (
+    Cassette,
+    CassetteMissError,
+    CassetteProvider,
+    request_fingerprint,
+)
+from medbilldozer.providers.llm_interface import AnalysisResult, Issue, LLMProvider
+
+
+class CountingProvider(LLMProvider):
+    """Provider that counts calls."""
+
+    prompt_version = "3"
+
+    def __init__(self):
+        self.calls = 0
+
+    def name(self) -> str:
+        return "counting"
+
+    def analyze_document(self, raw_text, facts=None):
+        self.calls += 1
+        return AnalysisResult(
+            issues=[Issue(type="duplicate_charge", summary=raw_text, max_savings=12.5)],
+            meta={"provider": "counting"},
+        )
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "cassettes" / "patient_counting.jsonl.gz"
+
+
+@pytest.mark.unit
+class TestCassetteProvider:
+    def test_record_then_replay(self, path):
+        live = CountingProvider()
+        recorder = CassetteProvider(live, Cassette(path, mode="record"))
+        recorded = recorder.analyze_document("bill A")
+        recorder.analyze_document("bill A")
+        assert live.calls == 2  # record mode never serves from the cassette
+
+        replay_live = CountingProvider()
+        player = CassetteProvider(replay_live, Cassette(path, mode="replay"))
+        replayed = player.analyze_document("bill A")
+
+        assert replay_live.calls == 0
+        assert replayed.issues[0].summary == recorded.issues[0].summary
+        assert replayed.meta["cache_hit"] is True
+
+    def test_replay_miss_raises(self, path):
+        CassetteProvider(CountingProvider(), Cassette(path, mode="record")).analyze_document("bill A")
+        live = CountingProvider()
+        player = CassetteProvider(live, Cassette(path, mode="replay"))
+
+        with pytest.raises(CassetteMissError):
+            player.analyze_document("bill B")
+        assert live.calls == 0
+
+    def test_replay_without_live_provider(self, path):
+        CassetteProvider(CountingProvider(), Cassette(path, mode="record")).analyze_document("bill A")
+
+        player = CassetteProvider(None, Cassette(path, mode="replay"))
+
+        assert player.name() == "counting"
+        assert player.prompt_version == "3"
+        assert player.analyze_document("bill A").issues[0].summary == "bill A"
+
+    def test_auto_records_misses_only(self, path):
+        live = CountingProvider()
+        provider = CassetteProvider(live, Cassette(path, mode="auto"))
+        provider.analyze_document("bill A")
+        provider.analyze_document("bill A")
+
+        assert live.calls == 1
+
+    def test_replay_requires_recorded_file(self, path):
+        with pytest.raises(FileNotFoundError):
+            Cassette(path, mode="replay")
+
+
+@pytest.mark.unit
+class TestCassetteStore:
+    def test_call_skips_failed_responses(self, path):
+        cassette = Cassette(path, mode="auto")
+        key = request_fingerprint(model="gpt-4o-mini", image="xray.png", prompt="p")
+
+        assert cassette.call(key, lambda: None) is None
+        assert cassette.call(key, lambda: "ERROR - mismatch") == "ERROR - mismatch"
+        assert cassette.call(key, lambda: "never called") == "ERROR - mismatch"
+        assert len(Cassette(path, mode="replay")) == 1
+
+    def test_truncated_write_and_compact(self, path):
+        cassette = Cassette(path, mode="record")
+        for i in range(3):
+            cassette.call(f"k{i}", lambda i=i: f"response {i}")
+        torn = gzip.compress(b'{"type": "interaction", "key": "k3", "response": "' + b"x" * 200 + b'"}\n')
+        with open(path, "ab") as f:
+            f.write(torn[: len(torn) // 2])
+
+        reopened = Cassette(path, mode="auto")
+        assert len(reopened) == 3
+
+        reopened.compact()
+        replay = Cassette(path, mode="replay")
+        assert [replay.get(f"k{i}") for i in range(3)] == ["response 0", "response 1", "response 2"]
+        assert replay.meta == {}
@@ -0,0 +1,176 @@
+"""Tests for the coverage matrix.
+
+Tests verify:
+- CoverageIndex rows match build_coverage_matrix for the same documents
+- Removing or re-syncing documents updates only their rows
+- sync() follows the given document order, as build_coverage_matrix does
+- Fuzzy matching joins similar descriptions on the same date
+- Serialized indexes restore to the same rows and keep updating
+"""
+
+import json
+
+import pytest
+
+from medbilldozer.core.coverage_matrix import CoverageIndex, build_coverage_matrix
+
+
+def _receipt(doc_id, date, *items):
+    return {
+        "document_id": doc_id,
+        "facts": {
+            "document_type": "receipt",
+            "date_of_service": date,
+            "receipt_items": [{"description": d, "amount": a} for d, a in items],
+        },
+    }
+
+
+def _fsa(doc_id, *items):
+    return {
+        "document_id": doc_id,
+        "facts": {
+            "document_type": "fsa_claim_history",
+            "fsa_claim_items": [
+                {"description": d, "date_submitted": date, "amount_reimbursed": a} for d, date, a in items
+            ],
+        },
+    }
+
+
+def _insurance(doc_id, *items):
+    return {
+        "document_id": doc_id,
+        "facts": {
+            "document_type": "insurance_claim_history",
+            "insurance_claim_items": [
+                {"description": d, "date_of_service": date, "insurance_paid": a} for d, date, a in items
+            ],
+        },
+    }
+
+
+DOCUMENTS = [
+    _receipt("r1", "2024-01-05", ("Office Visit", 120.0), ("Chest X-Ray", 80.0)),
+    _fsa("f1", ("office visit", "2024-01-05", 100.0), ("Glasses", "2024-02-01", 200.0)),
+    _insurance("i1", ("Chest X-Ray", "2024-01-05", 60.0), ("Lab panel", "2024-03-01", 40.0)),
+    _receipt("r2", "2024-01-05", ("Office Visit", 130.0)),
+]
+
+
+@pytest.mark.unit
+class TestCoverageIndex:
+    """Test CoverageIndex against build_coverage_matrix."""
+
+    def test_matches_full_build(self):
+        index = CoverageIndex().add_documents(DOCUMENTS)
+
+        assert index.rows() == build_coverage_matrix(DOCUMENTS)
+
+    def test_remove_document(self):
+        index = CoverageIndex().add_documents(DOCUMENTS)
+
+        assert index.remove_document("r1")
+        assert not index.remove_document("r1")
+        assert index.rows() == build_coverage_matrix([d for d in DOCUMENTS if d["document_id"] != "r1"])
+
+    def test_remove_everything(self):
+        index = CoverageIndex().add_documents(DOCUMENTS)
+        for doc in DOCUMENTS:
+            index.remove_document(doc["document_id"])
+
+        assert index.rows() == []
+        assert len(index) == 0
+        assert index._token_index == {}
+
+    def test_sync_reindexes_changed_documents(self):
+        index = CoverageIndex().sync(DOCUMENTS)
+        changed = _receipt("r2", "2024-01-05", ("Office Visit", 99.0))
+        updated = DOCUMENTS[1:3] + [changed]
+
+        rows = index.sync(updated).rows()
+
+        assert index.document_ids == ["f1", "i1", "r2"]
+        assert rows == build_coverage_matrix(updated)
+
+    def test_sync_keeps_document_order_for_shared_slots(self):
+        first = _receipt("a", "2024-01-05", ("Office Visit", 10.0))
+        second = _receipt("b", "2024-01-05", ("Office Visit", 20.0), ("Lab Work", 5.0))
+        changed = _receipt("a", "2024-01-05", ("Lab Work", 3.0), ("Office Visit", 11.0))
+        index = CoverageIndex().sync([first, second])
+
+        rows = index.sync([changed, second]).rows()
+
+        assert index.document_ids == ["a", "b"]
+        assert rows == build_coverage_matrix([changed, second])
+        assert [row.receipt_amount for row in rows] == [5.0, 20.0]
+
+    def test_sync_follows_reordered_documents(self):
+        index = CoverageIndex().sync(DOCUMENTS)
+        reordered = DOCUMENTS[::-1]
+
+        assert index.sync(reordered).rows() == build_coverage_matrix(reordered)
+
+    def test_rows_are_copies(self):
+        index = CoverageIndex().add_documents(DOCUMENTS)
+        index.rows()[0].status = "tampered"
+
+        assert index.rows() == build_coverage_matrix(DOCUMENTS)
+
+    def test_requires_document_id(self):
+        with pytest.raises(ValueError):
+            CoverageIndex().add_document({"facts": {}})
+
+
+@pytest.mark.unit
+class TestFuzzyMatching:
+    """Test token-based description matching."""
+
+    def test_joins_similar_descriptions_on_same_date(self):
+        index = CoverageIndex(fuzzy_threshold=0.5).add_documents([
+            _receipt("r1", "2024-01-05", ("X-Ray, chest (2 views)", 80.0)),
+            _insurance("i1", ("Chest x-ray 2 views", "2024-01-05", 60.0), ("Chest x-ray", "2024-02-05", 60.0)),
+        ])
+
+        rows = index.rows()
+        assert len(rows) == 2
+        assert rows[0].description == "X-Ray, chest (2 views)"
+        assert (rows[0].receipt_amount, rows[0].insurance_amount) == (80.0, 60.0)
+        assert rows[0].status == "⚠️ Missing FSA"
+
+    def test_dissimilar_descriptions_stay_apart(self):
+        index = CoverageIndex(fuzzy_threshold=0.5).add_documents([
+            _receipt("r1", "2024-01-05", ("Chest X-Ray", 80.0)),
+            _insurance("i1", ("Blood panel", "2024-01-05", 60.0)),
+        ])
+
+        assert len(index.rows()) == 2
+
+    def test_rejects_bad_threshold(self):
+        with pytest.raises(ValueError):
+            CoverageIndex(fuzzy_threshold=0)
+
+
+@pytest.mark.unit
+class TestSerialization:
+    """Test to_dict/from_dict round trips."""
+
+    def test_round_trip_through_json(self):
+        index = CoverageIndex(fuzzy_threshold=0.5).add_documents(DOCUMENTS)
+        index.remove_document("f1")
+
+        restored = CoverageIndex.from_dict(json.loads(json.dumps(index.to_dict())))
+
+        assert restored.rows() == index.rows()
+        assert restored.document_ids == index.document_ids
+
+    def test_restored_index_keeps_updating(self):
+        restored = CoverageIndex.from_dict(CoverageIndex().add_documents(DOCUMENTS[:2]).to_dict())
+
+        restored.add_documents(DOCUMENTS[2:])
+
+        assert restored.rows() == build_coverage_matrix(DOCUMENTS)
+
+    def test_rejects_unknown_version(self):
+        with pytest.raises(ValueError):
+            CoverageIndex.from_dict({"version": 99})
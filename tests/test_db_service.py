@@ -0,0 +1,379 @@
+"""Tests for the backend's DBService against a stubbed PostgREST.
+
+Tests verify:
+- get_documents_bulk() chunks large IN queries and drops other users' rows
+- Rows memoized per analysis are reused only by the analysis' owner
+- Progress is patched through the patch_analysis_progress RPC
+- A missing RPC (404) switches to the read-modify-write fallback for good
+- The fallback merges progress into the per-document results
+- Issue statistics map view rows, turning NULL sums into zeros
+- Statistics are only returned for the requesting user's analyses
+- GET /issues/statistics rejects more than MAX_STATISTICS_ANALYSES ids
+- trigger_analysis releases memoized rows when it rejects or fails a request
+- trigger_analysis picks the queue lane itself, ignoring any client priority
+"""
+
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+from urllib.parse import parse_qsl
+
+import httpx
+import pytest
+
+pytest.importorskip("pydantic_settings")
+
+# Required settings; the services under test never use them
+os.environ.setdefault("FIREBASE_PROJECT_ID", "test-project")
+os.environ.setdefault("GCS_PROJECT_ID", "test-project")
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from app.services.db_service import (  # noqa: E402
+    BULK_FETCH_CHUNK_SIZE,
+    ISSUE_STATISTICS_COUNTS,
+    ISSUE_STATISTICS_SAVINGS,
+    DBService,
+)
+from app.services.postgrest_client import PostgrestError  # noqa: E402
+from tests.test_postgrest_client import FakePostgrest, _client  # noqa: E402
+
+
+def _documents(user_id, count, prefix="d"):
+    return [{"document_id": f"{prefix}{i}", "user_id": user_id} for i in range(count)]
+
+
+def _document_queries(server):
+    return [
+        dict(parse_qsl(request.url.query.decode()))
+        for request in server.requests
+        if request.url.path.endswith("/documents")
+    ]
+
+
+@pytest.mark.unit
+class TestGetDocumentsBulk:
+    """Test the batched document lookup used by analyses."""
+
+    def test_large_requests_are_chunked(self):
+        server = FakePostgrest({"documents": _documents("u1", 250) + _documents("u2", 1, prefix="x")})
+        db = DBService(client=_client(server))
+        doc_ids = [f"d{i}" for i in range(250)] + ["d0", "x0", "missing"]
+
+        docs = asyncio.run(db.get_documents_bulk(doc_ids, "u1"))
+
+        assert list(docs) == [f"d{i}" for i in range(250)]
+        queries = _document_queries(server)
+        assert len(queries) == 3
+        assert all(query["user_id"] == "eq.u1" for query in queries)
+        sizes = [query["document_id"].count(",") + 1 for query in queries]
+        assert sorted(sizes, reverse=True) == [BULK_FETCH_CHUNK_SIZE, BULK_FETCH_CHUNK_SIZE, 52]
+
+    def test_analysis_memo_is_reused_until_released(self):
+        server = FakePostgrest({"documents": _documents("u1", 2)})
+        db = DBService(client=_client(server))
+
+        async def scenario():
+            first = await db.get_documents_bulk(["d0", "d1", "d9"], "u1", analysis_id="a1")
+            second = await db.get_documents_bulk(["d1", "d9"], "u1", analysis_id="a1")
+            requests_before_release = len(server.requests)
+            db.release_analysis_documents("a1")
+            await db.get_documents_bulk(["d1"], "u1", analysis_id="a1")
+            return first, second, requests_before_release
+
+        first, second, requests_before_release = asyncio.run(scenario())
+
+        assert list(first) == ["d0", "d1"]
+        # Found and not-found rows are both memoized: no second round-trip
+        assert list(second) == ["d1"]
+        assert requests_before_release == 1
+        assert len(server.requests) == 2
+
+    def test_analysis_memo_is_not_shared_with_other_users(self):
+        server = FakePostgrest({"documents": _documents("u1", 1)})
+        db = DBService(client=_client(server))
+
+        async def scenario():
+            await db.get_documents_bulk(["d0"], "u1", analysis_id="a1")
+            return await db.get_documents_bulk(["d0"], "u2", analysis_id="a1")
+
+        assert asyncio.run(scenario()) == {}
+        assert _document_queries(server)[-1]["user_id"] == "eq.u2"
+
+
+class WithoutProgressRPC:
+    """FakePostgrest whose /rpc endpoints answer with the given status."""
+
+    def __init__(self, server, status_code=404):
+        self.server = server
+        self.status_code = status_code
+        self.rpc_calls = 0
+
+    def __call__(self, request):
+        if "/rpc/" in request.url.path:
+            self.rpc_calls += 1
+            return httpx.Response(self.status_code, json={"message": "function not available"})
+        return self.server(request)
+
+
+def _progress(phase, updated_at="2026-01-01T00:00:05"):
+    return {"phase": phase, "updated_at": updated_at}
+
+
+def _analysis(results):
+    return {"analyses": [{"analysis_id": "a1", "user_id": "u1", "results": results}]}
+
+
+@pytest.mark.unit
+class TestUpdateDocumentsProgress:
+    """Test the batched progress write behind ProgressReporter."""
+
+    def test_patches_through_rpc(self):
+        server = FakePostgrest()
+        db = DBService(client=_client(server))
+        progress = {"d1": _progress("analyzing"), "d2": _progress("loading")}
+
+        assert asyncio.run(db.update_documents_progress("a1", progress)) is True
+
+        (request,) = server.requests
+        assert request.method == "POST"
+        assert request.url.path.endswith("/rpc/patch_analysis_progress")
+        assert json.loads(request.content) == {"p_analysis_id": "a1", "p_progress": progress}
+
+    def test_missing_rpc_switches_to_fallback(self):
+        server = FakePostgrest(_analysis([]))
+        handler = WithoutProgressRPC(server)
+        db = DBService(client=_client(handler))
+
+        async def scenario():
+            first = await db.update_documents_progress("a1", {"d1": _progress("loading")})
+            second = await db.update_documents_progress("a1", {"d1": _progress("analyzing")})
+            return first, second
+
+        assert asyncio.run(scenario()) == (True, True)
+        assert handler.rpc_calls == 1
+        assert db._progress_rpc_available is False
+        assert server.tables["analyses"][0]["results"][0]["progress"]["phase"] == "analyzing"
+
+    def test_other_rpc_errors_propagate(self):
+        handler = WithoutProgressRPC(FakePostgrest(_analysis([])), status_code=500)
+        db = DBService(client=_client(handler))
+
+        with pytest.raises(PostgrestError):
+            asyncio.run(db.update_documents_progress("a1", {"d1": _progress("loading")}))
+        assert db._progress_rpc_available is True
+
+    def test_fallback_merges_into_document_results(self):
+        server = FakePostgrest(_analysis([
+            {"document_id": "d1", "filename": "bill.pdf", "progress": _progress("loading", "2026-01-01T00:00:01")},
+        ]))
+        db = DBService(client=_client(WithoutProgressRPC(server)))
+
+        updated = asyncio.run(db.update_documents_progress("a1", {
+            "d1": _progress("analyzing"),
+            "d2": _progress("loading"),
+        }))
+
+        assert updated is True
+        assert server.tables["analyses"][0]["results"] == [
+            {"document_id": "d1", "filename": "bill.pdf", "progress": _progress("analyzing")},
+            {"document_id": "d2", "progress": {**_progress("loading"), "started_at": "2026-01-01T00:00:05"}},
+        ]
+
+    def test_fallback_leaves_final_results_alone(self):
+        final = {"documents": [], "total_issues": 0}
+        server = FakePostgrest(_analysis(final))
+        db = DBService(client=_client(WithoutProgressRPC(server)))
+
+        assert asyncio.run(db.update_documents_progress("a1", {"d1": _progress("loading")})) is False
+        assert server.tables["analyses"][0]["results"] == final
+        assert asyncio.run(db.update_documents_progress("missing", {"d1": _progress("loading")})) is False
+
+
+def _statistics_row(analysis_id, user_id, **values):
+    row = {"analysis_id": analysis_id, "user_id": user_id}
+    row.update({key: None for key in ISSUE_STATISTICS_COUNTS + ISSUE_STATISTICS_SAVINGS})
+    row.update(values)
+    return row
+
+
+def _statistics_server():
+    return FakePostgrest({"issue_statistics": [
+        _statistics_row("a1", "u1", open_count=2, resolved_count="1",
+                        open_potential_savings=150.5, resolved_savings="20"),
+        _statistics_row("a2", "u1"),  # SUMs over an analysis without issues
+        _statistics_row("a3", "u2", open_count=7),
+    ]})
+
+
+@pytest.mark.unit
+class TestIssueStatistics:
+    """Test statistics served from the issue_statistics view."""
+
+    def test_maps_view_row(self):
+        db = DBService(client=_client(_statistics_server()))
+
+        stats = asyncio.run(db.get_issue_statistics("a1"))
+
+        assert stats == {
+            "open_count": 2, "follow_up_count": 0, "resolved_count": 1, "ignored_count": 0,
+            "open_potential_savings": 150.5, "follow_up_potential_savings": 0.0, "resolved_savings": 20.0,
+        }
+        assert isinstance(stats["resolved_count"], int)
+
+    def test_null_sums_and_missing_rows_report_zeros(self):
+        db = DBService(client=_client(_statistics_server()))
+
+        async def scenario():
+            return await db.get_issue_statistics("a2"), await db.get_issue_statistics("missing")
+
+        empty, missing = asyncio.run(scenario())
+
+        assert empty == missing
+        assert set(empty.values()) == {0}
+
+    def test_bulk_is_scoped_to_the_user(self):
+        server = _statistics_server()
+        db = DBService(client=_client(server))
+
+        stats = asyncio.run(db.get_issue_statistics_bulk(["a1", "a2", "a3", "missing", "a1"], "u1"))
+
+        assert sorted(stats) == ["a1", "a2"]
+        assert stats["a1"]["open_count"] == 2
+        assert stats["a2"]["open_count"] == 0
+        assert len(server.requests) == 1
+        assert asyncio.run(db.get_issue_statistics_bulk([], "u1")) == {}
+        assert len(server.requests) == 1
+
+    def test_statistics_routes(self):
+        issues = pytest.importorskip("app.api.issues")
+        db = DBService(client=_client(_statistics_server()))
+        user = {"user_id": "u1"}
+
+        async def scenario():
+            listed = await issues.get_issue_statistics_for_analyses(
+                ["a3", "a2", "missing", "a1", "a2"], user, db
+            )
+            single = await issues.get_issue_statistics("a1", user, db)
+            with pytest.raises(issues.HTTPException) as exc_info:
+                await issues.get_issue_statistics("a3", user, db)
+            return listed, single, exc_info.value
+
+        listed, single, error = asyncio.run(scenario())
+
+        assert [stats.analysis_id for stats in listed] == ["a2", "a1"]
+        assert listed[1] == single
+        assert single.open_potential_savings == 150.5
+        assert error.status_code == 404
+
+    def test_statistics_route_caps_analysis_ids(self):
+        issues = pytest.importorskip("app.api.issues")
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        server = _statistics_server()
+        app = FastAPI()
+        app.include_router(issues.router, prefix="/issues")
+        app.dependency_overrides[issues.get_current_user] = lambda: {"user_id": "u1"}
+        app.dependency_overrides[issues.get_db_service] = lambda: DBService(client=_client(server))
+        client = TestClient(app)
+
+        def get(count):
+            ids = ["a1"] + [f"x{i}" for i in range(count - 1)]
+            return client.get("/issues/statistics", params={"analysis_ids": ids})
+
+        allowed = get(issues.MAX_STATISTICS_ANALYSES)
+        rejected = get(issues.MAX_STATISTICS_ANALYSES + 1)
+
+        assert allowed.status_code == 200
+        assert [stats["analysis_id"] for stats in allowed.json()] == ["a1"]
+        assert rejected.status_code == 422
+        assert len(server.requests) == 1
+
+
+class FakeProgress:
+    def start_analysis(self, *args, **kwargs):
+        pass
+
+
+class FailingQueue:
+    in_process = True
+
+    async def enqueue(self, job):
+        raise ConnectionError("queue unavailable")
+
+
+@pytest.mark.unit
+class TestTriggerAnalysisRelease:
+    """Test that trigger_analysis never leaves memoized rows behind."""
+
+    @pytest.fixture
+    def trigger(self):
+        analyze = pytest.importorskip("app.api.analyze")
+        from app.models.requests import AnalyzeRequest
+        server = FakePostgrest({"documents": _documents("u1", 1)})
+        db = DBService(client=_client(server))
+
+        def trigger(document_ids):
+            request = AnalyzeRequest(document_ids=document_ids)
+            with pytest.raises(analyze.HTTPException) as exc_info:
+                asyncio.run(analyze.trigger_analysis(
+                    request, {"user_id": "u1"}, db, FakeProgress(), FailingQueue()
+                ))
+            return db, exc_info.value
+
+        return trigger
+
+    def test_released_when_a_document_is_not_found(self, trigger):
+        db, error = trigger(["d0", "d9"])
+
+        assert error.status_code == 404
+        assert error.detail["document_id"] == "d9"
+        assert db._analysis_documents == {}
+
+    def test_released_when_enqueueing_fails(self, trigger):
+        db, error = trigger(["d0"])
+
+        assert error.status_code == 500
+        assert "queue unavailable" in error.detail["message"]
+        assert db._analysis_documents == {}
+
+
+class RecordingQueue:
+    in_process = False
+
+    def __init__(self):
+        self.jobs = []
+
+    async def enqueue(self, job):
+        self.jobs.append(job)
+
+
+@pytest.mark.unit
+class TestTriggerAnalysisLane:
+    """Test that the server, not the client, assigns the queue lane."""
+
+    def _enqueued(self, body):
+        analyze = pytest.importorskip("app.api.analyze")
+        from app.models.requests import AnalyzeRequest
+        server = FakePostgrest({"documents": _documents("u1", 20), "analyses": []})
+        db = DBService(client=_client(server))
+        queue = RecordingQueue()
+        request = AnalyzeRequest(**body)
+        asyncio.run(analyze.trigger_analysis(request, {"user_id": "u1"}, db, FakeProgress(), queue))
+        (job,) = queue.jobs
+        return job
+
+    def test_client_priority_is_ignored(self):
+        job = self._enqueued({"document_ids": ["d0"], "priority": "high"})
+
+        assert job.priority == "normal"
+
+    def test_bulk_requests_use_the_low_lane(self):
+        from app.config import settings
+        count = settings.analysis_bulk_document_threshold + 1
+        job = self._enqueued({"document_ids": [f"d{i}" for i in range(count)]})
+
+        assert job.priority == "low"
@@ -0,0 +1,117 @@
+"""Tests for benchmark detection matching.
+
+Tests verify:
+- Optimal assignment is independent of the order detections are listed in
+- Optimal assignment finds the most matches where first-match falls short
+- The "first" strategy reproduces the legacy first-match scoring
+- The Hungarian solver agrees with brute force on small matrices
+- Match scores are exposed per pair
+"""
+
+import itertools
+import json
+import random
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.detection_matching import DetectionMatcher, _hungarian_max  # noqa: E402
+
+
+@dataclass
+class Expected:
+    type: str
+    cpt_code: Optional[str] = None
+
+
+def _legacy_first_match(expected, detected):
+    """The matching loop evaluate_detection used before the matcher."""
+    matched = []
+    taken = set()
+    for det_idx, issue in enumerate(detected):
+        text = json.dumps(issue).lower()
+        for exp_idx, exp in enumerate(expected):
+            if exp_idx in taken:
+                continue
+            if (exp.cpt_code and exp.cpt_code.lower() in text) or any(
+                kw in text for kw in exp.type.split('_')
+            ):
+                taken.add(exp_idx)
+                matched.append((det_idx, exp_idx))
+                break
+    return matched
+
+
+@pytest.mark.unit
+class TestDetectionMatcher:
+    def test_optimal_beats_first_match(self):
+        expected = [Expected("gender_mismatch", "76805"), Expected("age_screening", "77067")]
+        # The first detection mentions both; first-match gives it issue 0 and
+        # leaves the second detection (which only fits issue 0) unmatched
+        detected = [
+            {"summary": "gender mismatch; screening mammogram 77067"},
+            {"summary": "obstetric ultrasound 76805 on male patient"},
+        ]
+
+        first = DetectionMatcher(expected, strategy="first").match(detected)
+        optimal = DetectionMatcher(expected).match(detected)
+
+        assert len(first.pairs) == 1
+        assert {(p.detected_index, p.expected_index) for p in optimal.pairs} == {(0, 1), (1, 0)}
+
+    def test_optimal_is_order_independent(self):
+        rng = random.Random(7)
+        expected = [Expected("gender_mismatch", "76805"), Expected("age_screening"), Expected("duplicate_charge", "99213")]
+        words = ["gender", "age", "screening", "duplicate", "76805", "99213", "charge", "note"]
+        for _ in range(50):
+            detected = [{"summary": " ".join(rng.sample(words, 2))} for _ in range(rng.randint(1, 5))]
+            shuffled = detected[:]
+            rng.shuffle(shuffled)
+            a = DetectionMatcher(expected).match(detected)
+            b = DetectionMatcher(expected).match(shuffled)
+            assert len(a.pairs) == len(b.pairs)
+            assert sum(p.score for p in a.pairs) == pytest.approx(sum(p.score for p in b.pairs))
+
+    def test_first_strategy_matches_legacy(self):
+        rng = random.Random(3)
+        types = ["gender_mismatch", "age_inappropriate_screening", "duplicate_charge", "surgical_history_contradiction"]
+        codes = [None, "76805", "99213", "45378"]
+        words = ["gender", "screening", "duplicate", "history", "76805", "99213", "45378", "billing"]
+        for _ in range(100):
+            expected = [Expected(rng.choice(types), rng.choice(codes)) for _ in range(rng.randint(1, 4))]
+            detected = [{"type": rng.choice(words), "summary": rng.choice(words)} for _ in range(rng.randint(0, 5))]
+            match = DetectionMatcher(expected, strategy="first").match(detected)
+            assert [(p.detected_index, p.expected_index) for p in match.pairs] == _legacy_first_match(expected, detected)
+
+    def test_exposes_scores(self):
+        expected = [Expected("age_inappropriate_screening", "77067")]
+        match = DetectionMatcher(expected).match([{"summary": "screening 77067"}, {"summary": "unrelated"}])
+
+        assert match.to_dict() == [{"detected_index": 0, "expected_index": 0, "score": pytest.approx(1.3333)}]
+        assert match.candidates == 1
+
+    def test_rejects_unknown_strategy(self):
+        with pytest.raises(ValueError):
+            DetectionMatcher([], strategy="best")
+
+
+@pytest.mark.unit
+class TestHungarian:
+    def test_agrees_with_brute_force(self):
+        rng = random.Random(11)
+        for size in range(1, 6):
+            for _ in range(20):
+                weights = [[rng.choice([0.0, rng.random() * 5]) for _ in range(size)] for _ in range(size)]
+                assignment = _hungarian_max(weights)
+                best = max(
+                    sum(weights[i][perm[i]] for i in range(size))
+                    for perm in itertools.permutations(range(size))
+                )
+                assert sorted(assignment) == list(range(size))
+                assert sum(weights[i][assignment[i]] for i in range(size)) == pytest.approx(best)
@@ -0,0 +1,111 @@
+"""Tests for the compiled document classifier.
+
+Tests verify:
+- Classification, pre-facts and local type match per-pattern re.search on benchmarks/inputs
+- Signals are case-insensitive while pre-fact flags stay case-sensitive
+- Leading word boundaries are still enforced
+- The batch API preserves input order
+"""
+
+import re
+from pathlib import Path
+
+import pytest
+
+from medbilldozer.core.document_classifier import (
+    DOCUMENT_CLASSIFIER,
+    DOCUMENT_SIGNALS,
+    LOCAL_TYPE_RULES,
+    PRE_FACT_FLAGS,
+    DocumentClassifier,
+)
+
+INPUTS_DIR = Path(__file__).parent.parent / "benchmarks" / "inputs"
+
+
+def _reference_scores(text):
+    scores = {}
+    for doc_type, patterns in DOCUMENT_SIGNALS.items():
+        matches = sum(1 for p in patterns if re.search(p, text, re.IGNORECASE))
+        if matches:
+            scores[doc_type] = matches
+    return scores
+
+
+def _reference_local_type(text):
+    for doc_type, pattern, ignore_case in LOCAL_TYPE_RULES:
+        if re.search(pattern, text, re.IGNORECASE if ignore_case else 0):
+            return doc_type
+    return "unknown"
+
+
+@pytest.fixture(scope="module")
+def benchmark_documents():
+    """Every document in benchmarks/inputs."""
+    texts = [path.read_text(encoding="utf-8") for path in sorted(INPUTS_DIR.glob("*.txt"))]
+    assert texts, f"No benchmark inputs found in {INPUTS_DIR}"
+    return texts
+
+
+@pytest.mark.unit
+class TestEquivalence:
+    """Test agreement with the per-pattern implementation."""
+
+    def test_benchmark_inputs(self, benchmark_documents):
+        for text in benchmark_documents:
+            scan = DOCUMENT_CLASSIFIER.scan(text)
+            assert scan.scores == _reference_scores(text)
+            assert scan.flags == {
+                name: bool(re.search(pattern, text)) for name, pattern in PRE_FACT_FLAGS.items()
+            }
+            assert scan.local_type == _reference_local_type(text)
+
+    def test_length_changing_lowercase_falls_back(self):
+        # "İ".lower() is two code points; results must not shift
+        text = "İİ Pharmacy Rx 12345"
+        scan = DOCUMENT_CLASSIFIER.scan(text)
+        assert scan.scores == _reference_scores(text)
+        assert scan.flags["contains_rx"] is True
+        assert scan.local_type == "medical_bill"
+
+
+@pytest.mark.unit
+class TestCaseAndBoundaries:
+    """Test case handling and word boundaries."""
+
+    def test_signal_is_case_insensitive_but_flag_is_not(self):
+        scan = DOCUMENT_CLASSIFIER.scan("cpt 99213, rx filled, d2750")
+        assert scan.scores == {"medical_bill": 1, "pharmacy_receipt": 1, "dental_bill": 1}
+        assert scan.flags == {"contains_cpt": False, "contains_dental_code": False, "contains_rx": False}
+        assert scan.local_type == "medical_bill"
+
+    def test_flag_found_after_lowercase_occurrence(self):
+        scan = DOCUMENT_CLASSIFIER.scan("cpt first, then CPT")
+        assert scan.flags["contains_cpt"] is True
+
+    def test_leading_boundary_enforced(self):
+        scan = DOCUMENT_CLASSIFIER.scan("XCPT ABCD1234 Prx")
+        assert scan.scores == {}
+        assert not any(scan.flags.values())
+
+    def test_pre_facts_include_counts(self):
+        facts = DOCUMENT_CLASSIFIER.scan("Line 1\nLine 2\nCPT").pre_facts()
+        assert facts["line_count"] == 3
+        assert facts["char_count"] == 17
+        assert facts["contains_cpt"] is True
+
+
+@pytest.mark.unit
+class TestBatchAPI:
+    """Test classify_many()."""
+
+    def test_preserves_order(self, benchmark_documents):
+        results = DOCUMENT_CLASSIFIER.classify_many(benchmark_documents)
+        assert results == [DOCUMENT_CLASSIFIER.classify(t) for t in benchmark_documents]
+
+    def test_custom_rules(self):
+        classifier = DocumentClassifier({"lab_report": [r"\bHbA1c\b", "Reference Range"]}, {})
+        assert classifier.classify_many(["hba1c 5.4", "nothing"]) == [
+            {"document_type": "lab_report", "confidence": 1.0, "scores": {"lab_report": 1}},
+            {"document_type": "generic", "confidence": 0.0, "scores": {}},
+        ]
@@ -0,0 +1,120 @@
+"""Tests for the ensemble post-processing scanners.
+
+Tests verify:
+- The keyword automaton agrees with a naive in-order substring scan
+- Label canonicalization matches the label-map semantics
+- CPT tokenization carries the current date of service forward
+- Deterministic heuristics still flag gender mismatches, duplicates and interactions
+"""
+
+import random
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+# Mock external dependencies
+sys.modules['openai'] = MagicMock()
+
+from medbilldozer.providers.ensemble_heuristics import (
+    KeywordAutomaton,
+    LabelCanonicalizer,
+    extract_cpt_entries,
+    heuristic_drug_interactions,
+    heuristic_duplicate_charge,
+    heuristic_gender_mismatch,
+)
+from medbilldozer.providers.medgemma_ensemble_provider import SIMPLE_LABEL_MAP
+
+
+def _naive_best(keywords, text):
+    return next((idx for idx, kw in enumerate(keywords) if kw in text), None)
+
+
+@pytest.mark.unit
+class TestKeywordAutomaton:
+    """Test Aho–Corasick matching."""
+
+    def test_matches_naive_scan_on_random_text(self):
+        keywords = ["he", "she", "his", "hers", "ushe", "e", "rs"]
+        automaton = KeywordAutomaton(keywords)
+        rng = random.Random(0)
+        for _ in range(500):
+            text = "".join(rng.choice("ehrsuix ") for _ in range(rng.randint(0, 20)))
+            assert automaton.best_match(text) == _naive_best(keywords, text), text
+            assert automaton.contains_any(text) == any(kw in text for kw in keywords)
+
+    def test_overlapping_keyword_found_via_fail_link(self):
+        automaton = KeywordAutomaton(["repeated", "repeat", "eat"])
+        assert automaton.best_match("repeatedly") == 0
+        assert automaton.best_match("repeal or eat") == 2
+
+    def test_rejects_empty_keyword(self):
+        with pytest.raises(ValueError):
+            KeywordAutomaton(["ok", ""])
+
+
+@pytest.mark.unit
+class TestLabelCanonicalizer:
+    """Test label canonicalization semantics."""
+
+    canonicalizer = LabelCanonicalizer(SIMPLE_LABEL_MAP)
+
+    @pytest.mark.parametrize("raw_type,summary,expected", [
+        ("Duplicate Charge", None, "duplicate_charge"),
+        ("billing anomaly", "Male patient billed for Pap smear", "gender_mismatch"),
+        ("Possible repeated imaging", None, "temporal_violation"),
+        (None, "Screening colonoscopy for 8-year-old", "age_inappropriate_service"),
+        ("Unbundled Lab-Panel", None, "unbundled_lab_panel"),
+        (None, None, "other"),
+    ])
+    def test_canonicalize(self, raw_type, summary, expected):
+        assert self.canonicalizer.canonicalize(raw_type, summary) == expected
+
+    def test_first_key_in_map_order_wins(self):
+        # Both "duplicate" and "repeat" occur; "duplicate" comes first in the map
+        assert self.canonicalizer.canonicalize("repeat duplicate", None) == "duplicate_charge"
+
+
+@pytest.mark.unit
+class TestExtractCptEntries:
+    """Test single-pass CPT tokenization."""
+
+    def test_uses_most_recent_date_of_service(self):
+        text = (
+            "Date of Service: 2024-01-05\nCPT 99213 $40.00\n"
+            "Date of Service: 01/06/2024\nCPT:80053 $12.50\n"
+        )
+        entries = extract_cpt_entries(text)
+        assert [(e["cpt"], e["date"]) for e in entries] == [
+            ("99213", "2024-01-05"),
+            ("80053", "01/06/2024"),
+        ]
+        assert entries[0]["amount"] == "$40.00"
+
+    def test_no_date_before_first_code(self):
+        entries = extract_cpt_entries("CPT 99213 $40.00\nDate of Service: 2024-01-05")
+        assert entries[0]["date"] is None
+
+
+@pytest.mark.unit
+class TestHeuristics:
+    """Test the deterministic heuristics end to end."""
+
+    def test_gender_mismatch(self):
+        text = "Sex: M\nCPT 88150 pap smear screening $40.00"
+        issues = heuristic_gender_mismatch(text, set())
+        assert [(i.type, i.code) for i in issues] == [("gender_mismatch", "88150")]
+        assert heuristic_gender_mismatch(text, {"88150"}) == []
+
+    def test_duplicate_charge_across_documents(self):
+        doc = "Date of Service: 2024-01-05\nCPT 99213 Office visit $40.00"
+        text = f"--- DOCUMENT 1 ---\n{doc}\n--- DOCUMENT 2 ---\n{doc}"
+        issues = heuristic_duplicate_charge(text, set())
+        assert len(issues) == 1
+        assert issues[0].date == "2024-01-05"
+        assert issues[0].code == "99213"
+
+    def test_drug_interactions(self):
+        issues = heuristic_drug_interactions("Meds: Warfarin 5mg, Aspirin 81mg", set())
+        assert [i.summary for i in issues] == ["Possible drug-drug interaction: warfarin + aspirin"]
@@ -0,0 +1,236 @@
+"""Tests for the pooled Hugging Face transport.
+
+Tests verify:
+- Retry-After parsing (seconds and HTTP-date)
+- Backoff honours Retry-After and stays within the jitter cap
+- Sync and async paths retry transient statuses and surface errors
+- Per-endpoint concurrency limits cap in-flight async requests
+- Moving to a new event loop closes the client bound to the old one
+- Loops running in different threads keep their own clients and limits
+"""
+
+import asyncio
+import threading
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from medbilldozer.providers import hf_transport
+from medbilldozer.providers.hf_transport import (
+    HFTransport,
+    HFTransportError,
+    RetryPolicy,
+    parse_retry_after,
+)
+
+
+URL = "https://endpoint.example/v1/chat/completions"
+OK = {"choices": [{"message": {"content": "{\"issues\": []}"}, "finish_reason": "stop"}]}
+
+
+def _no_wait_policy(max_retries=3):
+    return RetryPolicy(max_retries=max_retries, base_delay=0.0, max_delay=0.0)
+
+
+def _async_transport(handler, **kwargs):
+    """HFTransport whose httpx client is backed by a MockTransport."""
+    transport = HFTransport(**kwargs)
+    real_client = httpx.AsyncClient
+
+    def client_factory(**client_kwargs):
+        client_kwargs.pop("http2", None)
+        return real_client(transport=httpx.MockTransport(handler), **client_kwargs)
+
+    return transport, patch.object(hf_transport.httpx, "AsyncClient", side_effect=client_factory)
+
+
+@pytest.mark.unit
+class TestRetryPolicy:
+    """Test backoff and Retry-After handling."""
+
+    def test_parse_retry_after_seconds(self):
+        assert parse_retry_after("7") == 7.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+
+    def test_parse_retry_after_http_date(self):
+        now = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+        assert parse_retry_after("Mon, 01 Jan 2024 12:00:30 GMT", now=now) == 30.0
+
+    def test_delay_honours_retry_after(self):
+        policy = RetryPolicy(base_delay=1.0, max_retry_after=60)
+        assert 10.0 <= policy.delay(0, retry_after=10) <= 11.0
+        assert policy.delay(0, retry_after=600) <= 61.0
+
+    def test_delay_jitter_is_capped(self):
+        policy = RetryPolicy(base_delay=1.0, max_delay=4.0)
+        assert all(0 <= policy.delay(attempt) <= 4.0 for attempt in range(10))
+
+    def test_should_retry(self):
+        policy = RetryPolicy(max_retries=2)
+        assert policy.should_retry(0, 503)
+        assert policy.should_retry(0, None)
+        assert not policy.should_retry(0, 400)
+        assert not policy.should_retry(2, 503)
+
+
+@pytest.mark.unit
+class TestSyncTransport:
+    """Test the pooled requests.Session path."""
+
+    def _response(self, status, body=None, headers=None):
+        response = MagicMock()
+        response.status_code = status
+        response.headers = headers or {}
+        response.json.return_value = body
+        response.text = "error"
+        return response
+
+    def test_retries_then_succeeds(self):
+        transport = HFTransport(retry=_no_wait_policy())
+        session = MagicMock()
+        session.post.side_effect = [
+            self._response(429, headers={"Retry-After": "0"}),
+            self._response(200, OK),
+        ]
+        transport._session = session
+
+        assert transport.post_json(URL, {}, {}) == OK
+        assert session.post.call_count == 2
+
+    def test_client_error_not_retried(self):
+        transport = HFTransport(retry=_no_wait_policy())
+        session = MagicMock()
+        session.post.return_value = self._response(400)
+        transport._session = session
+
+        with pytest.raises(HFTransportError) as exc:
+            transport.post_json(URL, {}, {})
+        assert exc.value.status_code == 400
+        assert session.post.call_count == 1
+
+
+@pytest.mark.unit
+class TestAsyncTransport:
+    """Test the httpx.AsyncClient path."""
+
+    def test_retries_on_503(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(503, headers={"Retry-After": "0"})
+            return httpx.Response(200, json=OK)
+
+        transport, patched = _async_transport(handler, retry=_no_wait_policy())
+        with patched:
+            result = asyncio.run(transport.post_json_async(URL, {}, {"model": "m"}))
+        assert result == OK
+        assert len(calls) == 2
+
+    def test_gives_up_after_max_retries(self):
+        transport, patched = _async_transport(
+            lambda request: httpx.Response(502), retry=_no_wait_policy(max_retries=1)
+        )
+        with patched, pytest.raises(HFTransportError) as exc:
+            asyncio.run(transport.post_json_async(URL, {}, {}))
+        assert exc.value.status_code == 502
+
+    def test_endpoint_limit_caps_in_flight(self):
+        state = {"active": 0, "peak": 0}
+
+        async def handler(request):
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            await asyncio.sleep(0.01)
+            state["active"] -= 1
+            return httpx.Response(200, json=OK)
+
+        transport, patched = _async_transport(handler, endpoint_limits={URL: 2})
+
+        async def run():
+            await asyncio.gather(*(transport.post_json_async(URL, {}, {}) for _ in range(6)))
+            await transport.aclose()
+
+        with patched:
+            asyncio.run(run())
+        assert state["peak"] == 2
+
+    def test_new_loop_closes_previous_client(self):
+        transport, patched = _async_transport(lambda request: httpx.Response(200, json=OK))
+
+        async def post():
+            await transport.post_json_async(URL, {}, {})
+            return transport._async_clients[asyncio.get_running_loop()]
+
+        with patched:
+            first = asyncio.run(post())
+            second = asyncio.run(post())
+
+        assert second is not first
+        assert first.is_closed
+        assert not second.is_closed
+
+    def test_concurrent_loops_keep_their_own_client_and_limit(self):
+        peaks = {}
+        started = threading.Barrier(2)
+
+        async def handler(request):
+            state = peaks.setdefault(threading.get_ident(), {"active": 0, "peak": 0})
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            await asyncio.sleep(0.02)
+            state["active"] -= 1
+            return httpx.Response(200, json=OK)
+
+        transport, patched = _async_transport(handler, endpoint_limits={URL: 2})
+        clients, errors = [], []
+
+        async def run():
+            await transport.post_json_async(URL, {}, {})
+            started.wait(timeout=5)
+            await asyncio.gather(*(transport.post_json_async(URL, {}, {}) for _ in range(6)))
+            client = transport._async_clients[asyncio.get_running_loop()]
+            clients.append(client)
+            await asyncio.sleep(0.02)
+            assert not client.is_closed
+
+        def worker():
+            try:
+                asyncio.run(run())
+            except Exception as e:
+                errors.append(e)
+
+        with patched:
+            threads = [threading.Thread(target=worker) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert errors == []
+        assert clients[0] is not clients[1]
+        assert [state["peak"] for state in peaks.values()] == [2, 2]
+
+
+@pytest.mark.unit
+def test_medgemma_async_uses_shared_transport(monkeypatch):
+    """analyze_document_async should parse issues returned over the transport."""
+    from medbilldozer.providers.medgemma_hosted_provider import MedGemmaHostedProvider
+
+    content = '{"issues": [{"type": "duplicate_charge", "summary": "Dup", "max_savings": 40}]}'
+    transport = MagicMock()
+
+    async def post_json_async(url, headers, payload, timeout=300):
+        return {"choices": [{"message": {"content": content}, "finish_reason": "stop"}]}
+
+    transport.post_json_async = post_json_async
+    monkeypatch.setenv("HF_API_TOKEN", "test-token")
+    with patch("medbilldozer.providers.medgemma_hosted_provider.get_hf_transport", return_value=transport):
+        result = asyncio.run(MedGemmaHostedProvider().analyze_document_async("CPT 99213"))
+
+    assert [i.type for i in result.issues] == ["duplicate_charge"]
+    assert result.meta["total_max_savings"] == 40.0
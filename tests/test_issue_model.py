@@ -0,0 +1,175 @@
+"""Tests for the Issue/AnalysisResult data model and its serialization.
+
+Tests verify:
+- Slotted Issues keep attribute access and reject unknown attributes
+- FrozenIssue mirrors Issue's fields, is immutable and hashable
+- to_dict() matches dataclasses.asdict() and round-trips through from_dict()
+- dumps_json() gives the same JSON with and without orjson
+- normalize_issues() handles frozen issues
+"""
+
+import dataclasses
+import json
+import pickle
+import sys
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+
+# Mock openai before importing the orchestrator
+sys.modules['openai'] = MagicMock()
+
+from medbilldozer.core.orchestrator_agent import normalize_issues  # noqa: E402
+from medbilldozer.providers.llm_interface import (  # noqa: E402
+    ISSUE_FIELDS,
+    AnalysisResult,
+    FrozenIssue,
+    Issue,
+)
+from medbilldozer.utils import serialization  # noqa: E402
+from medbilldozer.utils.serialization import analysis_to_dict, dumps_json  # noqa: E402
+
+
+def _issue(**overrides):
+    values = {
+        "type": "duplicate_charge",
+        "summary": "Billed twice",
+        "evidence": "Line 3 and 4",
+        "code": "99213",
+        "max_savings": 125.5,
+        "confidence": 0.9,
+    }
+    values.update(overrides)
+    return Issue(**values)
+
+
+@pytest.mark.unit
+class TestIssue:
+    """Test slotted and frozen issues."""
+
+    def test_slotted_attribute_access(self):
+        issue = _issue()
+        issue.max_savings = 10.0
+
+        assert issue.max_savings == 10.0
+        assert not hasattr(issue, "__dict__")
+        with pytest.raises(AttributeError):
+            issue.unknown_field = 1
+
+    def test_to_dict_matches_asdict(self):
+        issue = _issue()
+
+        assert issue.to_dict() == dataclasses.asdict(issue)
+        assert tuple(issue.to_dict()) == ISSUE_FIELDS
+        assert issue.to_tuple() == dataclasses.astuple(issue)
+
+    def test_from_dict_ignores_unknown_keys(self):
+        issue = _issue()
+
+        assert Issue.from_dict({**issue.to_dict(), "metadata": {}}) == issue
+
+    def test_frozen_mirrors_issue(self):
+        assert tuple(f.name for f in dataclasses.fields(FrozenIssue)) == ISSUE_FIELDS
+        assert [f.default for f in dataclasses.fields(FrozenIssue)] == [
+            f.default for f in dataclasses.fields(Issue)
+        ]
+
+    def test_freeze_and_thaw(self):
+        issue = _issue()
+        frozen = issue.freeze()
+
+        assert frozen.thaw() == issue
+        assert frozen.to_dict() == issue.to_dict()
+        assert hash(frozen) == hash(_issue().freeze())
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            frozen.max_savings = 0
+
+    def test_pickle_round_trip(self):
+        issue = _issue()
+
+        assert pickle.loads(pickle.dumps(issue)) == issue
+        assert pickle.loads(pickle.dumps(issue.freeze())) == issue.freeze()
+
+
+@pytest.mark.unit
+class TestAnalysisResult:
+    """Test AnalysisResult conversions."""
+
+    def test_round_trip(self):
+        result = AnalysisResult(issues=[_issue(), _issue(code="80053")], meta={"provider": "test"})
+
+        assert AnalysisResult.from_dict(json.loads(json.dumps(result.to_dict()))) == result
+
+    def test_freeze(self):
+        result = AnalysisResult(issues=[_issue()], meta={"provider": "test"})
+        frozen = result.freeze()
+
+        assert isinstance(frozen.issues, tuple)
+        with pytest.raises(TypeError):
+            frozen.meta["provider"] = "other"
+        assert frozen.thaw() == result
+
+    def test_analysis_to_dict_fast_and_duck_typed(self):
+        class LegacyIssue:
+            type = "legacy"
+            summary = "No evidence attribute"
+
+        result = AnalysisResult(issues=[_issue(), LegacyIssue()], meta={})
+
+        issues = analysis_to_dict(result)["issues"]
+        assert issues[0] == {"type": "duplicate_charge", "summary": "Billed twice",
+                             "evidence": "Line 3 and 4", "max_savings": 125.5}
+        assert issues[1] == {"type": "legacy", "summary": "No evidence attribute",
+                             "evidence": None, "max_savings": None}
+
+
+@pytest.mark.unit
+class TestDumpsJson:
+    """Test dumps_json with and without orjson."""
+
+    PAYLOAD = {
+        "result": AnalysisResult(issues=[_issue()], meta={"when": datetime(2024, 1, 2, 3, 4, 5)}),
+        "frozen": _issue().freeze(),
+        "amount": Decimal("12.50"),
+        "codes": ("99213", "80053"),
+        "name": "Zoë",
+    }
+
+    EXPECTED = {
+        "result": {"issues": [_issue().to_dict()], "meta": {"when": "2024-01-02T03:04:05"}},
+        "frozen": _issue().to_dict(),
+        "amount": "12.50",
+        "codes": ["99213", "80053"],
+        "name": "Zoë",
+    }
+
+    def test_stdlib_fallback(self, monkeypatch):
+        monkeypatch.setattr(serialization, "orjson", None)
+
+        assert json.loads(dumps_json(self.PAYLOAD)) == self.EXPECTED
+
+    def test_orjson(self):
+        pytest.importorskip("orjson")
+
+        assert json.loads(dumps_json(self.PAYLOAD)) == self.EXPECTED
+
+    def test_sort_keys(self, monkeypatch):
+        monkeypatch.setattr(serialization, "orjson", None)
+
+        assert dumps_json({"b": 1, "a": 2}, sort_keys=True) == b'{"a":2,"b":1}'
+
+
+@pytest.mark.unit
+class TestNormalizeFrozenIssues:
+    """Test normalize_issues with immutable issues."""
+
+    def test_rounds_frozen_issue_savings(self):
+        frozen = _issue(max_savings="10.456").freeze()
+
+        normalized = normalize_issues([frozen])
+
+        assert isinstance(normalized[0], FrozenIssue)
+        assert normalized[0].max_savings == 10.46
+        assert frozen.max_savings == "10.456"
@@ -0,0 +1,183 @@
+"""Tests for the backend's analysis job queue.
+
+Tests verify:
+- Jobs are reserved from the high, normal and low lanes in that order
+- A job waiting past max_lane_wait is served ahead of higher lanes
+- A lease that is not acknowledged or kept alive expires and is requeued
+- Failing jobs are retried, then dead-lettered with on_dead_letter called
+- Stopping a worker releases its in-flight job back to the queue
+- AnalysisJob round-trips through JSON and rejects unknown priorities
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from app.services.job_queue import (  # noqa: E402
+    AnalysisJob,
+    InProcessJobQueue,
+    JobWorker,
+)
+
+
+def _job(analysis_id="a1", priority="normal"):
+    return AnalysisJob(
+        analysis_id=analysis_id,
+        user_id="u1",
+        document_ids=["d1", "d2"],
+        provider="gpt-4o-mini",
+        priority=priority,
+    )
+
+
+@pytest.mark.unit
+class TestAnalysisJob:
+    """Test AnalysisJob serialization."""
+
+    def test_json_round_trip(self):
+        job = _job(priority="high")
+
+        assert AnalysisJob.from_json(job.to_json()) == job
+
+    def test_rejects_unknown_priority(self):
+        with pytest.raises(ValueError):
+            _job(priority="urgent")
+
+
+@pytest.mark.unit
+class TestInProcessJobQueue:
+    """Test InProcessJobQueue lanes and leases."""
+
+    def test_priority_order(self):
+        async def scenario():
+            queue = InProcessJobQueue()
+            for analysis_id, priority in [("l1", "low"), ("n1", "normal"), ("h1", "high"), ("n2", "normal")]:
+                await queue.enqueue(_job(analysis_id, priority))
+            return [(await queue.reserve(timeout=0)).analysis_id for _ in range(4)]
+
+        assert asyncio.run(scenario()) == ["h1", "n1", "n2", "l1"]
+
+    def test_aged_job_is_served_before_higher_lanes(self):
+        async def scenario():
+            queue = InProcessJobQueue(max_lane_wait=60)
+            stale_low, stale_normal = _job("l1", "low"), _job("n1", "normal")
+            stale_low.enqueued_at -= 120
+            stale_normal.enqueued_at -= 90
+            for job in [_job("h1", "high"), stale_normal, stale_low, _job("h2", "high")]:
+                await queue.enqueue(job)
+            return [(await queue.reserve(timeout=0)).analysis_id for _ in range(4)]
+
+        assert asyncio.run(scenario()) == ["l1", "n1", "h1", "h2"]
+
+    def test_reserve_times_out_when_empty(self):
+        assert asyncio.run(InProcessJobQueue().reserve(timeout=0.01)) is None
+
+    def test_expired_lease_is_requeued(self):
+        async def scenario():
+            queue = InProcessJobQueue(visibility_timeout=0.05)
+            await queue.enqueue(_job("a1"))
+            first = await queue.reserve(timeout=0)
+            assert await queue.reserve(timeout=0) is None
+            second = await queue.reserve(timeout=1)
+            return first, second
+
+        first, second = asyncio.run(scenario())
+        assert second.job_id == first.job_id
+
+    def test_heartbeat_keeps_lease(self):
+        async def scenario():
+            queue = InProcessJobQueue(visibility_timeout=0.1)
+            await queue.enqueue(_job("a1"))
+            job = await queue.reserve(timeout=0)
+            for _ in range(3):
+                await asyncio.sleep(0.05)
+                await queue.heartbeat(job)
+            return await queue.reserve(timeout=0)
+
+        assert asyncio.run(scenario()) is None
+
+    def test_acked_job_is_not_requeued(self):
+        async def scenario():
+            queue = InProcessJobQueue(visibility_timeout=0.02)
+            await queue.enqueue(_job("a1"))
+            await queue.ack(await queue.reserve(timeout=0))
+            return await queue.reserve(timeout=0.05)
+
+        assert asyncio.run(scenario()) is None
+
+
+@pytest.mark.unit
+class TestJobWorker:
+    """Test JobWorker retries, dead letters and shutdown."""
+
+    def test_runs_and_acks_jobs(self):
+        async def scenario():
+            queue = InProcessJobQueue()
+            done = []
+
+            async def handler(job):
+                done.append(job.analysis_id)
+
+            worker = JobWorker(queue, handler, concurrency=2, poll_timeout=0.01)
+            for i in range(5):
+                await queue.enqueue(_job(f"a{i}"))
+            worker.start()
+            while len(done) < 5:
+                await asyncio.sleep(0.01)
+            await worker.stop()
+            return sorted(done), queue.pending(), queue._leases
+
+        done, pending, leases = asyncio.run(scenario())
+        assert done == [f"a{i}" for i in range(5)]
+        assert pending == 0
+        assert leases == {}
+
+    def test_retries_then_dead_letters(self):
+        async def scenario():
+            queue = InProcessJobQueue()
+            calls = []
+            dead = []
+
+            async def handler(job):
+                calls.append(job.attempts)
+                raise RuntimeError("provider down")
+
+            async def on_dead_letter(job, error):
+                dead.append((job.analysis_id, error))
+
+            worker = JobWorker(queue, handler, max_attempts=3, on_dead_letter=on_dead_letter)
+            await queue.enqueue(_job("a1"))
+            while not dead:
+                await worker.process(await queue.reserve(timeout=1))
+            return calls, dead, queue
+
+        calls, dead, queue = asyncio.run(scenario())
+        assert calls == [0, 1, 2]
+        assert dead == [("a1", "provider down")]
+        assert len(queue.dead_letters) == 1
+        assert queue.pending() == 0
+
+    def test_stop_releases_in_flight_job(self):
+        async def scenario():
+            queue = InProcessJobQueue()
+            started = asyncio.Event()
+
+            async def handler(job):
+                started.set()
+                await asyncio.sleep(60)
+
+            worker = JobWorker(queue, handler, concurrency=1, poll_timeout=0.01)
+            await queue.enqueue(_job("a1"))
+            worker.start()
+            await started.wait()
+            await worker.stop()
+            return await queue.reserve(timeout=0)
+
+        job = asyncio.run(scenario())
+        assert job is not None
+        assert job.analysis_id == "a1"
+        assert job.attempts == 0
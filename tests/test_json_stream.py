@@ -0,0 +1,133 @@
+"""Tests for the shared incremental JSON parser.
+
+Tests verify:
+- Issues are emitted as soon as they close, regardless of chunk boundaries
+- Strings, escapes and numbers split across chunks parse correctly
+- Truncated output is repaired from the parser stack in one pass
+- Prose, fences and invalid candidates before the real object are skipped
+- With root_key, example objects and nested elements are never taken as the root
+"""
+
+import json
+
+import pytest
+
+from medbilldozer.utils.json_stream import (
+    IncrementalJSONParser,
+    iter_stream_items,
+    parse_llm_json,
+)
+
+
+ISSUES = [
+    {"type": "duplicate_charge", "summary": "Billed \"twice\"\non 1/15", "code": "99213", "max_savings": 150.0},
+    {"type": "math_error", "summary": "Café total ≠ sum", "code": None, "max_savings": -1.5e2},
+    {"type": "other", "summary": "", "nested": {"flags": [True, False, None]}, "max_savings": 0},
+]
+DOCUMENT = "```json\n" + json.dumps({"issues": ISSUES, "meta": {"n": 3}}, ensure_ascii=False) + "\n```"
+
+
+def _chunks(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+@pytest.mark.unit
+class TestStreaming:
+    """Test incremental emission of array elements."""
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 10_000])
+    def test_emits_each_issue_once_for_any_chunking(self, size):
+        parser = IncrementalJSONParser(stream_key="issues")
+        emitted = []
+        for chunk in _chunks(DOCUMENT, size):
+            emitted.extend(parser.feed(chunk))
+        assert emitted == ISSUES
+        assert parser.close() == {"issues": ISSUES, "meta": {"n": 3}}
+        assert not parser.was_repaired
+
+    def test_issue_emitted_before_stream_ends(self):
+        parser = IncrementalJSONParser(stream_key="issues")
+        first = json.dumps(ISSUES[0])
+        assert parser.feed('{"issues": [' + first[:-1]) == []
+        assert parser.feed("}, {") == [ISSUES[0]]
+
+    def test_number_at_chunk_boundary_waits_for_more_digits(self):
+        parser = IncrementalJSONParser(stream_key="issues")
+        assert parser.feed('{"issues": [12') == []
+        assert parser.feed("34, 5]}") == [1234, 5]
+
+    @pytest.mark.parametrize("size", [1, 3, 7, 10_000])
+    def test_escaped_surrogate_pair(self, size):
+        text = '{"issues":[{"type":"\\ud83d\\ude00"}, "\\ud83d", "\\ud83d\\n"]}'
+        parser = IncrementalJSONParser(stream_key="issues")
+        emitted = []
+        for chunk in _chunks(text, size):
+            emitted.extend(parser.feed(chunk))
+        assert emitted == json.loads(text)["issues"]
+        assert emitted[0]["type"] == "\U0001F600"
+        assert emitted[0]["type"].encode("utf-8")
+
+    def test_iter_stream_items(self):
+        assert list(iter_stream_items(_chunks(DOCUMENT, 5))) == ISSUES
+
+
+@pytest.mark.unit
+class TestRepair:
+    """Test tolerant parsing of malformed output."""
+
+    def test_truncated_issue_is_dropped(self):
+        text = '{"issues": [{"type": "x"}, {"type": "y", "summary": "cut off he'
+        parsed, repaired = parse_llm_json(text)
+        assert parsed == {"issues": [{"type": "x"}]}
+        assert repaired
+
+    def test_truncated_nested_object_is_closed(self):
+        parsed, repaired = parse_llm_json('{"meta": {"provider": "m", "count": 4')
+        # The trailing number may be incomplete, so it is dropped
+        assert parsed == {"meta": {"provider": "m"}}
+        assert repaired
+
+    def test_trailing_commas(self):
+        parsed, repaired = parse_llm_json('{"issues": [{"type": "x",},],}')
+        assert parsed == {"issues": [{"type": "x"}]}
+        assert repaired
+
+    def test_skips_prose_with_braces(self):
+        text = 'Use {placeholders} like so. Result: {"issues": []} Thanks!'
+        parsed, repaired = parse_llm_json(text)
+        assert parsed == {"issues": []}
+
+    def test_root_key_skips_other_objects(self):
+        text = '{"note": "preamble"} {"documents": {"doc_0": {"issues": []}}}'
+        parsed, _ = parse_llm_json(text, root_key="documents")
+        assert list(parsed) == ["documents"]
+
+    def test_broken_sibling_keeps_completed_issues(self):
+        text = '{"issues": [{"type":"dup","summary":"s","max_savings":10}, {"type":"x","max_savings": $5}]}'
+        parsed, repaired = parse_llm_json(text, root_key="issues")
+        assert parsed == {"issues": [{"type": "dup", "summary": "s", "max_savings": 10}]}
+        assert repaired
+
+    def test_broken_sibling_while_streaming(self):
+        text = '{"issues": [{"type":"dup","max_savings":10}, {"type":"x","max_savings": $5}]}'
+        parser = IncrementalJSONParser(stream_key="issues", root_key="issues")
+        emitted = []
+        for chunk in _chunks(text, 7):
+            emitted.extend(parser.feed(chunk))
+        assert emitted == [{"type": "dup", "max_savings": 10}]
+        assert parser.close() == {"issues": emitted}
+        assert parser.was_repaired
+
+    def test_prose_example_object_is_skipped(self):
+        text = 'Example: {"a": 1}. Output: {"issues": []}'
+        assert parse_llm_json(text, root_key="issues") == ({"issues": []}, False)
+        with pytest.raises(ValueError, match="Failed to parse"):
+            parse_llm_json('Example: {"a": 1}. No findings.', root_key="issues")
+
+    def test_errors(self):
+        with pytest.raises(ValueError, match="Empty"):
+            parse_llm_json("   ")
+        with pytest.raises(ValueError, match="No JSON object found"):
+            parse_llm_json("no json here")
+        with pytest.raises(ValueError, match="Failed to parse"):
+            parse_llm_json("{ not json")
@@ -0,0 +1,84 @@
+"""Tests for MedGemma batched multi-document analysis.
+
+Tests verify:
+- Keyed batch responses map back to per-document results in order
+- Unparseable batches and missing documents fall back to single calls
+- Batches respect the document-count limit
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from medbilldozer.providers import medgemma_hosted_provider
+from medbilldozer.providers.medgemma_hosted_provider import MedGemmaHostedProvider
+
+
+def _single_response(doc_type):
+    return json.dumps({"issues": [{"type": doc_type, "summary": "single", "max_savings": 1}]})
+
+
+def _batch_response(issue_types):
+    return json.dumps({
+        "documents": {
+            doc_id: {"issues": [{"type": t, "summary": "batched", "max_savings": 5}]}
+            for doc_id, t in issue_types.items()
+        }
+    })
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    monkeypatch.setenv("HF_API_TOKEN", "test-token")
+    return MedGemmaHostedProvider()
+
+
+@pytest.mark.unit
+class TestAnalyzeDocuments:
+    """Test batched prompting and fallback behavior."""
+
+    def test_batch_maps_results_in_order(self, provider):
+        response = _batch_response({"doc_0": "duplicate_charge", "doc_1": "overbilling"})
+        with patch.object(provider, "_call_model", return_value=response) as call:
+            results = provider.analyze_documents(["EOB one", "Receipt two"])
+
+        assert call.call_count == 1
+        prompt = call.call_args[0][0]
+        assert prompt.count("<<<DOC doc_") == 2
+        assert [r.issues[0].type for r in results] == ["duplicate_charge", "overbilling"]
+        assert all(r.meta["batched"] and r.meta["batch_size"] == 2 for r in results)
+
+    def test_missing_document_falls_back(self, provider):
+        responses = [_batch_response({"doc_0": "duplicate_charge"}), _single_response("math_error")]
+        with patch.object(provider, "_call_model", side_effect=responses) as call:
+            results = provider.analyze_documents(["EOB one", "Receipt two"])
+
+        assert call.call_count == 2
+        assert results[0].meta["batched"] is True
+        assert results[1].issues[0].type == "math_error"
+        assert "batched" not in results[1].meta
+
+    def test_unparseable_batch_falls_back_to_singles(self, provider):
+        responses = ["not json at all", _single_response("a"), _single_response("b")]
+        with patch.object(provider, "_call_model", side_effect=responses) as call:
+            results = provider.analyze_documents(["one", "two"])
+
+        assert call.call_count == 3
+        assert [r.issues[0].type for r in results] == ["a", "b"]
+
+    def test_batches_respect_document_limit(self, provider):
+        def fake_call(prompt, max_tokens=4096):
+            ids = [line[len("<<<DOC "):-3] for line in prompt.splitlines() if line.startswith("<<<DOC ")]
+            if not ids:
+                return _single_response("overbilling")
+            return _batch_response({doc_id: "overbilling" for doc_id in ids})
+
+        with patch.object(medgemma_hosted_provider, "BATCH_MAX_DOCUMENTS", 2), \
+                patch.object(provider, "_call_model", side_effect=fake_call) as call:
+            results = provider.analyze_documents(["a", "b", "c", "d", "e"])
+
+        # 2 + 2 batched requests, the trailing singleton goes through analyze_document
+        assert call.call_count == 3
+        assert len(results) == 5
+        assert [r.meta.get("batched", False) for r in results] == [True, True, True, True, False]
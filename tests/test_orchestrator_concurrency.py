@@ -0,0 +1,104 @@
+"""Tests for OrchestratorAgent concurrent phase execution.
+
+Tests verify:
+- Sequential and concurrent modes produce the same issues and workflow log
+- Phase-2 line-item parsing overlaps with the analyzer call
+"""
+
+import sys
+import time
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Mock external dependencies
+sys.modules['openai'] = MagicMock()
+
+from medbilldozer.core import orchestrator_agent
+from medbilldozer.core.orchestrator_agent import OrchestratorAgent
+from medbilldozer.providers.llm_interface import AnalysisResult, Issue, LLMProvider
+
+
+DELAY = 0.2
+
+LINE_ITEMS = {
+    "medical_line_items": [
+        {"date_of_service": "2024-01-05", "cpt_code": "99213", "patient_responsibility": 40.0},
+        {"date_of_service": "2024-01-05", "cpt_code": "99213", "patient_responsibility": 40.0},
+    ]
+}
+
+
+class SlowProvider(LLMProvider):
+    """Provider that sleeps to simulate a remote round-trip."""
+
+    def __init__(self):
+        self.seen_facts = None
+
+    def name(self) -> str:
+        return "slow"
+
+    def analyze_document(self, raw_text, facts=None):
+        self.seen_facts = facts
+        time.sleep(DELAY)
+        return AnalysisResult(
+            issues=[Issue(type="overbilling", summary="High fee", max_savings=10)],
+            meta={},
+        )
+
+
+def _slow_phase2(prompt, model):
+    time.sleep(DELAY)
+    return json.dumps(LINE_ITEMS)
+
+
+@pytest.fixture
+def pipeline():
+    """Patch extraction so only phase-2 and the analyzer do any work."""
+    provider = SlowProvider()
+    facts = {"document_type": "medical_bill"}
+    with patch.object(orchestrator_agent, "extract_facts_openai", return_value=dict(facts)), \
+            patch.object(orchestrator_agent, "normalize_facts", side_effect=lambda f: f), \
+            patch.object(orchestrator_agent, "_run_phase2_prompt", side_effect=_slow_phase2), \
+            patch.object(orchestrator_agent.ProviderRegistry, "get", return_value=provider):
+        yield provider
+
+
+def _run(concurrent_phases: bool):
+    agent = OrchestratorAgent(analyzer_override="slow", concurrent_phases=concurrent_phases)
+    phases = []
+    start = time.perf_counter()
+    result = agent.run("CPT 99213 Date of Service", progress_callback=lambda log, s: phases.append(s))
+    return result, phases, time.perf_counter() - start
+
+
+@pytest.mark.unit
+def test_concurrent_mode_matches_sequential_output(pipeline):
+    """Issues, savings and workflow log keys should not depend on the mode."""
+    seq, seq_phases, _ = _run(concurrent_phases=False)
+    conc, conc_phases, _ = _run(concurrent_phases=True)
+
+    assert [i.type for i in seq["analysis"].issues] == [i.type for i in conc["analysis"].issues]
+    assert [i.source for i in conc["analysis"].issues] == ["llm", "deterministic"]
+    assert seq["analysis"].meta == conc["analysis"].meta
+    assert seq["facts"] == conc["facts"]
+    assert seq["_workflow_log"]["extraction"]["medical_item_count"] == 2
+    assert conc["_workflow_log"]["extraction"]["medical_item_count"] == 2
+    assert conc["_workflow_log"]["analysis"]["mode"] == "facts+text"
+    assert conc["_workflow_log"]["analysis"]["analyzer"] == "slow"
+    assert sorted(seq_phases) == sorted(conc_phases)
+
+
+@pytest.mark.unit
+def test_concurrent_mode_overlaps_remote_calls(pipeline):
+    """Wall-clock should approach the slowest single call, not the sum."""
+    _, _, elapsed = _run(concurrent_phases=True)
+    assert elapsed < DELAY * 1.75
+
+
+@pytest.mark.unit
+def test_concurrent_mode_passes_facts_snapshot(pipeline):
+    """The analyzer must not observe facts being mutated by phase-2."""
+    _run(concurrent_phases=True)
+    assert "medical_line_items" not in pipeline.seen_facts
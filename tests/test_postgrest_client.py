@@ -0,0 +1,178 @@
+"""Tests for the backend's async PostgREST client.
+
+Tests verify:
+- Builder chains translate to PostgREST query strings (eq, in, order, range)
+- Writes send Prefer: return=representation and return the affected rows
+- Error bodies and timeouts surface as PostgrestError
+- Moving to a new event loop closes the pool bound to the old one
+- The client works against a local PostgREST-compatible stand-in
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from app.services.postgrest_client import AsyncPostgrestClient, PostgrestError  # noqa: E402
+
+
+class FakePostgrest:
+    """Minimal in-memory PostgREST: eq./in. filters, order, limit/offset."""
+
+    def __init__(self, tables=None):
+        self.tables = tables or {}
+        self.requests = []
+
+    def _matches(self, row, params):
+        for column, expr in params:
+            if column in ("select", "order", "limit", "offset"):
+                continue
+            op, _, value = expr.partition(".")
+            cell = str(row.get(column))
+            if op == "eq" and cell != value:
+                return False
+            if op == "in" and cell not in [v.strip('"') for v in value[1:-1].split(",")]:
+                return False
+        return True
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        table = request.url.path.rsplit("/", 1)[-1]
+        rows = self.tables.setdefault(table, [])
+        params = list(request.url.params.multi_items())
+        matched = [row for row in rows if self._matches(row, params)]
+
+        if request.method == "POST":
+            new = json.loads(request.content)
+            new = new if isinstance(new, list) else [new]
+            rows.extend(new)
+            return httpx.Response(201, json=new)
+        if request.method == "PATCH":
+            for row in matched:
+                row.update(json.loads(request.content))
+            return httpx.Response(200, json=matched)
+        if request.method == "DELETE":
+            self.tables[table] = [row for row in rows if row not in matched]
+            return httpx.Response(200, json=matched)
+
+        query = dict(params)
+        if "order" in query:
+            column, _, direction = query["order"].partition(".")
+            matched.sort(key=lambda r: r[column], reverse=direction == "desc")
+        offset = int(query.get("offset", 0))
+        limit = int(query.get("limit", len(matched)))
+        return httpx.Response(200, json=matched[offset:offset + limit])
+
+
+def _client(handler):
+    return AsyncPostgrestClient(
+        "http://postgrest.test/rest/v1", "service-key", transport=httpx.MockTransport(handler)
+    )
+
+
+@pytest.mark.unit
+class TestQueryBuilder:
+    """Test translation of builder chains to requests."""
+
+    def test_select_filters_order_range(self):
+        server = FakePostgrest({"documents": [
+            {"document_id": f"d{i}", "user_id": "u1", "uploaded_at": i} for i in range(5)
+        ]})
+        client = _client(server)
+
+        async def run():
+            return await client.table("documents")\
+                .select("*")\
+                .eq("user_id", "u1")\
+                .order("uploaded_at", desc=True)\
+                .range(1, 2)\
+                .execute()
+
+        result = asyncio.run(run())
+
+        assert [row["document_id"] for row in result.data] == ["d3", "d2"]
+        request = server.requests[0]
+        assert request.headers["apikey"] == "service-key"
+        assert request.headers["Authorization"] == "Bearer service-key"
+        assert request.url.params["order"] == "uploaded_at.desc"
+        assert (request.url.params["offset"], request.url.params["limit"]) == ("1", "2")
+
+    def test_in_quotes_reserved_characters(self):
+        server = FakePostgrest()
+        asyncio.run(_client(server).table("documents").select().in_("name", ["a", "b,c"]).execute())
+
+        assert server.requests[0].url.params["name"] == 'in.(a,"b,c")'
+
+    def test_insert_update_delete(self):
+        server = FakePostgrest()
+        client = _client(server)
+
+        async def run():
+            inserted = await client.table("issues").insert([{"issue_id": "i1", "status": "open"}]).execute()
+            updated = await client.table("issues").update({"status": "resolved"}).eq("issue_id", "i1").execute()
+            deleted = await client.table("issues").delete().eq("issue_id", "i1").execute()
+            return inserted, updated, deleted
+
+        inserted, updated, deleted = asyncio.run(run())
+
+        assert inserted.data == [{"issue_id": "i1", "status": "open"}]
+        assert updated.data[0]["status"] == "resolved"
+        assert deleted.data[0]["issue_id"] == "i1"
+        assert server.tables["issues"] == []
+        assert all(r.headers["Prefer"] == "return=representation" for r in server.requests)
+
+
+@pytest.mark.unit
+class TestErrors:
+    """Test error reporting."""
+
+    def test_error_body_is_raised(self):
+        def handler(request):
+            return httpx.Response(400, json={"message": "column does not exist", "code": "42703"})
+
+        with pytest.raises(PostgrestError, match="column does not exist") as exc_info:
+            asyncio.run(_client(handler).table("documents").select().execute())
+
+        assert exc_info.value.status_code == 400
+        assert exc_info.value.code == "42703"
+
+    def test_timeout_is_flagged(self):
+        def handler(request):
+            raise httpx.ReadTimeout("slow", request=request)
+
+        with pytest.raises(PostgrestError) as exc_info:
+            asyncio.run(_client(handler).table("documents").select().timeout(0.1).execute())
+
+        assert exc_info.value.timed_out is True
+
+    def test_rpc_posts_params(self):
+        server = FakePostgrest()
+        asyncio.run(_client(server).rpc("issue_stats", {"p_analysis_id": "a1"}).execute())
+
+        request = server.requests[0]
+        assert (request.method, request.url.path) == ("POST", "/rest/v1/rpc/issue_stats")
+        assert json.loads(request.content) == {"p_analysis_id": "a1"}
+
+
+@pytest.mark.unit
+class TestEventLoops:
+    """Test rebinding the pool when the event loop changes."""
+
+    def test_new_loop_closes_previous_pool(self):
+        client = _client(FakePostgrest())
+
+        async def fetch():
+            await client.table("documents").select().execute()
+            return client._client
+
+        first = asyncio.run(fetch())
+        second = asyncio.run(fetch())
+
+        assert second is not first
+        assert first.is_closed
+        assert not second.is_closed
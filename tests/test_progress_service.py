@@ -0,0 +1,145 @@
+"""Tests for the backend's ProgressReporter.
+
+Tests verify:
+- Repeated reports for a document coalesce into one batched write
+- A failed write is requeued without overwriting newer phases
+- finish() flushes pending progress before it returns
+- Subscribers receive events published from worker threads
+"""
+
+import asyncio
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pydantic_settings")
+
+# Required settings; the services under test never use them
+os.environ.setdefault("FIREBASE_PROJECT_ID", "test-project")
+os.environ.setdefault("GCS_PROJECT_ID", "test-project")
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from app.services import progress_service  # noqa: E402
+
+
+class FakeDB:
+    """Records update_documents_progress calls; the first `fail` calls raise."""
+
+    def __init__(self, fail=0):
+        self.fail = fail
+        self.writes = []
+
+    async def update_documents_progress(self, analysis_id, progress_by_document):
+        if self.fail:
+            self.fail -= 1
+            raise ConnectionError("database unavailable")
+        self.writes.append((analysis_id, progress_by_document))
+        return True
+
+
+@pytest.fixture
+def make_reporter(monkeypatch):
+    def make(db):
+        monkeypatch.setattr(progress_service, "get_db_service", lambda: db)
+        reporter = progress_service.ProgressReporter(flush_interval=60)
+        reporter.start_analysis("a1", "u1", "smart")
+        return reporter
+
+    return make
+
+
+def _phases(write):
+    return {document_id: progress["phase"] for document_id, progress in write[1].items()}
+
+
+@pytest.mark.unit
+class TestFlush:
+    """Test batching of progress writes."""
+
+    def test_repeated_reports_coalesce(self, make_reporter):
+        db = FakeDB()
+        reporter = make_reporter(db)
+        reporter.report("a1", "d1", "loading", started_at="2026-01-01T00:00:00")
+        reporter.report("a1", "d1", "extracting")
+        reporter.report("a1", "d1", "analyzing")
+        reporter.report("a1", "d2", "loading")
+
+        asyncio.run(reporter.flush())
+        asyncio.run(reporter.flush())
+
+        assert len(db.writes) == 1
+        assert _phases(db.writes[0]) == {"d1": "analyzing", "d2": "loading"}
+        assert db.writes[0][1]["d1"]["started_at"] == "2026-01-01T00:00:00"
+
+    def test_failed_write_is_requeued_behind_newer_phases(self, make_reporter):
+        db = FakeDB(fail=1)
+        reporter = make_reporter(db)
+        reporter.report("a1", "d1", "loading")
+        reporter.report("a1", "d2", "loading")
+
+        asyncio.run(reporter.flush())
+        assert db.writes == []
+
+        reporter.report("a1", "d2", "analyzing")
+        asyncio.run(reporter.flush())
+
+        assert len(db.writes) == 1
+        assert _phases(db.writes[0]) == {"d1": "loading", "d2": "analyzing"}
+
+    def test_finish_flushes_before_returning(self, make_reporter):
+        db = FakeDB()
+        reporter = make_reporter(db)
+        reporter.report("a1", "d1", "analyzing")
+
+        asyncio.run(reporter.finish("a1"))
+
+        assert [_phases(write) for write in db.writes] == [{"d1": "analyzing"}]
+        assert reporter.snapshot("a1", "u1") is None
+        # Late reports from workers are ignored once the analysis finished
+        reporter.report("a1", "d1", "done")
+        asyncio.run(reporter.flush())
+        assert len(db.writes) == 1
+
+
+@pytest.mark.unit
+class TestSubscribe:
+    """Test the event stream behind GET /analyze/{id}/events."""
+
+    def test_events_from_worker_thread_reach_subscriber(self, make_reporter):
+        reporter = make_reporter(FakeDB())
+
+        async def scenario():
+            queue, snapshot = reporter.subscribe("a1", "u1")
+            worker = threading.Thread(target=lambda: (
+                reporter.report("a1", "d1", "analyzing"),
+                reporter.publish("a1", "issue", {"document_id": "d1", "issue": {"type": "x"}}),
+            ))
+            worker.start()
+            await asyncio.get_running_loop().run_in_executor(None, worker.join)
+            reporter.end_stream("a1", {"status": "completed"})
+
+            events = []
+            while (item := await asyncio.wait_for(queue.get(), timeout=1)) is not None:
+                events.append(item)
+            return snapshot, events
+
+        snapshot, events = asyncio.run(scenario())
+
+        assert snapshot["status"] == "processing"
+        assert [event for event, _ in events] == ["phase", "issue", "complete"]
+        assert events[0][1]["document_id"] == "d1"
+        assert events[0][1]["phase"] == "analyzing"
+        assert events[2][1] == {"status": "completed"}
+
+    def test_subscribe_requires_owner(self, make_reporter):
+        reporter = make_reporter(FakeDB())
+
+        async def scenario():
+            return reporter.subscribe("a1", "someone-else"), reporter.subscribe("missing", "u1")
+
+        assert asyncio.run(scenario()) == (None, None)
@@ -0,0 +1,95 @@
+"""Tests for cached prompt templates.
+
+Tests verify:
+- Source files are read once and re-read only when their mtime/size changes
+- Missing files are skipped and picked up when they appear
+- check_interval throttles file checks
+- The fact extraction prompt keeps a stable prefix across documents
+"""
+
+import os
+
+import pytest
+
+from medbilldozer.extractors.extraction_prompt import (
+    build_fact_extraction_prompt,
+    build_fact_extraction_prompt_parts,
+)
+from medbilldozer.prompts.prompt_templates import PromptTemplate
+
+
+def _join(contents):
+    return "|".join(f"{name}={text}" for name, text in contents.items())
+
+
+def _touch(path, text, mtime):
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.mark.unit
+class TestPromptTemplate:
+    """Test PromptTemplate caching and invalidation."""
+
+    def test_reads_files_once(self, tmp_path):
+        _touch(tmp_path / "a.md", "alpha", 1_000)
+        template = PromptTemplate([tmp_path / "a.md"], _join, check_interval=0)
+
+        prompts = [template.render(f"question {i}") for i in range(3)]
+
+        assert template.loads == 1
+        assert [p.text for p in prompts] == [f"a.md=alphaquestion {i}" for i in range(3)]
+        assert len({p.prefix_key for p in prompts}) == 1
+
+    def test_reloads_on_change(self, tmp_path):
+        _touch(tmp_path / "a.md", "alpha", 1_000)
+        template = PromptTemplate([tmp_path / "a.md"], _join, check_interval=0)
+        first = template.render("")
+
+        _touch(tmp_path / "a.md", "gamma", 2_000)
+        second = template.render("")
+
+        assert second.prefix == "a.md=gamma"
+        assert second.prefix_key != first.prefix_key
+        assert template.loads == 2
+
+    def test_missing_file_picked_up_later(self, tmp_path):
+        _touch(tmp_path / "a.md", "alpha", 1_000)
+        template = PromptTemplate([tmp_path / "a.md", tmp_path / "b.md"], _join, check_interval=0)
+        assert template.prefix() == "a.md=alpha"
+
+        _touch(tmp_path / "b.md", "beta", 1_000)
+
+        assert template.prefix() == "a.md=alpha|b.md=beta"
+        assert template.contents() == {"a.md": "alpha", "b.md": "beta"}
+
+    def test_check_interval_throttles(self, tmp_path):
+        _touch(tmp_path / "a.md", "alpha", 1_000)
+        template = PromptTemplate([tmp_path / "a.md"], _join, check_interval=3600)
+        template.prefix()
+
+        _touch(tmp_path / "a.md", "gamma", 2_000)
+        assert template.prefix() == "a.md=alpha"
+
+        template.invalidate()
+        assert template.prefix() == "a.md=gamma"
+
+
+@pytest.mark.unit
+class TestFactExtractionPrompt:
+    """Test the split fact extraction prompt."""
+
+    @pytest.mark.parametrize("include_context", [True, False])
+    def test_parts_match_full_prompt(self, include_context):
+        parts = build_fact_extraction_prompt_parts("RECEIPT #123", include_context)
+
+        assert parts.text == build_fact_extraction_prompt("RECEIPT #123", include_context)
+        assert parts.suffix == "RECEIPT #123\n"
+        assert parts.prefix.rstrip().endswith("DOCUMENT:\n-----------------------------------")
+
+    def test_prefix_is_shared_across_documents(self):
+        first = build_fact_extraction_prompt_parts("bill one")
+        second = build_fact_extraction_prompt_parts("bill two")
+
+        assert first.prefix == second.prefix
+        assert first.prefix_key == second.prefix_key
@@ -0,0 +1,216 @@
+"""Tests for streaming issues from providers through the orchestrator.
+
+Tests verify:
+- The default stream_document() yields analyze_document() issues and returns its result
+- MedGemma yields each issue as soon as its JSON object closes
+- Stream failures fall back to the buffered call, or return a partial result
+- Nested issue objects and prose examples are never taken as the response root
+- CachingProvider replays cached issues and stores streamed results
+- _call_analyzer forwards streamed issues and keeps the text-only fallback
+- SSE bodies are decoded into completion deltas
+"""
+
+import sys
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Mock external dependencies
+sys.modules['openai'] = MagicMock()
+
+from medbilldozer.core.orchestrator_agent import _call_analyzer
+from medbilldozer.providers.hf_transport import HFTransport, HFTransportError
+from medbilldozer.providers.llm_interface import (
+    AnalysisResult,
+    Issue,
+    LLMProvider,
+    LocalHeuristicProvider,
+    drain_stream,
+)
+from medbilldozer.providers.medgemma_hosted_provider import MedGemmaHostedProvider
+from medbilldozer.providers.result_cache import CachingProvider, MemoryLRUCache
+
+
+BILL = """Date of Service: 2024-01-15
+CPT 99213 - Office visit $150.00
+CPT 99213 - Office visit $150.00
+"""
+
+RESPONSE = json.dumps({"issues": [
+    {"type": "duplicate_charge", "summary": "Duplicate 99213", "code": "99213", "max_savings": 150},
+    {"type": "overbilling", "summary": "High fee", "max_savings": "40.5"},
+]})
+
+
+def _chunks(text, size=7):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class TextOnlyProvider(LLMProvider):
+    def name(self):
+        return "text-only"
+
+    def analyze_document(self, raw_text):
+        return AnalysisResult(issues=[Issue(type="other", summary="text only")], meta={})
+
+
+@pytest.fixture
+def medgemma(monkeypatch):
+    monkeypatch.setenv("HF_API_TOKEN", "test-token")
+    provider = MedGemmaHostedProvider()
+    monkeypatch.setattr(provider, "_ensure_ready", lambda: None)
+    return provider
+
+
+def _patch_stream(chunks):
+    transport = MagicMock()
+    transport.stream_chat.side_effect = lambda *args, **kwargs: iter(chunks)
+    return patch(
+        "medbilldozer.providers.medgemma_hosted_provider.get_hf_transport",
+        return_value=transport,
+    )
+
+
+@pytest.mark.unit
+class TestDefaultStream:
+    """Test the LLMProvider.stream_document() default."""
+
+    def test_yields_issues_and_returns_result(self):
+        provider = LocalHeuristicProvider()
+        seen = []
+        result = drain_stream(provider.stream_document(BILL), seen.append)
+
+        assert result.issues
+        assert seen == result.issues
+
+
+@pytest.mark.unit
+class TestMedGemmaStream:
+    """Test MedGemma streaming over the transport."""
+
+    def test_issues_yielded_before_stream_ends(self, medgemma):
+        chunks = _chunks(RESPONSE)
+        consumed = []
+
+        def tracking():
+            for chunk in chunks:
+                consumed.append(chunk)
+                yield chunk
+
+        transport = MagicMock()
+        transport.stream_chat.return_value = tracking()
+        with patch("medbilldozer.providers.medgemma_hosted_provider.get_hf_transport", return_value=transport):
+            stream = medgemma.stream_document(BILL)
+            first = next(stream)
+            assert first.type == "duplicate_charge"
+            assert len(consumed) < len(chunks)
+            rest = []
+            result = drain_stream(stream, rest.append)
+
+        assert [i.type for i in rest] == ["overbilling"]
+        assert rest[0].max_savings == 40.5
+        assert result.meta["total_max_savings"] == 190.5
+        assert result.issues == [first] + rest
+
+    def test_failure_before_first_issue_falls_back(self, medgemma):
+        transport = MagicMock()
+        transport.stream_chat.side_effect = HFTransportError("HTTP 400", status_code=400)
+        buffered = AnalysisResult(issues=[Issue(type="math_error", summary="s")], meta={})
+        with patch("medbilldozer.providers.medgemma_hosted_provider.get_hf_transport", return_value=transport), \
+                patch.object(medgemma, "analyze_document", return_value=buffered) as analyze:
+            seen = []
+            result = drain_stream(medgemma.stream_document(BILL), seen.append)
+
+        analyze.assert_called_once()
+        assert result is buffered
+        assert [i.type for i in seen] == ["math_error"]
+
+    def test_interruption_after_issue_returns_partial_result(self, medgemma):
+        first_issue = RESPONSE[:RESPONSE.index("}") + 2]
+
+        def interrupted(*args, **kwargs):
+            yield first_issue
+            raise HFTransportError("Stream interrupted")
+
+        transport = MagicMock()
+        transport.stream_chat.side_effect = interrupted
+        with patch("medbilldozer.providers.medgemma_hosted_provider.get_hf_transport", return_value=transport), \
+                patch.object(medgemma, "analyze_document") as analyze:
+            result = drain_stream(medgemma.stream_document(BILL))
+
+        analyze.assert_not_called()
+        assert [i.type for i in result.issues] == ["duplicate_charge"]
+        assert "Stream interrupted" in result.meta["error"]
+
+    def test_broken_sibling_keeps_completed_issue(self, medgemma):
+        text = '{"issues": [{"type":"dup","summary":"s","max_savings":10}, {"type":"x","max_savings": $5}]}'
+
+        buffered = medgemma._parse_content(text, attempt=1)
+        with _patch_stream(_chunks(text)), patch.object(medgemma, "analyze_document") as analyze:
+            streamed = drain_stream(medgemma.stream_document(BILL))
+
+        analyze.assert_not_called()
+        assert [i.type for i in buffered.issues] == ["dup"]
+        assert [i.type for i in streamed.issues] == ["dup"]
+
+    def test_prose_example_object_is_not_the_response(self, medgemma):
+        assert medgemma._parse_content('Example: {"a": 1}. Output: {"issues": []}', attempt=1).issues == []
+        with pytest.raises(ValueError):
+            medgemma._parse_content('Example: {"a": 1}. No findings.', attempt=1)
+
+
+@pytest.mark.unit
+class TestCachingStream:
+    """Test CachingProvider.stream_document()."""
+
+    def test_miss_then_hit(self, medgemma):
+        cached = CachingProvider(medgemma, MemoryLRUCache())
+        with _patch_stream(_chunks(RESPONSE)) as get_transport:
+            first = drain_stream(cached.stream_document(BILL))
+            seen = []
+            second = drain_stream(cached.stream_document(BILL), seen.append)
+
+        assert get_transport.return_value.stream_chat.call_count == 1
+        assert second.meta["cache_hit"] is True
+        assert seen == first.issues
+
+
+@pytest.mark.unit
+class TestCallAnalyzerStreaming:
+    """Test issue forwarding in the orchestrator's analyzer call."""
+
+    def test_forwards_issues_in_facts_mode(self):
+        seen = []
+        result, mode = _call_analyzer(LocalHeuristicProvider(), BILL, {}, seen.append)
+
+        assert mode == "facts+text"
+        assert seen == result.issues
+
+    def test_text_only_fallback(self):
+        seen = []
+        result, mode = _call_analyzer(TextOnlyProvider(), BILL, {}, seen.append)
+
+        assert mode == "text_only"
+        assert [i.summary for i in seen] == ["text only"]
+
+
+@pytest.mark.unit
+class TestSSEDecoding:
+    """Test decoding of OpenAI-style SSE bodies."""
+
+    def test_extracts_deltas_until_done(self):
+        events = [
+            ": comment",
+            "data: " + json.dumps({"choices": [{"delta": {"role": "assistant"}}]}),
+            "",
+            "data: " + json.dumps({"choices": [{"delta": {"content": "{\"iss"}}]}),
+            "data: not-json",
+            "data: " + json.dumps({"choices": [{"delta": {"content": "ues\": []}"}}]}),
+            "data: [DONE]",
+            "data: " + json.dumps({"choices": [{"delta": {"content": "ignored"}}]}),
+        ]
+        response = MagicMock()
+        response.iter_lines.return_value = iter(events)
+
+        assert "".join(HFTransport._iter_sse_content(response)) == '{"issues": []}'
@@ -0,0 +1,149 @@
+"""Tests for the provider result cache.
+
+Tests verify:
+- Keys are content-addressed and insensitive to whitespace changes
+- Memory LRU and SQLite tiers honour max entries and TTL
+- Tiered cache promotes disk hits into memory
+- CachingProvider skips repeat calls and never caches errors
+"""
+
+import time
+
+import pytest
+
+from medbilldozer.providers.llm_interface import AnalysisResult, Issue, LLMProvider
+from medbilldozer.providers.result_cache import (
+    CachingProvider,
+    MemoryLRUCache,
+    SQLiteResultCache,
+    TieredResultCache,
+    cache_key,
+    result_cache_from_env,
+)
+
+
+class CountingProvider(LLMProvider):
+    """Provider that counts calls and optionally reports an error."""
+
+    def __init__(self, error: bool = False):
+        self.calls = 0
+        self.error = error
+        self.model = "counting-model"
+
+    def name(self) -> str:
+        return "counting"
+
+    def analyze_document(self, raw_text, facts=None):
+        self.calls += 1
+        meta = {"provider": "counting"}
+        if self.error:
+            meta["error"] = "boom"
+            return AnalysisResult(issues=[], meta=meta)
+        return AnalysisResult(
+            issues=[Issue(type="duplicate_charge", summary="Dup", max_savings=12.5, code="99213")],
+            meta=meta,
+        )
+
+
+@pytest.mark.unit
+class TestCacheKey:
+    """Test content-addressed key construction."""
+
+    def test_whitespace_insensitive(self):
+        assert cache_key("p", "m", "1", "CPT  99213\n$40") == cache_key("p", "m", "1", "CPT 99213 $40")
+
+    def test_model_and_prompt_version_change_key(self):
+        base = cache_key("p", "m", "1", "text", {"a": 1})
+        assert base != cache_key("p", "m2", "1", "text", {"a": 1})
+        assert base != cache_key("p", "m", "2", "text", {"a": 1})
+        assert base != cache_key("p", "m", "1", "text", {"a": 2})
+
+
+@pytest.mark.unit
+class TestCacheTiers:
+    """Test eviction and expiry of individual tiers."""
+
+    def test_memory_lru_evicts_least_recent(self):
+        cache = MemoryLRUCache(max_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        assert cache.get("a") == "1"
+        cache.set("c", "3")
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+        assert cache.stats.evictions == 1
+
+    def test_memory_ttl_expires(self):
+        cache = MemoryLRUCache(ttl_seconds=0.01)
+        cache.set("a", "1")
+        time.sleep(0.02)
+        assert cache.get("a") is None
+
+    def test_sqlite_persists_and_trims(self, tmp_path):
+        path = tmp_path / "cache.sqlite3"
+        cache = SQLiteResultCache(path=path, max_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.set("c", "3")
+        assert len(cache) == 2
+        cache.close()
+
+        reopened = SQLiteResultCache(path=path, max_entries=2)
+        assert reopened.get("c") == "3"
+        assert reopened.get("a") is None
+        reopened.close()
+
+    def test_tiered_promotes_disk_hits(self, tmp_path):
+        disk = SQLiteResultCache(path=tmp_path / "cache.sqlite3")
+        disk.set("k", "payload")
+        cache = TieredResultCache(MemoryLRUCache(), disk)
+
+        assert cache.get("k") == "payload"
+        assert cache.memory.get("k") == "payload"
+        stats = cache.stats_by_tier()
+        assert stats["total"]["hits"] == 1
+        assert stats["disk"]["hits"] == 1
+        disk.close()
+
+    def test_from_env_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv("PROVIDER_CACHE", raising=False)
+        assert result_cache_from_env() is None
+
+    def test_from_env_memory_only(self, monkeypatch):
+        monkeypatch.setenv("PROVIDER_CACHE", "1")
+        monkeypatch.setenv("PROVIDER_CACHE_PATH", "none")
+        cache = result_cache_from_env()
+        assert isinstance(cache, TieredResultCache)
+        assert cache.disk is None
+
+
+@pytest.mark.unit
+class TestCachingProvider:
+    """Test the provider wrapper."""
+
+    def test_repeat_call_served_from_cache(self):
+        provider = CountingProvider()
+        cached = CachingProvider(provider, MemoryLRUCache())
+
+        first = cached.analyze_document("CPT 99213", facts={"patient_name": "A"})
+        second = cached.analyze_document("CPT  99213", facts={"patient_name": "A"})
+
+        assert provider.calls == 1
+        assert second.meta["cache_hit"] is True
+        assert "cache_hit" not in first.meta
+        assert second.issues[0].code == "99213"
+        assert second.issues[0].max_savings == 12.5
+
+    def test_error_results_not_cached(self):
+        provider = CountingProvider(error=True)
+        cached = CachingProvider(provider, MemoryLRUCache())
+
+        cached.analyze_document("text")
+        cached.analyze_document("text")
+        assert provider.calls == 2
+
+    def test_delegates_identity(self):
+        cached = CachingProvider(CountingProvider(), MemoryLRUCache())
+        assert cached.name() == "counting"
+        assert cached.model_id() == "counting-model"
+        assert cached.model == "counting-model"
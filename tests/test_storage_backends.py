@@ -0,0 +1,137 @@
+"""Tests for the backend's streaming blob storage.
+
+Tests verify:
+- The local backend streams blobs in chunks and rejects paths outside a bucket
+- Streaming base64 matches base64 of the whole blob for any chunk size
+- max_bytes stops downloads early
+- The disk cache serves hits locally, never keeps partial reads, and evicts LRU entries
+"""
+
+import asyncio
+import base64
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from app.services.storage_backends import (  # noqa: E402
+    BlobTooLargeError,
+    DiskBlobCache,
+    LocalStorageBackend,
+    iter_blob_chunks,
+    read_blob_base64,
+    read_blob_bytes,
+)
+
+BLOB = bytes(range(256)) * 41  # 10496 bytes, not a multiple of 3
+
+
+class CountingBackend(LocalStorageBackend):
+    """Local backend that counts opens (i.e. cache misses)."""
+
+    def __init__(self, root):
+        super().__init__(root)
+        self.opens = 0
+
+    def open_read(self, bucket_name, blob_path, chunk_size=1024):
+        self.opens += 1
+        return super().open_read(bucket_name, blob_path, chunk_size)
+
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = CountingBackend(tmp_path / "buckets")
+    backend.write("documents", "user1/doc1/scan.png", BLOB)
+    return backend
+
+
+async def _collect(iterator):
+    return [chunk async for chunk in iterator]
+
+
+@pytest.mark.unit
+class TestLocalBackend:
+    """Test LocalStorageBackend and chunked reads."""
+
+    def test_streams_in_chunks(self, backend):
+        chunks = asyncio.run(_collect(iter_blob_chunks(backend, "documents", "user1/doc1/scan.png", 4096)))
+
+        assert [len(c) for c in chunks] == [4096, 4096, 2304]
+        assert b"".join(chunks) == BLOB
+
+    def test_exists_and_delete(self, backend):
+        assert backend.exists("documents", "user1/doc1/scan.png")
+        backend.delete("documents", "user1/doc1/scan.png")
+        assert not backend.exists("documents", "user1/doc1/scan.png")
+
+    def test_rejects_path_escape(self, backend):
+        with pytest.raises(ValueError):
+            backend.path_for("documents", "../other/secret.txt")
+
+    def test_missing_blob_raises(self, backend):
+        with pytest.raises(FileNotFoundError):
+            asyncio.run(read_blob_bytes(backend, "documents", "missing.png"))
+
+
+@pytest.mark.unit
+class TestBase64:
+    """Test streaming base64 encoding."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 4, 1000, 1 << 20])
+    def test_matches_whole_blob_encoding(self, backend, chunk_size):
+        encoded = asyncio.run(read_blob_base64(backend, "documents", "user1/doc1/scan.png", chunk_size))
+
+        assert encoded == base64.b64encode(BLOB).decode("ascii")
+
+    def test_max_bytes(self, backend):
+        with pytest.raises(BlobTooLargeError):
+            asyncio.run(read_blob_base64(
+                backend, "documents", "user1/doc1/scan.png", 1024, max_bytes=len(BLOB) - 1
+            ))
+        data = asyncio.run(read_blob_bytes(
+            backend, "documents", "user1/doc1/scan.png", 1024, max_bytes=len(BLOB)
+        ))
+        assert data == BLOB
+
+
+@pytest.mark.unit
+class TestDiskCache:
+    """Test DiskBlobCache read-through behavior."""
+
+    def test_hit_skips_backend(self, backend, tmp_path):
+        cache = DiskBlobCache(tmp_path / "cache")
+        first = asyncio.run(read_blob_bytes(backend, "documents", "user1/doc1/scan.png", 4096, cache))
+        second = asyncio.run(read_blob_bytes(backend, "documents", "user1/doc1/scan.png", 4096, cache))
+
+        assert first == second == BLOB
+        assert backend.opens == 1
+
+    def test_partial_read_not_cached(self, backend, tmp_path):
+        cache = DiskBlobCache(tmp_path / "cache")
+
+        async def read_first_chunk():
+            stream = iter_blob_chunks(backend, "documents", "user1/doc1/scan.png", 1024, cache)
+            await stream.__anext__()
+            await stream.aclose()
+
+        asyncio.run(read_first_chunk())
+
+        assert list((tmp_path / "cache").iterdir()) == []
+        assert cache.open_cached("documents", "user1/doc1/scan.png") is None
+
+    def test_evicts_least_recently_used(self, backend, tmp_path):
+        backend.write("documents", "b.png", BLOB)
+        cache = DiskBlobCache(tmp_path / "cache", max_bytes=len(BLOB) * 2)
+        asyncio.run(read_blob_bytes(backend, "documents", "user1/doc1/scan.png", 4096, cache))
+        asyncio.run(read_blob_bytes(backend, "documents", "b.png", 4096, cache))
+        # Make the first entry the oldest, then add a third
+        old = cache._key_path("documents", "user1/doc1/scan.png")
+        os.utime(old, (1, 1))
+        backend.write("documents", "c.png", BLOB)
+        asyncio.run(read_blob_bytes(backend, "documents", "c.png", 4096, cache))
+
+        assert not old.exists()
+        assert cache.open_cached("documents", "b.png") is not None
@@ -0,0 +1,124 @@
+"""Tests for transaction normalization.
+
+Tests verify:
+- The columnar batch path produces the same canonical_ids and transactions
+  as normalize_line_items in compat mode
+- Batch deduplication matches deduplicate_transactions, including order
+  and provenance
+- Packed fingerprints group the same transactions under different ids
+- Raw values that format differently (1 vs 1.0 vs True) are not conflated
+"""
+
+import random
+from decimal import Decimal
+
+import pytest
+
+from medbilldozer.core.transaction_normalization import (
+    FINGERPRINT_PACKED,
+    build_transaction_fingerprint,
+    deduplicate_transactions,
+    normalize_documents,
+    normalize_line_items,
+)
+
+
+def _claim_history(seed=7, documents=6, rows=200):
+    """Random line items with many repeats across documents."""
+    rng = random.Random(seed)
+    providers = ["Valley Clinic", " valley clinic", "VALLEY CLINIC ", "Hill Hospital", None, ""]
+    dates = ["2024-01-05", "2024-02-11", " 2024-03-09", None]
+    cpts = ["99213", "99214", "80053", None]
+    amounts = [125, 125.0, "125.00", 80.5, "80.50", Decimal("2.675"), 2.675, None, 0]
+    units = [1, 2, None, 0, "2", 1.0]
+    history = []
+    for d in range(documents):
+        items = []
+        for _ in range(rows):
+            item = {
+                "patient_dob": rng.choice(["1980-04-01", "1980-04-01 ", None]),
+                "provider": rng.choice(providers),
+                "date_of_service": rng.choice(dates),
+                "cpt": rng.choice(cpts),
+                "billed": rng.choice(amounts),
+                "allowed": rng.choice(amounts),
+                "description": rng.choice(["Office visit", None]),
+            }
+            unit = rng.choice(units + ["missing"])
+            if unit != "missing":
+                item["units"] = unit
+            items.append(item)
+        history.append((items, f"doc-{d}"))
+    return history
+
+
+def _item_by_item(history):
+    transactions = []
+    for items, document_id in history:
+        transactions.extend(normalize_line_items(items, document_id))
+    return transactions
+
+
+@pytest.mark.unit
+class TestNormalizeDocuments:
+    """Test the columnar batch path against the item-by-item path."""
+
+    def test_compat_matches_normalize_line_items(self):
+        history = _claim_history()
+
+        batch = normalize_documents(history)
+
+        assert batch.to_transactions() == _item_by_item(history)
+
+    def test_deduplicate_matches(self):
+        history = _claim_history()
+        expected_unique, expected_provenance = deduplicate_transactions(_item_by_item(history))
+
+        unique, provenance = normalize_documents(history).deduplicate()
+
+        assert list(unique) == list(expected_unique)
+        assert list(unique.values()) == list(expected_unique.values())
+        assert provenance == expected_provenance
+        assert list(provenance) == list(expected_provenance)
+
+    def test_packed_groups_the_same_rows(self):
+        history = _claim_history(seed=11)
+        compat = normalize_documents(history)
+        packed = normalize_documents(history, fingerprint=FINGERPRINT_PACKED)
+
+        compat_unique, compat_provenance = compat.deduplicate()
+        packed_unique, packed_provenance = packed.deduplicate()
+
+        assert set(compat_unique).isdisjoint(packed_unique)
+        assert list(packed_provenance.values()) == list(compat_provenance.values())
+
+    def test_distinguishes_equal_but_differently_formatted_units(self):
+        items = [{"cpt": "99213", "units": value, "billed": 10} for value in (1, 1.0, True)]
+
+        batch = normalize_documents([(items, "doc")])
+
+        assert list(batch.canonical_ids) == [
+            build_transaction_fingerprint(
+                patient_dob=None, provider_name=None, date_of_service=None,
+                cpt_code="99213", units=value, billed_amount=Decimal("10"),
+            )
+            for value in (1, 1.0, True)
+        ]
+        assert len(set(batch.canonical_ids)) == 3
+
+    def test_unhashable_values(self):
+        items = [{"cpt": "99213", "units": [2]}, {"cpt": "99213", "units": [2]}]
+
+        unique, provenance = normalize_documents([(items, "doc")]).deduplicate()
+
+        assert list(provenance.values()) == [["doc", "doc"]]
+
+    def test_empty(self):
+        batch = normalize_documents([([], "doc")])
+
+        assert len(batch) == 0
+        assert batch.deduplicate() == ({}, {})
+
+    def test_rejects_unknown_mode(self):
+        with pytest.raises(ValueError):
+            normalize_documents([], fingerprint="md5")